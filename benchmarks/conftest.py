@@ -0,0 +1,203 @@
+"""
+すべての lambda_handler のベンチマーク（pytest-benchmark）
+
+各関数は template.yaml から読み込みます（CodeUri / Handler / Layers / Environment）。
+AWSへの呼び出しはプロセス内のフェイク（DynamoDB は fake_dynamodb、それ以外は fake_services）が処理するため、
+計測するのはハンドラーのCPU時間（イベントの解析・SDKのシリアライズ・レスポンスの組み立て）です。
+
+使い方:
+    pip install -r benchmarks/requirements.txt
+
+    # 基準（ベースライン）を保存する（benchmarks/baselines/<マシン>/0001_baseline.json）
+    python -m pytest benchmarks --benchmark-save=baseline
+
+    # 変更後に最新の基準と比べ、中央値が 20% 以上遅くなった関数があれば失敗にする
+    python -m pytest benchmarks --benchmark-compare
+    python -m pytest benchmarks --benchmark-compare=0001 --benchmark-compare-fail=mean:10%
+
+    # 一部だけ実行する
+    python -m pytest benchmarks/test_todos.py -k exercises1
+
+基準はマシン（OS・Pythonのバージョン）ごとのディレクトリに保存され、同じマシンの結果とだけ比べます。
+比べる場合は、同じマシン（CIのランナーなど）で保存した基準を使ってください。
+共有のVMなど、変更がなくても実行ごとに 20% 以上ぶれるマシンでは、判定を緩めるか専用のランナーで実行してください。
+"""
+
+import inspect
+import itertools
+import os
+import sys
+import uuid
+
+import boto3
+import pytest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+TOOLS_DIR = os.path.join(ROOT_DIR, "tools")
+FAKE_DYNAMODB_DIR = os.path.join(ROOT_DIR, "exercises1", "backend", "tools")
+
+# 基準の保存先と、--benchmark-compare のときの既定の判定
+BASELINE_DIR = os.path.join(BENCHMARK_DIR, "baselines")
+DEFAULT_STORAGE = "file://./.benchmarks"
+DEFAULT_COMPARE_FAIL = "median:20%"
+
+sys.path.insert(0, TOOLS_DIR)
+sys.path.insert(0, FAKE_DYNAMODB_DIR)
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+os.environ.setdefault("AWS_REGION", os.environ["AWS_DEFAULT_REGION"])
+# 認証情報を探しに行かない（インスタンスメタデータへの問い合わせで待たない）ようにする
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "fake")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "fake")
+
+import fake_dynamodb  # noqa: E402
+import seed_tables  # noqa: E402
+from fake_services import FakeServices  # noqa: E402
+from sam_template import LambdaContext, load_app, load_handler  # noqa: E402
+
+# 読み込んだハンドラーのモジュール名の番号
+_handler_index = itertools.count()
+
+
+def pytest_configure(config):
+    """基準の保存先を benchmarks/baselines にし、比較するときの既定の判定を設定する"""
+    if config.getoption("benchmark_storage", None) == DEFAULT_STORAGE:
+        config.option.benchmark_storage = "file://" + BASELINE_DIR
+    if config.getoption("benchmark_compare", None) and not config.getoption("benchmark_compare_fail", None):
+        from pytest_benchmark.utils import parse_compare_fail
+        config.option.benchmark_compare_fail = [parse_compare_fail(DEFAULT_COMPARE_FAIL)]
+
+
+def template_path(project):
+    """プロジェクト（lecture5, exercises2/backend など）の template.yaml のパス"""
+    return os.path.join(ROOT_DIR, project, "template.yaml")
+
+
+class FakeAws:
+    """
+    1つのテストで使うフェイクのAWS（DynamoDBのデータベースとその他のサービス）
+
+    session はフェイクにつながった boto3 のセッションで、boto3.client() などの既定のセッションと
+    各プロジェクトの aws_clients のセッションをこれに置き換えます。
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.endpoint = fake_dynamodb.Endpoint.from_url(f"memory://{name}")
+        self.database = self.endpoint.database
+        self.services = FakeServices()
+        self.session = boto3.session.Session(region_name=os.environ["AWS_DEFAULT_REGION"],
+                                             **fake_dynamodb.CLIENT_KWARGS)
+        self.session.events.register("before-send.dynamodb", self.endpoint, unique_id=fake_dynamodb.HOOK_ID)
+        self.session.events.register("before-call", self.services)
+
+    def create_tables(self, project):
+        """テンプレートのテーブルを作る（作成済みのテーブルは飛ばす）"""
+        for table in seed_tables.discover_tables(template_path(project)).values():
+            if table["name"] not in self.database.tables:
+                self.database.create_table(table["definition"])
+
+    def create_table(self, name, hash_key, range_key=None):
+        """テンプレートにないテーブル（文字列のキー）を作る"""
+        keys = [(hash_key, "HASH")] + ([(range_key, "RANGE")] if range_key else [])
+        self.database.create_table({
+            "TableName": name,
+            "KeySchema": [{"AttributeName": key, "KeyType": key_type} for key, key_type in keys],
+            "AttributeDefinitions": [{"AttributeName": key, "AttributeType": "S"} for key, _ in keys],
+        })
+
+    def table(self, name):
+        return self.session.resource("dynamodb").Table(name)
+
+    def put_items(self, table_name, items):
+        """アイテムを書き込む（ベンチマークの準備用）"""
+        with self.table(table_name).batch_writer() as writer:
+            for item in items:
+                writer.put_item(Item=item)
+
+    def seed(self, project, generated):
+        """seed_tables の generate_* が返す（論理ID, アイテム）をテンプレートのテーブルに書き込む"""
+        tables = seed_tables.discover_tables(template_path(project))
+        rows = {}
+        for logical_id, item in generated:
+            rows.setdefault(tables[logical_id]["name"], []).append(item)
+        for table_name, items in rows.items():
+            self.put_items(table_name, items)
+        return rows
+
+
+class LoadedFunction:
+    """
+    読み込んだ関数（ハンドラーとLambdaのコンテキスト）
+
+    globals はハンドラーのモジュールの名前空間です（モジュール内の関数をスタブに差し替えるときに使う）。
+    """
+
+    def __init__(self, function, handler):
+        self.function = function
+        self.handler = handler
+        self.context = LambdaContext(function)
+        self.globals = inspect.unwrap(handler).__globals__
+
+    def __call__(self, event):
+        return self.handler(event, self.context)
+
+
+def is_project_module(module, layer_dirs):
+    """別のプロジェクトのレイヤーなど、読み込み直すべきリポジトリ内のモジュールか"""
+    path = os.path.normpath(getattr(module, "__file__", None) or os.sep)
+    if not path.startswith(ROOT_DIR + os.sep) or "site-packages" in path:
+        return False
+    keep = (TOOLS_DIR, FAKE_DYNAMODB_DIR, BENCHMARK_DIR, *layer_dirs)
+    return not any(path.startswith(os.path.normpath(directory) + os.sep) for directory in keep)
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """テストごとに新しいフェイクのAWS（既定のセッションもフェイクにつなぐ）"""
+    fake = FakeAws(f"bench-{uuid.uuid4().hex}")
+    monkeypatch.setattr(boto3, "DEFAULT_SESSION", fake.session)
+    yield fake
+    fake_dynamodb.reset(fake.name)
+
+
+@pytest.fixture
+def load(aws, monkeypatch):
+    """
+    テンプレートの関数を読み込む
+
+    lecture7 と exercises2 のように同じ名前のモジュール（aws_clients, response など）を持つプロジェクトがあるため、
+    読み込む前に別のプロジェクトのモジュールを sys.modules から外し、この関数のレイヤーを sys.path の先頭にします。
+
+    Args（返す関数の引数）:
+        project (str): template.yaml のあるディレクトリ（例: lecture5, exercises2/backend）
+        logical_id (str): 関数の論理ID
+        environment (dict | None): 上書きする環境変数
+        **overrides: テンプレートのパラメーターの値（例: ApiLayout="router"）
+
+    Returns（返す関数の戻り値）:
+        LoadedFunction: 読み込んだ関数
+    """
+
+    def load_function(project, logical_id, environment=None, **overrides):
+        function = load_app(template_path(project), overrides)["functions"][logical_id]
+        function["environment"].update(environment or {})
+        aws.create_tables(project)
+        for name in [name for name, module in sys.modules.items()
+                     if is_project_module(module, function["layer_dirs"])]:
+            del sys.modules[name]
+        for layer_dir in reversed(function["layer_dirs"]):
+            monkeypatch.syspath_prepend(layer_dir)
+        for name, value in function["environment"].items():
+            monkeypatch.setenv(name, value)
+        handler = load_handler(function, next(_handler_index))
+
+        clients = sys.modules.get("aws_clients")
+        if clients is not None and not is_project_module(clients, function["layer_dirs"]):
+            monkeypatch.setattr(clients, "_session", aws.session)
+            for name in ("_clients", "_resources", "_tables"):
+                monkeypatch.setattr(clients, name, {})
+        return LoadedFunction(function, handler)
+
+    return load_function
@@ -0,0 +1,214 @@
+"""
+DynamoDB以外のAWSサービスをプロセス内で再現するフェイク（ベンチマーク用）
+
+botocore の before-call フックで呼び出しを受け取り、パース済みのレスポンスを返します。
+リクエストの検証とシリアライズ（ハンドラーのプロセス内で行われる処理）はそのまま実行され、通信だけを置き換えます。
+DynamoDBは fake_dynamodb（before-send フック）が処理するため、ここでは扱いません。
+
+対応している操作:
+    cognito-idp: AdminCreateUser / AdminSetUserPassword / AdminGetUser / AdminUpdateUserAttributes /
+                 AdminDeleteUser / ListUsers（Limit, PaginationToken）
+    logs: DescribeLogStreams / CreateLogStream / PutLogEvents / GetLogEvents
+    states: SendTaskSuccess / SendTaskFailure
+    sns: Publish
+    sqs: SendMessage / ReceiveMessage / DeleteMessage
+
+対応していない操作は NotImplementedError にします（ベンチマークが実際のAWSに接続しないようにする）。
+"""
+
+import collections
+import hashlib
+import json
+import uuid
+
+from botocore import xform_name
+from botocore.awsrequest import AWSResponse
+
+# サービス名（エンドポイントの接頭辞）→ 操作のメソッド名の接頭辞
+SERVICE_PREFIXES = {
+    "cognito-idp": "cognito",
+    "logs": "logs",
+    "states": "sfn",
+    "sns": "sns",
+    "sqs": "sqs",
+}
+
+# fake_dynamodb が処理するサービス
+PASSTHROUGH_SERVICES = {"dynamodb"}
+
+
+class FakeServiceError(Exception):
+    """AWSのエラーレスポンスとして返す例外"""
+
+    def __init__(self, code, message, status_code=400):
+        super().__init__(message)
+        self.code = code
+        self.status_code = status_code
+
+
+def request_parameters(params):
+    """シリアライズ済みのリクエスト（JSONのボディ、またはクエリの辞書）から値を取り出す"""
+    body = params.get("body")
+    if isinstance(body, dict):
+        return body
+    return json.loads(body) if body else {}
+
+
+class FakeServices:
+    """
+    Cognito / CloudWatch Logs / Step Functions / SNS / SQS のフェイク
+
+    セッションの before-call に登録して使います。状態（ユーザー・ログ・送信したメッセージ）は
+    インスタンスごとに持つため、テストごとに新しいインスタンスを作ります。
+    """
+
+    def __init__(self):
+        self.users = {}
+        self.log_streams = {}
+        self.queues = collections.defaultdict(collections.deque)
+        self.published = []
+        self.task_results = []
+        self.calls = collections.Counter()
+
+    def __call__(self, model, params, **kwargs):
+        service_name = model.service_model.endpoint_prefix
+        if service_name in PASSTHROUGH_SERVICES:
+            return None
+        prefix = SERVICE_PREFIXES.get(service_name)
+        method = getattr(self, f"{prefix}_{xform_name(model.name)}", None) if prefix else None
+        if method is None:
+            raise NotImplementedError(f"フェイクにない操作です: {service_name}.{model.name}")
+        self.calls[f"{service_name}.{model.name}"] += 1
+        try:
+            status_code, parsed = 200, method(request_parameters(params))
+        except FakeServiceError as e:
+            status_code, parsed = e.status_code, {"Error": {"Code": e.code, "Message": str(e)}}
+        parsed["ResponseMetadata"] = {"RequestId": uuid.uuid4().hex, "HTTPStatusCode": status_code,
+                                      "HTTPHeaders": {}, "RetryAttempts": 0}
+        return AWSResponse(f"https://{service_name}.fake", status_code, {}, None), parsed
+
+    # Cognito
+    def add_user(self, username, email, role, status="CONFIRMED"):
+        """ユーザーを登録する（ベンチマークの準備用）"""
+        self.users[username] = {
+            "Username": username,
+            "Attributes": [
+                {"Name": "sub", "Value": str(uuid.uuid5(uuid.NAMESPACE_URL, username))},
+                {"Name": "email", "Value": email},
+                {"Name": "email_verified", "Value": "true"},
+                {"Name": "custom:role", "Value": role},
+            ],
+            "Enabled": True,
+            "UserStatus": status,
+        }
+        return self.users[username]
+
+    def _get_user(self, request):
+        user = self.users.get(request["Username"])
+        if user is None:
+            raise FakeServiceError("UserNotFoundException", "User does not exist.")
+        return user
+
+    def cognito_admin_create_user(self, request):
+        if request["Username"] in self.users:
+            raise FakeServiceError("UsernameExistsException", "User account already exists")
+        attributes = {attribute["Name"]: attribute["Value"] for attribute in request.get("UserAttributes", [])}
+        user = self.add_user(request["Username"], attributes.get("email"), attributes.get("custom:role"),
+                             status="FORCE_CHANGE_PASSWORD")
+        return {"User": dict(user)}
+
+    def cognito_admin_set_user_password(self, request):
+        user = self._get_user(request)
+        if request.get("Permanent"):
+            user["UserStatus"] = "CONFIRMED"
+        return {}
+
+    def cognito_admin_get_user(self, request):
+        user = self._get_user(request)
+        return {"Username": user["Username"], "UserAttributes": user["Attributes"], "Enabled": user["Enabled"],
+                "UserStatus": user["UserStatus"]}
+
+    def cognito_admin_update_user_attributes(self, request):
+        user = self._get_user(request)
+        attributes = {attribute["Name"]: attribute for attribute in user["Attributes"]}
+        for attribute in request["UserAttributes"]:
+            attributes[attribute["Name"]] = dict(attribute)
+        user["Attributes"] = list(attributes.values())
+        return {}
+
+    def cognito_admin_delete_user(self, request):
+        self._get_user(request)
+        del self.users[request["Username"]]
+        return {}
+
+    def cognito_list_users(self, request):
+        limit = request.get("Limit", 60)
+        start = int(request.get("PaginationToken") or 0)
+        users = list(self.users.values())[start:start + limit]
+        response = {"Users": [dict(user) for user in users]}
+        if start + limit < len(self.users):
+            response["PaginationToken"] = str(start + limit)
+        return response
+
+    # CloudWatch Logs
+    def logs_describe_log_streams(self, request):
+        group, prefix = request["logGroupName"], request.get("logStreamNamePrefix", "")
+        return {"logStreams": [{"logStreamName": stream} for (name, stream) in sorted(self.log_streams)
+                               if name == group and stream.startswith(prefix)]}
+
+    def logs_create_log_stream(self, request):
+        key = (request["logGroupName"], request["logStreamName"])
+        if key in self.log_streams:
+            raise FakeServiceError("ResourceAlreadyExistsException", "The specified log stream already exists")
+        self.log_streams[key] = []
+        return {}
+
+    def logs_put_log_events(self, request):
+        key = (request["logGroupName"], request["logStreamName"])
+        if key not in self.log_streams:
+            raise FakeServiceError("ResourceNotFoundException", "The specified log stream does not exist.")
+        self.log_streams[key].extend(request["logEvents"])
+        return {"nextSequenceToken": str(len(self.log_streams[key]))}
+
+    def logs_get_log_events(self, request):
+        events = self.log_streams.get((request["logGroupName"], request["logStreamName"]))
+        if events is None:
+            raise FakeServiceError("ResourceNotFoundException", "The specified log stream does not exist.")
+        return {"events": [dict(event, ingestionTime=event["timestamp"]) for event in events]}
+
+    # Step Functions
+    def sfn_send_task_success(self, request):
+        self.task_results.append(("success", request["taskToken"], request["output"]))
+        return {}
+
+    def sfn_send_task_failure(self, request):
+        self.task_results.append(("failure", request["taskToken"], request.get("error")))
+        return {}
+
+    # SNS（クエリ形式のため、値は Action などと同じ階層にある）
+    def sns_publish(self, request):
+        self.published.append(request)
+        return {"MessageId": str(uuid.uuid4())}
+
+    # SQS
+    def sqs_send_message(self, request):
+        message_id = str(uuid.uuid4())
+        self.queues[request["QueueUrl"]].append({
+            "MessageId": message_id,
+            "ReceiptHandle": message_id,
+            "Body": request["MessageBody"],
+            "Attributes": {"MessageGroupId": request.get("MessageGroupId", "")},
+        })
+        return {"MessageId": message_id, "MD5OfMessageBody": hashlib.md5(request["MessageBody"].encode()).hexdigest()}
+
+    def sqs_receive_message(self, request):
+        queue = self.queues[request["QueueUrl"]]
+        messages = list(queue)[:request.get("MaxNumberOfMessages", 1)]
+        return {"Messages": messages} if messages else {}
+
+    def sqs_delete_message(self, request):
+        queue = self.queues[request["QueueUrl"]]
+        for message in list(queue):
+            if message["ReceiptHandle"] == request["ReceiptHandle"]:
+                queue.remove(message)
+        return {}
@@ -0,0 +1,115 @@
+"""
+ベンチマークで使うイベント（API Gateway のプロキシ統合・DynamoDBストリーム・オーソライザー）を作る
+"""
+
+import json
+import time
+import uuid
+
+from boto3.dynamodb.types import TypeSerializer
+
+ACCOUNT_ID = "123456789012"
+API_ID = "benchapi"
+STAGE = "Prod"
+STAGE_ARN = f"arn:aws:execute-api:ap-northeast-1:{ACCOUNT_ID}:{API_ID}/{STAGE}"
+
+serializer = TypeSerializer()
+
+
+def api_event(method, resource, path_parameters=None, query=None, body=None, principal_id=None, username=None,
+              claims=None, headers=None):
+    """
+    API Gateway（REST API）のプロキシ統合のイベントを作る
+
+    Args:
+        method (str): HTTPメソッド
+        resource (str): リソースのパス（例: /todos/{id}）
+        path_parameters (dict | None): パスパラメーター（resource の {名前} を置き換える）
+        query (dict | None): クエリ文字列のパラメーター
+        body (dict | list | str | None): ボディ（dict と list はJSONにする）
+        principal_id (str | None): Lambdaオーソライザーが返した principalId
+        username (str | None): Lambdaオーソライザーの context の username
+        claims (dict | None): Cognitoオーソライザーのクレーム（principal_id の代わりに使う）
+        headers (dict | None): ヘッダー
+
+    Returns:
+        dict: イベント
+    """
+    path = resource
+    for name, value in (path_parameters or {}).items():
+        path = path.replace("{" + name + "}", str(value)).replace("{" + name + "+}", str(value))
+    authorizer = None
+    if claims is not None:
+        authorizer = {"claims": claims}
+    elif principal_id is not None:
+        authorizer = {"principalId": principal_id, "username": username, "integrationLatency": 0}
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body, ensure_ascii=False)
+    return {
+        "resource": resource,
+        "path": path,
+        "httpMethod": method,
+        "headers": {"Accept": "application/json", "Content-Type": "application/json", **(headers or {})},
+        "multiValueHeaders": {},
+        "queryStringParameters": query,
+        "multiValueQueryStringParameters": {name: [value] for name, value in query.items()} if query else None,
+        "pathParameters": path_parameters,
+        "stageVariables": None,
+        "requestContext": {
+            "accountId": ACCOUNT_ID,
+            "apiId": API_ID,
+            "stage": STAGE,
+            "resourcePath": resource,
+            "httpMethod": method,
+            "path": f"/{STAGE}{path}",
+            "requestId": str(uuid.uuid4()),
+            "requestTimeEpoch": int(time.time() * 1000),
+            "identity": {"sourceIp": "127.0.0.1", "userAgent": "benchmark"},
+            "authorizer": authorizer,
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+def stream_record(event_name, keys, new_image=None, old_image=None, table_name="table"):
+    """
+    DynamoDBストリームのレコードを作る
+
+    Args:
+        event_name (str): INSERT / MODIFY / REMOVE
+        keys (dict): キーの属性（Pythonの値）
+        new_image (dict | None): 変更後のアイテム
+        old_image (dict | None): 変更前のアイテム
+
+    Returns:
+        dict: レコード（値はDynamoDB JSON）
+    """
+    dynamodb = {
+        "Keys": {name: serializer.serialize(value) for name, value in keys.items()},
+        "StreamViewType": "NEW_AND_OLD_IMAGES",
+        "SequenceNumber": str(uuid.uuid4().int % 10 ** 21),
+        "SizeBytes": 256,
+    }
+    if new_image is not None:
+        dynamodb["NewImage"] = {name: serializer.serialize(value) for name, value in new_image.items()}
+    if old_image is not None:
+        dynamodb["OldImage"] = {name: serializer.serialize(value) for name, value in old_image.items()}
+    return {
+        "eventID": uuid.uuid4().hex,
+        "eventName": event_name,
+        "eventVersion": "1.1",
+        "eventSource": "aws:dynamodb",
+        "awsRegion": "ap-northeast-1",
+        "dynamodb": dynamodb,
+        "eventSourceARN": f"arn:aws:dynamodb:ap-northeast-1:{ACCOUNT_ID}:table/{table_name}/stream/2026-01-01T00:00:00",
+    }
+
+
+def token_event(token, method, resource):
+    """TOKEN タイプのLambdaオーソライザーのイベントを作る"""
+    return {
+        "type": "TOKEN",
+        "authorizationToken": f"Bearer {token}",
+        "methodArn": f"{STAGE_ARN}/{method}{resource}",
+    }
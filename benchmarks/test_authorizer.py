@@ -0,0 +1,123 @@
+"""
+Lambdaオーソライザーと Cognito のトリガー（lecture7, lecture8, exercises2）のベンチマーク
+
+exercises2 のオーソライザーは署名を検証するため、テスト用のRSA鍵で署名したトークンを使い、
+JWKSの取得（get_public_keys）をその公開鍵を返すスタブに差し替えます。
+exercises2 の AuthorizerFunction は LambdaTokenAuthorizer と同じコードのため、LambdaTokenAuthorizer だけを計測します。
+"""
+
+import base64
+import itertools
+import json
+import os
+import time
+import uuid
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from lambda_events import token_event
+
+EXERCISES2 = "exercises2/backend"
+KEY_ID = "benchmark-key"
+ROLE_ID = "5b0c4f3e-0000-4000-8000-000000000001"
+ALLOWED_OPERATIONS = ["GET /troubles", "POST /troubles", "GET /comments", "POST /comments", "GET /roles",
+                      "GET /roles/{role_id}", "PUT /roles/{role_id}", "GET /users", "GET /users/{user_id}",
+                      "ANY /todos/{proxy+}"]
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def b64url(number):
+    return base64.urlsafe_b64encode(number.to_bytes((number.bit_length() + 7) // 8, "big")).rstrip(b"=").decode()
+
+
+def jwk(private_key):
+    """公開鍵をJWKS（Cognito の jwks.json の keys の要素）の形にする"""
+    numbers = private_key.public_key().public_numbers()
+    return {"kid": KEY_ID, "kty": "RSA", "alg": "RS256", "use": "sig", "e": b64url(numbers.e), "n": b64url(numbers.n)}
+
+
+def id_token(function, private_key, number):
+    """オーソライザーの環境変数（ユーザープール・クライアントID）に合わせたIDトークン"""
+    environment = function.function["environment"]
+    now = int(time.time())
+    claims = {
+        "sub": str(uuid.UUID(int=number)),
+        "username": f"user{number:04d}",
+        "custom:role": ROLE_ID,
+        "aud": environment.get("COGNITO_CLIENT_ID", "client"),
+        "iss": f"https://cognito-idp.{os.environ['AWS_REGION']}.amazonaws.com/{environment['COGNITO_USER_POOL_ID']}",
+        "token_use": "id",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": KEY_ID})
+
+
+@pytest.fixture
+def authorizer(load, aws, monkeypatch, private_key):
+    """ロールを登録し、オーソライザーを読み込む"""
+
+    def load_authorizer(project):
+        function = load(project, "LambdaTokenAuthorizer")
+        aws.put_items("RoleAccessTable", [{"role_id": ROLE_ID, "name": "general", "is_super_user": False,
+                                           "allowed_operations": ALLOWED_OPERATIONS}])
+        if "get_public_keys" in function.globals:
+            monkeypatch.setitem(function.globals, "get_public_keys", lambda: [jwk(private_key)])
+        return function
+
+    return load_authorizer
+
+
+def assert_allowed(policy):
+    assert policy["policyDocument"]["Statement"][0]["Effect"] == "Allow", json.dumps(policy)
+
+
+@pytest.mark.parametrize("project", ["lecture7", "lecture8", EXERCISES2])
+def test_same_token(benchmark, authorizer, private_key, project):
+    """同じトークンでの呼び出し（exercises2 ではポリシーのキャッシュに当たる）を計測します。"""
+    function = authorizer(project)
+    event = token_event(id_token(function, private_key, 1), "GET", "/troubles")
+    assert_allowed(function(event))
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("project", ["lecture7", "lecture8", EXERCISES2])
+def test_distinct_tokens(benchmark, authorizer, private_key, project):
+    """毎回別のトークンでの呼び出し（署名の検証とポリシーの組み立て）を計測します。"""
+    function = authorizer(project)
+    numbers = itertools.count(1)
+    assert_allowed(function(token_event(id_token(function, private_key, 0), "GET", "/troubles")))
+
+    def setup():
+        return (token_event(id_token(function, private_key, next(numbers)), "GET", "/troubles"),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert_allowed(result)
+
+
+@pytest.mark.parametrize("project", ["lecture7", "lecture8", EXERCISES2])
+def test_pre_token_generation(benchmark, load, project):
+    """PreTokenGenerationFunction（IDトークンにロールのクレームを追加する）を計測します。"""
+    function = load(project, "PreTokenGenerationFunction")
+
+    def event():
+        return {
+            "version": "1",
+            "triggerSource": "TokenGeneration_Authentication",
+            "region": "ap-northeast-1",
+            "userPoolId": "ap-northeast-1_benchmark",
+            "userName": "user0001",
+            "callerContext": {"awsSdkVersion": "aws-sdk-unknown-unknown", "clientId": "client"},
+            "request": {"userAttributes": {"sub": str(uuid.UUID(int=1)), "email": "user0001@example.com",
+                                           "custom:role": ROLE_ID}, "groupConfiguration": {}},
+            "response": {},
+        }
+
+    assert function(event())["response"]["claimsOverrideDetails"]
+    benchmark.pedantic(function, setup=lambda: ((event(),), {}), rounds=1000)
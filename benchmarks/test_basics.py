@@ -0,0 +1,101 @@
+"""
+AWSのサービスを使わない関数（lecture1〜4, lecture6）のベンチマーク
+"""
+
+import json
+
+import pytest
+
+from lambda_events import api_event
+
+# 半角の数字・記号を含む長めの文章（convert の置換が多く発生する）
+CONVERT_MESSAGE = "".join(
+    f"{i}番目の予定は2026/10/{i % 28 + 1:02d}(土) 10:{i % 60:02d}-11:{i % 60:02d}です。電話: 03-1234-{i:04d}; "
+    for i in range(40)
+)
+
+
+def test_lecture1_hello_world(benchmark, load):
+    """lecture1 の HelloWorldFunction を計測します。"""
+    function = load("lecture1", "HelloWorldFunction")
+    event = api_event("GET", "/hello")
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("message", ["123", CONVERT_MESSAGE], ids=["short", "long"])
+def test_lecture1_convert(benchmark, load, message):
+    """lecture1 の ConvertFunction（半角から全角への変換）を短い文と長い文で計測します。"""
+    function = load("lecture1", "ConvertFunction")
+    event = api_event("POST", "/convert", body={"message": message})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_lecture2_sample(benchmark, load, method):
+    """lecture2 の SampleGetFunction / SamplePostFunction を計測します。"""
+    logical_id = "SampleGetFunction" if method == "GET" else "SamplePostFunction"
+    function = load("lecture2", logical_id)
+    if method == "GET":
+        event = api_event("GET", "/echo", query={"message": "こんにちは"})
+    else:
+        event = api_event("POST", "/echo", body={"message": "こんにちは"})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_lecture2_path_param(benchmark, load):
+    """lecture2 の SamplePathParamFunction を計測します。"""
+    function = load("lecture2", "SamplePathParamFunction")
+    event = api_event("GET", "/echo/message={message}", path_parameters={"message": "hello"})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_lecture2_query(benchmark, load, monkeypatch):
+    """lecture2 の SampleQueryFunction を計測します（外部APIの呼び出しはスタブにします）。"""
+    users = [{"id": i, "name": f"user{i}", "email": f"user{i}@example.com"} for i in range(10)]
+
+    class Response:
+        def json(self):
+            return json.loads(json.dumps(users))
+
+    function = load("lecture2", "SampleQueryFunction")
+    monkeypatch.setattr(function.globals["requests"], "get", lambda url, **kwargs: Response())
+    event = api_event("GET", "/users")
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("logical_id,event", [
+    ("GetValidateFunction", api_event("GET", "/work", query={"user_id": "u-1"})),
+    ("PutValidateFunction", api_event("PUT", "/work", body={
+        "user_id": "u-1", "name": "山田太郎", "email": "taro@example.com", "age": 30})),
+    ("DeleteValidateFunction", api_event("DELETE", "/work/{user_id}", path_parameters={"user_id": "u-1"})),
+], ids=["get", "put", "delete"])
+def test_lecture3_validation(benchmark, load, logical_id, event):
+    """lecture3 の入力検証の関数（powertools の validate）を計測します。"""
+    function = load("lecture3", logical_id)
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_lecture4_hello_world(benchmark, load):
+    """lecture4 の HelloWorldFunction を計測します。"""
+    function = load("lecture4", "HelloWorldFunction")
+    event = api_event("GET", "/hello")
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("logical_id", ["AdminFunction", "GeneralFunction"])
+def test_lecture6_check_protect(benchmark, load, logical_id):
+    """lecture6 の Cognitoオーソライザーのクレームを読む関数を計測します。"""
+    function = load("lecture6", logical_id)
+    claims = {"sub": "0f6e7a52-0000-4000-8000-000000000001", "cognito:groups": "admin,general",
+              "email": "admin@example.com"}
+    event = api_event("GET", "/protected/admin" if logical_id == "AdminFunction" else "/protected/general",
+                      claims=claims)
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
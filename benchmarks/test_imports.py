@@ -0,0 +1,69 @@
+"""
+すべての関数のハンドラーを新しいPythonプロセスで読み込めることの確認（計測はしない）
+
+ベンチマークは1つのプロセスで複数のプロジェクトの関数を読み込むため、別のプロジェクトのレイヤーのモジュールが
+sys.modules に残っていると、レイヤーに足りないモジュールがあっても気付けません。
+ここでは関数ごとに、その関数のコードのディレクトリとレイヤーだけを sys.path にしたプロセスで読み込みます。
+また、プロジェクトごとのレイヤーにコピーした共通モジュールの内容が揃っていることも確認します。
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from profile_cold_start import ROOT_DIR, find_templates
+from sam_template import load_app
+
+# ハンドラーのファイルを読み込み、ハンドラーの関数があることを確認する
+IMPORT_SCRIPT = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("app", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+getattr(module, sys.argv[2])
+"""
+
+
+def all_layer_dirs():
+    return sorted({layer_dir for template_path in find_templates([])
+                   for function in load_app(template_path)["functions"].values()
+                   for layer_dir in function["layer_dirs"]})
+
+
+def all_functions():
+    for template_path in find_templates([]):
+        project = os.path.relpath(os.path.dirname(template_path), ROOT_DIR).replace(os.sep, "/")
+        for logical_id, function in load_app(template_path)["functions"].items():
+            yield pytest.param(function, id=f"{project}:{logical_id}")
+
+
+@pytest.mark.parametrize("function", list(all_functions()))
+def test_handler_imports_in_fresh_interpreter(function):
+    env = dict(os.environ, **function["environment"])
+    env.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+    env["PYTHONPATH"] = os.pathsep.join([function["code_dir"], *function["layer_dirs"]])
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT, function["file"], function["handler"]],
+                            cwd=function["code_dir"], env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr.strip().splitlines()[-1]
+
+
+def test_shared_layer_modules_are_copied():
+    """
+    レイヤーの共通モジュールは、プロジェクトごとにそのまま sam build できるよう、ほかのプロジェクトへの
+    シンボリックリンクではなくコピーで置く。同じ名前のモジュールは改行コードを除いて同じ内容であることを確認します。
+    """
+    contents = {}
+    for layer_dir in all_layer_dirs():
+        for name in sorted(os.listdir(layer_dir)):
+            path = os.path.join(layer_dir, name)
+            if not name.endswith(".py"):
+                continue
+            assert not os.path.islink(path), path
+            with open(path, "rb") as f:
+                contents.setdefault(name, {})[os.path.relpath(path, ROOT_DIR)] = f.read().replace(b"\r\n", b"\n")
+
+    for name, copies in contents.items():
+        assert len(set(copies.values())) == 1, f"{name} の内容が異なります: {sorted(copies)}"
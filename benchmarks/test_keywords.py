@@ -0,0 +1,44 @@
+"""
+lecture3 のキーワード（keyword-store テーブル）の関数のベンチマーク
+"""
+
+import uuid
+
+import pytest
+
+from lambda_events import api_event
+
+TABLE_NAME = "keyword-store"
+
+
+@pytest.fixture
+def keywords(aws):
+    """keyword-store テーブル（テンプレートにないため作る）と100件のキーワード"""
+    aws.create_table(TABLE_NAME, "id")
+    items = [{"id": str(uuid.UUID(int=i)), "keyword": f"キーワード{i}"} for i in range(100)]
+    aws.put_items(TABLE_NAME, items)
+    return items
+
+
+def test_store(benchmark, load, keywords):
+    """StoreFunction（put_item）を計測します。"""
+    function = load("lecture3", "StoreFunction")
+    event = api_event("POST", "/keyword", body={"keyword": "サーバーレス"})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_describe(benchmark, load, keywords):
+    """DescribeStoreFunction（10件の scan）を計測します。"""
+    function = load("lecture3", "DescribeStoreFunction")
+    event = api_event("GET", "/keyword")
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_get_by_id(benchmark, load, keywords):
+    """GetKeywordByIdFunction（パーティションキーの query）を計測します。"""
+    function = load("lecture3", "GetKeywordByIdFunction")
+    event = api_event("GET", "/keyword/{id}", path_parameters={"id": keywords[42]["id"]})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
@@ -0,0 +1,59 @@
+"""
+tools/local_api.py を起動してHTTPで呼び出せることの確認（計測はしない）
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from profile_cold_start import ROOT_DIR
+
+LOCAL_API = os.path.join(ROOT_DIR, "tools", "local_api.py")
+
+# サーバーが待ち受けを始めるまで待つ時間（秒）
+STARTUP_TIMEOUT = 30
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request(url, method="GET", body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    with urllib.request.urlopen(urllib.request.Request(url, data=data, method=method), timeout=30) as response:
+        return response.status, json.loads(response.read())
+
+
+def test_memory_endpoint_without_template_creates_tables():
+    """memory:// のURLに template= がなくても、提供するテンプレートのテーブルが作られることを確認します。"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, LOCAL_API, "exercises1/backend/template.yaml", "--port", str(port), "--workers", "1",
+         "--endpoint-url", "memory://local-api-test", "--quiet"],
+        cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                assert process.poll() is None, process.stderr.read()
+                assert time.monotonic() < deadline, "local_api.py が起動しませんでした"
+                time.sleep(0.2)
+
+        status, created = request(f"http://127.0.0.1:{port}/todos", "POST", {"title": "買い物"})
+        assert status == 201
+        status, listed = request(f"http://127.0.0.1:{port}/todos")
+        assert status == 200
+        assert [item["id"] for item in listed["items"]] == [created["id"]]
+    finally:
+        process.terminate()
+        process.communicate(timeout=30)
@@ -0,0 +1,76 @@
+"""
+ロールの関数（lecture7, lecture8, exercises2 の RoleService）のベンチマーク
+"""
+
+import json
+import random
+
+import pytest
+
+import seed_tables
+from lambda_events import api_event
+
+PROJECTS = ["lecture7", "lecture8", "exercises2/backend"]
+
+# 一覧の計測に使うロールの件数
+ROLE_COUNT = 50
+
+ROLE = {"name": "ベンチマーク", "is_super_user": False,
+        "allowed_operations": ["GET /todos", "POST /todos", "GET /troubles", "POST /troubles"]}
+
+
+@pytest.fixture
+def roles(aws, project):
+    aws.create_tables(project)
+    return aws.seed(project, seed_tables.generate_roles(range(ROLE_COUNT), random.Random(1), 1))["RoleAccessTable"]
+
+
+@pytest.fixture(params=PROJECTS)
+def project(request):
+    return request.param
+
+
+@pytest.mark.parametrize("logical_id,method,resource,body", [
+    ("ListRolesFunction", "GET", "/roles", None),
+    ("GetRoleFunction", "GET", "/roles/{role_id}", None),
+    ("CreateRoleFunction", "POST", "/roles", ROLE),
+    ("UpdateRoleFunction", "PATCH", "/roles/{role_id}", {"name": "更新後", "allowed_operations": ["GET /todos"]}),
+], ids=["list", "get", "create", "update"])
+def test_role(benchmark, load, roles, project, logical_id, method, resource, body):
+    """RoleService の一覧・取得・作成・更新を計測します。"""
+    function = load(project, logical_id)
+    event = api_event(method, resource, path_parameters={"role_id": roles[3]["role_id"]} if "{" in resource else None,
+                      body=body)
+    assert function(event)["statusCode"] in (200, 201)
+    benchmark(function, event)
+
+
+def test_delete_role(benchmark, load, aws, roles, project):
+    """DeleteRoleFunction を計測します（毎回、削除するロールを書き込んでから呼び出す）。"""
+    function = load(project, "DeleteRoleFunction")
+    table = aws.table("RoleAccessTable")
+    generated = seed_tables.generate_roles(range(ROLE_COUNT, ROLE_COUNT + 1000), random.Random(2), 2)
+
+    def setup():
+        _, role = next(generated)
+        table.put_item(Item=role)
+        return (api_event("DELETE", "/roles/{role_id}", path_parameters={"role_id": role["role_id"]}),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert result["statusCode"] == 200
+
+
+@pytest.mark.parametrize("logical_id", ["ListRolesFunction", "GetRoleFunction"])
+def test_numeric_role_attributes(load, aws, logical_id):
+    """exercises2 で数値（Decimal）の属性を持つロールも返せることを確認します（計測はしない）。"""
+    project = "exercises2/backend"
+    function = load(project, logical_id)
+    role_id = seed_tables.stable_uuid(1, "role", 0)
+    aws.put_items("RoleAccessTable", [{"role_id": role_id, "name": "数値", "is_super_user": 1,
+                                       "allowed_operations": ["GET /todos"]}])
+    event = api_event("GET", "/roles/{role_id}" if logical_id == "GetRoleFunction" else "/roles",
+                      path_parameters={"role_id": role_id} if logical_id == "GetRoleFunction" else None)
+    response = function(event)
+    assert response["statusCode"] == 200
+    body = json.loads(response["body"])
+    assert (body if logical_id == "GetRoleFunction" else body[0])["is_super_user"] == 1
@@ -0,0 +1,229 @@
+"""
+TODOの関数（lecture5, lecture7 の TodoService, exercises1）のベンチマーク
+"""
+
+import datetime
+import json
+import random
+import uuid
+
+import pytest
+
+import seed_tables
+from lambda_events import api_event, stream_record
+
+EXERCISES1 = "exercises1/backend"
+USER_ID = "0f6e7a52-0000-4000-8000-000000000001"
+
+# 一覧・取得の計測に使うアイテムの件数
+TODO_COUNT = 500
+
+
+def new_todo(i):
+    """作成・一括操作で使うTODO（すべての項目を指定する）"""
+    return {
+        "title": f"ベンチマーク用のTODO {i}",
+        "description": "定期的に確認する作業です。" * 4,
+        "due_date": (datetime.date(2026, 10, 1) + datetime.timedelta(days=i % 60)).isoformat(),
+        "is_completed": i % 3 == 0,
+        "priority": ("low", "medium", "high")[i % 3],
+        "tags": [f"tag{i % 7:03d}", f"tag{i % 11:03d}"],
+    }
+
+
+# lecture5（convert-status-table）
+@pytest.fixture
+def lecture5_todos(aws):
+    aws.create_tables("lecture5")
+    items = [{"id": str(uuid.UUID(int=i)), "title": f"TODO {i}", "checked": i % 2 == 0} for i in range(TODO_COUNT)]
+    aws.put_items("convert-status-table", items)
+    return items
+
+
+@pytest.mark.parametrize("logical_id,event", [
+    ("TodoListFunction", api_event("GET", "/todos")),
+    ("TodoGetFunction", api_event("GET", "/todos/{id}", path_parameters={"id": str(uuid.UUID(int=7))})),
+    ("TodoCreateFunction", api_event("POST", "/todos", body={"title": "ベンチマーク"})),
+    ("TodoUpdateFunction", api_event("PUT", "/todos/{id}", path_parameters={"id": str(uuid.UUID(int=7))},
+                                     body={"title": "更新後", "checked": True})),
+], ids=["list", "get", "create", "update"])
+def test_lecture5(benchmark, load, lecture5_todos, logical_id, event):
+    """lecture5 のTODOの関数を計測します。"""
+    function = load("lecture5", logical_id)
+    assert function(event)["statusCode"] in (200, 201)
+    benchmark(function, event)
+
+
+def test_lecture5_delete(benchmark, load, aws, lecture5_todos):
+    """lecture5 の TodoDeleteFunction を計測します（毎回、削除するアイテムを書き込んでから呼び出す）。"""
+    function = load("lecture5", "TodoDeleteFunction")
+    table = aws.table("convert-status-table")
+
+    def setup():
+        item_id = str(uuid.uuid4())
+        table.put_item(Item={"id": item_id, "title": "削除するTODO", "checked": False})
+        return (api_event("DELETE", "/todos/{id}", path_parameters={"id": item_id}),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert result["statusCode"] == 200
+
+
+# lecture7 の TodoService（ユーザーごとのパーティション）
+@pytest.fixture
+def lecture7_todos(aws):
+    aws.create_tables("lecture7")
+    items = [{"user_id": USER_ID, "todo_id": f"todo#{uuid.UUID(int=i)}", **new_todo(i)} for i in range(TODO_COUNT)]
+    aws.put_items("TodoTable", items)
+    return items
+
+
+@pytest.mark.parametrize("logical_id,event", [
+    ("TodoListFunction", api_event("GET", "/todos", principal_id=USER_ID)),
+    ("TodoGetFunction", api_event("GET", "/todos/{id}", path_parameters={"id": str(uuid.UUID(int=7))},
+                                  principal_id=USER_ID)),
+    ("TodoCreateFunction", api_event("POST", "/todos", body=new_todo(1), principal_id=USER_ID)),
+    ("TodoUpdateFunction", api_event("PUT", "/todos/{id}", path_parameters={"id": str(uuid.UUID(int=7))},
+                                     body={"title": "更新後", "is_completed": True, "tags": ["tag001"]},
+                                     principal_id=USER_ID)),
+], ids=["list", "get", "create", "update"])
+def test_lecture7(benchmark, load, lecture7_todos, logical_id, event):
+    """lecture7 の TodoService の関数を計測します。"""
+    function = load("lecture7", logical_id)
+    assert function(event)["statusCode"] in (200, 201)
+    benchmark(function, event)
+
+
+def test_lecture7_delete(benchmark, load, aws, lecture7_todos):
+    """lecture7 の TodoDeleteFunction を計測します（毎回、削除するアイテムを書き込んでから呼び出す）。"""
+    function = load("lecture7", "TodoDeleteFunction")
+    table = aws.table("TodoTable")
+
+    def setup():
+        todo_id = str(uuid.uuid4())
+        table.put_item(Item={"user_id": USER_ID, "todo_id": f"todo#{todo_id}", **new_todo(0)})
+        return (api_event("DELETE", "/todos/{id}", path_parameters={"id": todo_id}, principal_id=USER_ID),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert result["statusCode"] == 204
+
+
+# exercises1（インデックスとタグテーブルを持つTODO API）
+@pytest.fixture
+def exercises1_todos(aws):
+    """seed_tables と同じ分布のTODO（タグテーブルの行も含む）"""
+    aws.create_tables(EXERCISES1)
+    generated = seed_tables.generate_todos(range(TODO_COUNT), random.Random(1), 1, 1.1, datetime.date.today())
+    return aws.seed(EXERCISES1, generated)["exercises1-table"]
+
+
+def popular_tag(todos):
+    """最も多くのTODOに付いているタグ"""
+    counts = {}
+    for todo in todos:
+        for tag in todo["tags"]:
+            counts[tag] = counts.get(tag, 0) + 1
+    return max(counts, key=counts.get)
+
+
+@pytest.mark.parametrize("query", [
+    None,
+    {"limit": "50"},
+    {"is_completed": "false", "priority": "high"},
+    {"due_after": "2000-01-01", "due_before": "2999-12-31"},
+    "tag",
+    "ids",
+], ids=["scan", "scan-limit50", "status-priority", "due-range", "tag", "ids"])
+def test_exercises1_list(benchmark, load, exercises1_todos, query):
+    """exercises1 の ListTodos をスキャン・各インデックスのクエリ・ID指定で計測します。"""
+    if query == "tag":
+        query = {"tag": popular_tag(exercises1_todos)}
+    elif query == "ids":
+        query = {"ids": ",".join(todo["id"] for todo in exercises1_todos[:20])}
+    function = load(EXERCISES1, "TodoListFunction")
+    event = api_event("GET", "/todos", query=query)
+    response = function(event)
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["items"]
+    benchmark(function, event)
+
+
+def test_exercises1_list_next_page(benchmark, load, exercises1_todos):
+    """exercises1 の ListTodos の2ページ目（nextToken の署名の検証を含む）を計測します。"""
+    function = load(EXERCISES1, "TodoListFunction")
+    first = json.loads(function(api_event("GET", "/todos", query={"limit": "20"}))["body"])
+    event = api_event("GET", "/todos", query={"limit": "20", "nextToken": first["nextToken"]})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("logical_id,method,resource,body", [
+    ("TodoGetFunction", "GET", "/todos/{id}", None),
+    ("TodoCreateFunction", "POST", "/todos", new_todo(1)),
+    ("TodoUpdateFunction", "PUT", "/todos/{id}", {"title": "更新後", "is_completed": True, "priority": "high",
+                                                  "tags": ["tag001", "tag002"], "due_date": None}),
+], ids=["get", "create", "update"])
+def test_exercises1_item(benchmark, load, exercises1_todos, logical_id, method, resource, body):
+    """exercises1 の GetTodo / CreateTodo / UpdateTodo を計測します。"""
+    function = load(EXERCISES1, logical_id)
+    event = api_event(method, resource, path_parameters={"id": exercises1_todos[7]["id"]} if "{id}" in resource else None,
+                      body=body)
+    assert function(event)["statusCode"] in (200, 201)
+    benchmark(function, event)
+
+
+def test_exercises1_delete(benchmark, load, aws, exercises1_todos):
+    """exercises1 の DeleteTodo を計測します（毎回、削除するアイテムを書き込んでから呼び出す）。"""
+    function = load(EXERCISES1, "TodoDeleteFunction")
+    table = aws.table("exercises1-table")
+
+    def setup():
+        todo = dict(exercises1_todos[0], id=str(uuid.uuid4()))
+        table.put_item(Item=todo)
+        return (api_event("DELETE", "/todos/{id}", path_parameters={"id": todo["id"]}),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert result["statusCode"] == 204
+
+
+def test_exercises1_batch(benchmark, load, exercises1_todos):
+    """exercises1 の BatchTodos（作成50件と更新10件）を計測します。"""
+    function = load(EXERCISES1, "TodoBatchFunction")
+    operations = [{"op": "create", "todo": new_todo(i)} for i in range(50)]
+    operations += [{"op": "update", "id": todo["id"], "todo": {"is_completed": True}}
+                   for todo in exercises1_todos[:10]]
+    event = api_event("POST", "/todos/batch", body={"operations": operations})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_exercises1_sync_tags(benchmark, load, exercises1_todos):
+    """exercises1 の SyncTodoTags（追加・変更・削除が混ざった100件のストリームレコード）を計測します。"""
+    function = load(EXERCISES1, "SyncTodoTagsFunction")
+    records = []
+    for i, todo in enumerate(exercises1_todos[:100]):
+        keys = {"id": todo["id"]}
+        changed = dict(todo, tags=sorted({*todo["tags"][:1], f"tag{i % 13:03d}"}), is_completed=not todo["is_completed"])
+        if i % 3 == 0:
+            records.append(stream_record("INSERT", keys, new_image=todo, table_name="exercises1-table"))
+        elif i % 3 == 1:
+            records.append(stream_record("MODIFY", keys, new_image=changed, old_image=todo,
+                                         table_name="exercises1-table"))
+        else:
+            records.append(stream_record("REMOVE", keys, old_image=todo, table_name="exercises1-table"))
+    event = {"Records": records}
+    function(event)
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("method,path,body", [
+    ("GET", "todos", None),
+    ("GET", "todos/{id}", None),
+    ("POST", "todos", new_todo(1)),
+], ids=["list", "get", "create"])
+def test_exercises1_router(benchmark, load, exercises1_todos, method, path, body):
+    """exercises1 の ApiLayout=router の TodoRouterFunction（ルートの解決を含む）を計測します。"""
+    function = load(EXERCISES1, "TodoRouterFunction", ApiLayout="router")
+    proxy = path.replace("{id}", exercises1_todos[7]["id"])
+    event = api_event(method, "/{proxy+}", path_parameters={"proxy": proxy}, body=body)
+    assert function(event)["statusCode"] in (200, 201)
+    benchmark(function, event)
@@ -0,0 +1,105 @@
+"""
+トラブル・コメントの関数とストリームのフック（lecture7, lecture8, exercises2）のベンチマーク
+"""
+
+import datetime
+import json
+import random
+import time
+
+import pytest
+
+import seed_tables
+from lambda_events import api_event, stream_record
+
+EXERCISES2 = "exercises2/backend"
+LOG_GROUP_NAME = "CheckTroubleCountLogGroup"
+USER_ID = "0f6e7a52-0000-4000-8000-000000000001"
+
+# 一覧の計測に使うアイテムの件数
+TROUBLE_COUNT = 500
+COMMENT_COUNT = 2000
+USER_COUNT = 50
+
+
+@pytest.fixture
+def troubles(aws, project):
+    aws.create_tables(project)
+    generated = seed_tables.generate_troubles(range(TROUBLE_COUNT), random.Random(1), 1, 1.1, USER_COUNT)
+    return aws.seed(project, generated)["TroubleTable"]
+
+
+@pytest.mark.parametrize("project", ["lecture8", EXERCISES2])
+@pytest.mark.parametrize("logical_id,event", [
+    ("ListTroublesFunction", api_event("GET", "/troubles", principal_id=USER_ID)),
+    ("CreateTroubleFunction", api_event("POST", "/troubles", body={"category": "緊急", "message": "サーバーが停止しました"},
+                                        principal_id=USER_ID)),
+], ids=["list", "create"])
+def test_trouble(benchmark, load, troubles, project, logical_id, event):
+    """TroubleService の一覧（テーブル全体のスキャン）と作成を計測します。"""
+    function = load(project, logical_id)
+    assert function(event)["statusCode"] in (200, 201)
+    benchmark(function, event)
+
+
+@pytest.fixture
+def comments(aws):
+    aws.create_tables(EXERCISES2)
+    generated = seed_tables.generate_comments(range(COMMENT_COUNT), random.Random(1), 1, 1.1, USER_COUNT,
+                                              TROUBLE_COUNT, datetime.date.today())
+    return aws.seed(EXERCISES2, generated)["Comments"]
+
+
+@pytest.mark.parametrize("method", ["GET", "POST"])
+def test_comments(benchmark, load, comments, method):
+    """exercises2 の CommentsFunction（最もコメントの多いトラブルの取得と投稿）を計測します。"""
+    function = load(EXERCISES2, "CommentsFunction")
+    trouble_id = seed_tables.stable_uuid(1, "trouble", 0)
+    if method == "GET":
+        event = api_event("GET", "/comments", query={"trouble_id": trouble_id}, principal_id=USER_ID)
+    else:
+        event = api_event("POST", "/comments", body={"trouble_id": trouble_id, "comment": "確認しました。"},
+                          principal_id=USER_ID)
+    response = function(event)
+    assert response["statusCode"] in (200, 201)
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("project", ["lecture8", EXERCISES2])
+def test_hook_create_trouble(benchmark, load, troubles, project):
+    """HookCreateTrouble（ストリームの100件のうち緊急のものを CloudWatch Logs に書き込む）を計測します。"""
+    function = load(project, "HookCreateTrouble")
+    records = []
+    for i, trouble in enumerate(troubles[:100]):
+        keys = {"user_id": trouble["user_id"], "item_id": trouble["item_id"]}
+        new_image = dict(trouble, category="緊急" if i % 10 == 0 else trouble["category"])
+        records.append(stream_record("INSERT", keys, new_image=new_image, table_name="TroubleTable"))
+    event = {"Records": records}
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("project", ["lecture8", EXERCISES2])
+def test_check_trouble_count(benchmark, load, aws, project):
+    """CheckTroubleCount（1時間前のログストリームの件数を数える）を計測します。"""
+    function = load(project, "CheckTroubleCount")
+    hour = (datetime.datetime.now() - datetime.timedelta(hours=1)).strftime("%Y-%m-%d-%H")
+    timestamp = int(time.time() * 1000)
+    aws.services.log_streams[(LOG_GROUP_NAME, f"CheckTroubleCount-{hour}")] = [
+        {"timestamp": timestamp, "message": json.dumps(f"緊急のトラブル {i}", ensure_ascii=False)} for i in range(200)
+    ]
+    assert json.loads(function({})["body"])["count"] == 200
+    benchmark(function, {})
+
+
+@pytest.mark.parametrize("project", ["lecture7", "lecture8", EXERCISES2])
+def test_invalidate_role_cache(benchmark, load, aws, project):
+    """InvalidateRoleCacheFunction（ロールの変更でキャッシュのバージョンを上げる）を計測します。"""
+    function = load(project, "InvalidateRoleCacheFunction")
+    roles = [role for _, role in seed_tables.generate_roles(range(20), random.Random(1), 1)]
+    records = [stream_record("MODIFY" if i % 2 else "REMOVE", {"role_id": role["role_id"]}, new_image=role,
+                             old_image=role, table_name="RoleAccessTable")
+               for i, role in enumerate(roles)]
+    event = {"Records": records}
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
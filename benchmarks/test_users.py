@@ -0,0 +1,71 @@
+"""
+ユーザーの関数（lecture7, lecture8, exercises2 の UserService、Cognitoはフェイク）のベンチマーク
+"""
+
+import itertools
+
+import pytest
+
+from lambda_events import api_event
+
+PROJECTS = ["lecture7", "lecture8", "exercises2/backend"]
+
+# ListUsers は50件ずつ取得するため、3ページになる件数にする
+USER_COUNT = 120
+
+
+@pytest.fixture(params=PROJECTS)
+def project(request):
+    return request.param
+
+
+@pytest.fixture
+def users(aws):
+    """フェイクのCognitoに登録したユーザー名"""
+    usernames = [f"user{i:04d}" for i in range(USER_COUNT)]
+    for i, username in enumerate(usernames):
+        aws.services.add_user(username, f"{username}@example.com", f"role-{i % 5}")
+    return usernames
+
+
+@pytest.mark.parametrize("logical_id,event", [
+    ("ListUsersFunction", api_event("GET", "/users")),
+    ("GetUserFunction", api_event("GET", "/users/{username}", path_parameters={"username": "user0007"})),
+    ("GetUserFunction", api_event("GET", "/users/{username}", path_parameters={"username": "me"},
+                                  principal_id="sub-0007", username="user0007")),
+    ("UpdateUserFunction", api_event("PATCH", "/users/{username}", path_parameters={"username": "user0007"},
+                                     body={"email": "new@example.com", "custom:role": "role-1"})),
+], ids=["list", "get", "get-me", "update"])
+def test_user(benchmark, load, users, project, logical_id, event):
+    """UserService の一覧（ページング）・取得・更新を計測します。"""
+    function = load(project, logical_id)
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_create_user(benchmark, load, users, project):
+    """CreateUserFunction（AdminCreateUser と AdminSetUserPassword）を計測します。"""
+    function = load(project, "CreateUserFunction")
+    numbers = itertools.count()
+
+    def setup():
+        username = f"new-user{next(numbers):05d}"
+        return (api_event("POST", "/users", body={"username": username, "email": f"{username}@example.com",
+                                                  "role": "role-0"}),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert result["statusCode"] == 201
+
+
+def test_delete_user(benchmark, load, aws, users, project):
+    """DeleteUserFunction を計測します（毎回、削除するユーザーを登録してから呼び出す）。"""
+    function = load(project, "DeleteUserFunction")
+    numbers = itertools.count()
+
+    def setup():
+        username = f"old-user{next(numbers):05d}"
+        aws.services.add_user(username, f"{username}@example.com", "role-0")
+        return (api_event("DELETE", "/users/{username}", path_parameters={"username": username}),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert result["statusCode"] == 204
@@ -0,0 +1,54 @@
+"""
+承認フロー（lecture9 の Step Functions のタスク）と通知（appendix/winbeep の SQS）の関数のベンチマーク
+"""
+
+import itertools
+import json
+
+import pytest
+
+from lambda_events import api_event
+
+API_KEY = "benchmark-api-key"
+TASK_TOKEN = "AAAAKgAAAAIAAAAAAAAAAbenchmarktasktoken" * 8
+
+
+def test_send_sns(benchmark, load, aws):
+    """lecture9 の SendSnsLambda（承認依頼のメッセージの組み立てと Publish）を計測します。"""
+    function = load("lecture9", "SendSnsLambda")
+    event = {"token": TASK_TOKEN, "requestId": "req-0001"}
+    assert function(event) == {"status": "sent"}
+    assert aws.services.published
+    benchmark(function, event)
+
+
+@pytest.mark.parametrize("action", ["approve", "reject"])
+def test_callback(benchmark, load, aws, action):
+    """lecture9 の ApprovalCallback（SendTaskSuccess / SendTaskFailure）を計測します。"""
+    function = load("lecture9", "ApprovalCallback")
+    event = api_event("GET", f"/{action}", query={"token": TASK_TOKEN, "requestId": "req-0001"})
+    assert function(event)["statusCode"] == 200
+    assert aws.services.task_results[-1][0] == ("success" if action == "approve" else "failure")
+    benchmark(function, event)
+
+
+def test_notify_post(benchmark, load):
+    """appendix/winbeep の NotifyFunction の送信（SendMessage）を計測します。"""
+    function = load("appendix/winbeep", "NotifyFunction")
+    event = api_event("POST", "/notify", body={"message": "ビルドが完了しました"}, headers={"x-api-key": API_KEY})
+    assert function(event)["statusCode"] == 200
+    benchmark(function, event)
+
+
+def test_notify_get(benchmark, load):
+    """appendix/winbeep の NotifyFunction の受信（ReceiveMessage と DeleteMessage）を計測します（毎回、1件送信してから呼び出す）。"""
+    function = load("appendix/winbeep", "NotifyFunction")
+    headers = {"x-api-key": API_KEY}
+    numbers = itertools.count()
+
+    def setup():
+        function(api_event("POST", "/notify", body={"message": f"通知 {next(numbers)}"}, headers=headers))
+        return (api_event("GET", "/poll", headers=headers),), {}
+
+    result = benchmark.pedantic(function, setup=setup, rounds=200)
+    assert json.loads(result["body"])["message"].startswith("通知")
@@ -75,8 +75,32 @@ class TestApiGateway:
         
         # ステータスコードが200であることを確認
         assert response.status_code == 200
-        # レスポンスがリスト形式であることを確認
-        assert isinstance(response.json(), list)
+        # レスポンスがページ形式（items と nextToken）であることを確認
+        body = response.json()
+        assert isinstance(body["items"], list)
+        assert "nextToken" in body
+
+    def test_get_todos_pagination(self, api_gateway_url):
+        """
+        GET /todos のページネーションのテスト
+
+        limit を指定した場合に件数が制限され、nextToken で次のページを取得できることを確認します。
+
+        Args:
+            api_gateway_url: API Gateway URL（フィクスチャから取得）
+        """
+        response = requests.get(f"{api_gateway_url}/todos", params={"limit": 1})
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["items"]) <= 1
+
+        if body["nextToken"]:
+            next_response = requests.get(f"{api_gateway_url}/todos", params={"limit": 1, "nextToken": body["nextToken"]})
+            assert next_response.status_code == 200
+
+        # 改ざんされたトークンは拒否されることを確認
+        response = requests.get(f"{api_gateway_url}/todos", params={"nextToken": "invalid"})
+        assert response.status_code == 400
 
     def test_create_todo(self, api_gateway_url):
         """
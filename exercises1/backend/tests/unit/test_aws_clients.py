@@ -0,0 +1,69 @@
+"""
+AWSクライアント作成用共通モジュールのユニットテスト
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "todo_service", "CommonLayer"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+
+import aws_clients  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(aws_clients, "_session", None)
+    monkeypatch.setattr(aws_clients, "_clients", {})
+    monkeypatch.setattr(aws_clients, "_resources", {})
+    monkeypatch.setattr(aws_clients, "_tables", {})
+    monkeypatch.setattr(aws_clients, "_endpoints", {})
+
+
+def test_clients_are_created_lazily_and_reused():
+    """最初に使われるまで作成されず、作成後は同じクライアントが返ることを確認します。"""
+    sns = aws_clients.lazy_client("sns")
+    assert aws_clients._clients == {}
+
+    assert sns.meta.service_model.service_name == "sns"
+    assert aws_clients.get_client("sns") is aws_clients._clients["sns"]
+    assert aws_clients.lazy_table("t").name == "t"
+    assert aws_clients.get_table("t") is aws_clients.get_table("t")
+    assert aws_clients.get_resource("dynamodb").meta.client is aws_clients.get_table("t").meta.client
+
+
+def test_config_is_applied():
+    """コネクションプール・タイムアウト・再試行の設定が適用されることを確認します。"""
+    config = aws_clients.get_client("dynamodb").meta.config
+
+    assert config.max_pool_connections == aws_clients.MAX_POOL_CONNECTIONS
+    assert config.tcp_keepalive is True
+    assert (config.connect_timeout, config.read_timeout) == (aws_clients.CONNECT_TIMEOUT, aws_clients.READ_TIMEOUT)
+    assert config.retries["mode"] == "adaptive"
+
+
+def test_endpoint_url_override(monkeypatch):
+    """ENDPOINT_URL と、サービスごとの ENDPOINT_URL_<サービス名> が使われることを確認します。"""
+    monkeypatch.setenv("ENDPOINT_URL", "http://localhost:4566")
+    monkeypatch.setenv("ENDPOINT_URL_COGNITO_IDP", "http://localhost:9229")
+
+    assert aws_clients.get_client("dynamodb").meta.endpoint_url == "http://localhost:4566"
+    assert aws_clients.get_client("cognito-idp").meta.endpoint_url == "http://localhost:9229"
+
+
+def test_registered_endpoint_creates_clients(monkeypatch):
+    """register_endpoint で登録した接頭辞のURLは、登録した関数でクライアントを作ることを確認します。"""
+    monkeypatch.setenv("ENDPOINT_URL_DYNAMODB", "memory://test")
+    created = []
+
+    def create(factory, service_name, url, config):
+        created.append((service_name, url, config))
+        return factory(service_name, endpoint_url="http://localhost:8000", config=config)
+
+    aws_clients.register_endpoint("memory://", create)
+
+    assert aws_clients.get_client("dynamodb").meta.endpoint_url == "http://localhost:8000"
+    assert created == [("dynamodb", "memory://test", aws_clients.CONFIG)]
@@ -0,0 +1,152 @@
+"""
+一括操作（BatchTodos）のユニットテスト
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(BACKEND_DIR, "todo_service", "CommonLayer"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+os.environ.setdefault("TODO_TABLE_NAME", "exercises1-table")
+os.environ.setdefault("POWERTOOLS_LOG_LEVEL", "ERROR")
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_schema(function_name):
+    return load_module(f"{function_name}_schema", os.path.join(BACKEND_DIR, "todo_service", function_name, "schema.py"))
+
+
+batch_schema = load_schema("BatchTodos")
+# app.py は同じディレクトリの schema を読み込むため、一時的に登録してから読み込む
+sys.modules["schema"] = batch_schema
+try:
+    batch_app = load_module("batch_todos_app", os.path.join(BACKEND_DIR, "todo_service", "BatchTodos", "app.py"))
+finally:
+    del sys.modules["schema"]
+
+
+class LambdaContext:
+    function_name = "BatchTodos"
+    memory_limit_in_mb = 128
+    invoked_function_arn = "arn:aws:lambda:ap-northeast-1:123456789012:function:BatchTodos"
+    aws_request_id = "test"
+
+
+class FakeDynamoDB:
+    """batch_write_item のスタブ（最初の数回は一部を UnprocessedItems として返す。failing_calls 回目はエラーにする）"""
+
+    def __init__(self, unprocessed_rounds=0, failing_calls=()):
+        self.calls = []
+        self.unprocessed_rounds = unprocessed_rounds
+        self.failing_calls = failing_calls
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        assert len(requests) <= 25
+        self.calls.append(len(requests))
+        if len(self.calls) in self.failing_calls:
+            raise RuntimeError("ProvisionedThroughputExceededException")
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            return {"UnprocessedItems": {table_name: requests[len(requests) // 2:]}}
+        return {"UnprocessedItems": {}}
+
+
+@pytest.fixture
+def fake_dynamodb(monkeypatch):
+    def install(**kwargs):
+        fake = FakeDynamoDB(**kwargs)
+        monkeypatch.setattr(batch_app, "dynamoDB", fake)
+        monkeypatch.setattr(batch_app.time, "sleep", lambda seconds: None)
+        return fake
+    return install
+
+
+def invoke(operations):
+    response = batch_app.lambda_handler({"body": json.dumps({"operations": operations})}, LambdaContext())
+    return response["statusCode"], json.loads(response["body"])
+
+
+@pytest.mark.parametrize("function_name,copy_name", [("CreateTodo", "create_schema"), ("UpdateTodo", "update_schema")])
+def test_schemas_match_single_item_functions(function_name, copy_name):
+    """一括操作のスキーマが CreateTodo / UpdateTodo の schema.py と一致していることを確認します。"""
+    assert getattr(batch_schema, copy_name) == load_schema(function_name).schema
+
+
+def test_writes_are_chunked(fake_dynamodb):
+    """作成と削除が25件ずつの BatchWriteItem にまとめられることを確認します。"""
+    fake = fake_dynamodb()
+    operations = [{"op": "create", "todo": {"title": f"todo {i}"}} for i in range(40)]
+    operations += [{"op": "delete", "id": f"id-{i}"} for i in range(20)]
+
+    status, body = invoke(operations)
+
+    assert status == 200
+    assert fake.calls == [25, 25, 10]
+    assert body["succeeded"] == 60
+    assert [result["status"] for result in body["results"]] == [201] * 40 + [204] * 20
+    assert body["results"][0]["item"]["priority"] == "medium"
+
+
+def test_unprocessed_items_are_retried(fake_dynamodb):
+    """UnprocessedItems が再試行され、最後まで残った操作だけが失敗になることを確認します。"""
+    fake = fake_dynamodb(unprocessed_rounds=batch_app.MAX_RETRIES + 1)
+    operations = [{"op": "delete", "id": f"id-{i}"} for i in range(8)]
+
+    status, body = invoke(operations)
+
+    assert status == 200
+    assert len(fake.calls) == batch_app.MAX_RETRIES + 1
+    failed = [result["index"] for result in body["results"] if result["status"] == 503]
+    assert failed and failed == sorted(failed) and failed[-1] == 7
+    assert body["failed"] == len(failed)
+
+
+def test_failed_chunk_does_not_fail_other_chunks(fake_dynamodb):
+    """2つ目のまとまりの BatchWriteItem がエラーになっても、そのまとまりの操作だけが失敗になることを確認します。"""
+    fake = fake_dynamodb(failing_calls=(2,))
+    operations = [{"op": "delete", "id": f"id-{i}"} for i in range(60)]
+
+    status, body = invoke(operations)
+
+    assert status == 200
+    assert fake.calls == [25, 25, 10]
+    assert [result["status"] for result in body["results"]] == [204] * 25 + [500] * 25 + [204] * 10
+    assert body["results"][25]["error"] == "ProvisionedThroughputExceededException"
+    assert (body["succeeded"], body["failed"]) == (35, 25)
+
+
+def test_invalid_operations_are_reported_per_item(fake_dynamodb):
+    """不正な操作はその操作だけが400になり、他の操作は実行されることを確認します。"""
+    fake_dynamodb()
+
+    status, body = invoke([
+        {"op": "create", "todo": {"title": ""}},
+        {"op": "delete"},
+        {"op": "delete", "id": "same"},
+        {"op": "delete", "id": "same"},
+        {"op": "create", "todo": {"title": "ok", "priority": "high"}},
+    ])
+
+    assert status == 200
+    assert [result["status"] for result in body["results"]] == [400, 400, 204, 400, 201]
+
+
+def test_invalid_envelope_is_rejected(fake_dynamodb):
+    """操作の一覧がない、または上限を超える場合は400を返すことを確認します。"""
+    fake_dynamodb()
+
+    assert invoke([])[0] == 400
+    assert invoke([{"op": "delete", "id": str(i)} for i in range(batch_schema.MAX_OPERATIONS + 1)])[0] == 400
@@ -0,0 +1,115 @@
+"""
+低レベルクライアントでDynamoDBを読み取る共通モジュールのユニットテスト
+"""
+
+import os
+import sys
+from decimal import Decimal
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "todo_service", "CommonLayer"))
+
+import dynamodb_client  # noqa: E402
+
+VALUES = {
+    "title": "買い物",
+    "count": Decimal("1.50"),
+    "is_completed": True,
+    "due_date": None,
+    "tags": ["仕事", Decimal(2), {"nested": False}],
+    "string_set": {"a", "b"},
+    "number_set": {Decimal(1), Decimal(2)},
+    "binary": Binary(b"\x00\x01"),
+    "binary_set": {Binary(b"a")},
+    "map": {"empty": []},
+}
+
+
+@pytest.fixture
+def stubbed():
+    client = boto3.client("dynamodb", region_name="ap-northeast-1",
+                          aws_access_key_id="test", aws_secret_access_key="test")
+    with Stubber(client) as stubber:
+        yield client, stubber
+        stubber.assert_no_pending_responses()
+
+
+def test_deserialize_matches_type_deserializer():
+    """TypeDeserializer と同じ値・型に変換されることを確認します。"""
+    serializer, deserializer = TypeSerializer(), TypeDeserializer()
+    item = {name: serializer.serialize(value) for name, value in VALUES.items()}
+
+    assert dynamodb_client.deserialize_item(item) == {name: deserializer.deserialize(value)
+                                                      for name, value in item.items()}
+    assert dynamodb_client.deserialize({"N": "3"}) == 3
+    assert type(dynamodb_client.deserialize({"N": "3"})) is Decimal
+
+
+def test_serialize_round_trip():
+    """serialize_item の結果を戻すと元の値になり、float は扱わないことを確認します。"""
+    item = dynamodb_client.serialize_item(VALUES)
+
+    assert dynamodb_client.deserialize_item(item) == VALUES
+    assert item["is_completed"] == {"BOOL": True}
+    assert item["due_date"] == {"NULL": True}
+    with pytest.raises(TypeError):
+        dynamodb_client.serialize(1.5)
+
+
+def test_query_converts_conditions_and_items(stubbed):
+    """Key / Attr の条件が式に、ExclusiveStartKey とレスポンスが変換されることを確認します。"""
+    client, stubber = stubbed
+    stubber.add_response("query", {
+        "Items": [{"id": {"S": "1"}, "tags": {"L": [{"S": "仕事"}]}}],
+        "LastEvaluatedKey": {"tag": {"S": "仕事"}, "sort_key": {"S": "2026-01-01#1"}},
+    }, {
+        "TableName": "tags",
+        "KeyConditionExpression": "#n0 = :v0",
+        "FilterExpression": "#n1 = :v1",
+        "ExpressionAttributeNames": {"#n0": "tag", "#n1": "is_completed"},
+        "ExpressionAttributeValues": {":v0": {"S": "仕事"}, ":v1": {"BOOL": False}},
+        "ExclusiveStartKey": {"tag": {"S": "仕事"}, "sort_key": {"S": "#"}},
+        "Limit": 10,
+    })
+
+    response = dynamodb_client.ClientTable("tags", client).query(
+        KeyConditionExpression=Key("tag").eq("仕事"),
+        FilterExpression=Attr("is_completed").eq(False),
+        ExclusiveStartKey={"tag": "仕事", "sort_key": "#"},
+        Limit=10,
+    )
+
+    assert response["Items"] == [{"id": "1", "tags": ["仕事"]}]
+    assert response["LastEvaluatedKey"] == {"tag": "仕事", "sort_key": "2026-01-01#1"}
+
+
+def test_get_item_and_batch_get_item(stubbed):
+    """get_item と batch_get_item（UnprocessedKeys を含む）が変換されることを確認します。"""
+    client, stubber = stubbed
+    stubber.add_response("get_item", {"Item": {"id": {"S": "1"}, "priority": {"S": "high"}}},
+                         {"TableName": "todos", "Key": {"id": {"S": "1"}}})
+    stubber.add_response("get_item", {}, {"TableName": "todos", "Key": {"id": {"S": "2"}}})
+    stubber.add_response("batch_get_item", {
+        "Responses": {"todos": [{"id": {"S": "1"}}]},
+        "UnprocessedKeys": {"todos": {"Keys": [{"id": {"S": "2"}}], "ProjectionExpression": "#id",
+                                      "ExpressionAttributeNames": {"#id": "id"}}},
+    }, {
+        "RequestItems": {"todos": {"Keys": [{"id": {"S": "1"}}, {"id": {"S": "2"}}], "ProjectionExpression": "#id",
+                                   "ExpressionAttributeNames": {"#id": "id"}}},
+    })
+
+    table = dynamodb_client.ClientTable("todos", client)
+    assert table.get_item(Key={"id": "1"})["Item"] == {"id": "1", "priority": "high"}
+    assert "Item" not in table.get_item(Key={"id": "2"})
+
+    response = dynamodb_client.ClientResource(client).batch_get_item(RequestItems={
+        "todos": {"Keys": [{"id": "1"}, {"id": "2"}], "ProjectionExpression": "#id",
+                  "ExpressionAttributeNames": {"#id": "id"}},
+    })
+    assert response["Responses"] == {"todos": [{"id": "1"}]}
+    assert response["UnprocessedKeys"]["todos"]["Keys"] == [{"id": "2"}]
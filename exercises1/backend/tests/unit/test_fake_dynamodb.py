@@ -0,0 +1,207 @@
+"""
+プロセス内のDynamoDBのフェイク（tools/fake_dynamodb.py）のユニットテスト
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(BACKEND_DIR, "todo_service", "CommonLayer"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "tools"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+os.environ.setdefault("TODO_TABLE_NAME", "exercises1-table")
+os.environ.setdefault("TODO_TAG_TABLE_NAME", "exercises1-tag-table")
+os.environ.setdefault("POWERTOOLS_LOG_LEVEL", "ERROR")
+
+import aws_clients  # noqa: E402
+import fake_dynamodb  # noqa: E402
+
+TEMPLATE = os.path.join(BACKEND_DIR, "template.yaml")
+
+
+class LambdaContext:
+    function_name = "Test"
+    memory_limit_in_mb = 128
+    invoked_function_arn = "arn:aws:lambda:ap-northeast-1:123456789012:function:Test"
+    aws_request_id = "test"
+
+
+@pytest.fixture
+def client():
+    fake_dynamodb.reset()
+    client = boto3.client("dynamodb", region_name="ap-northeast-1", **fake_dynamodb.CLIENT_KWARGS)
+    endpoint = fake_dynamodb.attach(client, "memory://test")
+    endpoint.database.create_table({
+        "TableName": "todos",
+        "KeySchema": [{"AttributeName": "user", "KeyType": "HASH"}, {"AttributeName": "id", "KeyType": "RANGE"}],
+        "AttributeDefinitions": [{"AttributeName": "user", "AttributeType": "S"},
+                                 {"AttributeName": "id", "AttributeType": "N"}],
+    })
+    yield client
+    fake_dynamodb.reset()
+
+
+def test_put_get_update_delete_with_conditions(client):
+    """条件付きの書き込みとSET・ADDの更新式が評価されることを確認します。"""
+    table = boto3.resource("dynamodb", region_name="ap-northeast-1", **fake_dynamodb.CLIENT_KWARGS).Table("todos")
+    fake_dynamodb.attach(table.meta.client, "memory://test")
+
+    table.put_item(Item={"user": "u1", "id": 1, "title": "買い物", "tags": ["a"]},
+                   ConditionExpression=Attr("id").not_exists())
+    with pytest.raises(ClientError) as e:
+        table.put_item(Item={"user": "u1", "id": 1}, ConditionExpression=Attr("id").not_exists())
+    assert e.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+    updated = table.update_item(
+        Key={"user": "u1", "id": 1},
+        UpdateExpression="SET title = :t, tags = list_append(tags, :more) ADD views :one",
+        ConditionExpression="attribute_exists(id) AND title = :old",
+        ExpressionAttributeValues={":t": "掃除", ":more": ["b"], ":one": 1, ":old": "買い物"},
+        ReturnValues="ALL_NEW",
+    )["Attributes"]
+    assert (updated["title"], updated["tags"], updated["views"]) == ("掃除", ["a", "b"], 1)
+
+    assert table.get_item(Key={"user": "u1", "id": 1}, ProjectionExpression="title")["Item"] == {"title": "掃除"}
+    table.delete_item(Key={"user": "u1", "id": 1})
+    assert "Item" not in table.get_item(Key={"user": "u1", "id": 1})
+
+
+def test_query_and_scan_pagination(client):
+    """Query と Scan が Limit と ExclusiveStartKey で重複なくページングできることを確認します。"""
+    requests = [{"PutRequest": {"Item": {"user": {"S": f"u{i % 2}"}, "id": {"N": str(i)}}}} for i in range(25)]
+    client.batch_write_item(RequestItems={"todos": requests})
+    table = boto3.resource("dynamodb", region_name="ap-northeast-1", **fake_dynamodb.CLIENT_KWARGS).Table("todos")
+    fake_dynamodb.attach(table.meta.client, "memory://test")
+
+    ids, start = [], {}
+    while True:
+        page = table.query(KeyConditionExpression=Key("user").eq("u0") & Key("id").gt(3), Limit=4, **start)
+        ids.extend(int(item["id"]) for item in page["Items"])
+        if "LastEvaluatedKey" not in page:
+            break
+        start = {"ExclusiveStartKey": page["LastEvaluatedKey"]}
+    assert ids == list(range(4, 25, 2))
+
+    scanned, start = [], {}
+    while True:
+        page = client.scan(TableName="todos", Limit=7, **start)
+        scanned.extend((item["user"]["S"], item["id"]["N"]) for item in page["Items"])
+        if "LastEvaluatedKey" not in page:
+            break
+        start = {"ExclusiveStartKey": page["LastEvaluatedKey"]}
+    assert len(scanned) == len(set(scanned)) == 25
+
+    keys = [{"user": {"S": "u1"}, "id": {"N": str(i)}} for i in (1, 3, 99)]
+    response = client.batch_get_item(RequestItems={"todos": {"Keys": keys}})
+    assert sorted(item["id"]["N"] for item in response["Responses"]["todos"]) == ["1", "3"]
+
+
+def test_throttling_is_retried(client):
+    """スロットリングのエラーを返し、botocore が再試行することを確認します。"""
+    endpoint = fake_dynamodb.attach(client, "memory://test?throttle_rate=0.5&seed=1")
+    for i in range(10):
+        client.put_item(TableName="todos", Item={"user": {"S": "u"}, "id": {"N": str(i)}})
+    assert endpoint.calls["PutItem"] > 10
+    assert client.scan(TableName="todos", Select="COUNT")["Count"] == 10
+
+
+def test_index_key_type_mismatch_is_rejected(client):
+    """インデックスのキー属性に NULL や型の違う値を書き込むと ValidationException になることを確認します。"""
+    fake_dynamodb.get_database("test").create_table({
+        "TableName": "due",
+        "KeySchema": [{"AttributeName": "id", "KeyType": "HASH"}],
+        "AttributeDefinitions": [{"AttributeName": "id", "AttributeType": "S"},
+                                 {"AttributeName": "due_date", "AttributeType": "S"}],
+        "GlobalSecondaryIndexes": [{"IndexName": "DueDateIndex",
+                                    "KeySchema": [{"AttributeName": "due_date", "KeyType": "HASH"}],
+                                    "Projection": {"ProjectionType": "ALL"}}],
+    })
+    for value in ({"NULL": True}, {"N": "1"}):
+        with pytest.raises(ClientError) as e:
+            client.put_item(TableName="due", Item={"id": {"S": "1"}, "due_date": value})
+        assert e.value.response["Error"]["Code"] == "ValidationException"
+        with pytest.raises(ClientError):
+            client.batch_write_item(RequestItems={"due": [{"PutRequest": {"Item": {"id": {"S": "2"}, "due_date": value}}}]})
+
+    client.put_item(TableName="due", Item={"id": {"S": "3"}})
+    assert client.scan(TableName="due", Select="COUNT")["Count"] == 1
+
+
+def load_handler(name):
+    spec = importlib.util.spec_from_file_location(
+        f"fake_{name.lower()}_app", os.path.join(BACKEND_DIR, "todo_service", name, "app.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.path.insert(0, os.path.join(BACKEND_DIR, "todo_service", name))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.pop(0)
+    return module
+
+
+def test_handlers_run_against_memory_endpoint(monkeypatch):
+    """ENDPOINT_URL_DYNAMODB に memory:// を指定すると、ハンドラーがフェイクのテーブルを使うことを確認します。"""
+    fake_dynamodb.reset()
+    monkeypatch.setenv("ENDPOINT_URL_DYNAMODB", f"memory://handlers?template={TEMPLATE}")
+    monkeypatch.setattr(aws_clients, "_session", None)
+    monkeypatch.setattr(aws_clients, "_clients", {})
+    monkeypatch.setattr(aws_clients, "_resources", {})
+    monkeypatch.setattr(aws_clients, "_tables", {})
+    monkeypatch.setattr(aws_clients, "_endpoints", {})
+    fake_dynamodb.install(aws_clients)
+
+    create_app, get_app = load_handler("CreateTodo"), load_handler("GetTodo")
+    body = {"title": "買い物", "priority": "high", "tags": ["家事"]}
+    created = create_app.lambda_handler({"httpMethod": "POST", "resource": "/todos", "body": json.dumps(body)},
+                                        LambdaContext())
+    assert created["statusCode"] == 201
+    todo_id = json.loads(created["body"])["id"]
+
+    found = get_app.lambda_handler({"httpMethod": "GET", "resource": "/todos/{id}", "pathParameters": {"id": todo_id}},
+                                   LambdaContext())
+    assert found["statusCode"] == 200
+    assert json.loads(found["body"])["title"] == "買い物"
+    assert fake_dynamodb.get_database("handlers").table("exercises1-table").items
+    fake_dynamodb.reset()
+
+
+def test_create_without_due_date_omits_due_date_index_keys(monkeypatch):
+    """期限のないTODOを作成すると、due_date と due_bucket を書かない（DueDateIndex に入らない）ことを確認します。"""
+    fake_dynamodb.reset()
+    monkeypatch.setenv("ENDPOINT_URL_DYNAMODB", f"memory://handlers?template={TEMPLATE}")
+    monkeypatch.setattr(aws_clients, "_session", None)
+    monkeypatch.setattr(aws_clients, "_clients", {})
+    monkeypatch.setattr(aws_clients, "_resources", {})
+    monkeypatch.setattr(aws_clients, "_tables", {})
+    monkeypatch.setattr(aws_clients, "_endpoints", {})
+    fake_dynamodb.install(aws_clients)
+
+    # CreateTodo と BatchTodos はどちらも同じ名前の schema を読み込むため、読み込むたびに取り除く
+    monkeypatch.delitem(sys.modules, "schema", raising=False)
+    create_app = load_handler("CreateTodo")
+    monkeypatch.delitem(sys.modules, "schema", raising=False)
+    batch_app = load_handler("BatchTodos")
+    monkeypatch.delitem(sys.modules, "schema", raising=False)
+
+    created = create_app.lambda_handler(
+        {"httpMethod": "POST", "resource": "/todos", "body": json.dumps({"title": "期限なし"})}, LambdaContext())
+    assert created["statusCode"] == 201
+    batch = batch_app.lambda_handler(
+        {"body": json.dumps({"operations": [{"op": "create", "todo": {"title": "期限なし"}},
+                                            {"op": "create", "todo": {"title": "期限あり", "due_date": "2026-10-18"}}]})},
+        LambdaContext())
+    assert [result["status"] for result in json.loads(batch["body"])["results"]] == [201, 201]
+
+    items = fake_dynamodb.get_database("handlers").table("exercises1-table").items.values()
+    undated = [item for item in items if "due_date" not in item]
+    assert len(undated) == 2
+    assert all("due_bucket" not in item and item["due_sort"] == {"S": "9999-12-31"} for item in undated)
+    fake_dynamodb.reset()
@@ -0,0 +1,157 @@
+"""
+TODO一覧取得（ListTodos）のユニットテスト
+"""
+
+import importlib.util
+import json
+import os
+import sys
+
+import boto3
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(BACKEND_DIR, "todo_service", "CommonLayer"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "tools"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+os.environ.setdefault("TODO_TABLE_NAME", "exercises1-table")
+os.environ.setdefault("TODO_TAG_TABLE_NAME", "exercises1-tag-table")
+os.environ.setdefault("PAGINATION_TOKEN_SECRET", "test-secret")
+os.environ.setdefault("POWERTOOLS_LOG_LEVEL", "ERROR")
+
+import fake_dynamodb as fake_db  # noqa: E402
+import todo_index  # noqa: E402
+
+spec = importlib.util.spec_from_file_location(
+    "list_todos_app", os.path.join(BACKEND_DIR, "todo_service", "ListTodos", "app.py"))
+list_app = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(list_app)
+
+
+class LambdaContext:
+    function_name = "ListTodos"
+    memory_limit_in_mb = 128
+    invoked_function_arn = "arn:aws:lambda:ap-northeast-1:123456789012:function:ListTodos"
+    aws_request_id = "test"
+
+
+class FakeDynamoDB:
+    """batch_get_item のスタブ（最初の数回は一部を UnprocessedKeys として返す）"""
+
+    def __init__(self, items, unprocessed_rounds=0):
+        self.items = items
+        self.unprocessed_rounds = unprocessed_rounds
+        self.calls = []
+
+    def batch_get_item(self, RequestItems):
+        (table_name, request), = RequestItems.items()
+        keys = request["Keys"]
+        assert len(keys) <= 100
+        assert set(request["ExpressionAttributeNames"].values()) == set(list_app.PROJECTION_ATTRIBUTES)
+        self.calls.append(len(keys))
+        processed, unprocessed = keys, []
+        if self.unprocessed_rounds:
+            self.unprocessed_rounds -= 1
+            processed, unprocessed = keys[:len(keys) // 2], keys[len(keys) // 2:]
+        response = {"Responses": {table_name: [self.items[key["id"]] for key in processed if key["id"] in self.items]}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {table_name: dict(request, Keys=unprocessed)}
+        return response
+
+
+@pytest.fixture
+def fake_dynamodb(monkeypatch):
+    def install(**kwargs):
+        items = {f"id-{i}": {"id": f"id-{i}", "title": f"todo {i}"} for i in range(0, 200, 2)}
+        fake = FakeDynamoDB(items, **kwargs)
+        monkeypatch.setattr(list_app, "dynamoDB", fake)
+        monkeypatch.setattr(list_app.time, "sleep", lambda seconds: None)
+        return fake
+    return install
+
+
+def invoke(query_params):
+    response = list_app.lambda_handler({"queryStringParameters": query_params}, LambdaContext())
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_ids_are_returned_in_request_order(fake_dynamodb):
+    """指定された順に返り、存在しないIDが missing に含まれることを確認します。"""
+    fake = fake_dynamodb(unprocessed_rounds=2)
+
+    status, body = invoke({"ids": "id-8,id-3,id-2,id-8,id-5,id-0"})
+
+    assert status == 200
+    assert [item["id"] for item in body["items"]] == ["id-8", "id-2", "id-0"]
+    assert body["missing"] == ["id-3", "id-5"]
+    assert len(fake.calls) == 3
+
+
+def test_ids_are_chunked(fake_dynamodb):
+    """100件ずつの BatchGetItem に分けて取得することを確認します。"""
+    fake = fake_dynamodb()
+    list_app.MAX_IDS, original = 150, list_app.MAX_IDS
+    try:
+        status, body = invoke({"ids": ",".join(f"id-{i}" for i in range(150))})
+    finally:
+        list_app.MAX_IDS = original
+
+    assert status == 200
+    assert fake.calls == [100, 50]
+    assert len(body["items"]) == 75
+
+
+def test_unprocessed_ids_after_retries_return_503(fake_dynamodb):
+    """再試行しても取得できないIDがある場合は503を返すことを確認します。"""
+    fake_dynamodb(unprocessed_rounds=list_app.MAX_RETRIES + 1)
+
+    assert invoke({"ids": "id-0,id-2,id-4"})[0] == 503
+
+
+@pytest.mark.parametrize("query_params", [{"ids": ""}, {"ids": ",,"}, {"ids": "id-0", "priority": "high"},
+                                          {"ids": ",".join(str(i) for i in range(101))}])
+def test_invalid_ids_are_rejected(fake_dynamodb, query_params):
+    """ids が空・多すぎる・他の条件と同時に指定された場合は400を返すことを確認します。"""
+    fake_dynamodb()
+
+    assert invoke(query_params)[0] == 400
+
+
+def test_next_token_is_rejected_without_secret(monkeypatch):
+    """署名の鍵が設定されていない場合は nextToken を検証せずに受け付けず、500を返すことを確認します。"""
+    pagination = sys.modules["pagination"]
+    token = pagination.encode_cursor({"id": "id-10"})
+    monkeypatch.setattr(pagination, "_secret", b"")
+
+    status, _ = invoke({"nextToken": token})
+
+    assert status == 500
+
+
+def test_tag_page_is_filled_past_filtered_out_items(monkeypatch):
+    """タグのパーティションで条件に合わないTODOが先に並んでいても、limit 件のページを返すことを確認します。"""
+    fake_db.reset()
+    client = boto3.client("dynamodb", region_name="ap-northeast-1", **fake_db.CLIENT_KWARGS)
+    fake_db.attach(client, "memory://list-todos").database.load_template(os.path.join(BACKEND_DIR, "template.yaml"))
+    resource = boto3.resource("dynamodb", region_name="ap-northeast-1", **fake_db.CLIENT_KWARGS)
+    fake_db.attach(resource.meta.client, "memory://list-todos")
+    tag_table_name = os.environ["TODO_TAG_TABLE_NAME"]
+    monkeypatch.setattr(list_app, "tag_table", list_app.ClientTable(tag_table_name, client))
+    # 期限順で、完了済みの5件の後に未完了の3件が並ぶ
+    for i in range(8):
+        todo = {"id": f"id-{i}", "title": f"todo {i}", "due_date": f"2026-10-{i + 1:02d}", "is_completed": i < 5,
+                "priority": "medium", "tags": ["家事"]}
+        for row in todo_index.tag_rows(todo).values():
+            resource.Table(tag_table_name).put_item(Item=row)
+
+    status, first = invoke({"tag": "家事", "is_completed": "false", "limit": "2"})
+    assert status == 200
+    assert [item["id"] for item in first["items"]] == ["id-5", "id-6"]
+    assert first["nextToken"]
+
+    status, second = invoke({"tag": "家事", "is_completed": "false", "limit": "2", "nextToken": first["nextToken"]})
+    assert status == 200
+    assert [item["id"] for item in second["items"]] == ["id-7"]
+    assert second["nextToken"] is None
+    fake_db.reset()
@@ -0,0 +1,115 @@
+"""
+EMFでメトリクスを記録する共通モジュールのユニットテスト
+"""
+
+import json
+import os
+import sys
+
+import pytest
+from botocore.awsrequest import AWSResponse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "todo_service", "CommonLayer"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
+
+import aws_clients  # noqa: E402
+import metrics  # noqa: E402
+
+
+class RawBody:
+    """AWSResponse に渡すレスポンスボディ"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+@pytest.fixture
+def records(monkeypatch):
+    monkeypatch.setattr(aws_clients, "_session", None)
+    monkeypatch.setattr(aws_clients, "_clients", {})
+    monkeypatch.setattr(aws_clients, "_resources", {})
+    monkeypatch.setattr(aws_clients, "_tables", {})
+    monkeypatch.setattr(metrics, "_cold_start", True)
+    records = []
+    monkeypatch.setattr(metrics, "sink", records.append)
+    return records
+
+
+def fake_dynamodb(sent, body):
+    """送信せずに body を返すDynamoDBクライアント（送信したリクエストは sent に追加する）"""
+    def send(request, **kwargs):
+        sent.append(json.loads(request.body))
+        return AWSResponse(request.url, 200, {}, RawBody(json.dumps(body).encode()))
+
+    client = aws_clients.get_client("dynamodb")
+    client.meta.events.register("before-send", send)
+    return client
+
+
+def test_records_latency_and_dynamodb_calls(records):
+    """DynamoDBの呼び出し回数と消費キャパシティがルートごとに記録されることを確認します。"""
+    sent = []
+
+    @metrics.record_metrics
+    def handler(event, context):
+        client = fake_dynamodb(sent, {"Item": {}, "ConsumedCapacity": {"TableName": "todos", "CapacityUnits": 0.5}})
+        client.get_item(TableName="todos", Key={"id": {"S": "1"}})
+        client.get_item(TableName="todos", Key={"id": {"S": "2"}})
+        return {"statusCode": 200}
+
+    handler({"httpMethod": "GET", "resource": "/todos/{id}"}, None)
+    handler({"httpMethod": "GET", "resource": "/todos/{id}"}, None)
+
+    first, second = records
+    assert sent[0]["ReturnConsumedCapacity"] == "TOTAL"
+    assert first["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Function", "Route"]]
+    assert first["Route"] == "GET /todos/{id}"
+    assert (first["ColdStart"], second["ColdStart"]) == (1, 0)
+    assert (first["AWSCalls"], first["DynamoDBCalls"], first["ConsumedCapacity"]) == (2, 2, 1.0)
+    assert first["CapacityByTable"] == {"todos": 1.0}
+    assert first["StatusCode"] == 200
+    assert first["Latency"] >= first["AWSCallTime"] > 0
+
+
+def test_records_when_handler_raises(records):
+    """例外が発生した場合も記録してから送出されることを確認します。"""
+    @metrics.record_metrics
+    def handler(event, context):
+        raise RuntimeError("失敗")
+
+    with pytest.raises(RuntimeError):
+        handler({"Records": []}, None)
+
+    assert records[0]["Route"] == "-"
+    assert records[0]["StatusCode"] == "error"
+    assert records[0]["AWSCalls"] == 0
+
+
+def test_records_custom_metrics(records):
+    """add_metric で加算した値が独自のメトリクスとして記録されることを確認します。"""
+    @metrics.record_metrics
+    def handler(event, context):
+        metrics.add_metric("CacheHit", 1)
+        metrics.add_metric("CacheHit", 1)
+        metrics.add_metric("PayloadSize", 512, "Bytes")
+        return {"statusCode": 200}
+
+    handler({"httpMethod": "GET", "resource": "/todos"}, None)
+    metrics.add_metric("CacheHit", 1)  # 呼び出しの外では記録しない
+
+    definitions = records[0]["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+    assert definitions[-2:] == [{"Name": "CacheHit", "Unit": "Count"}, {"Name": "PayloadSize", "Unit": "Bytes"}]
+    assert (records[0]["CacheHit"], records[0]["PayloadSize"]) == (2, 512)
+    assert len(records) == 1
+
+def test_route_of():
+    """REST API と HTTP API のイベントからルートを取り出せることを確認します。"""
+    assert metrics.route_of({"httpMethod": "POST", "resource": "/todos"}) == "POST /todos"
+    assert metrics.route_of({"routeKey": "GET /todos", "requestContext": {"http": {"method": "GET"}}}) == "GET /todos"
+    assert metrics.route_of({"Records": []}) == "-"
@@ -0,0 +1,81 @@
+"""
+ページネーション用共通モジュールのユニットテスト
+"""
+
+import os
+import sys
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "todo_service", "CommonLayer"))
+
+os.environ.setdefault("PAGINATION_TOKEN_SECRET", "test-secret")
+
+import pagination  # noqa: E402
+
+
+def test_cursor_round_trip():
+    """エンコードしたトークンから元のキーを復元できることを確認します。"""
+    key = {"id": "550e8400-e29b-41d4-a716-446655440000", "due_date": "2025-04-10", "count": Decimal("3")}
+
+    token = pagination.encode_cursor(key)
+
+    assert pagination.decode_cursor(token) == key
+    assert "=" not in token
+
+
+def test_cursor_is_none_when_no_more_pages():
+    """LastEvaluatedKey がない場合は None を返すことを確認します。"""
+    assert pagination.encode_cursor(None) is None
+    assert pagination.encode_cursor({}) is None
+
+
+@pytest.mark.parametrize("token", ["", "invalid", "!!!", "eyJpZCI6IjEifQ"])
+def test_invalid_cursor_is_rejected(token):
+    """不正な形式のトークンが拒否されることを確認します。"""
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor(token)
+
+
+def test_tampered_cursor_is_rejected():
+    """署名と内容が一致しないトークンが拒否されることを確認します。"""
+    token = pagination.encode_cursor({"id": "a"})
+    other = pagination.encode_cursor({"id": "b"})
+    tampered = token[:16] + other[16:]
+
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor(tampered)
+
+
+def test_cursor_requires_secret(monkeypatch):
+    """署名の鍵が設定されていない場合は、トークンを発行も受理もしないことを確認します。"""
+    token = pagination.encode_cursor({"id": "a"})
+    monkeypatch.setattr(pagination, "_secret", b"")
+
+    with pytest.raises(pagination.MissingSecretError):
+        pagination.encode_cursor({"id": "a"})
+    with pytest.raises(pagination.MissingSecretError):
+        pagination.decode_cursor(token)
+
+
+def test_cursor_is_bound_to_scope():
+    """別の検索条件で発行されたトークンが拒否されることを確認します。"""
+    token = pagination.encode_cursor({"id": "a"}, scope="priority=high")
+
+    assert pagination.decode_cursor(token, scope="priority=high") == {"id": "a"}
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.decode_cursor(token, scope="priority=low")
+
+
+@pytest.mark.parametrize("value,expected", [(None, 20), ("", 20), ("1", 1), ("100", 100)])
+def test_parse_limit(value, expected):
+    """limit の既定値と有効な値を確認します。"""
+    assert pagination.parse_limit(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0", "101", "-1", "abc", "1.5"])
+def test_parse_limit_rejects_invalid_values(value):
+    """範囲外または整数でない limit が拒否されることを確認します。"""
+    with pytest.raises(ValueError):
+        pagination.parse_limit(value)
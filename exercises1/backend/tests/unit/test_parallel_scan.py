@@ -0,0 +1,102 @@
+"""
+並列スキャン用共通モジュールのユニットテスト
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "todo_service", "CommonLayer"))
+
+import parallel_scan  # noqa: E402
+
+
+class ThrottlingError(Exception):
+    def __init__(self):
+        super().__init__("throttled")
+        self.response = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+
+
+class FakeScan:
+    """Segment / TotalSegments / Limit / ExclusiveStartKey を解釈する scan のスタブ"""
+
+    def __init__(self, count, throttle_first=0, fail_segment=None):
+        self.items = [{"id": str(i)} for i in range(count)]
+        self.throttle_remaining = throttle_first
+        self.fail_segment = fail_segment
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, Segment, TotalSegments, ReturnConsumedCapacity, Limit=10, ExclusiveStartKey=None):
+        with self.lock:
+            self.calls.append((Segment, TotalSegments))
+            if self.throttle_remaining:
+                self.throttle_remaining -= 1
+                raise ThrottlingError()
+        if Segment == self.fail_segment:
+            raise RuntimeError("scan failed")
+        segment_items = [item for item in self.items if int(item["id"]) % TotalSegments == Segment]
+        start = ExclusiveStartKey["position"] if ExclusiveStartKey else 0
+        page = segment_items[start:start + Limit]
+        response = {"Items": page, "ConsumedCapacity": {"CapacityUnits": 0.5}}
+        if start + Limit < len(segment_items):
+            response["LastEvaluatedKey"] = {"position": start + Limit}
+        return response
+
+
+@pytest.mark.parametrize("segments", [1, 3, 8])
+def test_scan_returns_every_item_once(segments):
+    """セグメント数に関わらず、すべてのアイテムが1回ずつ返ることを確認します。"""
+    scan = FakeScan(95)
+    scanner = parallel_scan.ParallelScanner(scan, total_segments=segments, page_size=10)
+
+    ids = [item["id"] for item in scanner.scan()]
+
+    assert sorted(ids, key=int) == [str(i) for i in range(95)]
+    assert {total for _, total in scan.calls} == {segments}
+    assert {segment for segment, _ in scan.calls} == set(range(segments))
+    assert scanner.stats["items"] == 95
+
+
+def test_throttling_is_retried():
+    """スロットリングを受けても再試行して最後まで読み取ることを確認します。"""
+    scan = FakeScan(30, throttle_first=3)
+    scanner = parallel_scan.ParallelScanner(scan, total_segments=2, page_size=10, base_delay=0.001)
+
+    assert len(list(scanner.scan())) == 30
+    assert scanner.stats["throttles"] == 3
+
+
+def test_scan_error_is_raised():
+    """スロットリング以外のエラーは呼び出し側に伝わることを確認します。"""
+    scanner = parallel_scan.ParallelScanner(FakeScan(30, fail_segment=1), total_segments=2, page_size=10)
+
+    with pytest.raises(RuntimeError, match="scan failed"):
+        list(scanner.scan())
+
+
+def test_stopping_early_stops_workers():
+    """途中でループを抜けると、ワーカーが残りのページを読まずに停止することを確認します。"""
+    scan = FakeScan(10000)
+    scanner = parallel_scan.ParallelScanner(scan, total_segments=4, page_size=10, max_buffered_pages=2)
+
+    stream = scanner.scan()
+    first = [next(stream) for _ in range(5)]
+    stream.close()
+
+    assert len(first) == 5
+    # キューが上限に達した時点でワーカーは待機するため、全ページ（1000回）は読まれない
+    assert len(scan.calls) < 100
+
+
+def test_capacity_limiter_halves_rate_on_throttling():
+    """スロットリングで速度が半分になり、成功で予算まで戻ることを確認します。"""
+    limiter = parallel_scan.CapacityLimiter(100)
+
+    limiter.throttled()
+    assert limiter.rate == 50
+    for _ in range(20):
+        limiter.consume(0)
+    assert limiter.rate == 100
@@ -0,0 +1,84 @@
+"""
+イベントのログ出力を間引く共通モジュールのユニットテスト
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "todo_service", "CommonLayer"))
+
+import request_log  # noqa: E402
+
+EVENT = {
+    "httpMethod": "POST",
+    "resource": "/todos",
+    "headers": {"Authorization": "Bearer secret-token", "Content-Type": "application/json"},
+    "body": json.dumps({"title": "買い物", "password": "p@ss", "description": "x" * 5000}),
+}
+
+
+class RecordingLogger:
+    """出力したログを (レベル, メッセージ) で記録するロガー"""
+
+    def __init__(self):
+        self.records = []
+
+    def info(self, message, *args):
+        self.records.append(("info", message % args))
+
+    def warning(self, message, *args):
+        self.records.append(("warning", message % args))
+
+    def error(self, message, *args):
+        self.records.append(("error", message % args))
+
+
+@pytest.fixture
+def logger(monkeypatch):
+    monkeypatch.setattr(request_log, "SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(request_log, "SAMPLE_RATES", {})
+    return RecordingLogger()
+
+
+def test_redacts_secrets_and_truncates():
+    """伏せるキーの値が置き換えられ、上限を超えた部分が省略されることを確認します。"""
+    redacted = request_log.redact(EVENT)
+    assert redacted["headers"] == {"Authorization": "***", "Content-Type": "application/json"}
+    assert json.loads(redacted["body"])["password"] == "***"
+
+    text = request_log.format_event(EVENT, 200)
+    assert len(text.split("...")[0].encode()) <= 200
+    assert text.endswith("バイト省略）")
+    assert "secret-token" not in request_log.format_event(EVENT)
+
+
+def test_only_sampled_requests_are_logged(logger, monkeypatch):
+    """サンプリング率0のルートは出力されず、1のルートは切り詰めて出力されることを確認します。"""
+    handler = request_log.log_requests(logger)(lambda event, context: {"statusCode": 201})
+
+    handler(EVENT, None)
+    assert logger.records == []
+
+    monkeypatch.setattr(request_log, "SAMPLE_RATES", {"POST /todos": 1.0})
+    handler(EVENT, None)
+    (level, message), = logger.records
+    assert level == "info"
+    assert "POST /todos" in message and message.endswith("バイト省略）")
+
+
+def test_errors_and_slow_requests_are_always_logged(logger, monkeypatch):
+    """エラーと遅いリクエストはサンプリングに関係なく切り詰めずに出力されることを確認します。"""
+    def failing(event, context):
+        raise RuntimeError("失敗")
+
+    with pytest.raises(RuntimeError):
+        request_log.log_requests(logger)(failing)(EVENT, None)
+    request_log.log_requests(logger)(lambda event, context: {"statusCode": 500})(EVENT, None)
+    monkeypatch.setattr(request_log, "SLOW_MS", 0)
+    request_log.log_requests(logger)(lambda event, context: {"statusCode": 200})(EVENT, None)
+
+    assert [level for level, _ in logger.records] == ["error", "error", "warning"]
+    assert all("バイト省略" not in message and "secret-token" not in message for _, message in logger.records)
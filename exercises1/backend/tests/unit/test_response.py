@@ -0,0 +1,63 @@
+"""
+レスポンス生成用共通モジュールのユニットテスト
+"""
+
+import json
+import os
+import sys
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import Binary
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "todo_service", "CommonLayer"))
+
+import response  # noqa: E402
+
+BODY = {
+    "items": [{"id": "1", "title": "買い物", "count": Decimal("3"), "ratio": Decimal("0.5"),
+               "tags": {"a"}, "raw": b"\x00\x01", "blob": Binary(b"\x02")}],
+    "total": Decimal("10"),
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(response, "orjson", None)
+    return request.param
+
+
+def test_dynamodb_types_are_converted(backend):
+    """Decimal・set・バイナリがJSONの型に変換されることを確認します。"""
+    assert json.loads(response.dumps(BODY)) == {
+        "items": [{"id": "1", "title": "買い物", "count": 3, "ratio": 0.5, "tags": ["a"], "raw": "AAE=", "blob": "Ag=="}],
+        "total": 10,
+    }
+
+
+def test_non_ascii_is_not_escaped(backend):
+    """どちらの実装でも非ASCII文字がエスケープされずに出力されることを確認します。"""
+    assert "買い物" in response.dumps(BODY)
+
+
+def test_large_integer_falls_back_to_stdlib():
+    """orjson が扱えない大きな整数も変換できることを確認します。"""
+    assert response.dumps({"n": 2 ** 70}) == '{"n": 1180591620717411303424}'
+
+
+def test_generate_response():
+    """ボディが None の場合はボディなしのレスポンスになることを確認します。"""
+    assert response.generate_response(204) == {"statusCode": 204, "headers": response.DEFAULT_HEADERS}
+    assert json.loads(response.generate_response(200, {"n": Decimal("1")})["body"]) == {"n": 1}
+    assert response.DEFAULT_HEADERS["Content-Type"] == "application/json; charset=utf-8"
+
+
+def test_generate_response_copies_headers():
+    """レスポンスのヘッダーを書き換えても既定のヘッダーが変わらないことを確認します。"""
+    first = response.generate_response(200, {})
+    first["headers"]["Set-Cookie"] = "session=1"
+    assert "Set-Cookie" not in response.DEFAULT_HEADERS
+    assert "Set-Cookie" not in response.generate_response(200, {})["headers"]
@@ -0,0 +1,70 @@
+"""
+ルーター（TodoRouter）のユニットテスト
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(BACKEND_DIR, "todo_service", "CommonLayer"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+os.environ.setdefault("TODO_TABLE_NAME", "exercises1-table")
+os.environ.setdefault("PAGINATION_TOKEN_SECRET", "test-secret")
+os.environ.setdefault("POWERTOOLS_LOG_LEVEL", "ERROR")
+
+spec = importlib.util.spec_from_file_location(
+    "todo_router_app", os.path.join(BACKEND_DIR, "todo_service", "TodoRouter", "app.py"))
+router_app = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(router_app)
+
+
+@pytest.mark.parametrize("path,expected", [
+    ("/todos", ("/todos", {})),
+    ("/todos/", ("/todos", {})),
+    ("/todos/batch", ("/todos/batch", {})),
+    ("/todos/abc", ("/todos/{id}", {"id": "abc"})),
+    ("/todos/abc/def", (None, None)),
+    ("/users", (None, None)),
+])
+def test_match_route(path, expected):
+    """固定のパスが優先され、{id} がパスパラメータになることを確認します。"""
+    assert router_app.match_route(path) == expected
+
+
+def test_dispatches_with_rewritten_event(monkeypatch):
+    """/{proxy+} のイベントが、個別の関数と同じ resource / pathParameters に置き換えられることを確認します。"""
+    calls = []
+    monkeypatch.setattr(router_app, "handlers", {"UpdateTodo": lambda event, context: calls.append(event) or "ok"})
+
+    result = router_app.lambda_handler(
+        {"httpMethod": "PUT", "path": "/todos/abc", "resource": "/{proxy+}", "pathParameters": {"proxy": "todos/abc"}},
+        None)
+
+    assert result == "ok"
+    assert calls[0]["resource"] == "/todos/{id}"
+    assert calls[0]["pathParameters"] == {"id": "abc"}
+
+
+def test_unknown_route_and_method():
+    """存在しないパスは404、定義されていないメソッドは405を返すことを確認します。"""
+    assert router_app.lambda_handler({"httpMethod": "GET", "path": "/users"}, None)["statusCode"] == 404
+    assert router_app.lambda_handler({"httpMethod": "PATCH", "path": "/todos/abc"}, None)["statusCode"] == 405
+
+
+def test_handlers_are_loaded_lazily(monkeypatch):
+    """関数は最初の呼び出しで読み込まれ、それぞれの schema を使うことを確認します。"""
+    monkeypatch.setattr(router_app, "handlers", {})
+
+    create = router_app.load_handler("CreateTodo")
+    update = router_app.load_handler("UpdateTodo")
+
+    assert router_app.load_handler("CreateTodo") is create
+    assert set(router_app.handlers) == {"CreateTodo", "UpdateTodo"}
+    assert sys.modules["todo_router.CreateTodo.app"].schema["required"] == ["title"]
+    assert "required" not in sys.modules["todo_router.UpdateTodo.app"].schema
+    assert "schema" not in sys.modules
+    assert update is not create
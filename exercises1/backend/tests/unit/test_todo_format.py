@@ -0,0 +1,35 @@
+"""
+生成したレスポンス整形関数のユニットテスト
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(BACKEND_DIR, "todo_service", "CommonLayer"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "tools"))
+
+import generate_formatters  # noqa: E402
+import models  # noqa: E402
+import todo_format  # noqa: E402
+
+
+def test_generated_module_is_up_to_date():
+    """todo_format.py が tools/models.py から生成し直されていることを確認します。"""
+    model_classes = [getattr(models, name) for name in models.__all__]
+
+    assert generate_formatters.read_hash(generate_formatters.OUTPUT_PATH) == \
+        generate_formatters.source_hash(model_classes)
+
+
+def test_defaults_are_filled():
+    """任意の属性がない場合に既定値が入り、インデックス属性は含まれないことを確認します。"""
+    item = {"id": "1", "title": "t", "status_priority": "open#medium", "due_sort": "9999-12-31"}
+
+    assert todo_format.format_todo(item) == {
+        "id": "1", "title": "t", "description": "", "due_date": None, "is_completed": False, "priority": "medium",
+        "tags": [],
+    }
+    assert todo_format.format_todo_list([item, item]) == [todo_format.format_todo(item)] * 2
+    # 既定値のリストは呼び出しごとに新しく作られる
+    assert todo_format.format_todo(item)["tags"] is not todo_format.format_todo(item)["tags"]
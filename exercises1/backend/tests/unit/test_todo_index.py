@@ -0,0 +1,181 @@
+"""
+絞り込み検索用共通モジュールのユニットテスト
+"""
+
+import os
+import random
+import sys
+
+import boto3
+import pytest
+from boto3.dynamodb.conditions import Key
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(BACKEND_DIR, "todo_service", "CommonLayer"))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "tools"))
+
+import fake_dynamodb  # noqa: E402
+import todo_index  # noqa: E402
+
+
+class FakeIndex:
+    """パーティションキーの一致・ソートキーの範囲と Limit / ExclusiveStartKey を解釈する query のスタブ"""
+
+    def __init__(self, items, key_name, sort_key):
+        self.items = items
+        self.key_name = key_name
+        self.sort_key = sort_key
+        self.read_count = 0
+
+    def query(self, KeyConditionExpression, Limit, ExclusiveStartKey=None, IndexName=None):
+        expression = KeyConditionExpression.get_expression()
+        lower = upper = None
+        if expression["operator"] == "AND":
+            partition_condition, sort_condition = expression["values"]
+            partition = partition_condition.get_expression()["values"][1]
+            lower, upper = sort_condition.get_expression()["values"][1:]
+        else:
+            partition = expression["values"][1]
+        matched = sorted(
+            (item for item in self.items
+             if item.get(self.key_name) == partition and (lower is None or lower <= item[self.sort_key] <= upper)),
+            key=lambda item: (item[self.sort_key], item["id"]),
+        )
+        start = 0
+        if ExclusiveStartKey:
+            start = next(i for i, item in enumerate(matched) if item["id"] == ExclusiveStartKey["id"]) + 1
+        page = matched[start:start + Limit]
+        self.read_count += len(page)
+        response = {"Items": page}
+        if start + Limit < len(matched):
+            last = page[-1]
+            response["LastEvaluatedKey"] = {self.key_name: last[self.key_name], self.sort_key: last[self.sort_key],
+                                            "id": last["id"]}
+        return response
+
+
+def make_todos(count, seed=0):
+    rng = random.Random(seed)
+    todos = []
+    for i in range(count):
+        todo = {
+            "id": f"todo-{i:04d}",
+            "is_completed": rng.random() < 0.5,
+            "priority": rng.choice(todo_index.PRIORITIES),
+            "due_date": rng.choice([None, f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"]),
+        }
+        todo.update(todo_index.index_attributes(todo))
+        todos.append(todo)
+    return todos
+
+
+def test_index_attributes():
+    """完了状態・優先度・期限からインデックス属性が計算されることを確認します。"""
+    assert todo_index.index_attributes({"id": "1", "is_completed": False, "priority": "high",
+                                        "due_date": "2026-01-02"}) == {
+        "status_priority": "open#high",
+        "due_sort": "2026-01-02",
+        "due_bucket": todo_index.due_bucket("1"),
+    }
+    assert todo_index.index_attributes({"id": "1", "is_completed": True}) == {
+        "status_priority": "completed#medium",
+        "due_sort": todo_index.NO_DUE_DATE,
+    }
+
+
+def test_sync_index_attributes_skips_concurrent_update():
+    """インデックス属性を書き込み、計算に使った属性が別の更新で変わっていた場合は書き込まないことを確認します。"""
+    fake_dynamodb.reset()
+    resource = boto3.resource("dynamodb", region_name="ap-northeast-1", **fake_dynamodb.CLIENT_KWARGS)
+    fake_dynamodb.attach(resource.meta.client, "memory://todo-index").database.load_template(
+        os.path.join(BACKEND_DIR, "template.yaml"))
+    table = resource.Table("exercises1-table")
+    item = {"id": "1", "title": "t", "is_completed": False, "priority": "high", "due_date": "2026-10-18"}
+    table.put_item(Item=item)
+
+    assert todo_index.sync_index_attributes(table, item)
+    assert table.get_item(Key={"id": "1"})["Item"] == {**item, **todo_index.index_attributes(item)}
+
+    # 読み取った後に別の更新で完了状態が変わった（テーブルは未完了のまま）場合
+    assert not todo_index.sync_index_attributes(table, dict(item, is_completed=True))
+    assert table.get_item(Key={"id": "1"})["Item"]["status_priority"] == "open#high"
+    fake_dynamodb.reset()
+
+
+def test_status_priority_partitions():
+    """絞り込み条件に該当するパーティションだけが選ばれることを確認します。"""
+    assert todo_index.status_priority_partitions(is_completed=False) == ["open#low", "open#medium", "open#high"]
+    assert todo_index.status_priority_partitions(is_completed=True, priority="low") == ["completed#low"]
+    assert len(todo_index.status_priority_partitions(priority="high")) == 2
+
+
+def test_tag_rows():
+    """タグごとに期限順のソートキーを持つアイテムが作られることを確認します。"""
+    rows = todo_index.tag_rows({"id": "1", "title": "t", "due_date": "2026-03-01", "tags": ["a", "b", "a"],
+                                "status_priority": "open#medium"})
+
+    assert set(rows) == {("a", "2026-03-01#1"), ("b", "2026-03-01#1")}
+    assert rows[("a", "2026-03-01#1")] == {"id": "1", "title": "t", "due_date": "2026-03-01", "tags": ["a", "b", "a"],
+                                           "tag": "a", "sort_key": "2026-03-01#1"}
+
+
+@pytest.mark.parametrize("is_completed,priority,limit", [(False, None, 7), (None, "high", 5), (True, "low", 50)])
+def test_query_partitions_pages_in_due_order(is_completed, priority, limit):
+    """ページをたどると、条件に合うアイテムがすべて期限順に1回ずつ返ることを確認します。"""
+    todos = make_todos(200)
+    index = FakeIndex(todos, "status_priority", "due_sort")
+    partitions = todo_index.status_priority_partitions(is_completed, priority)
+
+    results = []
+    cursor = None
+    while True:
+        items, cursor = todo_index.query_partitions(
+            index.query, "status_priority", partitions, "due_sort", ("status_priority", "due_sort", "id"),
+            limit, cursor, IndexName=todo_index.STATUS_PRIORITY_INDEX,
+        )
+        assert len(items) <= limit
+        results.extend(items)
+        if cursor is None:
+            break
+
+    expected = [todo for todo in todos if todo["status_priority"] in partitions]
+    assert sorted(todo["id"] for todo in results) == sorted(todo["id"] for todo in expected)
+    assert [todo["due_sort"] for todo in results] == sorted(todo["due_sort"] for todo in expected)
+    # 読み取り量は該当パーティションの件数とページ数に比例し、テーブル全体には比例しない
+    pages = -(-len(expected) // limit)
+    assert index.read_count <= len(expected) + pages * limit * len(partitions)
+
+
+def test_due_bucket_is_stable_and_spread():
+    """期限のパーティションがIDから決まり、各パーティションに分散することを確認します。"""
+    buckets = [todo_index.due_bucket(f"todo-{i}") for i in range(400)]
+
+    assert todo_index.due_bucket("todo-1") == buckets[1]
+    assert set(buckets) == set(todo_index.due_bucket_partitions())
+    assert max(buckets.count(bucket) for bucket in set(buckets)) < 400 / todo_index.DUE_BUCKETS * 2
+
+
+@pytest.mark.parametrize("due_after,due_before", [("2026-03-01", "2026-05-31"), (None, "2026-02-15"), ("2026-11-01", None)])
+def test_query_due_range_pages_in_due_order(due_after, due_before):
+    """期限の範囲に該当するアイテムだけが、期限順にすべて返ることを確認します。"""
+    todos = make_todos(300, seed=1)
+    index = FakeIndex(todos, "due_bucket", "due_date")
+    sort_condition = Key("due_date").between(*todo_index.due_range(due_after, due_before))
+
+    results = []
+    cursor = None
+    while True:
+        items, cursor = todo_index.query_partitions(
+            index.query, "due_bucket", todo_index.due_bucket_partitions(), "due_date",
+            ("due_bucket", "due_date", "id"), 10, cursor, sort_condition=sort_condition,
+            IndexName=todo_index.DUE_DATE_INDEX,
+        )
+        results.extend(items)
+        if cursor is None:
+            break
+
+    expected = [todo for todo in todos if todo["due_date"]
+                and (due_after or "") <= todo["due_date"] <= (due_before or "9999")]
+    assert expected
+    assert sorted(todo["id"] for todo in results) == sorted(todo["id"] for todo in expected)
+    assert [todo["due_date"] for todo in results] == sorted(todo["due_date"] for todo in expected)
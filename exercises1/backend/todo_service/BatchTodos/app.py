@@ -0,0 +1,253 @@
+"""
+TODOアイテム一括操作用のLambda関数
+
+このモジュールは複数のTODOの作成・更新・削除を1回のリクエストで行うLambda関数を提供します。
+各操作は CreateTodo / UpdateTodo と同じスキーマで検証し、操作ごとの結果を返します。
+
+- 作成と削除は25件ずつの BatchWriteItem にまとめ、UnprocessedItems はジッター付きで待機して再試行します
+- BatchWriteItem がエラーになった場合は、そのまとまりの未処理の操作だけを失敗にして残りのまとまりを続けます
+- BatchWriteItem は部分更新に対応していないため、更新は UpdateTodo と同じ条件付きの update_item を並列で実行します
+"""
+
+import json
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from mypy_boto3_dynamodb import DynamoDBServiceResource
+from aws_lambda_powertools.utilities.validation import validate
+from aws_lambda_powertools.utilities.validation.exceptions import SchemaValidationError
+from schema import create_schema, schema, update_schema
+from aws_lambda_powertools import Logger
+from aws_clients import lazy_resource, lazy_table
+from response import generate_response
+from todo_format import format_todo
+from todo_index import index_attributes, sync_index_attributes
+from metrics import record_metrics
+from request_log import log_requests
+
+# ロガーの初期化
+logger = Logger()
+
+# DynamoDBリソースとテーブル（最初に使われたときに作成し、以降の呼び出しで再利用する）
+dynamoDB: DynamoDBServiceResource = lazy_resource("dynamodb")
+table = lazy_table(os.getenv("TODO_TABLE_NAME"))
+
+# BatchWriteItem の1回あたりの最大件数（DynamoDBの上限）
+BATCH_WRITE_SIZE = 25
+
+# UnprocessedItems の再試行回数と待機時間（秒）
+MAX_RETRIES = 5
+BASE_DELAY = 0.05
+MAX_DELAY = 1.0
+
+# 更新を並列に実行するスレッド数
+UPDATE_WORKERS = 8
+
+def handle_exception(e):
+    """
+    例外処理を行う関数
+
+    Args:
+        e (Exception): 発生した例外
+
+    Returns:
+        dict: エラーレスポンス
+    """
+    logger.error("エラーが発生しました: %s", e)
+    return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
+
+def build_create_item(body):
+    """
+    作成操作のリクエストからTODOアイテムを作る関数（CreateTodo と同じ既定値）
+    """
+    todo_item = {
+        "id": str(uuid.uuid4()),
+        "title": body.get('title'),
+        "description": body.get('description', ''),
+        "is_completed": body.get('is_completed', False),
+        "priority": body.get('priority', 'medium'),
+        "tags": body.get('tags', []),
+    }
+    if body.get('due_date'):
+        todo_item["due_date"] = body['due_date']
+    todo_item.update(index_attributes(todo_item))
+    return todo_item
+
+def batch_write(requests):
+    """
+    書き込みリクエストを25件ずつ BatchWriteItem で実行する関数
+
+    Args:
+        requests (list[tuple[int, dict]]): 操作のインデックスと PutRequest / DeleteRequest の組
+
+    Returns:
+        dict[int, tuple[int, str]]: 処理されなかった操作のインデックスと (ステータスコード, エラーメッセージ)
+            （再試行しても残った場合は503、BatchWriteItem がエラーになった場合は500）
+    """
+    failed = {}
+    for start in range(0, len(requests), BATCH_WRITE_SIZE):
+        chunk = requests[start:start + BATCH_WRITE_SIZE]
+        # UnprocessedItems から操作を特定するためのキー（同じバッチ内でIDは重複しない）
+        index_by_id = {
+            (request.get("PutRequest", {}).get("Item") or request["DeleteRequest"]["Key"])["id"]: index
+            for index, request in chunk
+        }
+        pending = [request for _, request in chunk]
+        error = (503, "混雑のため処理できませんでした。再度実行してください")
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                response = dynamoDB.batch_write_item(RequestItems={table.name: pending})
+            except Exception as e:
+                # このまとまりの未処理の操作だけを失敗にし、次のまとまりへ進む
+                logger.error("一括書き込みでエラーが発生しました: %s", e)
+                error = (500, str(e))
+                break
+            pending = response.get('UnprocessedItems', {}).get(table.name, [])
+            if not pending:
+                break
+            if attempt < MAX_RETRIES:
+                # スロットリング時は全件が戻ることもあるため、ジッター付きの指数バックオフで待つ
+                time.sleep(random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt)))
+        for request in pending:
+            key = request.get("PutRequest", {}).get("Item") or request["DeleteRequest"]["Key"]
+            failed[index_by_id[key["id"]]] = error
+        if pending:
+            logger.warning("処理されなかった書き込みがあります: %d件", len(pending))
+    return failed
+
+def update_todo(item_id, body):
+    """
+    TODOアイテムを部分更新する関数（UpdateTodo と同じ更新内容と条件）
+
+    Returns:
+        tuple[int, dict]: ステータスコードと結果
+    """
+    update_expression = []
+    expression_attribute_values = {}
+    for name in ('title', 'description', 'due_date', 'priority', 'tags'):
+        if body.get(name) is not None:
+            update_expression.append(f"{name} = :{name}")
+            expression_attribute_values[f":{name}"] = body[name]
+    # is_completed が指定されていない場合は UpdateTodo と同じく False にする
+    update_expression.append("is_completed = :is_completed")
+    expression_attribute_values[':is_completed'] = body.get('is_completed') or False
+
+    try:
+        response = table.update_item(
+            Key={"id": item_id},
+            UpdateExpression="SET " + ", ".join(update_expression),
+            ExpressionAttributeValues=expression_attribute_values,
+            ConditionExpression="attribute_exists(id)",  # アイテムが存在することを確認
+            ReturnValues="ALL_NEW",
+        )
+    except dynamoDB.meta.client.exceptions.ConditionalCheckFailedException:
+        return 404, {"error": "指定されたTODOが見つかりません"}
+    except Exception as e:
+        logger.error("更新でエラーが発生しました: %s", e)
+        return 500, {"error": str(e)}
+
+    item = response['Attributes']
+    try:
+        # 絞り込み検索用のインデックス属性を更新（UpdateTodo と同じ）
+        if not sync_index_attributes(table, item):
+            logger.info("インデックス属性の更新をスキップしました（同時更新）。ID: %s", item_id)
+    except Exception as e:
+        logger.error("インデックス属性の更新でエラーが発生しました: %s", e)
+        return 500, {"error": str(e)}
+    return 200, {"item": format_todo(item)}
+
+def validate_operation(operation, seen_ids):
+    """
+    1件の操作を検証する関数
+
+    Returns:
+        str | None: エラーメッセージ（問題がない場合は None）
+    """
+    op = operation['op']
+    if op in ('update', 'delete'):
+        if not operation.get('id'):
+            return f"{op} には id が必要です"
+        if operation['id'] in seen_ids:
+            # BatchWriteItem は同じキーへの複数の操作を受け付けないため
+            return "同じIDへの操作が重複しています"
+        seen_ids.add(operation['id'])
+    if op in ('create', 'update'):
+        try:
+            validate(event=operation.get('todo') or {}, schema=create_schema if op == 'create' else update_schema)
+        except SchemaValidationError as e:
+            return str(e)
+    return None
+
+@record_metrics
+@logger.inject_lambda_context
+@log_requests(logger)
+def lambda_handler(event, context):
+    """
+    Lambda関数のエントリーポイント
+
+    Args:
+        event (dict): Lambda関数に渡されるイベントデータ
+        context (LambdaContext): Lambda関数のランタイム情報
+
+    Returns:
+        dict: API Gateway形式のレスポンス（操作ごとの結果を含む）
+    """
+    try:
+        body = json.loads(event.get('body') or '{}')
+        # リクエスト全体の形式をスキーマに対して検証
+        validate(event=body, schema=schema)
+    except (ValueError, SchemaValidationError) as e:
+        logger.error("スキーマ検証エラー: %s", e)
+        return generate_response(400, {"message": "入力が無効です", "error": str(e)})
+
+    operations = body['operations']
+    logger.info("一括操作を受信しました: %d件", len(operations))
+
+    results = [None] * len(operations)
+    write_requests = []
+    updates = []
+    seen_ids = set()
+
+    # 操作ごとの検証と書き込みリクエストの組み立て
+    for index, operation in enumerate(operations):
+        op = operation['op']
+        error = validate_operation(operation, seen_ids)
+        if error:
+            results[index] = {"index": index, "op": op, "status": 400, "error": error}
+            continue
+        if op == 'create':
+            item = build_create_item(operation['todo'])
+            write_requests.append((index, {"PutRequest": {"Item": item}}))
+            results[index] = {"index": index, "op": op, "status": 201, "item": format_todo(item)}
+        elif op == 'delete':
+            write_requests.append((index, {"DeleteRequest": {"Key": {"id": operation['id']}}}))
+            results[index] = {"index": index, "op": op, "status": 204, "id": operation['id']}
+        else:
+            updates.append((index, operation))
+
+    try:
+        failed = batch_write(write_requests)
+    except Exception as e:
+        return handle_exception(e)
+    for index, (status, error) in failed.items():
+        results[index] = {"index": index, "op": operations[index]['op'], "status": status, "error": error}
+
+    # 更新は1件ずつの条件付き更新を並列に実行
+    if updates:
+        with ThreadPoolExecutor(max_workers=UPDATE_WORKERS) as executor:
+            futures = [(index, executor.submit(update_todo, operation['id'], operation.get('todo') or {}))
+                       for index, operation in updates]
+            for index, future in futures:
+                status, result = future.result()
+                results[index] = {"index": index, "op": "update", "status": status, "id": operations[index]['id'],
+                                  **result}
+
+    succeeded = sum(1 for result in results if result["status"] < 400)
+    logger.info("一括操作が完了しました: 成功 %d件, 失敗 %d件", succeeded, len(results) - succeeded)
+    return generate_response(200, {
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+    })
@@ -0,0 +1,142 @@
+"""
+一括操作（POST /todos/batch）のスキーマ
+
+create_schema / update_schema は CreateTodo / UpdateTodo の schema.py と同じ内容です。
+Lambda関数ごとにパッケージされるため複製しており、一致していることはユニットテストで確認しています。
+"""
+
+# 1回のリクエストで受け付ける操作の最大数
+MAX_OPERATIONS = 100
+
+create_schema = {
+  "type": "object",
+  "title": "CreateTodo",
+  "properties": {
+    "title": {
+      "type": "string",
+      "title": "Title",
+      "description": "TODOのタイトル（必須）",
+      "minLength": 1,
+      "maxLength": 100
+    },
+    "description": {
+      "type": "string",
+      "description": "TODOの説明（任意）",
+      "maxLength": 500
+    },
+    "due_date": {
+      "type": "string",
+      "format": "date",
+      "description": "TODOの期限（YYYY-MM-DD、任意）"
+    },
+    "is_completed": {
+      "type": "boolean",
+      "description": "TODOの完了状態（任意）",
+      "default": False
+    },
+    "priority": {
+      "type": "string",
+      "description": "優先度（任意）",
+      "enum": ["low", "medium", "high"],
+      "default": "medium"
+    },
+    "tags": {
+      "type": "array",
+      "description": "タグ一覧（任意、最大10個）",
+      "maxItems": 10,
+      "items": {
+        "type": "string",
+        "maxLength": 20
+      }
+    }
+  },
+  "required": ["title"]
+}
+
+update_schema = {
+  "type": "object",
+  "title": "UpdateTodo",
+  "properties": {
+    "title": {
+      "anyOf": [
+        {"type": "string"},
+        {"type": "null"}
+      ],
+      "description": "TODOのタイトル（任意）",
+      "minLength": 1,
+      "maxLength": 100
+    },
+    "description": {
+      "anyOf": [
+        {"type": "string"},
+        {"type": "null"}
+      ],
+      "description": "TODOの説明（任意）",
+      "maxLength": 500
+    },
+    "due_date": {
+      "anyOf": [
+        {"type": "string", "format": "date"},
+        {"type": "null"}
+      ],
+      "description": "TODOの期限（YYYY-MM-DD、任意）"
+    },
+    "is_completed": {
+      "anyOf": [
+        {"type": "boolean"},
+        {"type": "null"}
+      ],
+      "description": "TODOの完了状態（任意）"
+    },
+    "priority": {
+      "anyOf": [
+        {"type": "string"},
+        {"type": "null"}
+      ],
+      "description": "優先度（任意）",
+      "enum": ["low", "medium", "high"]
+    },
+    "tags": {
+      "anyOf": [
+        {"type": "array", "items": {"type": "string", "maxLength": 20}, "maxItems": 10},
+        {"type": "null"}
+      ],
+      "description": "タグ一覧（任意、最大10個）"
+    }
+  },
+  "additionalProperties": False
+}
+
+schema = {
+  "type": "object",
+  "title": "BatchTodos",
+  "properties": {
+    "operations": {
+      "type": "array",
+      "description": "操作の一覧（最大100件）",
+      "minItems": 1,
+      "maxItems": MAX_OPERATIONS,
+      "items": {
+        "type": "object",
+        "properties": {
+          "op": {
+            "type": "string",
+            "description": "操作の種類",
+            "enum": ["create", "update", "delete"]
+          },
+          "id": {
+            "type": "string",
+            "description": "対象のTODOのID（update / delete の場合は必須）",
+            "minLength": 1
+          },
+          "todo": {
+            "type": "object",
+            "description": "TODOの内容（create / update の場合は必須）"
+          }
+        },
+        "required": ["op"]
+      }
+    }
+  },
+  "required": ["operations"]
+}
@@ -0,0 +1,192 @@
+"""
+AWSクライアント作成用の共通モジュール
+
+クライアントとリソースは最初に使われたときに作成し、同じコンテナ内の以降の呼び出しで再利用します。
+すべてのクライアントで1つのセッションと次の設定を共有するため、関数ごとに設定が異なることはありません。
+
+- コネクションプールの大きさとTCPキープアライブ（接続を使い回す）
+- 接続・読み取りのタイムアウト（既定の60秒ではLambdaのタイムアウトより先に打ち切れない）
+- adaptive モードの再試行（スロットリングが続くとクライアント側で送信の間隔を空ける）
+- ENDPOINT_URL（LocalStack など）。サービスごとに ENDPOINT_URL_DYNAMODB のように上書きできます
+  memory://<名前> のようなURLの作り方は register_endpoint で登録できます（ベンチマーク・テストのフェイク用）
+
+設定は環境変数 AWS_MAX_POOL_CONNECTIONS / AWS_CONNECT_TIMEOUT / AWS_READ_TIMEOUT / AWS_MAX_ATTEMPTS で変更できます。
+"""
+
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+
+# コネクションプールの大きさ（並列に処理するスレッド数より大きくする）
+MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "50"))
+
+# 接続・読み取りのタイムアウト（秒）
+CONNECT_TIMEOUT = float(os.getenv("AWS_CONNECT_TIMEOUT", "2"))
+READ_TIMEOUT = float(os.getenv("AWS_READ_TIMEOUT", "5"))
+
+# 最初の1回を含む最大の試行回数
+MAX_ATTEMPTS = int(os.getenv("AWS_MAX_ATTEMPTS", "3"))
+
+CONFIG = Config(
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT,
+    retries={"mode": "adaptive", "max_attempts": MAX_ATTEMPTS},
+)
+
+# 作成済みのセッション・クライアント・リソース・テーブル（複数のスレッドから使われるためロックで作成する）
+_lock = threading.Lock()
+_session = None
+_clients = {}
+_resources = {}
+_tables = {}
+
+# エンドポイントURLの接頭辞ごとの、クライアント・リソースを作る関数（register_endpoint で登録する）
+_endpoints = {}
+
+
+def endpoint_url(service_name):
+    """
+    サービスのエンドポイントURLを返す（指定がなければ None）
+
+    Args:
+        service_name (str): サービス名（例: dynamodb, cognito-idp）
+
+    Returns:
+        str | None: ENDPOINT_URL_<サービス名> または ENDPOINT_URL の値
+    """
+    name = "ENDPOINT_URL_" + service_name.upper().replace("-", "_")
+    return os.getenv(name) or os.getenv("ENDPOINT_URL") or None
+
+
+def register_endpoint(prefix, create):
+    """
+    エンドポイントURLが prefix で始まるときの、クライアント・リソースの作り方を登録する
+
+    ベンチマーク・テストでフェイク（memory:// など）につなぐためのもので、関数のコードからは呼び出しません。
+
+    Args:
+        prefix (str): エンドポイントURLの接頭辞（例: memory://）
+        create (Callable): create(factory, service_name, url, config) でクライアントまたはリソースを返す関数
+    """
+    _endpoints[prefix] = create
+
+
+def _create(factory, service_name):
+    """クライアントまたはリソースを作る（register_endpoint で登録した接頭辞のURLはその関数で作る）"""
+    url = endpoint_url(service_name)
+    for prefix, create in _endpoints.items():
+        if url and url.startswith(prefix):
+            return create(factory, service_name, url, CONFIG)
+    return factory(service_name, endpoint_url=url, config=CONFIG)
+
+
+def get_session():
+    """共有のセッションを返す"""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = boto3.session.Session()
+    return _session
+
+
+def get_client(service_name):
+    """
+    サービスのクライアントを返す（最初の呼び出しで作成する）
+
+    Args:
+        service_name (str): サービス名
+
+    Returns:
+        botocore.client.BaseClient: クライアント
+    """
+    client = _clients.get(service_name)
+    if client is None:
+        session = get_session()
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = _clients[service_name] = _create(session.client, service_name)
+    return client
+
+
+def get_resource(service_name):
+    """
+    サービスのリソースを返す（最初の呼び出しで作成する）
+
+    Args:
+        service_name (str): サービス名（dynamodb など）
+
+    Returns:
+        boto3.resources.base.ServiceResource: リソース
+    """
+    resource = _resources.get(service_name)
+    if resource is None:
+        session = get_session()
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                resource = _resources[service_name] = _create(session.resource, service_name)
+    return resource
+
+
+def get_table(table_name):
+    """
+    DynamoDBのテーブルを返す（最初の呼び出しで作成する）
+
+    Args:
+        table_name (str): テーブル名
+
+    Returns:
+        Table: テーブル
+    """
+    table = _tables.get(table_name)
+    if table is None:
+        table = _tables[table_name] = get_resource("dynamodb").Table(name=table_name)
+    return table
+
+
+class Lazy:
+    """
+    最初に属性が参照されたときに factory を呼び出し、以降はその結果に処理を任せるオブジェクト
+
+    モジュールの先頭で `table = lazy_table(...)` のように書いても、読み込み時にはクライアントを作成しません。
+    """
+
+    def __init__(self, factory, *args):
+        self._factory = factory
+        self._args = args
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = self._factory(*self._args)
+        return self._target
+
+    def __getattr__(self, name):
+        if name in ("_factory", "_args", "_target"):
+            # __init__ より前に参照された場合（コピーなど）に再帰しないようにする
+            raise AttributeError(name)
+        return getattr(self._resolve(), name)
+
+    def __repr__(self):
+        return f"Lazy({self._factory.__name__}{self._args!r})"
+
+
+def lazy_client(service_name):
+    """最初に使われたときに get_client を呼び出すクライアント"""
+    return Lazy(get_client, service_name)
+
+
+def lazy_resource(service_name):
+    """最初に使われたときに get_resource を呼び出すリソース"""
+    return Lazy(get_resource, service_name)
+
+
+def lazy_table(table_name):
+    """最初に使われたときに get_table を呼び出すテーブル"""
+    return Lazy(get_table, table_name)
@@ -0,0 +1,223 @@
+"""
+ハンドラーのレイテンシとAWS呼び出しを CloudWatch Embedded Metric Format（EMF）で記録する共通モジュール
+
+lambda_handler に @record_metrics を付けると、呼び出しごとに次の値を1行のJSONとして出力します。
+CloudWatch Logs がこの行からメトリクスを作るため、APMなしでルートごとのp99や消費キャパシティを確認できます。
+
+- Latency: ハンドラーの処理時間（ミリ秒）
+- ColdStart: コンテナで最初の呼び出しなら1
+- AWSCalls / AWSCallTime: aws_clients のクライアントでのAWS呼び出しの回数と合計時間（ミリ秒）
+- DynamoDBCalls / ConsumedCapacity: DynamoDBの呼び出し回数と消費キャパシティユニットの合計
+- ハンドラーの中で add_metric で加算した独自のメトリクス（キャッシュのヒットなど）
+
+ディメンションは関数名とルート（"GET /todos/{id}" のようなメソッドとリソース）です。
+テーブルごとの消費キャパシティは、メトリクスではないプロパティ（CapacityByTable）として同じ行に含めます。
+消費キャパシティを得るため、DynamoDBのリクエストに ReturnConsumedCapacity=TOTAL を追加します
+（METRICS_CAPTURE_CAPACITY=false で無効）。
+テストでは set_sink でリストなどに出力先を切り替えられます。
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+
+import aws_clients
+from request_log import route_of
+
+NAMESPACE = os.getenv("METRICS_NAMESPACE", "ServerlessApp")
+FUNCTION_NAME = os.getenv("AWS_LAMBDA_FUNCTION_NAME", "local")
+CAPTURE_CAPACITY = os.getenv("METRICS_CAPTURE_CAPACITY", "true").lower() != "false"
+
+# メトリクスの名前と単位（出力する順）
+METRICS = (
+    ("Latency", "Milliseconds"),
+    ("ColdStart", "Count"),
+    ("AWSCalls", "Count"),
+    ("AWSCallTime", "Milliseconds"),
+    ("DynamoDBCalls", "Count"),
+    ("ConsumedCapacity", "Count"),
+)
+
+# 呼び出しごとの集計（並列に実行されるAWS呼び出しからも更新するためロックで守る）
+_lock = threading.Lock()
+_current = None
+_cold_start = True
+
+# フックを登録済みのセッションとクライアントのイベント
+_hooked = weakref.WeakSet()
+
+
+def _print_sink(record):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+sink = _print_sink
+
+
+def set_sink(new_sink):
+    """
+    出力先を切り替える（テストでは records.append などを渡す）
+
+    Args:
+        new_sink (callable | None): EMFのレコード（dict）を受け取る関数（None で標準出力に戻す）
+
+    Returns:
+        callable: 以前の出力先
+    """
+    global sink
+    previous = sink
+    sink = new_sink or _print_sink
+    return previous
+
+
+def add_metric(name, value=1, unit="Count"):
+    """
+    呼び出し中のレコードに独自のメトリクスを加算する（@record_metrics の外では何もしない）
+
+    Args:
+        name (str): メトリクス名
+        value (int | float): 加算する値
+        unit (str): CloudWatch の単位
+    """
+    with _lock:
+        if _current is None:
+            return
+        total, _ = _current["Custom"].get(name, (0, unit))
+        _current["Custom"][name] = (total + value, unit)
+
+
+def _service_name(event_name):
+    # "before-call.dynamodb.Query" -> "dynamodb"
+    return event_name.split(".")[1]
+
+
+def _add_consumed_capacity(params, model, **kwargs):
+    if CAPTURE_CAPACITY and "ReturnConsumedCapacity" in model.input_shape.members:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+
+def _before_call(context, event_name, **kwargs):
+    context["metrics_start"] = time.perf_counter()
+
+
+def _after_call(context, event_name, parsed=None, **kwargs):
+    start = context.get("metrics_start")
+    if start is None or _current is None:
+        return
+    elapsed = time.perf_counter() - start
+    capacity = (parsed or {}).get("ConsumedCapacity") or []
+    if isinstance(capacity, dict):
+        capacity = [capacity]
+    with _lock:
+        if _current is None:
+            return
+        _current["AWSCalls"] += 1
+        _current["AWSCallTime"] += elapsed * 1000
+        if _service_name(event_name) == "dynamodb":
+            _current["DynamoDBCalls"] += 1
+            for entry in capacity:
+                units = entry.get("CapacityUnits") or 0
+                _current["ConsumedCapacity"] += units
+                by_table = _current["CapacityByTable"]
+                by_table[entry.get("TableName")] = by_table.get(entry.get("TableName"), 0) + units
+
+
+def _after_call_error(context, event_name, **kwargs):
+    _after_call(context, event_name)
+
+
+def _register(events):
+    events.register("provide-client-params.dynamodb", _add_consumed_capacity)
+    events.register("before-call", _before_call)
+    events.register("after-call", _after_call)
+    events.register("after-call-error", _after_call_error)
+
+
+def install_hooks():
+    """
+    aws_clients のセッションと作成済みのクライアントに、呼び出しを計測するフックを登録する
+
+    クライアントは作成時にセッションのフックをコピーするため、作成済みのクライアントにも個別に登録します。
+    """
+    targets = [aws_clients.get_session().events]
+    targets.extend(client.meta.events for client in list(aws_clients._clients.values()))
+    targets.extend(resource.meta.client.meta.events for resource in list(aws_clients._resources.values()))
+    for events in targets:
+        if events not in _hooked:
+            _hooked.add(events)
+            _register(events)
+
+
+def build_record(values, dimensions, properties, definitions=METRICS):
+    """
+    EMFのレコードを作る
+
+    Args:
+        values (dict): メトリクス名と値
+        dimensions (dict): ディメンション名と値
+        properties (dict): メトリクスではない追加の値（ログの検索用）
+        definitions (tuple): 出力するメトリクスの (名前, 単位)
+
+    Returns:
+        dict: 1行で出力するEMFのレコード
+    """
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": NAMESPACE,
+                "Dimensions": [list(dimensions)],
+                "Metrics": [{"Name": name, "Unit": unit} for name, unit in definitions],
+            }],
+        },
+        **dimensions,
+        **{name: values[name] for name, _ in definitions},
+        **properties,
+    }
+
+
+def record_metrics(handler):
+    """
+    lambda_handler のレイテンシとAWS呼び出しを記録するデコレーター
+
+    例外が発生した場合も記録してから送出します。
+    """
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        global _current, _cold_start
+        install_hooks()
+        with _lock:
+            cold_start, _cold_start = _cold_start, False
+            _current = {"AWSCalls": 0, "AWSCallTime": 0.0, "DynamoDBCalls": 0, "ConsumedCapacity": 0,
+                        "CapacityByTable": {}, "Custom": {}}
+        status_code = None
+        start = time.perf_counter()
+        try:
+            result = handler(event, context)
+            if isinstance(result, dict):
+                status_code = result.get("statusCode")
+            return result
+        except Exception:
+            status_code = "error"
+            raise
+        finally:
+            latency = (time.perf_counter() - start) * 1000
+            with _lock:
+                values, _current = _current, None
+            values.update(Latency=round(latency, 3), ColdStart=int(cold_start),
+                          AWSCallTime=round(values["AWSCallTime"], 3))
+            custom = values["Custom"]
+            values.update({name: total for name, (total, _) in custom.items()})
+            definitions = METRICS + tuple((name, unit) for name, (_, unit) in custom.items())
+            properties = {"StatusCode": status_code, "CapacityByTable": values["CapacityByTable"]}
+            request_id = getattr(context, "aws_request_id", None)
+            if request_id:
+                properties["RequestId"] = request_id
+            sink(build_record(values, {"Function": FUNCTION_NAME, "Route": route_of(event)}, properties, definitions))
+
+    return wrapper
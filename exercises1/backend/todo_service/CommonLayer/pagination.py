@@ -0,0 +1,115 @@
+"""
+ページネーション用の共通モジュール
+
+DynamoDBの LastEvaluatedKey を、署名付きの短いbase64url文字列（nextToken）に変換します。
+署名によりクライアントが任意の ExclusiveStartKey を指定できないようにし、
+scope を署名に含めることで、別の検索条件で発行されたトークンの再利用も防ぎます。
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+from decimal import Decimal
+
+# 一覧取得の件数の既定値と上限
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# 署名の長さ（バイト）。トークンを短く保つためHMAC-SHA256を切り詰めて使う
+SIGNATURE_LENGTH = 12
+
+_secret = os.getenv("PAGINATION_TOKEN_SECRET", "").encode()
+
+
+class InvalidCursorError(ValueError):
+    """nextToken が不正な場合の例外"""
+
+
+class MissingSecretError(RuntimeError):
+    """署名の鍵（PAGINATION_TOKEN_SECRET）が設定されていない場合の例外"""
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _sign(scope, payload):
+    # 空の鍵で署名すると誰でもトークンを偽造できるため、鍵がなければトークンを発行も受理もしない
+    if not _secret:
+        raise MissingSecretError("PAGINATION_TOKEN_SECRET が設定されていません")
+    return hmac.new(_secret, scope.encode() + b"\0" + payload, hashlib.sha256).digest()[:SIGNATURE_LENGTH]
+
+
+def encode_cursor(last_evaluated_key, scope=""):
+    """
+    LastEvaluatedKey を nextToken に変換する
+
+    Args:
+        last_evaluated_key (dict | None): DynamoDBが返した LastEvaluatedKey
+        scope (str): 検索条件を表す文字列（同じ条件でのみトークンを受け付ける）
+
+    Returns:
+        str | None: nextToken（続きがない場合は None）
+
+    Raises:
+        MissingSecretError: 署名の鍵が設定されていない場合
+    """
+    if not last_evaluated_key:
+        return None
+    payload = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True, default=_json_default).encode()
+    return base64.urlsafe_b64encode(_sign(scope, payload) + payload).rstrip(b"=").decode()
+
+
+def decode_cursor(token, scope=""):
+    """
+    nextToken を ExclusiveStartKey に戻す
+
+    Args:
+        token (str): クライアントから受け取った nextToken
+        scope (str): 検索条件を表す文字列（エンコード時と同じ値）
+
+    Returns:
+        dict: ExclusiveStartKey
+
+    Raises:
+        InvalidCursorError: トークンの形式または署名が不正な場合
+        MissingSecretError: 署名の鍵が設定されていない場合
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("nextToken の形式が不正です") from e
+
+    signature, payload = raw[:SIGNATURE_LENGTH], raw[SIGNATURE_LENGTH:]
+    if not payload or not hmac.compare_digest(signature, _sign(scope, payload)):
+        raise InvalidCursorError("nextToken の署名が不正です")
+
+    try:
+        key = json.loads(payload, parse_float=Decimal)
+    except ValueError as e:
+        raise InvalidCursorError("nextToken の形式が不正です") from e
+    if not isinstance(key, dict):
+        raise InvalidCursorError("nextToken の形式が不正です")
+    return key
+
+
+def parse_limit(value, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """
+    クエリパラメータ limit を検証して整数に変換する
+
+    Raises:
+        ValueError: 1以上 maximum 以下の整数でない場合
+    """
+    if value is None or value == "":
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"limit は1から{maximum}までの整数で指定してください") from e
+    if not 1 <= limit <= maximum:
+        raise ValueError(f"limit は1から{maximum}までの整数で指定してください")
+    return limit
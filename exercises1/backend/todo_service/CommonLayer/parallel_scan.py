@@ -0,0 +1,197 @@
+"""
+並列セグメントスキャン用の共通モジュール
+
+DynamoDBの Segment / TotalSegments を使ってテーブルを複数スレッドで同時にスキャンし、
+取得したアイテムを到着順に返します。
+
+- ページはサイズ上限付きのキューを経由して渡すため、呼び出し側が遅くてもメモリ使用量は一定です
+- 読み込みキャパシティ（RCU/秒）の予算を指定すると、消費量がその範囲に収まるよう待機します
+- スロットリングを受けた場合はジッター付きで待機して再試行し、全体の読み込み速度も下げます
+"""
+
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# スロットリングとして扱うエラーコード
+THROTTLING_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+_DONE = object()
+
+
+def is_throttling_error(e):
+    """botocore の ClientError がスロットリングによるものかどうか"""
+    code = getattr(e, "response", {}).get("Error", {}).get("Code")
+    return code in THROTTLING_ERROR_CODES
+
+
+class CapacityLimiter:
+    """
+    読み込みキャパシティの予算（RCU/秒）を守るためのトークンバケット
+
+    呼び出し前に残量が正になるまで待ち、呼び出し後に実際の消費量を差し引きます。
+    スロットリングを受けると速度を半分にし、成功が続くと予算まで少しずつ戻します。
+    """
+
+    def __init__(self, max_rate, min_rate=1.0):
+        self.max_rate = float(max_rate)
+        self.min_rate = min(float(min_rate), self.max_rate)
+        self.rate = self.max_rate
+        self.tokens = self.max_rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait(self, stop_event=None):
+        while True:
+            with self.lock:
+                self._refill(time.monotonic())
+                if self.tokens > 0:
+                    return
+                delay = -self.tokens / self.rate
+            if stop_event is not None and stop_event.wait(delay):
+                return
+            if stop_event is None:
+                time.sleep(delay)
+
+    def consume(self, units):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= units
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def throttled(self):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+
+
+class ParallelScanner:
+    """
+    テーブルを並列にスキャンしてアイテムを順次返す
+
+    使用例:
+        scanner = ParallelScanner(table.scan, total_segments=8, max_read_capacity=500)
+        for item in scanner.scan():
+            ...
+        print(scanner.stats)
+
+    Args:
+        scan (callable): boto3 の Table.scan または client.scan
+        total_segments (int): セグメント数（ワーカースレッド数）
+        scan_kwargs (dict): scan に追加で渡す引数（ProjectionExpression など）
+        page_size (int): 1回の scan で読み取る最大件数（Limit）
+        max_read_capacity (float): 読み込みキャパシティの予算（RCU/秒、None で無制限）
+        max_buffered_pages (int): キューに保持する最大ページ数
+        max_retries (int): スロットリング時の最大再試行回数
+        base_delay (float): 再試行の待機時間の基準（秒）
+        max_delay (float): 再試行の待機時間の上限（秒）
+    """
+
+    def __init__(self, scan, total_segments=4, scan_kwargs=None, page_size=None, max_read_capacity=None,
+                 max_buffered_pages=None, max_retries=10, base_delay=0.05, max_delay=5.0):
+        if total_segments < 1:
+            raise ValueError("total_segments は1以上で指定してください")
+        self.scan_func = scan
+        self.total_segments = total_segments
+        self.scan_kwargs = dict(scan_kwargs or {})
+        self.page_size = page_size
+        self.limiter = CapacityLimiter(max_read_capacity) if max_read_capacity else None
+        self.max_buffered_pages = max_buffered_pages or total_segments * 2
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = {}
+        self.stats_lock = threading.Lock()
+
+    def _add_stats(self, **values):
+        with self.stats_lock:
+            for name, value in values.items():
+                self.stats[name] = self.stats.get(name, 0) + value
+
+    def _scan_page(self, kwargs, stop_event):
+        """1ページ分をスキャンする（スロットリング時は待機して再試行）"""
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                self.limiter.wait(stop_event)
+            try:
+                return self.scan_func(**kwargs)
+            except Exception as e:
+                if not is_throttling_error(e) or attempt == self.max_retries:
+                    raise
+                self._add_stats(throttles=1)
+                if self.limiter is not None:
+                    self.limiter.throttled()
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                if stop_event.wait(delay):
+                    return None
+
+    def _put(self, pages, value, stop_event):
+        while not stop_event.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _scan_segment(self, segment, pages, stop_event):
+        kwargs = dict(self.scan_kwargs, Segment=segment, TotalSegments=self.total_segments,
+                      ReturnConsumedCapacity="TOTAL")
+        if self.page_size:
+            kwargs["Limit"] = self.page_size
+        try:
+            while not stop_event.is_set():
+                response = self._scan_page(kwargs, stop_event)
+                if response is None:
+                    break
+                consumed = response.get("ConsumedCapacity", {}).get("CapacityUnits", 0)
+                if self.limiter is not None:
+                    self.limiter.consume(consumed)
+                items = response.get("Items", [])
+                self._add_stats(pages=1, items=len(items), consumed_capacity=consumed)
+                if items and not self._put(pages, items, stop_event):
+                    break
+                last_evaluated_key = response.get("LastEvaluatedKey")
+                if not last_evaluated_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_evaluated_key
+        except Exception as e:
+            self._put(pages, e, stop_event)
+        finally:
+            self._put(pages, _DONE, stop_event)
+
+    def scan(self):
+        """
+        全セグメントのアイテムを到着順に返すジェネレーター
+
+        途中でループを抜けた場合は、残りのワーカーも停止します。
+        """
+        self.stats = {"pages": 0, "items": 0, "consumed_capacity": 0, "throttles": 0}
+        pages = queue.Queue(maxsize=self.max_buffered_pages)
+        stop_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.total_segments, thread_name_prefix="parallel-scan")
+        try:
+            for segment in range(self.total_segments):
+                executor.submit(self._scan_segment, segment, pages, stop_event)
+            remaining = self.total_segments
+            while remaining:
+                value = pages.get()
+                if value is _DONE:
+                    remaining -= 1
+                elif isinstance(value, Exception):
+                    raise value
+                else:
+                    yield from value
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=True)
@@ -0,0 +1,150 @@
+"""
+受信したイベントのログ出力を間引く共通モジュール
+
+すべての呼び出しでイベント全体をログに出力すると、JSONへの変換とCloudWatch Logsの取り込みの費用が
+リクエスト数に比例して増えます。lambda_handler に @log_requests(logger) を付けると、次の方針で出力します。
+
+- 通常のリクエスト: ルートごとのサンプリング率で選ばれたものだけを、上限のバイト数で切り詰めて出力する
+- エラー（例外・ステータスコード500以上）と遅いリクエスト: サンプリングに関係なく、切り詰めずに出力する
+- どちらの場合も Authorization ヘッダーやトークン・パスワードなどの値は伏せる
+
+イベントをJSONに変換するのは出力するときだけです。設定は次の環境変数で変更できます。
+
+- REQUEST_LOG_SAMPLE_RATE: 既定のサンプリング率（0〜1）
+- REQUEST_LOG_SAMPLE_RATES: ルートごとのサンプリング率（JSON、例: {"GET /todos": 0.01, "POST /todos": 0.2}）
+- REQUEST_LOG_MAX_BYTES: 通常のリクエストで出力するイベントの上限（バイト）
+- REQUEST_LOG_SLOW_MS: 遅いリクエストとみなす処理時間（ミリ秒）
+
+標準ライブラリ以外に依存しないため、このファイルだけをレイヤーに置いても使えます。
+"""
+
+import functools
+import json
+import os
+import random
+import time
+
+SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", "0.05"))
+SAMPLE_RATES = json.loads(os.getenv("REQUEST_LOG_SAMPLE_RATES") or "{}")
+MAX_BYTES = int(os.getenv("REQUEST_LOG_MAX_BYTES", "2048"))
+SLOW_MS = float(os.getenv("REQUEST_LOG_SLOW_MS", "1000"))
+
+# 値を伏せるキー（小文字で比較する）
+REDACTED_KEYS = frozenset({
+    "authorization", "authorizationtoken", "cookie", "cookies", "set-cookie", "x-api-key",
+    "password", "token", "idtoken", "accesstoken", "refreshtoken", "secret",
+})
+REDACTED = "***"
+
+
+class PrintLogger:
+    """print で出力するロガー（powertools の Logger を使っていない関数用）"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _print(self, level, message, *args):
+        print(f"[{self.name}] {level}: " + (message % args if args else message))
+
+    def info(self, message, *args):
+        self._print("INFO", message, *args)
+
+    def warning(self, message, *args):
+        self._print("WARNING", message, *args)
+
+    def error(self, message, *args):
+        self._print("ERROR", message, *args)
+
+
+def route_of(event):
+    """
+    API Gateway のイベントからルート（"GET /todos/{id}" の形）を返す
+
+    API Gateway 以外のイベント（DynamoDB Streams など）では "-" を返します。
+    """
+    if not isinstance(event, dict):
+        return "-"
+    method = event.get("httpMethod") or ((event.get("requestContext") or {}).get("http") or {}).get("method")
+    resource = event.get("resource") or event.get("routeKey")
+    if not method or not resource:
+        return "-"
+    return resource if resource.startswith(method + " ") else f"{method} {resource}"
+
+
+def sample_rate(route):
+    """ルートのサンプリング率を返す（指定がなければ既定の率）"""
+    return SAMPLE_RATES.get(route, SAMPLE_RATE)
+
+
+def redact(value):
+    """
+    辞書とリストをたどり、伏せるキーの値を *** に置き換えたコピーを返す
+
+    API Gateway のイベントの body のようにJSON文字列で入っている値も、辞書として読めればたどります。
+    """
+    if isinstance(value, dict):
+        return {key: REDACTED if isinstance(key, str) and key.lower() in REDACTED_KEYS else redact(item)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    if isinstance(value, str) and value[:1] in ("{", "["):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return value
+        return json.dumps(redact(parsed), ensure_ascii=False)
+    return value
+
+
+def format_event(event, max_bytes=None):
+    """
+    イベントを伏せ字にしてJSON文字列にする
+
+    Args:
+        event: イベント
+        max_bytes (int | None): 上限のバイト数（None の場合は切り詰めない）
+
+    Returns:
+        str: JSON文字列（切り詰めた場合は末尾に省略したバイト数を付ける）
+    """
+    text = json.dumps(redact(event), ensure_ascii=False, default=str)
+    if max_bytes is None:
+        return text
+    encoded = text.encode()
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode(errors="ignore") + f"...（{len(encoded) - max_bytes}バイト省略）"
+
+
+def log_requests(logger):
+    """
+    イベントのログ出力を間引くデコレーター
+
+    Args:
+        logger: info / warning / error を持つロガー（powertools の Logger、PrintLogger など）
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            route = route_of(event)
+            # 出力するかどうかは処理の前に決める（エラーと遅いリクエストは後で必ず出力する）
+            sampled = random.random() < sample_rate(route)
+            start = time.perf_counter()
+            try:
+                result = handler(event, context)
+            except Exception:
+                logger.error("エラーになったリクエストのイベント（%s）: %s", route, format_event(event))
+                raise
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            status_code = result.get("statusCode") if isinstance(result, dict) else None
+            if isinstance(status_code, int) and status_code >= 500:
+                logger.error("エラーになったリクエストのイベント（%s, %d）: %s", route, status_code, format_event(event))
+            elif elapsed_ms >= SLOW_MS:
+                logger.warning("遅いリクエストのイベント（%s, %.0fミリ秒）: %s", route, elapsed_ms, format_event(event))
+            elif sampled:
+                logger.info("イベントを受信しました（%s）: %s", route, format_event(event, MAX_BYTES))
+            return result
+
+        return wrapper
+
+    return decorator
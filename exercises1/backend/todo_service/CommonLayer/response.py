@@ -0,0 +1,112 @@
+"""
+APIレスポンス生成用の共通モジュール
+
+DynamoDBから読み取ったアイテムをそのままJSONにできるよう、Decimal・set・バイナリを変換します。
+orjson がインストールされていればそれを使い、なければ標準ライブラリの json を使います。
+どちらの場合も非ASCII文字はエスケープせず、UTF-8のまま出力します（ensure_ascii=False に統一）。
+"""
+
+import base64
+import json
+import os
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:  # orjson がない環境では標準ライブラリを使う
+    orjson = None
+
+# 非ASCII文字をエスケープするかどうか（orjson はエスケープしないため False に揃える）
+ENSURE_ASCII = False
+
+ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*")
+
+
+def json_default(value):
+    """
+    標準のJSONにない型を変換する（json.dumps / orjson.dumps の default）
+
+    - Decimal: 整数なら int、それ以外は float
+    - set / frozenset: list（DynamoDBの文字列セット・数値セット）
+    - bytes / Binary: base64文字列
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (bytes, bytearray)):
+        return base64.b64encode(value).decode()
+    # boto3.dynamodb.types.Binary（boto3 を読み込まずに判定する）
+    if type(value).__name__ == "Binary" and isinstance(getattr(value, "value", None), bytes):
+        return base64.b64encode(value.value).decode()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(body):
+    return json.dumps(body, default=json_default, ensure_ascii=ENSURE_ASCII)
+
+
+def dumps(body):
+    """
+    レスポンスボディをJSON文字列に変換する
+
+    Args:
+        body: 変換する値
+
+    Returns:
+        str: JSON文字列
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(body, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # 64ビットを超える整数など orjson が扱えない値は標準ライブラリで変換する
+            pass
+    return _stdlib_dumps(body)
+
+
+def build_headers(allow_methods=None, allow_headers=None):
+    """
+    レスポンスヘッダーを作る（モジュールの読み込み時に一度だけ呼び出す）
+
+    Args:
+        allow_methods (str | None): Access-Control-Allow-Methods の値
+        allow_headers (str | None): Access-Control-Allow-Headers の値
+
+    Returns:
+        dict: レスポンスヘッダー
+    """
+    headers = {
+        "Content-Type": "application/json; charset=utf-8",
+        "Access-Control-Allow-Origin": ALLOWED_ORIGINS,
+    }
+    if allow_headers:
+        headers["Access-Control-Allow-Headers"] = allow_headers
+    if allow_methods:
+        headers["Access-Control-Allow-Methods"] = allow_methods
+    return headers
+
+
+DEFAULT_HEADERS = build_headers()
+
+
+def generate_response(status_code, body=None, headers=DEFAULT_HEADERS):
+    """
+    API Gateway形式のレスポンスを生成する
+
+    Args:
+        status_code (int): HTTPステータスコード
+        body: レスポンスボディ（None の場合はボディなし）
+        headers (dict): build_headers で作ったレスポンスヘッダー（レスポンスごとにコピーする）
+
+    Returns:
+        dict: API Gateway形式のレスポンス
+    """
+    # 呼び出し側や API Gateway のミドルウェアがヘッダーを書き換えても共有の dict に残らないようにコピーする
+    response = {
+        "statusCode": status_code,
+        "headers": dict(headers),
+    }
+    if body is not None:
+        response["body"] = dumps(body)
+    return response
@@ -0,0 +1,32 @@
+"""
+DynamoDBのアイテムをレスポンスの形に変換する関数
+
+このファイルは tools/generate_formatters.py で生成されます。直接編集しないでください。
+フィールドを変更する場合は tools/models.py を編集して再生成してください。
+"""
+
+# source-hash: ad35580a52200eb5e37ce0435d8284a250e1e8a159a267544ac1574f22c25a96
+
+
+def format_todo(item):
+    return {
+        "id": item["id"],
+        "title": item["title"],
+        "description": item.get("description", ""),
+        "due_date": item.get("due_date"),
+        "is_completed": item.get("is_completed", False),
+        "priority": item.get("priority", "medium"),
+        "tags": item.get("tags", []),
+    }
+
+
+def format_todo_list(items):
+    return [{
+        "id": item["id"],
+        "title": item["title"],
+        "description": item.get("description", ""),
+        "due_date": item.get("due_date"),
+        "is_completed": item.get("is_completed", False),
+        "priority": item.get("priority", "medium"),
+        "tags": item.get("tags", []),
+    } for item in items]
@@ -0,0 +1,241 @@
+"""
+TODOの絞り込み検索用の共通モジュール
+
+完了状態・優先度・タグでの絞り込みを、テーブル全体のスキャンではなくインデックスへの
+クエリで行うための属性の計算とクエリ処理をまとめています。
+
+- StatusPriorityIndex（GSI）: パーティションキー status_priority（例: "open#high"）、ソートキー due_sort
+  未完了のTODOは "open#..." のパーティションだけに入るため、未完了の一覧は未完了のアイテムしか読みません
+- DueDateIndex（GSI）: パーティションキー due_bucket（例: "due#3"）、ソートキー due_date
+  期限のあるTODOだけが入り、書き込みはIDのハッシュで DUE_BUCKETS 個のパーティションに分散します
+- タグテーブル（転置インデックス）: パーティションキー tag、ソートキー sort_key（due_sort#id）
+  TODOテーブルのストリームから SyncTodoTags 関数が更新します
+"""
+
+import heapq
+import zlib
+
+from boto3.dynamodb.conditions import Attr, Key
+
+STATUS_PRIORITY_INDEX = "StatusPriorityIndex"
+DUE_DATE_INDEX = "DueDateIndex"
+
+# DueDateIndex のパーティション数（変更した場合は backfill_todo_indexes で既存のTODOを更新する）
+DUE_BUCKETS = 8
+
+STATUS_OPEN = "open"
+STATUS_COMPLETED = "completed"
+STATUSES = (STATUS_OPEN, STATUS_COMPLETED)
+PRIORITIES = ("low", "medium", "high")
+DEFAULT_PRIORITY = "medium"
+
+# 期限のないTODOは期限付きのTODOの後ろに並べる
+NO_DUE_DATE = "9999-12-31"
+
+# 期限での範囲指定の下限と上限（期限のないTODOは含めない）
+MIN_DUE_DATE = "0000-01-01"
+MAX_DUE_DATE = "9999-12-30"
+
+# タグテーブルに複製するTODOの属性
+TAG_ROW_ATTRIBUTES = ("id", "title", "description", "due_date", "is_completed", "priority", "tags")
+
+
+def index_attributes(item):
+    """
+    TODOアイテムからインデックス用の属性を計算する
+
+    Args:
+        item (dict): TODOアイテム（is_completed, priority, due_date を参照する）
+
+    Returns:
+        dict: status_priority と due_sort（期限がある場合は due_bucket も含む）
+    """
+    status = STATUS_COMPLETED if item.get("is_completed") else STATUS_OPEN
+    attributes = {
+        "status_priority": f"{status}#{item.get('priority') or DEFAULT_PRIORITY}",
+        "due_sort": item.get("due_date") or NO_DUE_DATE,
+    }
+    if item.get("due_date"):
+        attributes["due_bucket"] = due_bucket(item["id"])
+    return attributes
+
+
+def sync_index_attributes(table, item):
+    """
+    更新後のアイテムに合わせてインデックス用の属性を書き込む
+
+    status_priority, due_sort, due_bucket は完了状態・優先度・期限から計算するため、
+    部分更新の結果（ALL_NEW）を見てから、古くなっている場合だけ書き込みます。
+
+    Args:
+        table: boto3 の Table
+        item (dict): 更新後のTODOアイテム
+
+    Returns:
+        bool: 同時に別の更新が行われたため書き込まなかった場合は False
+    """
+    attributes = index_attributes(item)
+    if all(item.get(name) == value for name, value in attributes.items()):
+        return True
+    return update_index_attributes(table, item, attributes)
+
+
+def update_index_attributes(table, item, attributes):
+    """
+    計算に使った属性（is_completed, priority, due_date）が変わっていない場合だけインデックス属性を書き込む
+
+    同時に別の更新が行われた場合は、その更新側で書き込まれるため何もしません。
+
+    Args:
+        table: boto3 の Table
+        item (dict): 計算に使ったTODOアイテム
+        attributes (dict): index_attributes の結果
+
+    Returns:
+        bool: 書き込んだ場合は True
+    """
+    condition = Attr("is_completed").eq(item["is_completed"]) if "is_completed" in item \
+        else Attr("is_completed").not_exists()
+    for name in ("priority", "due_date"):
+        condition = condition & (Attr(name).eq(item[name]) if item.get(name) is not None else Attr(name).not_exists())
+    try:
+        table.update_item(
+            Key={"id": item["id"]},
+            UpdateExpression="SET " + ", ".join(f"{name} = :{name}" for name in attributes),
+            ExpressionAttributeValues={f":{name}": value for name, value in attributes.items()},
+            ConditionExpression=condition,
+        )
+        return True
+    except table.meta.client.exceptions.ConditionalCheckFailedException:
+        return False
+
+
+def due_bucket(todo_id):
+    """
+    TODOのIDから DueDateIndex のパーティションキーを決める
+
+    Pythonの hash() はプロセスごとに値が変わるため、CRC32を使います。
+    """
+    return f"due#{zlib.crc32(todo_id.encode()) % DUE_BUCKETS}"
+
+
+def due_bucket_partitions():
+    """DueDateIndex のすべてのパーティションキーを返す"""
+    return [f"due#{n}" for n in range(DUE_BUCKETS)]
+
+
+def due_range(due_after=None, due_before=None):
+    """
+    期限の範囲指定をソートキーの範囲に変換する（両端を含む）
+
+    Args:
+        due_after (str | None): この日以降（YYYY-MM-DD）
+        due_before (str | None): この日以前（YYYY-MM-DD）
+
+    Returns:
+        tuple[str, str]: 下限と上限
+    """
+    return due_after or MIN_DUE_DATE, min(due_before or MAX_DUE_DATE, MAX_DUE_DATE)
+
+
+def status_priority_partitions(is_completed=None, priority=None):
+    """
+    絞り込み条件に該当する StatusPriorityIndex のパーティションキーを返す
+
+    Args:
+        is_completed (bool | None): 完了状態（None の場合は絞り込まない）
+        priority (str | None): 優先度（None の場合は絞り込まない）
+
+    Returns:
+        list[str]: パーティションキーの一覧
+    """
+    statuses = STATUSES if is_completed is None else (STATUS_COMPLETED if is_completed else STATUS_OPEN,)
+    priorities = PRIORITIES if priority is None else (priority,)
+    return [f"{status}#{p}" for status in statuses for p in priorities]
+
+
+def tag_rows(item):
+    """
+    TODOアイテムからタグテーブルに書き込むアイテムを作る
+
+    Args:
+        item (dict): TODOアイテム
+
+    Returns:
+        dict: sort_key と tag の組をキーにしたタグテーブルのアイテム
+    """
+    sort_key = f"{index_attributes(item)['due_sort']}#{item['id']}"
+    rows = {}
+    for tag in set(item.get("tags") or []):
+        row = {name: item[name] for name in TAG_ROW_ATTRIBUTES if name in item}
+        row.update({"tag": tag, "sort_key": sort_key})
+        rows[(tag, sort_key)] = row
+    return rows
+
+
+def query_partitions(query, key_name, partitions, sort_key, key_attributes, limit, cursor=None, sort_condition=None,
+                     **query_kwargs):
+    """
+    複数のパーティションをクエリし、ソートキーの順にマージして limit 件を返す
+
+    各パーティションから最大 limit 件ずつ読み取るため、読み取り量は
+    テーブルの大きさではなく limit とパーティション数に比例します。
+
+    Args:
+        query (callable): boto3 の Table.query
+        key_name (str): パーティションキーの属性名
+        partitions (list[str]): クエリするパーティションキーの値
+        sort_key (str): ソートキーの属性名
+        key_attributes (tuple[str]): ExclusiveStartKey に含める属性名
+        limit (int): 返す最大件数
+        cursor (dict | None): 前回の呼び出しで返されたカーソル
+        sort_condition (Condition | None): ソートキーの条件（例: Key("due_date").between(...)）
+        **query_kwargs: query に追加で渡す引数（IndexName など）
+
+    Returns:
+        tuple[list[dict], dict | None]: アイテムの一覧と次のページのカーソル（続きがない場合は None）
+    """
+    # カーソルは パーティション -> ExclusiveStartKey（None は先頭から）。含まれないパーティションは読み終えている
+    if cursor is None:
+        cursor = {partition: None for partition in partitions}
+
+    fetched = {}
+    last_keys = {}
+    for partition in partitions:
+        if partition not in cursor:
+            continue
+        key_condition = Key(key_name).eq(partition)
+        if sort_condition is not None:
+            key_condition = key_condition & sort_condition
+        kwargs = dict(query_kwargs, KeyConditionExpression=key_condition, Limit=limit)
+        if cursor[partition]:
+            kwargs["ExclusiveStartKey"] = cursor[partition]
+        response = query(**kwargs)
+        fetched[partition] = response.get("Items", [])
+        last_keys[partition] = response.get("LastEvaluatedKey")
+
+    # 各パーティションの結果はソートキー順に並んでいるため、マージして先頭から limit 件を取る
+    merged = heapq.merge(
+        *([(item[sort_key], partition, index) for index, item in enumerate(items)]
+          for partition, items in fetched.items())
+    )
+    consumed = {partition: 0 for partition in fetched}
+    items = []
+    for _, partition, index in merged:
+        if len(items) == limit:
+            break
+        items.append(fetched[partition][index])
+        consumed[partition] = index + 1
+
+    next_cursor = {}
+    for partition, partition_items in fetched.items():
+        if consumed[partition] == len(partition_items):
+            # 読み取った分をすべて返した場合は、DynamoDBが返した続きの位置から再開する
+            if last_keys[partition]:
+                next_cursor[partition] = last_keys[partition]
+        elif consumed[partition] == 0:
+            next_cursor[partition] = cursor[partition]
+        else:
+            last_item = partition_items[consumed[partition] - 1]
+            next_cursor[partition] = {name: last_item[name] for name in key_attributes}
+    return items, next_cursor or None
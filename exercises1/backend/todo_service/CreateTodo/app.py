@@ -8,41 +8,24 @@ TODOアイテム作成用のLambda関数
 import json
 import os
 import uuid
-import boto3
 from mypy_boto3_dynamodb import DynamoDBServiceResource
 from aws_lambda_powertools.utilities.validation import validate
 from aws_lambda_powertools.utilities.validation.exceptions import SchemaValidationError
 from schema import schema
 from aws_lambda_powertools import Logger
+from aws_clients import lazy_resource, lazy_table
+from response import generate_response
+from todo_format import format_todo
+from todo_index import index_attributes
+from metrics import record_metrics
+from request_log import log_requests
 
 # ロガーの初期化
 logger = Logger()
 
-# DynamoDBのエンドポイントURL（ローカル開発用）
-ENDPOINT_URL = os.getenv('ENDPOINT_URL') or None
-
-# DynamoDBリソースとテーブルの初期化
-dynamoDB: DynamoDBServiceResource = boto3.resource("dynamodb", endpoint_url=ENDPOINT_URL)
-table = dynamoDB.Table(name=os.getenv("TODO_TABLE_NAME"))
-
-def generate_response(status_code, body):
-    """
-    APIレスポンスを生成する関数
-    
-    Args:
-        status_code (int): HTTPステータスコード
-        body (dict): レスポンスボディ
-        
-    Returns:
-        dict: API Gateway形式のレスポンス
-    """
-    return {
-        "statusCode": status_code,
-        "body": json.dumps(body),
-        "headers": {
-            'Access-Control-Allow-Origin': '*',  # CORS対応
-        },
-    }
+# DynamoDBリソースとテーブル（最初に使われたときに作成し、以降の呼び出しで再利用する）
+dynamoDB: DynamoDBServiceResource = lazy_resource("dynamodb")
+table = lazy_table(os.getenv("TODO_TABLE_NAME"))
 
 def handle_exception(e):
     """
@@ -57,7 +40,9 @@ def handle_exception(e):
     logger.error("エラーが発生しました: %s", e)
     return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
 
+@record_metrics
 @logger.inject_lambda_context
+@log_requests(logger)
 def lambda_handler(event, context):
     """
     Lambda関数のエントリーポイント
@@ -69,8 +54,6 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway形式のレスポンス
     """
-    logger.info("イベントを受信しました: %s", event)
-    
     # リクエストボディの取得とJSONパース
     body = json.loads(event.get('body', '{}'))
     
@@ -98,11 +81,15 @@ def lambda_handler(event, context):
             "id": todo_id,
             "title": title,
             "description": description,
-            "due_date": due_date,
             "is_completed": is_completed,
             "priority": priority,
             "tags": tags,
         }
+        # 期限がなければ due_date を書かない（DueDateIndex のキーに NULL は入れられない）
+        if due_date:
+            todo_item["due_date"] = due_date
+        # 絞り込み検索用のインデックス属性（status_priority, due_sort）を付与
+        todo_item.update(index_attributes(todo_item))
         
         table.put_item(Item=todo_item)
         logger.info("アイテムが作成されました。ID: %s", todo_id)
@@ -112,13 +99,7 @@ def lambda_handler(event, context):
     # 成功レスポンスを返す
     response_body = {
         "message": "アイテムが作成されました",
-        "id": todo_id,
-        "title": title,
-        "description": description,
-        "due_date": due_date,
-        "is_completed": is_completed,
-        "priority": priority,
-        "tags": tags,
+        **format_todo(todo_item),
     }
     
     return generate_response(201, response_body)
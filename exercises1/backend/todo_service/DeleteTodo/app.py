@@ -5,45 +5,20 @@ TODOアイテム削除用のLambda関数
 パスパラメータからIDを取得し、DynamoDBからアイテムを削除します。
 """
 
-import json
 import os
-import boto3
 from mypy_boto3_dynamodb import DynamoDBServiceResource
 from aws_lambda_powertools import Logger
+from aws_clients import lazy_resource, lazy_table
+from response import generate_response
+from metrics import record_metrics
+from request_log import log_requests
 
 # ロガーの初期化
 logger = Logger()
 
-# DynamoDBのエンドポイントURL（ローカル開発用）
-ENDPOINT_URL = os.getenv("ENDPOINT_URL") or None
-
-# DynamoDBリソースとテーブルの初期化
-dynamoDB: DynamoDBServiceResource = boto3.resource(
-    "dynamodb", endpoint_url=ENDPOINT_URL
-)
-table = dynamoDB.Table(name=os.getenv("TODO_TABLE_NAME"))
-
-
-def generate_response(status_code, body=None):
-    """
-    APIレスポンスを生成する関数
-    
-    Args:
-        status_code (int): HTTPステータスコード
-        body (dict, optional): レスポンスボディ（省略可能）
-        
-    Returns:
-        dict: API Gateway形式のレスポンス
-    """
-    response = {
-        "statusCode": status_code,
-        "headers": {
-            "Access-Control-Allow-Origin": "*",  # CORS対応
-        },
-    }
-    if body is not None:
-        response["body"] = json.dumps(body)
-    return response
+# DynamoDBリソースとテーブル（最初に使われたときに作成し、以降の呼び出しで再利用する）
+dynamoDB: DynamoDBServiceResource = lazy_resource("dynamodb")
+table = lazy_table(os.getenv("TODO_TABLE_NAME"))
 
 
 def handle_exception(e):
@@ -60,7 +35,9 @@ def handle_exception(e):
     return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
 
 
+@record_metrics
 @logger.inject_lambda_context
+@log_requests(logger)
 def lambda_handler(event, context):
     """
     Lambda関数のエントリーポイント
@@ -72,8 +49,6 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway形式のレスポンス
     """
-    logger.info("イベントを受信しました: %s", event)
-    
     # パスパラメータからTODO IDを取得
     item_id = event["pathParameters"]["id"]
 
@@ -5,40 +5,19 @@ TODOアイテム取得用のLambda関数
 パスパラメータからIDを取得し、DynamoDBからアイテムを検索します。
 """
 
-import json
 import os
-import boto3
-from mypy_boto3_dynamodb import DynamoDBServiceResource
 from aws_lambda_powertools import Logger
+from dynamodb_client import ClientTable
+from response import generate_response
+from todo_format import format_todo
+from metrics import record_metrics
+from request_log import log_requests
 
 # ロガーの初期化
 logger = Logger()
 
-# DynamoDBのエンドポイントURL（ローカル開発用）
-ENDPOINT_URL = os.getenv('ENDPOINT_URL') or None
-
-# DynamoDBリソースとテーブルの初期化
-dynamoDB: DynamoDBServiceResource = boto3.resource("dynamodb", endpoint_url=ENDPOINT_URL)
-table = dynamoDB.Table(name=os.getenv("TODO_TABLE_NAME"))
-
-def generate_response(status_code, body):
-    """
-    APIレスポンスを生成する関数
-    
-    Args:
-        status_code (int): HTTPステータスコード
-        body (dict): レスポンスボディ
-        
-    Returns:
-        dict: API Gateway形式のレスポンス
-    """
-    return {
-        "statusCode": status_code,
-        "body": json.dumps(body),
-        "headers": {
-            'Access-Control-Allow-Origin': '*',  # CORS対応
-        },
-    }
+# DynamoDBのテーブル（低レベルクライアントで読み取り、最初の呼び出しでクライアントを作成する）
+table = ClientTable(os.getenv("TODO_TABLE_NAME"))
 
 def handle_exception(e):
     """
@@ -53,7 +32,9 @@ def handle_exception(e):
     logger.error("エラーが発生しました: %s", e)
     return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
 
+@record_metrics
 @logger.inject_lambda_context
+@log_requests(logger)
 def lambda_handler(event, context):
     """
     Lambda関数のエントリーポイント
@@ -65,8 +46,6 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway形式のレスポンス
     """
-    logger.info("イベントを受信しました: %s", event)
-    
     # パスパラメータからTODO IDを取得
     item_id = event['pathParameters']['id']
 
@@ -81,15 +60,7 @@ def lambda_handler(event, context):
 
         if item:
             # 取得したアイテムからレスポンスボディを構築
-            body = {
-                "id": item["id"],
-                "title": item["title"],
-                "description": item.get("description", ""),
-                "due_date": item.get("due_date"),
-                "is_completed": item.get("is_completed", False),
-                "priority": item.get("priority", "medium"),
-                "tags": item.get("tags", [])
-            }
+            body = format_todo(item)
             status_code = 200
             logger.info("アイテムが取得されました: %s", body)
         else:
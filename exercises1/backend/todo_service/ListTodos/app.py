@@ -2,58 +2,293 @@
 TODOアイテム一覧取得用のLambda関数
 
 このモジュールはTODOアイテムの一覧を取得するためのLambda関数を提供します。
-クエリパラメータからページネーション情報を取得し、DynamoDBからアイテムを検索します。
+クエリパラメータからページネーション情報（limit, nextToken）を取得し、DynamoDBからアイテムを検索します。
+絞り込み条件（is_completed, priority, tag）や期限の範囲（due_after, due_before）が指定された場合は、
+スキャンではなくインデックスへのクエリで取得し、期限順に返します。
+ids（カンマ区切りのID）が指定された場合は、BatchGetItem でまとめて取得し、指定された順に返します。
 """
 
-import json
 import os
-import boto3
-from mypy_boto3_dynamodb import DynamoDBServiceResource
+import random
+import time
+from datetime import date
+from boto3.dynamodb.conditions import Attr, Key
 from aws_lambda_powertools import Logger
+from dynamodb_client import ClientResource, ClientTable
+from response import generate_response
+from metrics import record_metrics
+from request_log import log_requests
+from todo_format import format_todo_list
+from pagination import InvalidCursorError, MissingSecretError, decode_cursor, encode_cursor, parse_limit
+from todo_index import (
+    DUE_DATE_INDEX,
+    PRIORITIES,
+    STATUS_PRIORITY_INDEX,
+    due_bucket_partitions,
+    due_range,
+    query_partitions,
+    status_priority_partitions,
+)
 
 # ロガーの初期化
 logger = Logger()
 
-# DynamoDBのエンドポイントURL（ローカル開発用）
-ENDPOINT_URL = os.getenv('ENDPOINT_URL') or None
+# DynamoDBのテーブル（1MBのページを読むため、リソースではなく低レベルクライアントで読み取る）
+dynamoDB = ClientResource()
+table = ClientTable(os.getenv("TODO_TABLE_NAME"))
+tag_table = ClientTable(os.getenv("TODO_TAG_TABLE_NAME"))
 
-# DynamoDBリソースとテーブルの初期化
-dynamoDB: DynamoDBServiceResource = boto3.resource("dynamodb", endpoint_url=ENDPOINT_URL)
-table = dynamoDB.Table(name=os.getenv("TODO_TABLE_NAME"))
+# タグの最大文字数（CreateTodo / UpdateTodo のスキーマと同じ）
+MAX_TAG_LENGTH = 20
 
-def generate_response(status_code, body):
+# ids で一度に指定できるIDの最大数と、BatchGetItem の1回あたりの最大件数（DynamoDBの上限）
+MAX_IDS = 100
+BATCH_GET_SIZE = 100
+
+# UnprocessedKeys の再試行回数と待機時間（秒）
+MAX_RETRIES = 5
+BASE_DELAY = 0.05
+MAX_DELAY = 1.0
+
+# レスポンスに含める属性だけを読み取る（インデックス用の属性などは読まない）
+PROJECTION_ATTRIBUTES = ("id", "title", "description", "due_date", "is_completed", "priority", "tags")
+
+def handle_exception(e):
     """
-    APIレスポンスを生成する関数
+    例外処理を行う関数
     
     Args:
-        status_code (int): HTTPステータスコード
-        body (dict): レスポンスボディ
+        e (Exception): 発生した例外
         
     Returns:
-        dict: API Gateway形式のレスポンス
+        dict: エラーレスポンス
+    """
+    logger.error("エラーが発生しました: %s", e)
+    return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
+
+def parse_filters(query_params):
+    """
+    絞り込み条件のクエリパラメータを検証する関数
+    
+    Args:
+        query_params (dict): クエリパラメータ
+        
+    Returns:
+        dict: 指定された絞り込み条件（is_completed, priority, tag, due_after, due_before）
+        
+    Raises:
+        ValueError: パラメータの値が不正な場合
     """
-    return {
-        "statusCode": status_code,
-        "body": json.dumps(body),
-        "headers": {
-            'Access-Control-Allow-Origin': '*',  # CORS対応
-        },
+    filters = {}
+
+    is_completed = query_params.get('is_completed')
+    if is_completed is not None:
+        if is_completed not in ('true', 'false'):
+            raise ValueError("is_completed は true または false で指定してください")
+        filters['is_completed'] = is_completed == 'true'
+
+    priority = query_params.get('priority')
+    if priority is not None:
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority は {', '.join(PRIORITIES)} のいずれかで指定してください")
+        filters['priority'] = priority
+
+    tag = query_params.get('tag')
+    if tag is not None:
+        if not 1 <= len(tag) <= MAX_TAG_LENGTH:
+            raise ValueError(f"tag は1から{MAX_TAG_LENGTH}文字で指定してください")
+        filters['tag'] = tag
+
+    # 期限の範囲（YYYY-MM-DD、両端を含む）
+    for name in ('due_after', 'due_before'):
+        value = query_params.get(name)
+        if value is not None:
+            try:
+                date.fromisoformat(value)
+            except ValueError as e:
+                raise ValueError(f"{name} は YYYY-MM-DD 形式で指定してください") from e
+            if len(value) != 10:
+                raise ValueError(f"{name} は YYYY-MM-DD 形式で指定してください")
+            filters[name] = value
+    if filters.get('due_after', '') > filters.get('due_before', '9999-12-31'):
+        raise ValueError("due_after は due_before 以前の日付を指定してください")
+
+    return filters
+
+def has_due_range(filters):
+    """
+    期限の範囲が指定されているかどうかを判定する関数
+    """
+    return 'due_after' in filters or 'due_before' in filters
+
+def filter_scope(filters):
+    """
+    絞り込み条件を nextToken の署名に含める文字列に変換する関数
+    """
+    return "&".join(f"{name}={str(value).lower() if isinstance(value, bool) else value}"
+                    for name, value in sorted(filters.items()))
+
+def query_by_tag(filters, limit, start_key):
+    """
+    タグテーブル（転置インデックス）から期限順にTODOを取得する関数
+    
+    タグのパーティションだけを読むため、読み取り量はタグの付いたTODOの件数に比例します。
+    期限の範囲はソートキー（due_sort#id）の範囲で指定し、
+    完了状態・優先度はそのパーティション内でのみ絞り込みます。
+    FilterExpression は Limit 件を読んだ後に適用されるため、limit 件そろうか
+    パーティションの最後に達するまでクエリを続けます（条件に合わないTODOが続いても空のページを返さない）。
+    """
+    key_condition = Key('tag').eq(filters['tag'])
+    if has_due_range(filters):
+        lower, upper = due_range(filters.get('due_after'), filters.get('due_before'))
+        # ソートキーは "期限#ID" のため、上限の日付のすべてのIDを含むよう末尾を補う
+        key_condition = key_condition & Key('sort_key').between(lower, upper + "#\uffff")
+    query_kwargs = {
+        'KeyConditionExpression': key_condition,
     }
+    conditions = [Attr(name).eq(filters[name]) for name in ('is_completed', 'priority') if name in filters]
+    if conditions:
+        filter_expression = conditions[0]
+        for condition in conditions[1:]:
+            filter_expression = filter_expression & condition
+        query_kwargs['FilterExpression'] = filter_expression
+    items = []
+    while True:
+        if start_key:
+            query_kwargs['ExclusiveStartKey'] = start_key
+        response = tag_table.query(Limit=limit - len(items), **query_kwargs)
+        items.extend(response.get('Items', []))
+        start_key = response.get('LastEvaluatedKey')
+        if not start_key or len(items) >= limit:
+            return items, start_key
 
-def handle_exception(e):
+def query_by_status_priority(filters, limit, cursor):
     """
-    例外処理を行う関数
+    StatusPriorityIndex から期限順にTODOを取得する関数
+    
+    条件に該当するパーティション（例: 未完了なら "open#low", "open#medium", "open#high"）だけをクエリします。
+    """
+    partitions = status_priority_partitions(filters.get('is_completed'), filters.get('priority'))
+    sort_condition = None
+    if has_due_range(filters):
+        sort_condition = Key('due_sort').between(*due_range(filters.get('due_after'), filters.get('due_before')))
+    return query_partitions(
+        table.query,
+        'status_priority',
+        partitions,
+        'due_sort',
+        ('status_priority', 'due_sort', 'id'),
+        limit,
+        cursor,
+        sort_condition=sort_condition,
+        IndexName=STATUS_PRIORITY_INDEX,
+    )
+
+def query_by_due_date(filters, limit, cursor):
+    """
+    DueDateIndex から期限の範囲に該当するTODOを期限順に取得する関数
+    
+    期限のあるTODOはIDのハッシュで複数のパーティションに分散しているため、
+    すべてのパーティションを範囲指定でクエリしてマージします。
+    """
+    return query_partitions(
+        table.query,
+        'due_bucket',
+        due_bucket_partitions(),
+        'due_date',
+        ('due_bucket', 'due_date', 'id'),
+        limit,
+        cursor,
+        sort_condition=Key('due_date').between(*due_range(filters.get('due_after'), filters.get('due_before'))),
+        IndexName=DUE_DATE_INDEX,
+    )
+
+def parse_ids(value):
+    """
+    クエリパラメータ ids を検証してIDの一覧に変換する関数
+    
+    Returns:
+        list[str]: 重複を除いたIDの一覧（指定された順）
+        
+    Raises:
+        ValueError: IDが指定されていない、または多すぎる場合
+    """
+    ids = list(dict.fromkeys(item_id.strip() for item_id in value.split(',') if item_id.strip()))
+    if not 1 <= len(ids) <= MAX_IDS:
+        raise ValueError(f"ids は1から{MAX_IDS}個のIDをカンマ区切りで指定してください")
+    return ids
+
+def batch_get_todos(ids):
+    """
+    指定されたIDのTODOを BatchGetItem でまとめて取得する関数
+    
+    100件ずつに分けて取得し、UnprocessedKeys はジッター付きで待機して再試行します。
     
     Args:
-        e (Exception): 発生した例外
+        ids (list[str]): TODOのIDの一覧（重複なし）
         
     Returns:
-        dict: エラーレスポンス
+        dict: IDをキーにしたTODOアイテム（存在しないIDは含まない）
+        
+    Raises:
+        RuntimeError: 再試行しても取得できなかったIDがある場合
     """
-    logger.error("エラーが発生しました: %s", e)
-    return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
+    found = {}
+    for start in range(0, len(ids), BATCH_GET_SIZE):
+        request_items = {
+            table.name: {
+                'Keys': [{"id": item_id} for item_id in ids[start:start + BATCH_GET_SIZE]],
+                'ProjectionExpression': ", ".join(f"#{name}" for name in PROJECTION_ATTRIBUTES),
+                'ExpressionAttributeNames': {f"#{name}": name for name in PROJECTION_ATTRIBUTES},
+            },
+        }
+        for attempt in range(MAX_RETRIES + 1):
+            response = dynamoDB.batch_get_item(RequestItems=request_items)
+            for item in response.get('Responses', {}).get(table.name, []):
+                found[item["id"]] = item
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                break
+            if attempt < MAX_RETRIES:
+                time.sleep(random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt)))
+        if request_items:
+            raise RuntimeError(f"{len(request_items[table.name]['Keys'])}件のTODOを取得できませんでした")
+    return found
 
+def get_todos_by_ids(query_params):
+    """
+    ids で指定されたTODOを指定された順に返す関数
+    
+    存在しないIDは missing に含めます。
+    """
+    other_params = set(query_params) - {'ids'}
+    try:
+        if other_params:
+            raise ValueError(f"ids は {', '.join(sorted(other_params))} と同時に指定できません")
+        ids = parse_ids(query_params['ids'])
+    except ValueError as e:
+        logger.warning("クエリパラメータが不正です: %s", e)
+        return generate_response(400, {"message": "入力が無効です", "error": str(e)})
+
+    try:
+        found = batch_get_todos(ids)
+    except RuntimeError as e:
+        logger.warning("一部のTODOを取得できませんでした: %s", e)
+        return generate_response(503, {"message": "混雑のため取得できませんでした。再度実行してください", "error": str(e)})
+    except Exception as e:
+        return handle_exception(e)
+
+    response_body = {
+        "items": format_todo_list(found[item_id] for item_id in ids if item_id in found),
+        "missing": [item_id for item_id in ids if item_id not in found],
+        "nextToken": None,
+    }
+    logger.info("アイテムが取得されました: %d件（見つからないID: %d件）", len(response_body["items"]), len(response_body["missing"]))
+    return generate_response(200, response_body)
+
+@record_metrics
 @logger.inject_lambda_context
+@log_requests(logger)
 def lambda_handler(event, context):
     """
     Lambda関数のエントリーポイント
@@ -65,45 +300,56 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway形式のレスポンス
     """
-    logger.info("イベントを受信しました: %s", event)
-    
     # クエリパラメータの取得
     query_params = event.get('queryStringParameters') or {}
     next_token = query_params.get('nextToken')
 
-    # スキャンパラメータの設定
-    scan_kwargs = {}
-    if next_token:
-        scan_kwargs['ExclusiveStartKey'] = json.loads(next_token)
+    # IDを指定した取得
+    if 'ids' in query_params:
+        return get_todos_by_ids(query_params)
+
+    # 1回の呼び出しで読み取る件数と絞り込み条件の検証
+    try:
+        limit = parse_limit(query_params.get('limit'))
+        filters = parse_filters(query_params)
+        scope = filter_scope(filters)
+        cursor = decode_cursor(next_token, scope) if next_token else None
+    except MissingSecretError as e:
+        # 設定の誤りはクライアントの入力の誤りとして扱わない（nextToken を検証せずに受け付けない）
+        return handle_exception(e)
+    except (ValueError, InvalidCursorError) as e:
+        logger.warning("クエリパラメータが不正です: %s", e)
+        return generate_response(400, {"message": "入力が無効です", "error": str(e)})
 
     try:
-        # DynamoDBテーブルをスキャン
-        response = table.scan(**scan_kwargs)
-        items = response.get('Items', [])
-        last_evaluated_key = response.get('LastEvaluatedKey', None)
+        if 'tag' in filters:
+            # タグテーブルをクエリ
+            items, last_evaluated_key = query_by_tag(filters, limit, cursor)
+        elif 'is_completed' in filters or 'priority' in filters:
+            # StatusPriorityIndex をクエリ
+            items, last_evaluated_key = query_by_status_priority(filters, limit, cursor)
+        elif filters:
+            # 期限の範囲だけが指定された場合は DueDateIndex をクエリ
+            items, last_evaluated_key = query_by_due_date(filters, limit, cursor)
+        else:
+            # 絞り込み条件がない場合はDynamoDBテーブルをスキャン
+            scan_kwargs = {'Limit': limit}
+            if cursor:
+                scan_kwargs['ExclusiveStartKey'] = cursor
+            response = table.scan(**scan_kwargs)
+            items = response.get('Items', [])
+            last_evaluated_key = response.get('LastEvaluatedKey', None)
 
         # Todoスキーマに基づいてアイテムをフォーマット
-        formatted_items = [
-            {
-                "id": item.get("id"),
-                "title": item.get("title"),
-                "description": item.get("description", ""),
-                "due_date": item.get("due_date"),
-                "is_completed": item.get("is_completed", False),
-                "priority": item.get("priority", "medium"),
-                "tags": item.get("tags", [])
-            }
-            for item in items
-        ]
+        formatted_items = format_todo_list(items)
 
         # ページネーション対応のレスポンスボディを構築
-        # 現在はシンプルな配列を返しているが、将来的にはページネーション情報も含めることができる
-        # response_body = {
-        #     "items": formatted_items,
-        #     "nextToken": json.dumps(last_evaluated_key) if last_evaluated_key else None,
-        # }
+        response_body = {
+            "items": formatted_items,
+            "nextToken": encode_cursor(last_evaluated_key, scope),
+        }
 
         logger.info("アイテムが取得されました: %d件", len(formatted_items))
-        return generate_response(200, formatted_items)
+        return generate_response(200, response_body)
     except Exception as e:
         return handle_exception(e)
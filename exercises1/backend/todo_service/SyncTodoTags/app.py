@@ -0,0 +1,77 @@
+"""
+タグテーブル（転置インデックス）更新用のLambda関数
+
+このモジュールはTODOテーブルのストリームを受け取り、タグテーブルを更新するLambda関数を提供します。
+変更前後のアイテムからタグテーブルのアイテムを計算し、差分だけを書き込み・削除します。
+"""
+
+import os
+from boto3.dynamodb.types import TypeDeserializer
+from mypy_boto3_dynamodb import DynamoDBServiceResource
+from aws_lambda_powertools import Logger
+from aws_clients import lazy_resource, lazy_table
+from todo_index import tag_rows
+from metrics import record_metrics
+
+# ロガーの初期化
+logger = Logger()
+
+# DynamoDBリソースとテーブル（最初に使われたときに作成し、以降の呼び出しで再利用する）
+dynamoDB: DynamoDBServiceResource = lazy_resource("dynamodb")
+tag_table = lazy_table(os.getenv("TODO_TAG_TABLE_NAME"))
+
+deserializer = TypeDeserializer()
+
+def deserialize_image(image):
+    """
+    ストリームのイメージ（DynamoDB JSON）をPythonの辞書に変換する関数
+
+    Args:
+        image (dict | None): NewImage または OldImage
+
+    Returns:
+        dict | None: 変換後のアイテム
+    """
+    if not image:
+        return None
+    return {name: deserializer.deserialize(value) for name, value in image.items()}
+
+@record_metrics
+@logger.inject_lambda_context
+def lambda_handler(event, context):
+    """
+    Lambda関数のエントリーポイント
+
+    Args:
+        event (dict): DynamoDBストリームのイベントデータ
+        context (LambdaContext): Lambda関数のランタイム情報
+
+    Returns:
+        dict: 書き込み・削除した件数
+    """
+    # 同じバッチ内で同じTODOが複数回変更された場合も、記録の順に適用すれば最終状態になる
+    puts = {}
+    deletes = set()
+    for record in event['Records']:
+        old_item = deserialize_image(record['dynamodb'].get('OldImage'))
+        new_item = deserialize_image(record['dynamodb'].get('NewImage'))
+        old_rows = tag_rows(old_item) if old_item else {}
+        new_rows = tag_rows(new_item) if new_item else {}
+
+        for key in old_rows.keys() - new_rows.keys():
+            puts.pop(key, None)
+            deletes.add(key)
+        for key, row in new_rows.items():
+            # 内容が変わっていないタグは書き込まない
+            if old_rows.get(key) != row:
+                deletes.discard(key)
+                puts[key] = row
+
+    with tag_table.batch_writer() as batch:
+        for tag, sort_key in deletes:
+            batch.delete_item(Key={"tag": tag, "sort_key": sort_key})
+        for row in puts.values():
+            batch.put_item(Item=row)
+
+    logger.info("タグテーブルを更新しました: 書き込み %d件, 削除 %d件", len(puts), len(deletes))
+    return {"put": len(puts), "deleted": len(deletes)}
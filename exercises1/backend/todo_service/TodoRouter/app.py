@@ -0,0 +1,123 @@
+"""
+TODO APIのルーター用Lambda関数
+
+1つのLambda関数でTODO APIのすべてのルートを処理するための入口です（template.yaml の ApiLayout=router で使用）。
+メソッドとパスからルートを決め、既存の各関数（ListTodos, GetTodo など）の lambda_handler を呼び出します。
+
+- 各関数のモジュールは、そのルートが最初に呼び出されたときに読み込みます（使われないルートは読み込みません）
+- 関数を1つにまとめることで、利用の少ないルートもウォームなコンテナを共有でき、コールドスタートが減ります
+"""
+
+import importlib.util
+import os
+import sys
+from aws_lambda_powertools import Logger
+from response import generate_response
+
+# ロガーの初期化
+logger = Logger()
+
+# 各関数のディレクトリがあるディレクトリ（todo_service）
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ルートの定義（リソースのパス → メソッド → 関数のディレクトリ名）
+# 固定のパスを先に書く（/todos/batch は /todos/{id} より優先する）
+ROUTES = {
+    "/todos": {"GET": "ListTodos", "POST": "CreateTodo"},
+    "/todos/batch": {"POST": "BatchTodos"},
+    "/todos/{id}": {"GET": "GetTodo", "PUT": "UpdateTodo", "DELETE": "DeleteTodo"},
+}
+
+# 読み込み済みの lambda_handler（関数のディレクトリ名 → lambda_handler）
+handlers = {}
+
+def load_module(name, path):
+    """
+    ファイルからモジュールを読み込む関数
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def load_handler(function_name):
+    """
+    関数の lambda_handler を読み込む関数（2回目以降は読み込み済みのものを返す）
+
+    Args:
+        function_name (str): 関数のディレクトリ名
+
+    Returns:
+        callable: lambda_handler
+    """
+    handler = handlers.get(function_name)
+    if handler is not None:
+        return handler
+
+    function_dir = os.path.join(SERVICE_DIR, function_name)
+    schema_path = os.path.join(function_dir, "schema.py")
+    # 各関数は同じディレクトリの schema を `from schema import ...` で読み込むため、読み込み中だけ登録する
+    if os.path.exists(schema_path):
+        sys.modules["schema"] = load_module(f"todo_router.{function_name}.schema", schema_path)
+    try:
+        module = load_module(f"todo_router.{function_name}.app", os.path.join(function_dir, "app.py"))
+    finally:
+        sys.modules.pop("schema", None)
+
+    handler = handlers[function_name] = module.lambda_handler
+    logger.info("関数を読み込みました: %s", function_name)
+    return handler
+
+def match_route(path):
+    """
+    パスに一致するルートを探す関数
+
+    Args:
+        path (str): リクエストのパス（例: /todos/abc）
+
+    Returns:
+        tuple[str | None, dict | None]: リソースのパス（例: /todos/{id}）とパスパラメータ（一致しない場合は None）
+    """
+    parts = path.strip("/").split("/")
+    for resource in ROUTES:
+        template = resource.strip("/").split("/")
+        if len(template) != len(parts):
+            continue
+        path_parameters = {}
+        for expected, actual in zip(template, parts):
+            if expected.startswith("{"):
+                if not actual:
+                    break
+                path_parameters[expected[1:-1]] = actual
+            elif expected != actual:
+                break
+        else:
+            return resource, path_parameters
+    return None, None
+
+def lambda_handler(event, context):
+    """
+    Lambda関数のエントリーポイント
+
+    Args:
+        event (dict): Lambda関数に渡されるイベントデータ
+        context (LambdaContext): Lambda関数のランタイム情報
+
+    Returns:
+        dict: 呼び出した関数のレスポンス（API Gateway形式）
+    """
+    method = event.get("httpMethod", "").upper()
+    resource, path_parameters = match_route(event.get("path") or "/")
+    if resource is None:
+        logger.warning("ルートが見つかりません: %s %s", method, event.get("path"))
+        return generate_response(404, {"message": "指定されたパスが見つかりません"})
+
+    function_name = ROUTES[resource].get(method)
+    if function_name is None:
+        logger.warning("許可されていないメソッドです: %s %s", method, resource)
+        return generate_response(405, {"message": "許可されていないメソッドです"})
+
+    # 各関数が個別にデプロイされた場合と同じ形のイベントにする（/{proxy+} のパスパラメータを置き換える）
+    event = dict(event, resource=resource, pathParameters=path_parameters or None)
+    return load_handler(function_name)(event, context)
@@ -7,40 +7,23 @@ TODOアイテム更新用のLambda関数
 
 import json
 import os
-import boto3
 from mypy_boto3_dynamodb import DynamoDBServiceResource
 from aws_lambda_powertools.utilities.validation import validate
 from schema import schema
 from aws_lambda_powertools import Logger
+from aws_clients import lazy_resource, lazy_table
+from response import generate_response
+from todo_format import format_todo
+from todo_index import sync_index_attributes
+from metrics import record_metrics
+from request_log import log_requests
 
 # ロガーの初期化
 logger = Logger()
 
-# DynamoDBのエンドポイントURL（ローカル開発用）
-ENDPOINT_URL = os.getenv('ENDPOINT_URL') or None
-
-# DynamoDBリソースとテーブルの初期化
-dynamoDB: DynamoDBServiceResource = boto3.resource("dynamodb", endpoint_url=ENDPOINT_URL)
-table = dynamoDB.Table(name=os.getenv("TODO_TABLE_NAME"))
-
-def generate_response(status_code, body):
-    """
-    APIレスポンスを生成する関数
-    
-    Args:
-        status_code (int): HTTPステータスコード
-        body (dict): レスポンスボディ
-        
-    Returns:
-        dict: API Gateway形式のレスポンス
-    """
-    return {
-        "statusCode": status_code,
-        "body": json.dumps(body),
-        "headers": {
-            'Access-Control-Allow-Origin': '*',  # CORS対応
-        },
-    }
+# DynamoDBリソースとテーブル（最初に使われたときに作成し、以降の呼び出しで再利用する）
+dynamoDB: DynamoDBServiceResource = lazy_resource("dynamodb")
+table = lazy_table(os.getenv("TODO_TABLE_NAME"))
 
 def handle_exception(e):
     """
@@ -55,7 +38,9 @@ def handle_exception(e):
     logger.error("エラーが発生しました: %s", e)
     return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
 
+@record_metrics
 @logger.inject_lambda_context
+@log_requests(logger)
 def lambda_handler(event, context):
     """
     Lambda関数のエントリーポイント
@@ -67,8 +52,6 @@ def lambda_handler(event, context):
     Returns:
         dict: API Gateway形式のレスポンス
     """
-    logger.info("イベントを受信しました: %s", event)
-    
     # パスパラメータからTODO IDを取得
     item_id = event['pathParameters']['id']
     
@@ -153,6 +136,9 @@ def lambda_handler(event, context):
             ReturnValues="ALL_NEW"  # 更新後の全ての属性を返す
         )
         logger.info("アイテムが更新されました。ID: %s", item_id)
+        # 絞り込み検索用のインデックス属性を更新
+        if not sync_index_attributes(table, response['Attributes']):
+            logger.info("インデックス属性の更新をスキップしました（同時更新）。ID: %s", item_id)
     except dynamoDB.meta.client.exceptions.ConditionalCheckFailedException:
         # アイテムが見つからない場合
         logger.warning("アイテムが見つかりません: %s", item_id)
@@ -162,15 +148,7 @@ def lambda_handler(event, context):
 
     # レスポンスボディの構築
     updated_item = response.get('Attributes', None)
-    response_body = {
-        "id": updated_item["id"],
-        "title": updated_item["title"],
-        "description": updated_item.get("description", ""),
-        "due_date": updated_item.get("due_date"),
-        "is_completed": updated_item.get("is_completed", False),
-        "priority": updated_item.get("priority", "medium"),
-        "tags": updated_item.get("tags", [])
-    }
+    response_body = format_todo(updated_item)
 
     logger.info("更新されたアイテム: %s", response_body)
     return generate_response(200, response_body)
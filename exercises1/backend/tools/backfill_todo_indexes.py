@@ -0,0 +1,69 @@
+"""
+既存のTODOに絞り込み検索用のインデックスを作るツール
+
+StatusPriorityIndex・DueDateIndex とタグテーブルは、TODOの作成・更新時に書き込まれます。
+それより前に作られたTODOは検索結果に含まれないため、このツールで一度だけ補完します。
+
+- TODOテーブルを並列スキャンし、status_priority / due_sort / due_bucket が古いアイテムを更新します
+- すべてのTODOについて、タグテーブルのアイテムを書き込みます（何度実行しても結果は同じです）
+
+使い方:
+    python tools/backfill_todo_indexes.py --segments 4 --max-read-capacity 50
+    python tools/backfill_todo_indexes.py --endpoint-url http://localhost:4566 --dry-run
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "todo_service", "CommonLayer"))
+
+from parallel_scan import ParallelScanner  # noqa: E402
+from todo_index import index_attributes, tag_rows, update_index_attributes  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="既存のTODOに絞り込み検索用のインデックスを作る")
+    parser.add_argument("--table", default=os.getenv("TODO_TABLE_NAME", "exercises1-table"), help="TODOテーブル名")
+    parser.add_argument("--tag-table", default=os.getenv("TODO_TAG_TABLE_NAME", "exercises1-tag-table"),
+                        help="タグテーブル名")
+    parser.add_argument("--endpoint-url", default=os.getenv("ENDPOINT_URL"), help="DynamoDBのエンドポイント（LocalStackなど）")
+    parser.add_argument("--segments", type=int, default=4, help="セグメント数（並列度）")
+    parser.add_argument("--max-read-capacity", type=float, help="読み込みキャパシティの予算（RCU/秒）")
+    parser.add_argument("--dry-run", action="store_true", help="書き込まずに件数だけを表示する")
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource("dynamodb", endpoint_url=args.endpoint_url)
+    table = dynamodb.Table(args.table)
+    tag_table = dynamodb.Table(args.tag_table)
+    scanner = ParallelScanner(table.scan, total_segments=args.segments, max_read_capacity=args.max_read_capacity)
+
+    counts = {"items": 0, "updated": 0, "skipped": 0, "tag_rows": 0}
+    start = time.perf_counter()
+    with tag_table.batch_writer(overwrite_by_pkeys=["tag", "sort_key"]) as batch:
+        for item in scanner.scan():
+            counts["items"] += 1
+            attributes = index_attributes(item)
+            if any(item.get(name) != value for name, value in attributes.items()):
+                if args.dry_run or update_index_attributes(table, item, attributes):
+                    counts["updated"] += 1
+                else:
+                    counts["skipped"] += 1
+            for row in tag_rows(item).values():
+                counts["tag_rows"] += 1
+                if not args.dry_run:
+                    batch.put_item(Item=row)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"{counts['items']} 件を {elapsed:.2f} 秒で処理しました "
+        f"(インデックス属性の更新 {counts['updated']} 件, 同時更新でスキップ {counts['skipped']} 件, "
+        f"タグ {counts['tag_rows']} 件{'、ドライラン' if args.dry_run else ''})"
+    )
+
+
+if __name__ == "__main__":
+    main()
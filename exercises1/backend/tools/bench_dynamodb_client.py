@@ -0,0 +1,121 @@
+"""
+1MBの scan / query のページを読み取るときの、リソースと低レベルクライアントの時間を比べるベンチマーク
+
+DynamoDBの1回の scan / query が返す上限（1MB）になるまでTodoのアイテムを作り、
+botocore の Stubber で同じレスポンスを返して、次の2つを比べます。DynamoDBには接続しません。
+
+- resource: boto3.resource("dynamodb").Table の scan / query（TypeDeserializer で変換）
+- client: dynamodb_client.ClientTable の scan / query（手書きの変換）
+
+通信と botocore のレスポンスの解析は含まないため、差はリクエストとレスポンスの変換の時間です。
+
+使い方:
+    python tools/bench_dynamodb_client.py
+    python tools/bench_dynamodb_client.py --repeat 20 --page-kb 1024
+"""
+
+import argparse
+import copy
+import os
+import random
+import statistics
+import sys
+import time
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.stub import Stubber
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "todo_service", "CommonLayer"))
+
+from dynamodb_client import ClientTable, serialize_item  # noqa: E402
+from todo_index import index_attributes  # noqa: E402
+
+TABLE_NAME = "bench-todos"
+
+
+def item_size(item):
+    """DynamoDBのアイテムサイズの目安（属性名と値のバイト数）を返す"""
+    def value_size(value):
+        if isinstance(value, str):
+            return len(value.encode())
+        if isinstance(value, (bool, type(None))):
+            return 1
+        if isinstance(value, list):
+            return 3 + sum(1 + value_size(element) for element in value)
+        return 21
+    return sum(len(name.encode()) + value_size(value) for name, value in item.items())
+
+
+def make_page(page_bytes, seed=0):
+    """合計が page_bytes になるまでTodoを作り、DynamoDBの形式（{"S": ...}）で返す"""
+    rng = random.Random(seed)
+    items, total = [], 0
+    while total < page_bytes:
+        i = len(items)
+        item = {
+            "id": f"{i:08d}-0000-4000-8000-000000000000",
+            "title": f"ベンチマーク用のTODO {i}",
+            "description": "説明" * rng.randint(0, 50),
+            "due_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if rng.random() < 0.7 else None,
+            "is_completed": rng.random() < 0.5,
+            "priority": rng.choice(["low", "medium", "high"]),
+            "tags": rng.sample(["仕事", "家", "買い物", "急ぎ"], rng.randint(0, 3)),
+        }
+        item.update(index_attributes(item))
+        total += item_size(item)
+        items.append(serialize_item(item))
+    return items
+
+
+def measure(call, stubber, operation, response, expected_params, repeat):
+    """レスポンスを登録してから call だけを計測し、中央値（秒）を返す"""
+    timings = []
+    for _ in range(repeat):
+        # 変換でレスポンスが書き換えられるため、毎回コピーを登録する（計測には含めない）
+        stubber.add_response(operation, copy.deepcopy(response), expected_params)
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="リソースと低レベルクライアントの1MBのページの読み取り時間を比べる")
+    parser.add_argument("--page-kb", type=int, default=1024, help="1ページの大きさ（KB）")
+    parser.add_argument("--repeat", type=int, default=10, help="計測回数（中央値を使う）")
+    args = parser.parse_args()
+
+    items = make_page(args.page_kb * 1024)
+    response = {"Items": items, "Count": len(items), "ScannedCount": len(items),
+                "LastEvaluatedKey": {"id": items[-1]["id"]}}
+
+    client = boto3.client("dynamodb", region_name="ap-northeast-1",
+                          aws_access_key_id="bench", aws_secret_access_key="bench")
+    resource = boto3.resource("dynamodb", region_name="ap-northeast-1",
+                              aws_access_key_id="bench", aws_secret_access_key="bench")
+    resource_table = resource.Table(TABLE_NAME)
+    client_table = ClientTable(TABLE_NAME, client)
+
+    start_key = {"status_priority": "open#high", "due_sort": "2026-01-01", "id": "0"}
+    key_condition = Key("status_priority").eq("open#high")
+    cases = {
+        "scan": ("scan", {"ExclusiveStartKey": start_key}),
+        "query": ("query", {"IndexName": "StatusPriorityIndex", "KeyConditionExpression": key_condition,
+                            "ExclusiveStartKey": start_key}),
+    }
+
+    print(f"1ページ: {len(items)}件（約{args.page_kb}KB）, {args.repeat}回の中央値")
+    print(f"{'操作':<8}{'resource ms':>14}{'client ms':>12}{'短縮':>8}")
+    with Stubber(resource.meta.client) as resource_stubber, Stubber(client) as client_stubber:
+        for name, (operation, kwargs) in cases.items():
+            resource_seconds = measure(lambda: getattr(resource_table, operation)(**kwargs), resource_stubber,
+                                       operation, response, None, args.repeat)
+            client_seconds = measure(lambda: getattr(client_table, operation)(**kwargs), client_stubber,
+                                     operation, response, None, args.repeat)
+            print(f"{name:<8}{resource_seconds * 1000:>14.1f}{client_seconds * 1000:>12.1f}"
+                  f"{resource_seconds / client_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+レスポンス整形関数の1件あたりの時間を計測するベンチマーク
+
+DynamoDBから読み取った形のTodo（インデックス属性を含む）を10,000件作り、
+以前の各関数の書き方（item.get を並べた関数を1件ずつ呼ぶ）と、
+生成した format_todo / format_todo_list を比べます。DynamoDBには接続しません。
+
+使い方:
+    python tools/bench_formatters.py
+    python tools/bench_formatters.py --items 10000 --repeat 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "todo_service", "CommonLayer"))
+
+from todo_format import format_todo, format_todo_list  # noqa: E402
+from todo_index import index_attributes  # noqa: E402
+
+
+def make_items(count, seed=0):
+    """DynamoDBから読み取った形のTodoを作る（一部は任意の属性を持たない）"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        item = {"id": f"{i:08d}-0000-4000-8000-000000000000", "title": f"ベンチマーク用のTODO {i}"}
+        if rng.random() < 0.7:
+            item.update({
+                "description": "説明" * rng.randint(0, 50),
+                "due_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "is_completed": rng.random() < 0.5,
+                "priority": rng.choice(["low", "medium", "high"]),
+                "tags": rng.sample(["仕事", "家", "買い物", "急ぎ"], rng.randint(0, 3)),
+            })
+        item.update(index_attributes(item))
+        items.append(item)
+    return items
+
+
+def legacy_format_todo(item):
+    """以前の ListTodos の format_todo"""
+    return {
+        "id": item.get("id"),
+        "title": item.get("title"),
+        "description": item.get("description", ""),
+        "due_date": item.get("due_date"),
+        "is_completed": item.get("is_completed", False),
+        "priority": item.get("priority", "medium"),
+        "tags": item.get("tags", [])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="レスポンス整形関数のベンチマーク")
+    parser.add_argument("--items", type=int, default=10000, help="件数")
+    parser.add_argument("--repeat", type=int, default=20, help="計測の繰り返し回数")
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    assert [legacy_format_todo(item) for item in items] == format_todo_list(items)
+
+    candidates = [
+        ("手書きの format_todo", lambda: [legacy_format_todo(item) for item in items]),
+        ("生成した format_todo", lambda: [format_todo(item) for item in items]),
+        ("生成した format_todo_list", lambda: format_todo_list(items)),
+    ]
+    print(f"{'方法':<28}{'ns/件':>10}{'倍率':>8}")
+    baseline = None
+    for name, run in candidates:
+        seconds = min(timeit.repeat(run, number=args.repeat, repeat=3)) / args.repeat / len(items)
+        baseline = baseline or seconds
+        print(f"{name:<28}{seconds * 1e9:>10.0f}{baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+並列スキャンのセグメント数とスループットの関係を計測するベンチマーク
+
+LocalStack などのDynamoDBに対して、セグメント数を変えながらテーブル全体をスキャンし、
+件数/秒・ページ数・消費RCU・スロットリング回数を表にします。
+--seed を指定すると、計測前にダミーのTodoを書き込みます（専用のテーブルで実行してください）。
+
+使い方:
+    python tools/bench_parallel_scan.py --endpoint-url http://localhost:4566 --seed 50000
+    python tools/bench_parallel_scan.py --endpoint-url http://localhost:4566 --segments 1,2,4,8,16 --json result.json
+
+注意:
+    LocalStack はキャパシティの制限やパーティション分割を再現しないため、
+    実際のDynamoDBでの伸び方とは異なります。傾向の確認に使ってください。
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "todo_service", "CommonLayer"))
+
+from parallel_scan import ParallelScanner  # noqa: E402
+
+
+def seed_table(table, count):
+    """ダミーのTodoを書き込む"""
+    with table.batch_writer() as batch:
+        for i in range(count):
+            batch.put_item(Item={
+                "id": str(uuid.uuid4()),
+                "title": f"bench todo {i}",
+                "description": "x" * random.randint(0, 200),
+                "due_date": f"2026-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}",
+                "is_completed": random.random() < 0.3,
+                "priority": random.choice(["low", "medium", "high"]),
+                "tags": random.sample(["work", "home", "urgent", "later"], k=random.randint(0, 2)),
+            })
+
+
+def run(table, segments, page_size, max_read_capacity):
+    scanner = ParallelScanner(
+        table.scan,
+        total_segments=segments,
+        page_size=page_size,
+        max_read_capacity=max_read_capacity,
+        scan_kwargs={"ProjectionExpression": "id"},
+    )
+    start = time.perf_counter()
+    count = sum(1 for _ in scanner.scan())
+    elapsed = time.perf_counter() - start
+    return {
+        "segments": segments,
+        "items": count,
+        "seconds": elapsed,
+        "items_per_second": count / elapsed if elapsed else 0,
+        "pages": scanner.stats["pages"],
+        "consumed_capacity": float(scanner.stats["consumed_capacity"]),
+        "throttles": scanner.stats["throttles"],
+    }
+
+
+def print_table(results):
+    header = f"{'segments':>8} {'items':>9} {'seconds':>9} {'items/s':>10} {'speedup':>8} {'pages':>7} {'RCU':>9} {'throttles':>9}"
+    print(header)
+    print("-" * len(header))
+    baseline = results[0]["items_per_second"] or 1
+    for row in results:
+        print(f"{row['segments']:>8} {row['items']:>9} {row['seconds']:9.2f} {row['items_per_second']:10.0f} "
+              f"{row['items_per_second'] / baseline:7.2f}x {row['pages']:>7} {row['consumed_capacity']:9.1f} "
+              f"{row['throttles']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="並列スキャンのスループット計測")
+    parser.add_argument("--table", default=os.getenv("TABLE_NAME", "exercises1-table"), help="テーブル名")
+    parser.add_argument("--endpoint-url", default=os.getenv("ENDPOINT_URL", "http://localhost:4566"),
+                        help="DynamoDBのエンドポイント")
+    parser.add_argument("--segments", default="1,2,4,8,16", help="計測するセグメント数（カンマ区切り）")
+    parser.add_argument("--page-size", type=int, help="1回の scan で読み取る最大件数")
+    parser.add_argument("--max-read-capacity", type=float, help="読み込みキャパシティの予算（RCU/秒）")
+    parser.add_argument("--repeat", type=int, default=3, help="セグメント数ごとの試行回数（最良値を採用）")
+    parser.add_argument("--seed", type=int, default=0, help="計測前に書き込むダミーのTodoの件数")
+    parser.add_argument("--json", help="結果をJSONで書き出すファイルパス")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb", endpoint_url=args.endpoint_url).Table(args.table)
+    if args.seed:
+        print(f"{args.seed} 件のTodoを書き込んでいます...", file=sys.stderr)
+        seed_table(table, args.seed)
+
+    results = []
+    for segments in [int(value) for value in args.segments.split(",")]:
+        runs = [run(table, segments, args.page_size, args.max_read_capacity) for _ in range(args.repeat)]
+        results.append(max(runs, key=lambda row: row["items_per_second"]))
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"結果を {args.json} に書き出しました")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+レスポンスのJSON変換を計測するベンチマーク
+
+DynamoDBから読み取った形（数値が Decimal）のTodo一覧と、exercises2 の ListTroubles が返す形のトラブル一覧
+（日本語の文字列が中心）を、以前の各関数の方法（Decimal を変換してから json.dumps）と
+共通レイヤーの response.dumps で変換し、1回あたりの時間を比べます。DynamoDBには接続しません。
+
+使い方:
+    python tools/bench_response.py
+    python tools/bench_response.py --items 10,100,1000 --repeat 200
+    python tools/bench_response.py --payloads troubles
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "todo_service", "CommonLayer"))
+
+import response  # noqa: E402
+
+
+def make_items(count, seed=0):
+    """DynamoDBから読み取った形のTodoを作る"""
+    rng = random.Random(seed)
+    return [{
+        "id": f"{i:08d}-0000-4000-8000-000000000000",
+        "title": f"ベンチマーク用のTODO {i}",
+        "description": "説明" * rng.randint(0, 50),
+        "due_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "is_completed": rng.random() < 0.5,
+        "priority": rng.choice(["low", "medium", "high"]),
+        "tags": rng.sample(["仕事", "家", "買い物", "急ぎ"], rng.randint(0, 3)),
+        "version": Decimal(rng.randint(1, 20)),
+        "estimate": Decimal(str(round(rng.uniform(0.5, 8), 1))),
+    } for i in range(count)]
+
+
+TROUBLE_CATEGORIES = ["緊急", "通常", "要望", "質問"]
+TROUBLE_MESSAGES = ["サーバーが停止しました", "ログインできません", "画面の表示が崩れています", "通知が届きません"]
+
+
+def make_troubles(count, seed=0):
+    """exercises2 の ListTroubles が返す形のトラブルを作る"""
+    rng = random.Random(seed)
+    return [{
+        "item_id": f"{i:08d}-0000-4000-8000-000000000000",
+        "category": rng.choice(TROUBLE_CATEGORIES),
+        "message": rng.choice(TROUBLE_MESSAGES) * rng.randint(1, 5),
+    } for i in range(count)]
+
+
+# 計測するレスポンスの種類 -> (アイテムを作る関数, nextToken)
+PAYLOADS = {
+    "todos": (make_items, None),
+    "troubles": (make_troubles, '{"user_id": {"S": "0f6e7a52-0000-4000-8000-000000000001"}}'),
+}
+
+
+def convert_decimal(value):
+    """以前の方法: Decimal を再帰的に変換する"""
+    if isinstance(value, list):
+        return [convert_decimal(v) for v in value]
+    if isinstance(value, dict):
+        return {k: convert_decimal(v) for k, v in value.items()}
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def legacy_dumps(body):
+    return json.dumps(convert_decimal(body))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="レスポンスのJSON変換のベンチマーク")
+    parser.add_argument("--items", default="10,100,1000", help="1レスポンスあたりの件数（カンマ区切り）")
+    parser.add_argument("--repeat", type=int, default=100, help="計測の繰り返し回数")
+    parser.add_argument("--payloads", default=",".join(PAYLOADS),
+                        help=f"計測するレスポンスの種類（カンマ区切り、{'/'.join(PAYLOADS)}）")
+    args = parser.parse_args()
+
+    stdlib_only = lambda body: response._stdlib_dumps(body)  # noqa: E731
+    candidates = [("json.dumps + Decimal変換", legacy_dumps), ("response (標準ライブラリ)", stdlib_only)]
+    if response.orjson is not None:
+        candidates.append(("response (orjson)", response.dumps))
+
+    print(f"{'種類':<10}{'件数':>6}  {'方法':<28}{'ms/回':>10}{'倍率':>8}")
+    for payload in args.payloads.split(","):
+        make, next_token = PAYLOADS[payload]
+        for count in (int(value) for value in args.items.split(",")):
+            body = {"items": make(count), "nextToken": next_token}
+            baseline = None
+            for name, dumps in candidates:
+                seconds = min(timeit.repeat(lambda: dumps(body), number=args.repeat, repeat=3)) / args.repeat
+                baseline = baseline or seconds
+                print(f"{payload:<10}{count:>6}  {name:<28}{seconds * 1000:>10.3f}{baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+関数ごとの構成とルーター構成（ApiLayout=functions / router）を比べるベンチマーク
+
+次の2つを表にします。DynamoDBには接続しません。
+
+1. 初期化時間: 新しいPythonプロセスで各関数の app.py を読み込む時間（コールドスタート時の初期化に相当）
+   ルーター構成では、ルーターの読み込みと、そのルートの関数の読み込みの合計です
+2. コールドスタート回数: ルートごとのリクエスト数からポアソン到着のアクセスを作り、
+   最後のリクエストから --idle-timeout 秒以上空くとコンテナが回収されるとみなして数えます
+   （同時実行は考慮しない近似です。回収までの時間はAWSでは公開されていません）
+   ルーター構成では、ウォームなコンテナで別のルートが初めて呼ばれたときの読み込みも数えます
+   （共通のライブラリは読み込み済みのため、関数ごとの初期化時間を使うのは多めの見積もりです）
+
+使い方:
+    python tools/bench_router.py
+    python tools/bench_router.py --rates ListTodos=600,GetTodo=300,CreateTodo=30 --idle-timeout 600 --hours 24
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+SERVICE_DIR = os.path.join(BACKEND_DIR, "todo_service")
+
+sys.path.insert(0, os.path.join(SERVICE_DIR, "CommonLayer"))
+sys.path.insert(0, os.path.join(SERVICE_DIR, "TodoRouter"))
+
+from app import ROUTES  # noqa: E402
+
+# 1時間あたりのリクエスト数（既定値）
+DEFAULT_RATES = "ListTodos=600,GetTodo=300,CreateTodo=60,UpdateTodo=60,DeleteTodo=20,BatchTodos=2"
+
+# 新しいプロセスで実行する計測用のコード
+INIT_SCRIPT = """
+import importlib.util, json, os, sys, time
+sys.path.insert(0, os.path.join({service_dir!r}, "CommonLayer"))
+start = time.perf_counter()
+if {router!r}:
+    spec = importlib.util.spec_from_file_location("router", os.path.join({service_dir!r}, "TodoRouter", "app.py"))
+    router = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(router)
+    router.load_handler({function_name!r})
+else:
+    function_dir = os.path.join({service_dir!r}, {function_name!r})
+    sys.path.insert(0, function_dir)
+    spec = importlib.util.spec_from_file_location("app", os.path.join(function_dir, "app.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+def measure_init(function_name, router, repeat):
+    """初期化時間（秒）の中央値を計測する"""
+    env = dict(os.environ, AWS_DEFAULT_REGION=os.getenv("AWS_DEFAULT_REGION", "ap-northeast-1"),
+               TODO_TABLE_NAME="exercises1-table", TODO_TAG_TABLE_NAME="exercises1-tag-table",
+               POWERTOOLS_LOG_LEVEL="ERROR")
+    script = INIT_SCRIPT.format(service_dir=SERVICE_DIR, function_name=function_name, router=router)
+    samples = sorted(
+        json.loads(subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True,
+                                  text=True).stdout)
+        for _ in range(repeat)
+    )
+    return samples[len(samples) // 2]
+
+
+def make_trace(rates, hours, seed):
+    """ルートごとのポアソン到着を時刻順に並べる"""
+    rng = random.Random(seed)
+    trace = []
+    for function_name, per_hour in rates.items():
+        t = 0.0
+        while per_hour > 0:
+            t += rng.expovariate(per_hour / 3600)
+            if t > hours * 3600:
+                break
+            trace.append((t, function_name))
+    return sorted(trace)
+
+
+def count_cold_starts(trace, idle_timeout, pool_of):
+    """
+    コンテナのプールごとに、前回のリクエストから idle_timeout 秒以上空いたリクエストを数える
+
+    Returns:
+        tuple[dict, dict]: 関数ごとのコールドスタート回数と、ウォームなコンテナでの初回読み込みの回数
+    """
+    last_seen = {}
+    loaded = {}
+    cold = {}
+    lazy_loads = {}
+    for t, function_name in trace:
+        pool = pool_of(function_name)
+        if pool not in last_seen or t - last_seen[pool] >= idle_timeout:
+            cold[function_name] = cold.get(function_name, 0) + 1
+            loaded[pool] = {function_name}
+        elif function_name not in loaded[pool]:
+            lazy_loads[function_name] = lazy_loads.get(function_name, 0) + 1
+            loaded[pool].add(function_name)
+        last_seen[pool] = t
+    return cold, lazy_loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="関数ごとの構成とルーター構成の比較")
+    parser.add_argument("--rates", default=DEFAULT_RATES, help="関数ごとの1時間あたりのリクエスト数")
+    parser.add_argument("--idle-timeout", type=float, default=600, help="コンテナが回収されるまでの秒数（仮定）")
+    parser.add_argument("--hours", type=float, default=24, help="シミュレーションする時間")
+    parser.add_argument("--repeat", type=int, default=5, help="初期化時間の計測回数")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rates = {name: float(value) for name, value in (pair.split("=") for pair in args.rates.split(","))}
+    function_names = [name for methods in ROUTES.values() for name in methods.values()]
+
+    print(f"{'関数':<12}{'初期化(関数ごと) ms':>20}{'初期化(ルーター) ms':>20}")
+    init = {}
+    for function_name in function_names:
+        init[function_name] = (measure_init(function_name, False, args.repeat),
+                               measure_init(function_name, True, args.repeat))
+        print(f"{function_name:<12}{init[function_name][0] * 1000:>20.1f}{init[function_name][1] * 1000:>20.1f}")
+
+    trace = make_trace(rates, args.hours, args.seed)
+    layouts = {
+        "functions": count_cold_starts(trace, args.idle_timeout, lambda name: name),
+        "router": count_cold_starts(trace, args.idle_timeout, lambda name: "TodoRouter"),
+    }
+    print(f"\n{len(trace)}リクエスト / {args.hours:g}時間 / 回収まで{args.idle_timeout:g}秒")
+    print(f"{'構成':<12}{'コールドスタート':>16}{'初回読み込み':>12}{'初期化時間の合計 s':>20}")
+    for index, (layout, (cold, lazy_loads)) in enumerate(layouts.items()):
+        total_init = sum(count * init[name][index] for name, count in cold.items() if name in init)
+        total_init += sum(count * init[name][0] for name, count in lazy_loads.items() if name in init)
+        print(f"{layout:<12}{sum(cold.values()):>16}{sum(lazy_loads.values()):>12}{total_init:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1296 @@
+"""
+DynamoDBの操作をプロセス内で再現するフェイク（ベンチマーク・テスト用）
+
+LocalStack を起動せずに、ハンドラーの処理時間（CPU）だけを計測するためのものです。
+botocore の before-send フックでHTTPリクエストを受け取り、DynamoDBと同じ形式のJSONを返します。
+通信を置き換えるだけなので、リソース（Table）・低レベルクライアント・再試行・metrics のフックはそのまま動きます。
+
+対応している操作:
+    PutItem / GetItem / UpdateItem（SET・REMOVE・ADD・DELETE）/ DeleteItem
+    Query / Scan（ExclusiveStartKey, Limit, 1MBのページ, FilterExpression, Segment / TotalSegments）
+    BatchGetItem / BatchWriteItem / CreateTable / DeleteTable / DescribeTable / ListTables
+
+ConditionExpression / KeyConditionExpression / FilterExpression / ProjectionExpression は
+DynamoDBの式の文法（比較, BETWEEN, IN, AND / OR / NOT, attribute_exists などの関数）で評価します。
+
+ENDPOINT_URL と同じ方法で接続します。install(aws_clients) で登録すると、共通レイヤーの aws_clients は
+memory:// のエンドポイントでこのモジュールを使います（レイヤーはこのモジュールを読み込みません）。
+
+    ENDPOINT_URL_DYNAMODB="memory://bench?template=template.yaml&latency_ms=5&throttle_rate=0.01"
+
+- memory://<名前>: 同じ名前のエンドポイントは同じデータベース（プロセス内）を使う
+- template: テンプレートの AWS::DynamoDB::Table からテーブルを作る（相対パスは現在のディレクトリから）
+- latency_ms / jitter_ms: 1回の呼び出しごとに待つ時間（ミリ秒）
+- throttle_rate: ProvisionedThroughputExceededException を返す割合（botocore が再試行する）
+- unprocessed_rate: BatchGetItem / BatchWriteItem で未処理として返す割合
+- seed: 乱数のシード
+
+boto3 のクライアントに直接つなぐ場合は attach(client, "memory://bench") を使います。
+"""
+
+import base64
+import bisect
+import copy
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from decimal import Context, Decimal
+from urllib.parse import parse_qs, urlsplit
+
+from botocore.awsrequest import AWSResponse
+
+SCHEME = "memory"
+
+# DynamoDBの1回の Query / Scan が返す上限（バイト）
+MAX_PAGE_BYTES = 1024 * 1024
+
+# BatchGetItem / BatchWriteItem の1回あたりの上限
+MAX_BATCH_GET = 100
+MAX_BATCH_WRITE = 25
+
+# フェイクのクライアントを作るときの引数（署名のために認証情報が必要）
+CLIENT_KWARGS = {"aws_access_key_id": "fake", "aws_secret_access_key": "fake"}
+
+ERROR_PREFIX = "com.amazonaws.dynamodb.v20120810#"
+
+# before-send に登録するフックの ID（attach し直したときに置き換えるため）
+HOOK_ID = "fake-dynamodb"
+
+# DynamoDBの数値は38桁まで
+NUMBER_CONTEXT = Context(prec=38)
+
+
+class FakeError(Exception):
+    """DynamoDBのエラーレスポンスとして返す例外"""
+
+    def __init__(self, code, message, status=400):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+
+
+def validation_error(message):
+    return FakeError("ValidationException", message)
+
+
+# ---------------------------------------------------------------------------
+# 属性値（{"S": "..."} などのJSON形式）の比較・サイズ
+# ---------------------------------------------------------------------------
+
+def normalize_number(text):
+    """DynamoDBと同じく数値の表記を揃える（"1.50" -> "1.5"）"""
+    number = NUMBER_CONTEXT.create_decimal(text)
+    if number == number.to_integral_value():
+        return format(number.quantize(Decimal(1), context=NUMBER_CONTEXT), "f")
+    return format(number.normalize(NUMBER_CONTEXT), "f")
+
+
+def normalize_value(value):
+    """書き込む属性値の数値の表記を揃えたコピーを返す"""
+    (type_name, raw), = value.items()
+    if type_name == "N":
+        return {"N": normalize_number(raw)}
+    if type_name == "NS":
+        return {"NS": sorted(set(map(normalize_number, raw)), key=Decimal)}
+    if type_name == "M":
+        return {"M": {name: normalize_value(item) for name, item in raw.items()}}
+    if type_name == "L":
+        return {"L": [normalize_value(item) for item in raw]}
+    return value
+
+
+def comparable(value):
+    """
+    属性値を Python で比較できる値にする（型が違う値は等しくならない）
+
+    Returns:
+        tuple: (型, 値)
+    """
+    (type_name, raw), = value.items()
+    if type_name == "N":
+        return ("N", Decimal(raw))
+    if type_name == "B":
+        return ("B", base64.b64decode(raw))
+    if type_name in ("SS", "BS"):
+        return (type_name, frozenset(raw))
+    if type_name == "NS":
+        return (type_name, frozenset(map(Decimal, raw)))
+    if type_name == "L":
+        return ("L", tuple(comparable(item) for item in raw))
+    if type_name == "M":
+        return ("M", frozenset((name, comparable(item)) for name, item in raw.items()))
+    return (type_name, raw)
+
+
+def sort_value(value):
+    """キーの属性値の並び順（S は UTF-8 のバイト順と同じ文字コード順, N は数値順, B はバイト順）"""
+    return comparable(value)[1] if value is not None else ""
+
+
+def value_size(value):
+    """属性値のサイズの目安（バイト）"""
+    (type_name, raw), = value.items()
+    if type_name == "S":
+        return len(raw.encode())
+    if type_name == "N":
+        return len(raw.lstrip("-").replace(".", "")) // 2 + 1
+    if type_name == "B":
+        return len(base64.b64decode(raw))
+    if type_name in ("BOOL", "NULL"):
+        return 1
+    if type_name == "SS":
+        return sum(len(item.encode()) for item in raw)
+    if type_name == "NS":
+        return sum(len(item) // 2 + 1 for item in raw)
+    if type_name == "BS":
+        return sum(len(base64.b64decode(item)) for item in raw)
+    if type_name == "L":
+        return 3 + sum(1 + value_size(item) for item in raw)
+    return 3 + sum(len(name.encode()) + 1 + value_size(item) for name, item in raw.items())
+
+
+def item_size(item):
+    """アイテムのサイズの目安（属性名と属性値のバイト数）"""
+    return sum(len(name.encode()) + value_size(value) for name, value in item.items())
+
+
+# ---------------------------------------------------------------------------
+# 式の解析と評価
+# ---------------------------------------------------------------------------
+
+TOKEN = re.compile(r"""\s*(?:
+    (?P<index>\[\s*\d+\s*\])
+  | (?P<name>\#[A-Za-z0-9_]+)
+  | (?P<value>:[A-Za-z0-9_]+)
+  | (?P<op><>|<=|>=|=|<|>|\(|\)|,|\.|\+|-)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+)""", re.VERBOSE)
+
+KEYWORDS = {"AND", "OR", "NOT", "BETWEEN", "IN", "SET", "REMOVE", "ADD", "DELETE"}
+COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+
+
+class Parser:
+    """
+    DynamoDBの式を構文木（タプル）に変換する
+
+    構文木:
+        ("path", [名前または添字, ...]) / ("value", 属性値) / ("size", path)
+        ("compare", 演算子, 左, 右) / ("between", 値, 下限, 上限) / ("in", 値, [候補, ...])
+        ("and", 左, 右) / ("or", 左, 右) / ("not", 条件) / ("function", 関数名, [引数, ...])
+    """
+
+    def __init__(self, expression, names=None, values=None):
+        self.tokens = self._tokenize(expression)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+        self.used_names = set()
+        self.used_values = set()
+
+    @staticmethod
+    def _tokenize(expression):
+        tokens = []
+        position = 0
+        expression = expression.rstrip()
+        while position < len(expression):
+            match = TOKEN.match(expression, position)
+            if not match or match.end() == position:
+                raise validation_error(f"Invalid expression: unexpected token near '{expression[position:]}'")
+            kind = match.lastgroup
+            text = match.group(kind)
+            if kind == "word" and text.upper() in KEYWORDS:
+                kind, text = "keyword", text.upper()
+            tokens.append((kind, text))
+            position = match.end()
+        return tokens
+
+    def peek(self, kind=None, text=None):
+        if self.position >= len(self.tokens):
+            return None
+        token = self.tokens[self.position]
+        if (kind is None or token[0] == kind) and (text is None or token[1] == text):
+            return token
+        return None
+
+    def take(self, kind=None, text=None):
+        token = self.peek(kind, text)
+        if token is None:
+            found = self.tokens[self.position][1] if self.position < len(self.tokens) else "end of expression"
+            raise validation_error(f"Invalid expression: expected {text or kind}, found '{found}'")
+        self.position += 1
+        return token
+
+    def done(self):
+        if self.position != len(self.tokens):
+            raise validation_error(f"Invalid expression: unexpected token '{self.tokens[self.position][1]}'")
+
+    # 条件式
+    def condition(self):
+        node = self._and()
+        while self.peek("keyword", "OR"):
+            self.take()
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self.peek("keyword", "AND"):
+            self.take()
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self):
+        if self.peek("keyword", "NOT"):
+            self.take()
+            return ("not", self._not())
+        return self._primary()
+
+    def _primary(self):
+        if self.peek("op", "("):
+            self.take()
+            node = self.condition()
+            self.take("op", ")")
+            return node
+        word = self.peek("word")
+        if word and word[1] in ("attribute_exists", "attribute_not_exists", "attribute_type", "begins_with",
+                                "contains") and self._next_is_call():
+            self.take()
+            return ("function", word[1], self._arguments())
+        left = self.operand()
+        if self.peek("keyword", "BETWEEN"):
+            self.take()
+            lower = self.operand()
+            self.take("keyword", "AND")
+            return ("between", left, lower, self.operand())
+        if self.peek("keyword", "IN"):
+            self.take()
+            return ("in", left, self._arguments())
+        operator = self.take("op")[1]
+        if operator not in COMPARATORS:
+            raise validation_error(f"Invalid expression: unexpected operator '{operator}'")
+        return ("compare", operator, left, self.operand())
+
+    def _next_is_call(self):
+        return self.position + 1 < len(self.tokens) and self.tokens[self.position + 1] == ("op", "(")
+
+    def _arguments(self):
+        self.take("op", "(")
+        arguments = [self.operand()]
+        while self.peek("op", ","):
+            self.take()
+            arguments.append(self.operand())
+        self.take("op", ")")
+        return arguments
+
+    # 値
+    def operand(self):
+        token = self.peek("value")
+        if token:
+            self.take()
+            if token[1] not in self.values:
+                raise validation_error(f"An expression attribute value used in expression is not defined: {token[1]}")
+            self.used_values.add(token[1])
+            return ("value", self.values[token[1]])
+        word = self.peek("word")
+        if word and word[1] in ("size", "if_not_exists", "list_append") and self._next_is_call():
+            self.take()
+            arguments = self._arguments()
+            if word[1] == "size":
+                return ("size", arguments[0])
+            return (word[1], *arguments)
+        return self.path()
+
+    def path(self):
+        elements = [self._path_name()]
+        while True:
+            if self.peek("op", "."):
+                self.take()
+                elements.append(self._path_name())
+            elif self.peek("index"):
+                elements.append(int(self.take()[1].strip("[] ")))
+            else:
+                return ("path", elements)
+
+    def _path_name(self):
+        token = self.peek("name")
+        if token:
+            self.take()
+            if token[1] not in self.names:
+                raise validation_error(f"An expression attribute name used in expression is not defined: {token[1]}")
+            self.used_names.add(token[1])
+            return self.names[token[1]]
+        return self.take("word")[1]
+
+    # 更新式
+    def update(self):
+        """
+        Returns:
+            list[tuple]: ("SET", path, 値の式) / ("REMOVE", path) / ("ADD", path, 値) / ("DELETE", path, 値)
+        """
+        actions = []
+        while self.peek():
+            clause = self.take("keyword")[1]
+            if clause not in ("SET", "REMOVE", "ADD", "DELETE"):
+                raise validation_error(f"Invalid UpdateExpression: unexpected keyword '{clause}'")
+            while True:
+                path = self.path()
+                if clause == "SET":
+                    self.take("op", "=")
+                    actions.append(("SET", path, self._set_value()))
+                elif clause == "REMOVE":
+                    actions.append(("REMOVE", path))
+                else:
+                    actions.append((clause, path, self.operand()))
+                if not self.peek("op", ","):
+                    break
+                self.take()
+        if not actions:
+            raise validation_error("Invalid UpdateExpression: the expression is empty")
+        return actions
+
+    def _set_value(self):
+        node = self.operand()
+        if self.peek("op", "+") or self.peek("op", "-"):
+            operator = self.take()[1]
+            node = ("arithmetic", operator, node, self.operand())
+        return node
+
+    def projection(self):
+        paths = [self.path()]
+        while self.peek("op", ","):
+            self.take()
+            paths.append(self.path())
+        return paths
+
+
+def parse(expression, names, values, kind):
+    """式を解析し、使われなかったプレースホルダーがあればDynamoDBと同じくエラーにする"""
+    parser = Parser(expression, names, values)
+    node = getattr(parser, kind)()
+    parser.done()
+    return node, parser
+
+
+def check_unused(parsers, names, values):
+    used_names = set().union(*(parser.used_names for parser in parsers))
+    used_values = set().union(*(parser.used_values for parser in parsers))
+    unused = sorted(set(names or {}) - used_names) + sorted(set(values or {}) - used_values)
+    if unused:
+        raise validation_error(f"Value provided in ExpressionAttributeNames/Values unused in expressions: {unused}")
+
+
+def get_path(item, elements):
+    """アイテムからパスの属性値を取り出す（なければ None）"""
+    value = item.get(elements[0])
+    for element in elements[1:]:
+        if value is None:
+            return None
+        if isinstance(element, int):
+            items = value.get("L")
+            value = items[element] if items is not None and element < len(items) else None
+        else:
+            value = (value.get("M") or {}).get(element)
+    return value
+
+
+def set_path(item, elements, value):
+    """アイテムのパスに属性値を設定する（途中の Map / List は存在している必要がある）"""
+    if len(elements) == 1:
+        item[elements[0]] = value
+        return
+    parent = get_path(item, elements[:-1])
+    last = elements[-1]
+    if isinstance(last, int) and parent is not None and "L" in parent:
+        if last < len(parent["L"]):
+            parent["L"][last] = value
+        else:
+            parent["L"].append(value)
+    elif isinstance(last, str) and parent is not None and "M" in parent:
+        parent["M"][last] = value
+    else:
+        raise validation_error("The document path provided in the update expression is invalid for update")
+
+
+def remove_path(item, elements):
+    if len(elements) == 1:
+        item.pop(elements[0], None)
+        return
+    parent = get_path(item, elements[:-1])
+    last = elements[-1]
+    if isinstance(last, int) and parent is not None and "L" in parent:
+        if last < len(parent["L"]):
+            del parent["L"][last]
+    elif isinstance(last, str) and parent is not None and "M" in parent:
+        parent["M"].pop(last, None)
+
+
+def evaluate_operand(node, item):
+    kind = node[0]
+    if kind == "value":
+        return node[1]
+    if kind == "path":
+        return get_path(item, node[1])
+    if kind == "size":
+        value = evaluate_operand(node[1], item)
+        if value is None:
+            return None
+        (type_name, raw), = value.items()
+        if type_name == "S":
+            return {"N": str(len(raw.encode()))}
+        if type_name == "B":
+            return {"N": str(len(base64.b64decode(raw)))}
+        if type_name in ("SS", "NS", "BS", "L", "M"):
+            return {"N": str(len(raw))}
+        return None
+    if kind == "if_not_exists":
+        value = evaluate_operand(node[1], item)
+        return value if value is not None else evaluate_operand(node[2], item)
+    if kind == "list_append":
+        left, right = evaluate_operand(node[1], item), evaluate_operand(node[2], item)
+        if left is None or right is None or "L" not in left or "L" not in right:
+            raise validation_error("An operand in the update expression has an incorrect data type")
+        return {"L": left["L"] + right["L"]}
+    if kind == "arithmetic":
+        left, right = evaluate_operand(node[2], item), evaluate_operand(node[3], item)
+        if left is None or right is None or "N" not in left or "N" not in right:
+            raise validation_error("An operand in the update expression has an incorrect data type")
+        left, right = Decimal(left["N"]), Decimal(right["N"])
+        result = NUMBER_CONTEXT.add(left, right) if node[1] == "+" else NUMBER_CONTEXT.subtract(left, right)
+        return {"N": normalize_number(str(result))}
+    raise validation_error(f"Invalid operand: {kind}")
+
+
+def compare(operator, left, right):
+    if left is None or right is None:
+        return False
+    left, right = comparable(left), comparable(right)
+    if operator == "=":
+        return left == right
+    if operator == "<>":
+        return left != right
+    # 大小の比較は同じ型のスカラー（S / N / B）どうしだけ
+    if left[0] != right[0] or left[0] not in ("S", "N", "B"):
+        return False
+    if operator == "<":
+        return left[1] < right[1]
+    if operator == "<=":
+        return left[1] <= right[1]
+    if operator == ">":
+        return left[1] > right[1]
+    return left[1] >= right[1]
+
+
+def evaluate(node, item):
+    """条件式の構文木をアイテムに対して評価する"""
+    kind = node[0]
+    if kind == "and":
+        return evaluate(node[1], item) and evaluate(node[2], item)
+    if kind == "or":
+        return evaluate(node[1], item) or evaluate(node[2], item)
+    if kind == "not":
+        return not evaluate(node[1], item)
+    if kind == "compare":
+        return compare(node[1], evaluate_operand(node[2], item), evaluate_operand(node[3], item))
+    if kind == "between":
+        value = evaluate_operand(node[1], item)
+        return (compare(">=", value, evaluate_operand(node[2], item))
+                and compare("<=", value, evaluate_operand(node[3], item)))
+    if kind == "in":
+        value = evaluate_operand(node[1], item)
+        return any(compare("=", value, evaluate_operand(candidate, item)) for candidate in node[2])
+    if kind == "function":
+        name, arguments = node[1], node[2]
+        value = evaluate_operand(arguments[0], item)
+        if name == "attribute_exists":
+            return value is not None
+        if name == "attribute_not_exists":
+            return value is None
+        if value is None:
+            return False
+        operand = evaluate_operand(arguments[1], item)
+        if name == "attribute_type":
+            return operand is not None and next(iter(value)) == operand.get("S")
+        if name == "begins_with":
+            if operand is None:
+                return False
+            (type_name, raw), = value.items()
+            (operand_type, prefix), = operand.items()
+            if type_name != operand_type or type_name not in ("S", "B"):
+                return False
+            if type_name == "B":
+                return base64.b64decode(raw).startswith(base64.b64decode(prefix))
+            return raw.startswith(prefix)
+        if name == "contains":
+            if operand is None:
+                return False
+            (type_name, raw), = value.items()
+            if type_name == "S":
+                return "S" in operand and operand["S"] in raw
+            target = comparable(operand)
+            if type_name == "L":
+                return any(comparable(member) == target for member in raw)
+            if type_name in ("SS", "NS", "BS"):
+                return any(comparable({type_name[0]: member}) == target for member in raw)
+            return False
+    raise validation_error(f"Invalid condition: {kind}")
+
+
+def apply_update(item, actions):
+    """
+    更新式をアイテムに適用した新しいアイテムを返す
+
+    DynamoDBと同じく、右辺の値はすべて更新前のアイテムで評価してから設定します。
+    """
+    updated = copy.deepcopy(item)
+    resolved = []
+    for action in actions:
+        if action[0] == "SET":
+            resolved.append(("SET", action[1][1], normalize_value(evaluate_operand(action[2], item))))
+        elif action[0] == "REMOVE":
+            resolved.append(("REMOVE", action[1][1], None))
+        else:
+            resolved.append((action[0], action[1][1], normalize_value(evaluate_operand(action[2], item))))
+    for operation, elements, value in resolved:
+        if operation == "SET":
+            set_path(updated, elements, value)
+        elif operation == "REMOVE":
+            remove_path(updated, elements)
+        elif operation == "ADD":
+            current = get_path(updated, elements)
+            (type_name, raw), = value.items()
+            if current is None:
+                set_path(updated, elements, value)
+            elif type_name == "N" and "N" in current:
+                set_path(updated, elements,
+                         {"N": normalize_number(str(NUMBER_CONTEXT.add(Decimal(current["N"]), Decimal(raw))))})
+            elif type_name in current and type_name in ("SS", "NS", "BS"):
+                members = list(dict.fromkeys(current[type_name] + raw))
+                set_path(updated, elements, normalize_value({type_name: members}))
+            else:
+                raise validation_error("An operand in the update expression has an incorrect data type")
+        else:  # DELETE（セットから要素を取り除く）
+            current = get_path(updated, elements)
+            (type_name, raw), = value.items()
+            if current is not None and type_name in current:
+                remaining = [member for member in current[type_name] if member not in set(raw)]
+                if remaining:
+                    set_path(updated, elements, {type_name: remaining})
+                else:
+                    remove_path(updated, elements)
+    return updated
+
+
+def project(item, paths):
+    """ProjectionExpression のパスだけを含むアイテムを返す"""
+    if paths is None:
+        return item
+    result = {}
+    for elements in paths:
+        value = get_path(item, elements)
+        if value is None:
+            continue
+        if len(elements) == 1:
+            result[elements[0]] = value
+            continue
+        # 入れ子のパスは、途中の Map / List を作って設定する（List の添字は詰める）
+        target = result
+        for position, element in enumerate(elements[:-1]):
+            following = elements[position + 1]
+            container = {"L": []} if isinstance(following, int) else {"M": {}}
+            if isinstance(target, dict) and "L" not in target and "M" not in target:
+                target = target.setdefault(element, container)
+            elif "M" in target:
+                target = target["M"].setdefault(element, container)
+            else:
+                target["L"].append(container)
+                target = container
+        last = elements[-1]
+        if "M" in target:
+            target["M"][last] = value
+        else:
+            target["L"].append(value)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# テーブルとデータベース
+# ---------------------------------------------------------------------------
+
+class Index:
+    """グローバル・ローカルセカンダリインデックス（パーティションごとにアイテムを持つ）"""
+
+    def __init__(self, name, hash_key, range_key, projection):
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.projection_type = projection.get("ProjectionType", "ALL")
+        self.non_key_attributes = projection.get("NonKeyAttributes") or []
+        self.partitions = {}
+
+
+class Table:
+    """1つのテーブル（キーごとのアイテムと、パーティションごとの並び順）"""
+
+    def __init__(self, definition):
+        self.name = definition["TableName"]
+        self.definition = definition
+        self.hash_key, self.range_key = self._key_schema(definition["KeySchema"])
+        self.items = {}
+        self.partitions = {}
+        self.indexes = {}
+        self.attribute_types = {definition["AttributeName"]: definition["AttributeType"]
+                                for definition in definition.get("AttributeDefinitions") or []}
+        for index in (definition.get("GlobalSecondaryIndexes") or []) + (definition.get("LocalSecondaryIndexes") or []):
+            hash_key, range_key = self._key_schema(index["KeySchema"])
+            self.indexes[index["IndexName"]] = Index(index["IndexName"], hash_key, range_key,
+                                                     index.get("Projection") or {})
+        self._scan_cache = {}
+
+    @staticmethod
+    def _key_schema(key_schema):
+        keys = {element["KeyType"]: element["AttributeName"] for element in key_schema}
+        return keys["HASH"], keys.get("RANGE")
+
+    def key_attributes(self):
+        return [name for name in (self.hash_key, self.range_key) if name]
+
+    def key_of(self, item, check=True):
+        """アイテムまたはキーから、内部で使うキー（比較できるタプル）を返す"""
+        hash_value = item.get(self.hash_key)
+        range_value = item.get(self.range_key) if self.range_key else None
+        if check and (hash_value is None or (self.range_key and range_value is None)):
+            raise validation_error("The provided key element does not match the schema")
+        return (comparable(hash_value), comparable(range_value) if range_value is not None else None)
+
+    def key_item(self, item):
+        return {name: item[name] for name in self.key_attributes()}
+
+    def validate_key(self, key):
+        if set(key) != set(self.key_attributes()):
+            raise validation_error("The provided key element does not match the schema")
+        return self.key_of(key)
+
+    def validate_index_keys(self, item):
+        """インデックスのキー属性の型が AttributeDefinitions と一致することを確認する（NULL も拒否する）"""
+        for index in self.indexes.values():
+            for name in (index.hash_key, index.range_key):
+                value = item.get(name) if name else None
+                expected = self.attribute_types.get(name)
+                if value is not None and expected and next(iter(value)) != expected:
+                    raise validation_error(
+                        f"One or more parameter values were invalid: Type mismatch for Index Key {name} "
+                        f"Expected: {expected} Actual: {next(iter(value))} IndexName: {index.name}")
+
+    def put(self, item):
+        """アイテムを保存し、以前のアイテムを返す"""
+        self.validate_index_keys(item)
+        key = self.key_of(item)
+        old = self.items.get(key)
+        self._unindex(key, old)
+        self.items[key] = item
+        self.partitions.setdefault(key[0], {})[key] = item
+        for index in self.indexes.values():
+            hash_value = item.get(index.hash_key)
+            if hash_value is not None and (index.range_key is None or index.range_key in item):
+                index.partitions.setdefault(comparable(hash_value), {})[key] = item
+        if old is None:
+            self._scan_cache.clear()
+        return old
+
+    def delete(self, key):
+        old = self.items.pop(key, None)
+        self._unindex(key, old)
+        if old is not None:
+            self._scan_cache.clear()
+        return old
+
+    def _unindex(self, key, old):
+        if old is None:
+            return
+        self.partitions.get(key[0], {}).pop(key, None)
+        for index in self.indexes.values():
+            hash_value = old.get(index.hash_key)
+            if hash_value is not None:
+                index.partitions.get(comparable(hash_value), {}).pop(key, None)
+
+    @staticmethod
+    def scan_position(key):
+        """Scan の並び順（パーティションキーのハッシュ順）での位置"""
+        return (zlib.crc32(repr(key[0]).encode()), key)
+
+    def scan_order(self, segment=0, total_segments=1):
+        """
+        セグメントのキーを Scan の並び順で返す（書き込みでキーが増減するまで再利用する）
+
+        Returns:
+            list[tuple]: (並び順での位置, キー) の一覧
+        """
+        cache_key = (segment, total_segments)
+        order = self._scan_cache.get(cache_key)
+        if order is None:
+            positions = sorted(self.scan_position(key) for key in self.items)
+            order = self._scan_cache[cache_key] = [(position, position[1]) for position in positions
+                                                   if position[0] % total_segments == segment]
+        return order
+
+    def describe(self):
+        return {
+            "TableName": self.name,
+            "TableStatus": "ACTIVE",
+            "KeySchema": self.definition["KeySchema"],
+            "AttributeDefinitions": self.definition.get("AttributeDefinitions", []),
+            "ItemCount": len(self.items),
+            "TableSizeBytes": sum(item_size(item) for item in self.items.values()),
+            "TableArn": f"arn:aws:dynamodb:fake:000000000000:table/{self.name}",
+            "GlobalSecondaryIndexes": [
+                {"IndexName": index.name, "IndexStatus": "ACTIVE",
+                 "KeySchema": [{"AttributeName": index.hash_key, "KeyType": "HASH"}]
+                 + ([{"AttributeName": index.range_key, "KeyType": "RANGE"}] if index.range_key else []),
+                 "Projection": {"ProjectionType": index.projection_type}}
+                for index in self.indexes.values()
+            ],
+        }
+
+
+def read_units(size):
+    # 結果整合性のある読み込み（4KBごとに0.5）
+    return max(1, -(-size // 4096)) * 0.5
+
+
+def write_units(size):
+    return float(max(1, -(-size // 1024)))
+
+
+class Database:
+    """
+    プロセス内のテーブルの集まり
+
+    書き込みのたびに、DynamoDB Streams と同じ形式のレコードを add_stream_listener で登録した関数に渡せます
+    （SyncTodoTags のようなストリームのハンドラーを同期的に呼び出す場合に使う）。
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.lock = threading.RLock()
+        self.stream_listeners = {}
+
+    # テーブルの管理
+    def create_table(self, definition):
+        with self.lock:
+            if definition["TableName"] in self.tables:
+                raise FakeError("ResourceInUseException", f"Table already exists: {definition['TableName']}")
+            table = self.tables[definition["TableName"]] = Table(definition)
+            return table
+
+    def load_template(self, path):
+        """テンプレートの AWS::DynamoDB::Table からテーブルを作る（作成済みのテーブルは飛ばす）"""
+        import yaml
+
+        class Loader(yaml.SafeLoader):
+            pass
+
+        # !Ref や !Sub などの組み込み関数は値として使わないため、そのまま読み込む
+        Loader.add_multi_constructor("!", lambda loader, suffix, node: None)
+        with open(path, encoding="utf-8") as f:
+            template = yaml.load(f, Loader=Loader) or {}
+        created = []
+        for resource in (template.get("Resources") or {}).values():
+            if resource.get("Type") != "AWS::DynamoDB::Table":
+                continue
+            properties = resource.get("Properties") or {}
+            if not isinstance(properties.get("TableName"), str) or properties["TableName"] in self.tables:
+                continue
+            created.append(self.create_table(properties).name)
+        return created
+
+    def table(self, name):
+        table = self.tables.get(name)
+        if table is None:
+            raise FakeError("ResourceNotFoundException", f"Requested resource not found: Table: {name} not found")
+        return table
+
+    def add_stream_listener(self, table_name, listener):
+        """テーブルへの書き込みごとに listener(record) を呼び出す"""
+        self.stream_listeners.setdefault(table_name, []).append(listener)
+
+    def _notify(self, table, old, new):
+        listeners = self.stream_listeners.get(table.name)
+        if not listeners or (old is None and new is None):
+            return
+        record = {
+            "eventID": uuid.uuid4().hex,
+            "eventName": "INSERT" if old is None else "REMOVE" if new is None else "MODIFY",
+            "eventSource": "aws:dynamodb",
+            "dynamodb": {"Keys": table.key_item(new or old), "StreamViewType": "NEW_AND_OLD_IMAGES"},
+        }
+        if new is not None:
+            record["dynamodb"]["NewImage"] = copy.deepcopy(new)
+        if old is not None:
+            record["dynamodb"]["OldImage"] = copy.deepcopy(old)
+        for listener in listeners:
+            listener(record)
+
+    # 操作
+    def handle(self, operation, request, **options):
+        """
+        操作名（PutItem など）とリクエストのJSONから、レスポンスのJSONを返す
+
+        Args:
+            operation (str): 操作名
+            request (dict): リクエストのJSON
+            **options: バッチ操作に渡す unprocessed_rate と rng
+        """
+        handler = getattr(self, "op_" + re.sub(r"(?<!^)(?=[A-Z])", "_", operation).lower(), None)
+        if handler is None:
+            raise FakeError("UnknownOperationException", f"The fake does not support {operation}")
+        if operation not in ("BatchGetItem", "BatchWriteItem"):
+            options = {}
+        notifications = []
+        with self.lock:
+            response = handler(request, notifications, **options)
+        # リスナーの中でDynamoDBを呼び出せるよう、ロックの外で通知する
+        for table, old, new in notifications:
+            self._notify(table, old, new)
+        return response
+
+    @staticmethod
+    def _condition(request, table, parsers):
+        expression = request.get("ConditionExpression")
+        if expression is None:
+            return None
+        node, parser = parse(expression, request.get("ExpressionAttributeNames"),
+                             request.get("ExpressionAttributeValues"), "condition")
+        parsers.append(parser)
+        return node
+
+    @staticmethod
+    def _projection(request, parsers):
+        expression = request.get("ProjectionExpression")
+        if expression is None:
+            attributes = request.get("AttributesToGet")
+            return [[name] for name in attributes] if attributes else None
+        node, parser = parse(expression, request.get("ExpressionAttributeNames"), {}, "projection")
+        parsers.append(parser)
+        return [path[1] for path in node]
+
+    @staticmethod
+    def _capacity(request, table_name, units):
+        if request.get("ReturnConsumedCapacity") in ("TOTAL", "INDEXES"):
+            return {"ConsumedCapacity": {"TableName": table_name, "CapacityUnits": units}}
+        return {}
+
+    @staticmethod
+    def _check(node, item):
+        if node is not None and not evaluate(node, item or {}):
+            raise FakeError("ConditionalCheckFailedException", "The conditional request failed")
+
+    def op_create_table(self, request, notifications):
+        return {"TableDescription": self.create_table(request).describe()}
+
+    def op_delete_table(self, request, notifications):
+        table = self.table(request["TableName"])
+        del self.tables[table.name]
+        return {"TableDescription": table.describe()}
+
+    def op_describe_table(self, request, notifications):
+        return {"Table": self.table(request["TableName"]).describe()}
+
+    def op_list_tables(self, request, notifications):
+        return {"TableNames": sorted(self.tables)}
+
+    def op_put_item(self, request, notifications):
+        table = self.table(request["TableName"])
+        item = {name: normalize_value(value) for name, value in request["Item"].items()}
+        parsers = []
+        condition = self._condition(request, table, parsers)
+        check_unused(parsers, request.get("ExpressionAttributeNames"), request.get("ExpressionAttributeValues"))
+        key = table.key_of(item)
+        old = table.items.get(key)
+        self._check(condition, old)
+        table.put(item)
+        notifications.append((table, old, item))
+        response = self._capacity(request, table.name, write_units(item_size(item)))
+        if request.get("ReturnValues") == "ALL_OLD" and old is not None:
+            response["Attributes"] = old
+        return response
+
+    def op_get_item(self, request, notifications):
+        table = self.table(request["TableName"])
+        parsers = []
+        paths = self._projection(request, parsers)
+        check_unused(parsers, request.get("ExpressionAttributeNames"), None)
+        item = table.items.get(table.validate_key(request["Key"]))
+        response = self._capacity(request, table.name, read_units(item_size(item) if item else 0))
+        if item is not None:
+            response["Item"] = project(item, paths)
+        return response
+
+    def op_update_item(self, request, notifications):
+        table = self.table(request["TableName"])
+        names, values = request.get("ExpressionAttributeNames"), request.get("ExpressionAttributeValues")
+        parsers = []
+        condition = self._condition(request, table, parsers)
+        actions = None
+        if request.get("UpdateExpression"):
+            actions, parser = parse(request["UpdateExpression"], names, values, "update")
+            parsers.append(parser)
+        check_unused(parsers, names, values)
+        key = table.validate_key(request["Key"])
+        old = table.items.get(key)
+        self._check(condition, old)
+        new = apply_update(old if old is not None else dict(request["Key"]), actions or [])
+        for name in table.key_attributes():
+            if comparable(new.get(name) or {"NULL": True}) != comparable(request["Key"][name]):
+                raise validation_error("Cannot update attribute " + name + ". This attribute is part of the key")
+        table.put(new)
+        notifications.append((table, old, new))
+        response = self._capacity(request, table.name, write_units(item_size(new)))
+        return_values = request.get("ReturnValues", "NONE")
+        if return_values == "ALL_NEW":
+            response["Attributes"] = new
+        elif return_values == "ALL_OLD" and old is not None:
+            response["Attributes"] = old
+        elif return_values in ("UPDATED_NEW", "UPDATED_OLD"):
+            source = new if return_values == "UPDATED_NEW" else (old or {})
+            updated = {action[1][1][0] for action in actions or []}
+            response["Attributes"] = {name: source[name] for name in updated if name in source}
+        return response
+
+    def op_delete_item(self, request, notifications):
+        table = self.table(request["TableName"])
+        parsers = []
+        condition = self._condition(request, table, parsers)
+        check_unused(parsers, request.get("ExpressionAttributeNames"), request.get("ExpressionAttributeValues"))
+        key = table.validate_key(request["Key"])
+        old = table.items.get(key)
+        self._check(condition, old)
+        table.delete(key)
+        notifications.append((table, old, None))
+        response = self._capacity(request, table.name, write_units(item_size(old) if old else 0))
+        if request.get("ReturnValues") == "ALL_OLD" and old is not None:
+            response["Attributes"] = old
+        return response
+
+    def _index(self, table, request):
+        if not request.get("IndexName"):
+            return None
+        index = table.indexes.get(request["IndexName"])
+        if index is None:
+            raise validation_error(f"The table does not have the specified index: {request['IndexName']}")
+        return index
+
+    def op_query(self, request, notifications):
+        table = self.table(request["TableName"])
+        index = self._index(table, request)
+        hash_key = index.hash_key if index else table.hash_key
+        range_key = index.range_key if index else table.range_key
+        names, values = request.get("ExpressionAttributeNames"), request.get("ExpressionAttributeValues")
+
+        key_condition, parser = parse(request["KeyConditionExpression"], names, values, "condition")
+        hash_value = self._hash_value(key_condition, hash_key)
+        partition = (index.partitions if index else table.partitions).get(comparable(hash_value)) or {}
+
+        # ソートキー（インデックスではキーが重複するためテーブルのキーも使う）の順に並べる
+        def position(key, item):
+            return (sort_value(item.get(range_key)) if range_key else "", key)
+
+        entries = sorted((position(key, item), key) for key, item in partition.items())
+        return self._page(request, table, index, entries, partition.get, position, key_condition, [parser])
+
+    @staticmethod
+    def _hash_value(node, hash_key):
+        """キー条件からパーティションキーの値（hash_key = :value）を取り出す"""
+        nodes = [node]
+        while nodes:
+            current = nodes.pop()
+            if current[0] == "and":
+                nodes.extend(current[1:])
+            elif (current[0] == "compare" and current[1] == "=" and current[2] == ("path", [hash_key])
+                  and current[3][0] == "value"):
+                return current[3][1]
+        raise validation_error("Query condition missed key schema element: " + hash_key)
+
+    def op_scan(self, request, notifications):
+        table = self.table(request["TableName"])
+        index = self._index(table, request)
+        entries = table.scan_order(request.get("Segment", 0), request.get("TotalSegments") or 1)
+        if index is not None:
+            entries = [(position, key) for position, key in entries
+                       if index.hash_key in table.items[key]
+                       and (index.range_key is None or index.range_key in table.items[key])]
+        return self._page(request, table, index, entries, table.items.get,
+                          lambda key, item: table.scan_position(key), None, [])
+
+    def _page(self, request, table, index, entries, lookup, position, key_condition, parsers):
+        """
+        Query / Scan の1ページ分を返す（Limit と1MBの上限, ExclusiveStartKey, FilterExpression）
+
+        Args:
+            entries (list[tuple]): 並び順の位置とキーの組（位置の順に並んでいる）
+            lookup (callable): キーからアイテムを返す関数
+            position (callable): キーとアイテムから並び順の位置を返す関数（ExclusiveStartKey の位置を求める）
+        """
+        names, values = request.get("ExpressionAttributeNames"), request.get("ExpressionAttributeValues")
+        filter_node = None
+        if request.get("FilterExpression"):
+            filter_node, parser = parse(request["FilterExpression"], names, values, "condition")
+            parsers.append(parser)
+        paths = self._projection(request, parsers)
+        check_unused(parsers, names, values)
+
+        reverse = request.get("ScanIndexForward") is False
+        start = 0
+        if request.get("ExclusiveStartKey"):
+            # 削除されたアイテムのキーでも、並び順で次の位置から続けられるよう二分探索する
+            start_key = request["ExclusiveStartKey"]
+            start_position = (position(table.key_of(start_key), start_key), table.key_of(start_key))
+            start = bisect.bisect_left(entries, start_position) if reverse else bisect.bisect_right(entries, start_position)
+        if reverse:
+            entries = entries[:start][::-1] if request.get("ExclusiveStartKey") else entries[::-1]
+            start = 0
+
+        limit = request.get("Limit")
+        items, scanned, size = [], 0, 0
+        last_item = None
+        for _, key in itertools.islice(entries, start, None):
+            item = lookup(key)
+            if key_condition is not None and not evaluate(key_condition, item):
+                continue
+            scanned += 1
+            size += item_size(item)
+            if filter_node is None or evaluate(filter_node, item):
+                items.append(project(self._index_projection(table, index, item), paths))
+            if (limit and scanned >= limit) or size >= MAX_PAGE_BYTES:
+                last_item = item
+                break
+
+        response = {"Count": len(items), "ScannedCount": scanned}
+        if request.get("Select") != "COUNT":
+            response["Items"] = items
+        if last_item is not None:
+            key_names = table.key_attributes() + ([index.hash_key, index.range_key] if index else [])
+            response["LastEvaluatedKey"] = {name: last_item[name] for name in key_names if name and name in last_item}
+        response.update(self._capacity(request, table.name, read_units(size)))
+        return response
+
+    @staticmethod
+    def _index_projection(table, index, item):
+        if index is None or index.projection_type == "ALL":
+            return item
+        names = set(table.key_attributes()) | {index.hash_key, index.range_key}
+        if index.projection_type == "INCLUDE":
+            names.update(index.non_key_attributes)
+        return {name: value for name, value in item.items() if name in names}
+
+    def op_batch_get_item(self, request, notifications, unprocessed_rate=0.0, rng=random):
+        request_items = request["RequestItems"]
+        if sum(len(entry["Keys"]) for entry in request_items.values()) > MAX_BATCH_GET:
+            raise validation_error("Too many items requested for the BatchGetItem call")
+        responses, unprocessed, capacity = {}, {}, []
+        for table_name, entry in request_items.items():
+            table = self.table(table_name)
+            parsers = []
+            paths = self._projection(entry, parsers)
+            check_unused(parsers, entry.get("ExpressionAttributeNames"), None)
+            found, pending, size = [], [], 0
+            for key in entry["Keys"]:
+                if rng.random() < unprocessed_rate:
+                    pending.append(key)
+                    continue
+                item = table.items.get(table.validate_key(key))
+                if item is not None:
+                    size += item_size(item)
+                    found.append(project(item, paths))
+            responses[table_name] = found
+            if pending:
+                unprocessed[table_name] = dict(entry, Keys=pending)
+            capacity.append({"TableName": table_name, "CapacityUnits": read_units(size)})
+        response = {"Responses": responses, "UnprocessedKeys": unprocessed}
+        if request.get("ReturnConsumedCapacity") in ("TOTAL", "INDEXES"):
+            response["ConsumedCapacity"] = capacity
+        return response
+
+    def op_batch_write_item(self, request, notifications, unprocessed_rate=0.0, rng=random):
+        request_items = request["RequestItems"]
+        if sum(len(requests) for requests in request_items.values()) > MAX_BATCH_WRITE:
+            raise validation_error("Too many items requested for the BatchWriteItem call")
+        unprocessed, capacity = {}, []
+        for table_name, requests in request_items.items():
+            table = self.table(table_name)
+            keys = [table.key_of(write.get("PutRequest", {}).get("Item") or write["DeleteRequest"]["Key"])
+                    for write in requests]
+            if len(set(keys)) != len(keys):
+                raise validation_error("Provided list of item keys contains duplicates")
+            for write in requests:
+                if "PutRequest" in write:
+                    table.validate_index_keys(write["PutRequest"]["Item"])
+            units = 0.0
+            for write in requests:
+                if rng.random() < unprocessed_rate:
+                    unprocessed.setdefault(table_name, []).append(write)
+                    continue
+                if "PutRequest" in write:
+                    item = {name: normalize_value(value) for name, value in write["PutRequest"]["Item"].items()}
+                    notifications.append((table, table.put(item), item))
+                    units += write_units(item_size(item))
+                else:
+                    old = table.delete(table.validate_key(write["DeleteRequest"]["Key"]))
+                    notifications.append((table, old, None))
+                    units += write_units(item_size(old) if old else 0)
+            capacity.append({"TableName": table_name, "CapacityUnits": units})
+        response = {"UnprocessedItems": unprocessed}
+        if request.get("ReturnConsumedCapacity") in ("TOTAL", "INDEXES"):
+            response["ConsumedCapacity"] = capacity
+        return response
+
+
+# ---------------------------------------------------------------------------
+# botocore への接続
+# ---------------------------------------------------------------------------
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(name="default"):
+    """名前ごとのデータベース（プロセス内で共有する）を返す"""
+    with _databases_lock:
+        database = _databases.get(name)
+        if database is None:
+            database = _databases[name] = Database()
+        return database
+
+
+def reset(name=None):
+    """データベースを破棄する（name を省略するとすべて）"""
+    with _databases_lock:
+        if name is None:
+            _databases.clear()
+        else:
+            _databases.pop(name, None)
+
+
+class RawBody:
+    """AWSResponse に渡すレスポンスボディ"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+class Endpoint:
+    """
+    before-send フックとしてリクエストを受け取り、データベースの結果を返すエンドポイント
+
+    Args:
+        database (Database): データベース
+        latency_ms (float): 1回の呼び出しごとに待つ時間（ミリ秒）
+        jitter_ms (float): 待ち時間に加える0からjitter_msまでのばらつき（ミリ秒）
+        throttle_rate (float): スロットリングのエラーを返す割合
+        unprocessed_rate (float): バッチ操作で未処理として返す割合
+        seed (int | None): 乱数のシード
+    """
+
+    def __init__(self, database, latency_ms=0.0, jitter_ms=0.0, throttle_rate=0.0, unprocessed_rate=0.0, seed=None):
+        self.database = database
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.unprocessed_rate = unprocessed_rate
+        self.random = random.Random(seed)
+        self.calls = {}
+
+    @classmethod
+    def from_url(cls, url):
+        """memory://<名前>?latency_ms=... の形式のURLからエンドポイントを作る"""
+        parts = urlsplit(url)
+        if parts.scheme != SCHEME:
+            raise ValueError(f"{SCHEME}:// のURLを指定してください: {url}")
+        options = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        database = get_database(parts.netloc or "default")
+        for template in parse_qs(parts.query).get("template", []):
+            database.load_template(template)
+        return cls(
+            database,
+            latency_ms=float(options.get("latency_ms", 0)),
+            jitter_ms=float(options.get("jitter_ms", 0)),
+            throttle_rate=float(options.get("throttle_rate", 0)),
+            unprocessed_rate=float(options.get("unprocessed_rate", 0)),
+            seed=int(options["seed"]) if "seed" in options else None,
+        )
+
+    def _wait(self):
+        delay = self.latency_ms + (self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def handle(self, operation, request):
+        """
+        操作を実行してHTTPステータスとレスポンスのJSONを返す
+
+        Returns:
+            tuple[int, dict]: ステータスコードとレスポンス
+        """
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self._wait()
+        try:
+            if self.throttle_rate and self.random.random() < self.throttle_rate:
+                raise FakeError("ProvisionedThroughputExceededException",
+                                "The level of configured provisioned throughput for the table was exceeded")
+            return 200, self.database.handle(operation, request, unprocessed_rate=self.unprocessed_rate,
+                                             rng=self.random)
+        except FakeError as e:
+            return e.status, {"__type": ERROR_PREFIX + e.code, "message": e.message}
+
+    def __call__(self, request, **kwargs):
+        target = request.headers.get("X-Amz-Target")
+        if isinstance(target, bytes):
+            target = target.decode()
+        operation = target.split(".", 1)[1]
+        status, body = self.handle(operation, json.loads(request.body or b"{}"))
+        headers = {"x-amzn-RequestId": uuid.uuid4().hex, "Content-Type": "application/x-amz-json-1.0"}
+        return AWSResponse(request.url, status, headers, RawBody(json.dumps(body).encode()))
+
+
+def attach(client, url="memory://default"):
+    """
+    boto3 のDynamoDBクライアントの送信をフェイクに置き換える
+
+    Args:
+        client: boto3.client("dynamodb")（リソースの場合は resource.meta.client）
+        url (str): memory:// のURL
+
+    Returns:
+        Endpoint: 接続したエンドポイント（calls で操作ごとの呼び出し回数を確認できる）
+
+    同じクライアントに再び attach すると、前のエンドポイントと置き換えます。
+    """
+    endpoint = Endpoint.from_url(url)
+    client.meta.events.unregister("before-send.dynamodb", unique_id=HOOK_ID)
+    client.meta.events.register("before-send.dynamodb", endpoint, unique_id=HOOK_ID)
+    return endpoint
+
+
+def install(aws_clients):
+    """
+    共通レイヤーの aws_clients で、memory:// のエンドポイントのクライアント・リソースをこのフェイクにつなぐ
+
+    Args:
+        aws_clients: 読み込んだ aws_clients モジュール
+    """
+    def create(factory, service_name, url, config):
+        created = factory(service_name, region_name=aws_clients.get_session().region_name or "ap-northeast-1",
+                          config=config, **CLIENT_KWARGS)
+        attach(getattr(created.meta, "client", created), url)
+        return created
+
+    aws_clients.register_endpoint("memory://", create)
@@ -0,0 +1,129 @@
+"""
+DynamoDBのアイテムをレスポンスの形に変換する関数を生成するツール
+
+tools/models.py のモデルごとに、次の2つの関数を CommonLayer/todo_format.py に書き出します。
+
+- format_<モデル名>(item): 1件を変換する（フィールドごとの取り出しと既定値を直接書いたコード）
+- format_<モデル名>_list(items): 一覧を変換する（関数呼び出しを挟まない内包表記）
+
+lecture5 の generate-schema と同じく、生成元のハッシュをファイルの先頭に書き込み、
+モデルが変わっていない場合は書き換えません。
+
+使い方:
+    python tools/generate_formatters.py
+    python tools/generate_formatters.py --check   # 生成済みのファイルが最新かどうかだけを確認する
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+import models
+
+OUTPUT_PATH = os.path.join(os.path.dirname(__file__), "..", "todo_service", "CommonLayer", "todo_format.py")
+
+HASH_PREFIX = "# source-hash: "
+HEADER = '''"""
+DynamoDBのアイテムをレスポンスの形に変換する関数
+
+このファイルは tools/generate_formatters.py で生成されます。直接編集しないでください。
+フィールドを変更する場合は tools/models.py を編集して再生成してください。
+"""
+'''
+
+
+def snake_case(name):
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def literal(value):
+    # 文字列は他のモジュールと同じくダブルクォートで書く
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, str) else repr(value)
+
+
+def field_expressions(model_class):
+    """
+    フィールドごとに、アイテムから値を取り出す式を作る
+
+    Returns:
+        list[tuple[str, str]]: フィールド名と式
+    """
+    expressions = []
+    for name, field in model_class.model_fields.items():
+        if field.default_factory is not None:
+            default = field.default_factory()
+        elif field.default is PydanticUndefined:
+            # 必須のフィールドはアイテムに必ずある
+            expressions.append((name, f"item[{literal(name)}]"))
+            continue
+        else:
+            default = field.default
+        arguments = literal(name) if default is None else f"{literal(name)}, {literal(default)}"
+        expressions.append((name, f"item.get({arguments})"))
+    return expressions
+
+
+def generate_model(model_class):
+    """1つのモデルの整形関数のコードを作る"""
+    function_name = f"format_{snake_case(model_class.__name__)}"
+    fields = "".join(f"        {literal(name)}: {expression},\n" for name, expression in field_expressions(model_class))
+    return (
+        f"\n\ndef {function_name}(item):\n"
+        f"    return {{\n{fields}    }}\n"
+        f"\n\ndef {function_name}_list(items):\n"
+        f"    return [{{\n{fields}    }} for item in items]\n"
+    )
+
+
+def source_hash(model_classes):
+    # モデルの定義（フィールド・既定値）と生成処理が同じなら、生成されるコードも同じになる
+    source = json.dumps([model_class.model_json_schema() for model_class in model_classes], sort_keys=True,
+                        ensure_ascii=False)
+    with open(__file__, "rb") as f:
+        generator = f.read()
+    return hashlib.sha256(source.encode() + generator).hexdigest()
+
+
+def read_hash(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        for line in f:
+            if line.startswith(HASH_PREFIX):
+                return line[len(HASH_PREFIX):].strip()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="レスポンス整形関数を生成する")
+    parser.add_argument("--check", action="store_true", help="生成済みのファイルが最新でなければ終了コード1で終了する")
+    parser.add_argument("--force", action="store_true", help="ハッシュが変わっていなくても再生成する")
+    args = parser.parse_args()
+
+    model_classes = [getattr(models, name) for name in models.__all__]
+    for model_class in model_classes:
+        if not issubclass(model_class, BaseModel):
+            raise ValueError(f"Model {model_class.__name__} is not a valid Pydantic model")
+
+    digest = source_hash(model_classes)
+    if not args.force and read_hash(OUTPUT_PATH) == digest:
+        print(f"{OUTPUT_PATH} is up to date")
+        return
+    if args.check:
+        print(f"{OUTPUT_PATH} is out of date. Run python tools/generate_formatters.py", file=sys.stderr)
+        sys.exit(1)
+
+    code = HEADER + f"\n{HASH_PREFIX}{digest}\n" + "".join(generate_model(model_class) for model_class in model_classes)
+    with open(OUTPUT_PATH, "w", newline="\r\n") as f:
+        f.write(code)
+    print(f"Formatters for {', '.join(models.__all__)} have been written to {OUTPUT_PATH}")
+
+
+if __name__ == "__main__":
+    main()
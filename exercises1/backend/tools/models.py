@@ -0,0 +1,25 @@
+"""
+レスポンス整形関数の生成元となるモデル
+
+フィールドの順序・既定値が、生成される format_<モデル名> の出力になります。
+既定値のないフィールドは必須として扱い、アイテムから直接取り出します。
+"""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Todo(BaseModel):
+    id: str = Field(description="TODOの一意なUUID")
+    title: str = Field(description="TODOのタイトル")
+    description: str = Field("", description="詳細な説明")
+    due_date: Optional[str] = Field(None, description="期限の日付（YYYY-MM-DD）")
+    is_completed: bool = Field(False, description="完了フラグ")
+    priority: Literal["low", "medium", "high"] = Field("medium", description="優先度")
+    tags: List[str] = Field(default_factory=list, description="タグ一覧")
+
+
+__all__ = [
+    "Todo",
+]
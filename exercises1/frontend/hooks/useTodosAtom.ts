@@ -7,9 +7,17 @@ const BASE_URL = process.env.NEXT_PUBLIC_API_BASEURL || "http://localhost:3000";
 export const todosAtom = atom<Todo[]>([]);
 
 export const fetchTodos = async (): Promise<Todo[]> => {
-  const response = await fetch(`${BASE_URL}/todos`);
-  if (!response.ok) {
-    throw new Error("Failed to fetch TODOs");
-  }
-  return response.json();
+  const todos: Todo[] = [];
+  let nextToken: string | null = null;
+  do {
+    const query: string = nextToken ? `?limit=100&nextToken=${encodeURIComponent(nextToken)}` : "?limit=100";
+    const response = await fetch(`${BASE_URL}/todos${query}`);
+    if (!response.ok) {
+      throw new Error("Failed to fetch TODOs");
+    }
+    const page: { items: Todo[]; nextToken: string | null } = await response.json();
+    todos.push(...page.items);
+    nextToken = page.nextToken;
+  } while (nextToken);
+  return todos;
 };
@@ -33,14 +33,57 @@ const normalizeTodo = (todo: any): Todo => ({
   tags: todo.tags || []
 });
 
+/**
+ * Todoを1ページ分取得
+ * 
+ * @param params 取得件数と前のページの nextToken
+ * @returns Todoの配列と次のページの nextToken
+ */
+export const getTodosPage = async (
+  params: paths['/todos']['get']['parameters']['query'] = {}
+): Promise<{ items: Todo[]; nextToken: string | null }> => {
+  const response = await api.get<paths['/todos']['get']['responses']['200']['content']['application/json']>('/todos', { params });
+  return {
+    items: response.data.items.map(normalizeTodo),
+    nextToken: response.data.nextToken,
+  };
+};
+
 /**
  * 全てのTodoを取得
  * 
+ * nextToken がなくなるまでページを順に取得します。
+ * 
  * @returns Todoの配列
  */
 export const getTodos = async (): Promise<Todo[]> => {
-  const response = await api.get<Todo[]>('/todos');
-  return response.data.map(normalizeTodo);
+  const todos: Todo[] = [];
+  let nextToken: string | undefined;
+  do {
+    const page = await getTodosPage(nextToken ? { limit: 100, nextToken } : { limit: 100 });
+    todos.push(...page.items);
+    nextToken = page.nextToken ?? undefined;
+  } while (nextToken);
+  return todos;
+};
+
+/**
+ * 指定された複数のIDのTodoをまとめて取得
+ * 
+ * 100件ずつ1回のリクエストで取得します。存在しないIDは結果に含まれません。
+ * 
+ * @param ids 取得するTodoのIDの配列
+ * @returns 指定された順に並んだTodoの配列
+ */
+export const getTodosByIds = async (ids: string[]): Promise<Todo[]> => {
+  const todos: Todo[] = [];
+  for (let start = 0; start < ids.length; start += 100) {
+    const response = await api.get<paths['/todos']['get']['responses']['200']['content']['application/json']>('/todos', {
+      params: { ids: ids.slice(start, start + 100).join(',') },
+    });
+    todos.push(...response.data.items.map(normalizeTodo));
+  }
+  return todos;
 };
 
 /**
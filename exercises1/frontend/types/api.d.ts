@@ -13,7 +13,7 @@ export interface paths {
         };
         /**
          * TODO一覧取得
-         * @description 登録されているすべてのTODOを取得します。
+         * @description 登録されているTODOをページ単位で取得します。続きがある場合は nextToken を指定して次のページを取得します。nextToken は同じ絞り込み条件でのみ使用できます。
          */
         get: operations["getTodos"];
         put?: never;
@@ -28,6 +28,26 @@ export interface paths {
         patch?: never;
         trace?: never;
     };
+    "/todos/batch": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * TODO一括操作
+         * @description 最大100件のTODOの作成・更新・削除を1回のリクエストで行います。各操作は個別のAPIと同じ内容で検証され、操作ごとの結果が返ります。削除は存在しないIDに対しても成功として扱います。
+         */
+        post: operations["batchTodos"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/todos/{id}": {
         parameters: {
             query?: never;
@@ -101,6 +121,14 @@ export interface components {
             /** @description タグ一覧（最大10個まで） */
             tags?: string[];
         };
+        /** @description TODO一覧の1ページ分 */
+        TodoPage: {
+            items: components["schemas"]["Todo"][];
+            /** @description 次のページを取得するためのトークン（続きがない場合は null） */
+            nextToken: string | null;
+            /** @description ids を指定した場合に、見つからなかったID */
+            missing?: string[];
+        };
         /** @description 新規作成用のTODOデータ */
         TodoCreate: {
             /**
@@ -150,6 +178,44 @@ export interface components {
             /** @description タグ一覧（任意、最大10個） */
             tags?: string[];
         };
+        /** @description 一括操作の1件分の操作 */
+        TodoBatchOperation: {
+            /**
+             * @description 操作の種類
+             * @enum {string}
+             */
+            op: "create" | "update" | "delete";
+            /** @description 対象のTODOのID（update / delete の場合は必須） */
+            id?: string;
+            /** @description TODOの内容（create の場合は TodoCreate、update の場合は TodoUpdate） */
+            todo?: components["schemas"]["TodoCreate"] | components["schemas"]["TodoUpdate"];
+        };
+        /** @description 一括操作のリクエスト */
+        TodoBatchRequest: {
+            operations: components["schemas"]["TodoBatchOperation"][];
+        };
+        /** @description 一括操作の1件分の結果 */
+        TodoBatchResult: {
+            /** @description リクエストの operations 内の位置 */
+            index: number;
+            /** @enum {string} */
+            op: "create" | "update" | "delete";
+            /** @description 個別のAPIと同じステータスコード（201, 200, 204, 400, 404, 500, 503） */
+            status: number;
+            /** @description 対象のTODOのID（update / delete の場合） */
+            id?: string;
+            item?: components["schemas"]["Todo"];
+            /** @description 失敗した場合の理由 */
+            error?: string;
+        };
+        /** @description 一括操作のレスポンス */
+        TodoBatchResponse: {
+            results: components["schemas"]["TodoBatchResult"][];
+            /** @description 成功した操作の数 */
+            succeeded: number;
+            /** @description 失敗した操作の数 */
+            failed: number;
+        };
     };
     responses: never;
     parameters: never;
@@ -161,7 +227,24 @@ export type $defs = Record<string, never>;
 export interface operations {
     getTodos: {
         parameters: {
-            query?: never;
+            query?: {
+                /** @description 1ページあたりの最大件数 */
+                limit?: number;
+                /** @description 前のページのレスポンスに含まれていた nextToken */
+                nextToken?: string;
+                /** @description 完了状態で絞り込む（指定した場合は期限順に並ぶ） */
+                is_completed?: boolean;
+                /** @description 優先度で絞り込む（指定した場合は期限順に並ぶ） */
+                priority?: "low" | "medium" | "high";
+                /** @description タグで絞り込む（指定した場合は期限順に並ぶ） */
+                tag?: string;
+                /** @description 期限がこの日以降のTODOに絞り込む（YYYY-MM-DD、期限のないTODOは含まない、期限順に並ぶ） */
+                due_after?: string;
+                /** @description 期限がこの日以前のTODOに絞り込む（YYYY-MM-DD、期限のないTODOは含まない、期限順に並ぶ） */
+                due_before?: string;
+                /** @description 取得するTODOのID（カンマ区切り、最大100個）。指定した順に返り、存在しないIDは missing に含まれる。他のパラメータとは同時に指定できない */
+                ids?: string;
+            };
             header?: never;
             path?: never;
             cookie?: never;
@@ -174,7 +257,7 @@ export interface operations {
                     [name: string]: unknown;
                 };
                 content: {
-                    "application/json": components["schemas"]["Todo"][];
+                    "application/json": components["schemas"]["TodoPage"];
                 };
             };
             /** @description 不正なリクエストです */
@@ -184,6 +267,13 @@ export interface operations {
                 };
                 content?: never;
             };
+            /** @description 混雑のため ids で指定したTODOの一部を取得できませんでした */
+            503: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
         };
     };
     createTodo: {
@@ -217,6 +307,37 @@ export interface operations {
             };
         };
     };
+    batchTodos: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody: {
+            content: {
+                "application/json": components["schemas"]["TodoBatchRequest"];
+            };
+        };
+        responses: {
+            /** @description 操作ごとの結果（個々の操作の成否は results の status を参照） */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["TodoBatchResponse"];
+                };
+            };
+            /** @description リクエストが不正です */
+            400: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content?: never;
+            };
+        };
+    };
     getTodoById: {
         parameters: {
             query?: never;
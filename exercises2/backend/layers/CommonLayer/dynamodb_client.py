@@ -0,0 +1,247 @@
+"""
+低レベルクライアントでDynamoDBを読み取るための共通モジュール
+
+boto3 のリソース（Table）は、リクエストとレスポンスのすべての値を TypeSerializer / TypeDeserializer で変換します。
+1MBのページ（数千件）では、この変換がDynamoDBの応答時間と同じくらいかかることがあります。
+このモジュールの ClientTable は Table と同じ引数で get_item / query / scan を呼び出せ、
+低レベルクライアントの結果を、アイテムで使っている型に絞った手書きの変換で Python の値に戻します。
+
+- 変換結果はリソースと同じです（数値は Decimal、バイナリは Binary、セットは set）
+- KeyConditionExpression / FilterExpression には Key / Attr の条件をそのまま渡せます
+- 書き込み（条件付きの更新など）はこれまでどおりリソースを使います
+"""
+
+from decimal import Decimal
+
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import Binary
+
+from aws_clients import get_client
+
+# 条件オブジェクトを式に変換する引数（引数名, キー条件かどうか）
+CONDITION_PARAMETERS = (
+    ("KeyConditionExpression", True),
+    ("FilterExpression", False),
+    ("ConditionExpression", False),
+)
+
+# Python の値に変換するキーの引数
+KEY_PARAMETERS = ("Key", "ExclusiveStartKey")
+
+
+def _deserialize_binary(raw):
+    return Binary(raw)
+
+
+def _deserialize_map(raw):
+    return {name: deserialize(value) for name, value in raw.items()}
+
+
+def _deserialize_list(raw):
+    # タグなど文字列だけのリストが多いため、S は deserialize を呼ばずに取り出す
+    return [value["S"] if "S" in value else deserialize(value) for value in raw]
+
+
+# S / BOOL / N 以外の型の変換（S と BOOL はそのまま、N は Decimal）
+_DESERIALIZERS = {
+    "N": Decimal,
+    "NULL": lambda raw: None,
+    "M": _deserialize_map,
+    "L": _deserialize_list,
+    "SS": set,
+    "NS": lambda raw: set(map(Decimal, raw)),
+    "B": _deserialize_binary,
+    "BS": lambda raw: set(map(_deserialize_binary, raw)),
+}
+
+
+def deserialize(value):
+    """
+    DynamoDBの属性値（{"S": "..."} など）を Python の値に変換する
+
+    Args:
+        value (dict): 属性値
+
+    Returns:
+        Python の値（TypeDeserializer と同じ型）
+    """
+    raw = value.get("S")
+    if raw is None:
+        (type_name, raw), = value.items()
+        if type_name != "BOOL":
+            raw = _DESERIALIZERS[type_name](raw)
+    return raw
+
+
+def deserialize_item(item):
+    """
+    DynamoDBのアイテムを Python の辞書に変換する
+
+    Args:
+        item (dict): 属性名と属性値の辞書
+
+    Returns:
+        dict: 属性名と Python の値の辞書
+    """
+    # ほとんどの属性は S のため、先に S を取り出してから他の型を調べる（deserialize を展開したもの）
+    result = {}
+    for name, value in item.items():
+        raw = value.get("S")
+        if raw is None:
+            (type_name, raw), = value.items()
+            if type_name != "BOOL":
+                raw = _DESERIALIZERS[type_name](raw)
+        result[name] = raw
+    return result
+
+
+def serialize(value):
+    """
+    Python の値をDynamoDBの属性値に変換する（TypeSerializer と同じ規則）
+
+    Args:
+        value: 変換する値（float は TypeSerializer と同じく扱わない）
+
+    Returns:
+        dict: 属性値
+
+    Raises:
+        TypeError: DynamoDBで扱えない型の場合
+    """
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, dict):
+        return {"M": {name: serialize(item) for name, item in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {"L": [serialize(item) for item in value]}
+    if isinstance(value, (bytes, bytearray)):
+        return {"B": bytes(value)}
+    if isinstance(value, Binary):
+        return {"B": value.value}
+    if isinstance(value, (set, frozenset)):
+        if all(isinstance(item, (int, Decimal)) and not isinstance(item, bool) for item in value):
+            return {"NS": [str(item) for item in value]}
+        if all(isinstance(item, str) for item in value):
+            return {"SS": list(value)}
+        if all(isinstance(item, (bytes, bytearray, Binary)) for item in value):
+            return {"BS": [serialize(item)["B"] for item in value]}
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    raise TypeError(f"Unsupported type \"{type(value)}\" for value \"{value}\"")
+
+
+def serialize_item(item):
+    """Python の辞書をDynamoDBのアイテムに変換する"""
+    return {name: serialize(value) for name, value in item.items()}
+
+
+def build_request(table_name, kwargs):
+    """
+    Table のメソッドと同じ引数を、低レベルクライアントの引数に変換する
+
+    Args:
+        table_name (str | None): テーブル名（BatchGetItem などテーブルを指定しない場合は None）
+        kwargs (dict): Table.query などに渡す引数
+
+    Returns:
+        dict: 低レベルクライアントに渡す引数
+    """
+    request = dict(kwargs)
+    if table_name is not None:
+        request["TableName"] = table_name
+    names = dict(request.pop("ExpressionAttributeNames", None) or {})
+    values = {name: serialize(value)
+              for name, value in (request.pop("ExpressionAttributeValues", None) or {}).items()}
+
+    # 同じリクエスト内でプレースホルダー（#n0, :v0 など）が重ならないよう、1つの builder で変換する
+    builder = None
+    for parameter, is_key_condition in CONDITION_PARAMETERS:
+        condition = request.get(parameter)
+        if isinstance(condition, ConditionBase):
+            builder = builder or ConditionExpressionBuilder()
+            expression = builder.build_expression(condition, is_key_condition=is_key_condition)
+            request[parameter] = expression.condition_expression
+            names.update(expression.attribute_name_placeholders)
+            values.update((name, serialize(value))
+                          for name, value in expression.attribute_value_placeholders.items())
+    for parameter in KEY_PARAMETERS:
+        if parameter in request:
+            request[parameter] = serialize_item(request[parameter])
+    if names:
+        request["ExpressionAttributeNames"] = names
+    if values:
+        request["ExpressionAttributeValues"] = values
+    return request
+
+
+def deserialize_page(response):
+    """query / scan のレスポンスの Items と LastEvaluatedKey を Python の値に変換する"""
+    if "Items" in response:
+        response["Items"] = [deserialize_item(item) for item in response["Items"]]
+    if "LastEvaluatedKey" in response:
+        response["LastEvaluatedKey"] = deserialize_item(response["LastEvaluatedKey"])
+    return response
+
+
+class ClientTable:
+    """
+    低レベルクライアントで読み取る、boto3 の Table と同じ引数のテーブル
+
+    クライアントは最初の呼び出しで作成します（aws_clients の共有のクライアントを使う）。
+    """
+
+    def __init__(self, table_name, client=None):
+        self.name = table_name
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or get_client("dynamodb")
+
+    def get_item(self, **kwargs):
+        response = self.client.get_item(**build_request(self.name, kwargs))
+        if "Item" in response:
+            response["Item"] = deserialize_item(response["Item"])
+        return response
+
+    def query(self, **kwargs):
+        return deserialize_page(self.client.query(**build_request(self.name, kwargs)))
+
+    def scan(self, **kwargs):
+        return deserialize_page(self.client.scan(**build_request(self.name, kwargs)))
+
+    def __repr__(self):
+        return f"ClientTable({self.name!r})"
+
+
+class ClientResource:
+    """低レベルクライアントで BatchGetItem を実行する、boto3 のリソースと同じ引数のオブジェクト"""
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        return self._client or get_client("dynamodb")
+
+    def batch_get_item(self, RequestItems, **kwargs):
+        request_items = {}
+        for table_name, request in RequestItems.items():
+            request = build_request(None, request)
+            request["Keys"] = [serialize_item(key) for key in request["Keys"]]
+            request_items[table_name] = request
+        response = self.client.batch_get_item(RequestItems=request_items, **kwargs)
+        response["Responses"] = {table_name: [deserialize_item(item) for item in items]
+                                 for table_name, items in response.get("Responses", {}).items()}
+        # 再試行でそのまま渡せるよう、UnprocessedKeys のキーも Python の値に戻す
+        response["UnprocessedKeys"] = {
+            table_name: dict(request, Keys=[deserialize_item(key) for key in request["Keys"]])
+            for table_name, request in response.get("UnprocessedKeys", {}).items()
+        }
+        return response
@@ -1,54 +1,156 @@
 import os
-import json
+from collections import OrderedDict
 import jwt
-import boto3
 import requests
 from jwt import InvalidTokenError
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
 import base64
+import hashlib
+import time
+from dynamodb_client import ClientTable
+from metrics import add_metric, record_metrics
+from request_log import PrintLogger, log_requests
 
-dynamodb = boto3.resource("dynamodb")
-role_table = dynamodb.Table(os.environ["ROLE_TABLE_NAME"])
+# ロールの読み取りは認可のたびに発生するため、低レベルクライアントで読み取る
+role_table = ClientTable(os.environ["ROLE_TABLE_NAME"])
 cognito_user_pool_id = os.environ["COGNITO_USER_POOL_ID"]
 cognito_client_id = os.environ["COGNITO_CLIENT_ID"]
 
+# ロールキャッシュの設定（コンテナ内で再利用する）
+ROLE_CACHE_NAME = "roles"
+ROLE_CACHE_TTL_SECONDS = int(os.getenv("ROLE_CACHE_TTL_SECONDS", "300"))
+ROLE_CACHE_MAX_ENTRIES = int(os.getenv("ROLE_CACHE_MAX_ENTRIES", "128"))
+ROLE_VERSION_CHECK_INTERVAL_SECONDS = int(os.getenv("ROLE_VERSION_CHECK_INTERVAL_SECONDS", "10"))
+ROLE_VERSION_TABLE_NAME = os.getenv("ROLE_VERSION_TABLE_NAME")
+version_table = ClientTable(ROLE_VERSION_TABLE_NAME) if ROLE_VERSION_TABLE_NAME else None
+
+# role_id -> (ロール情報, 取得時刻)
+_role_cache = OrderedDict()
+_role_cache_state = {
+    "version": None,
+    "checked_at": None,
+}
+
+# 検証済みトークンのポリシーキャッシュの設定
+POLICY_CACHE_MAX_ENTRIES = int(os.getenv("POLICY_CACHE_MAX_ENTRIES", "1024"))
+
+# (トークンのハッシュ, API/ステージのARN) -> (ポリシー, 有効期限, ロールキャッシュのバージョン)
+_policy_cache = OrderedDict()
+_policy_cache_stats = {
+    "hits": 0,
+    "misses": 0,
+}
+
+# ロールごとのポリシー変換結果のキャッシュの設定
+COMPILED_POLICY_CACHE_MAX_ENTRIES = int(os.getenv("COMPILED_POLICY_CACHE_MAX_ENTRIES", "256"))
+SEGMENT_WILDCARD = "{}"  # 1セグメントに一致するパスパラメータ
+GREEDY_WILDCARD = "{+}"  # 1つ以上のセグメントに一致するパスパラメータ（{proxy+}）
+# 拒否ARNと操作の重なりを調べるときの文字の種類（1文字の文字列はその文字自体を表す）
+ANY_CHAR = "any"  # "/" を含む任意の1文字
+SEGMENT_CHAR = "segment"  # "/" 以外の任意の1文字
+
+# (role_id, ロールキャッシュのバージョン, API/ステージのARN)
+#   -> (allowed_operations, (許可するARN, 拒否するARN, リクエストごとに許可する操作))
+_compiled_policy_cache = OrderedDict()
+
+# JWKSキャッシュの設定（コンテナ内で再利用する）
+JWKS_CACHE_TTL_SECONDS = int(os.getenv("JWKS_CACHE_TTL_SECONDS", "3600"))
+JWKS_MIN_REFRESH_INTERVAL_SECONDS = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL_SECONDS", "60"))
+# 鍵を1つも取得できていない間（コールドスタートで取得に失敗した場合など）の再取得の最短間隔
+JWKS_EMPTY_CACHE_RETRY_SECONDS = float(os.getenv("JWKS_EMPTY_CACHE_RETRY_SECONDS", "1"))
+JWKS_FETCH_TIMEOUT_SECONDS = float(os.getenv("JWKS_FETCH_TIMEOUT_SECONDS", "3"))
+
+# kid -> 公開鍵オブジェクト
+_jwks_cache = {
+    "keys": {},
+    "fetched_at": None,
+    "last_refresh_attempt": None,
+}
+
 def int_to_bytes(n):
     return n.to_bytes((n.bit_length() + 7) // 8, byteorder='big')
 
+def b64url_to_int(value):
+    return int.from_bytes(base64.urlsafe_b64decode(value + "=="), byteorder='big')
+
+def parse_public_key(key):
+    numbers = RSAPublicNumbers(e=b64url_to_int(key["e"]), n=b64url_to_int(key["n"]))
+    return numbers.public_key(backend=default_backend())
+
 def get_public_key(token):
-    keys = get_public_keys()
     headers = jwt.get_unverified_header(token)
-    kid = headers["kid"]
-    
-    for key in keys:
-        if key["kid"] == kid:
-            numbers = RSAPublicNumbers(
-                e=int.from_bytes(base64.urlsafe_b64decode(key["e"] + "=="), byteorder='big'),
-                n=int.from_bytes(base64.urlsafe_b64decode(key["n"] + "=="), byteorder='big')
-            )
-            public_key = numbers.public_key(backend=default_backend())
-            return public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo
-            )
-    
-    raise InvalidTokenError("No matching key found")
+    kid = headers.get("kid")
+    if not kid:
+        raise InvalidTokenError("Missing kid")
+
+    now = time.monotonic()
+    fetched_at = _jwks_cache["fetched_at"]
+    if fetched_at is None or now - fetched_at >= JWKS_CACHE_TTL_SECONDS:
+        refresh_public_keys(now)
+
+    public_key = _jwks_cache["keys"].get(kid)
+    # 未知のkidの場合のみ強制的に再取得する（鍵のローテーション対応）
+    if public_key is None and refresh_public_keys(now):
+        public_key = _jwks_cache["keys"].get(kid)
+
+    if public_key is None:
+        raise InvalidTokenError("No matching key found")
+    return public_key
+
+def refresh_public_keys(now):
+    """
+    JWKSを取得してキャッシュを更新する。
+    不正なトークンによる再取得の連発を防ぐため、最短間隔内の再取得はスキップする。
+    ただし鍵を1つも持っていない間は、すべてのリクエストが拒否されるため短い間隔で再取得する。
+    取得に失敗した場合は既存のキャッシュをそのまま使う。
+    """
+    last_attempt = _jwks_cache["last_refresh_attempt"]
+    interval = JWKS_MIN_REFRESH_INTERVAL_SECONDS if _jwks_cache["keys"] else JWKS_EMPTY_CACHE_RETRY_SECONDS
+    if last_attempt is not None and now - last_attempt < interval:
+        return False
+    _jwks_cache["last_refresh_attempt"] = now
+
+    try:
+        keys = get_public_keys()
+        parsed = {
+            key["kid"]: parse_public_key(key)
+            for key in keys
+            if key.get("kty") == "RSA"
+        }
+    except Exception as e:
+        print(f"[Authorizer] Failed to refresh JWKS: {str(e)}")
+        return False
+
+    _jwks_cache["keys"] = parsed
+    _jwks_cache["fetched_at"] = now
+    return True
 
 # Cognitoの公開鍵を取得
 def get_public_keys():
     region = os.environ["AWS_REGION"]
-    keys_url = f"https://cognito-idp.{region}.amazonaws.com/{cognito_user_pool_id}/.well-known/jwks.json"
-    response = requests.get(keys_url)
+    # JWKS_URL が指定されていればそちらを使う（ローカル検証・ベンチマーク用）
+    keys_url = os.getenv("JWKS_URL") or f"https://cognito-idp.{region}.amazonaws.com/{cognito_user_pool_id}/.well-known/jwks.json"
+    response = requests.get(keys_url, timeout=JWKS_FETCH_TIMEOUT_SECONDS)
+    response.raise_for_status()
     return response.json()["keys"]
 
-def lambda_handler(event, context):
-    print("[Authorizer] Event:", json.dumps(event))
+# イベント（トークンは伏せる）はサンプリングしたものだけを出力する
+logger = PrintLogger("Authorizer")
 
+@record_metrics
+@log_requests(logger)
+def lambda_handler(event, context):
     token = event.get("authorizationToken", "").replace("Bearer ", "").strip()
     method_arn = event["methodArn"]
 
+    # 検証済みトークンのポリシーがキャッシュにあれば、署名検証とロール取得を省略する
+    cache_key = (hashlib.sha256(token.encode()).digest(), get_method_arn_prefix(method_arn))
+    sync_role_cache_version(time.monotonic())
+    cached_policy = get_cached_policy(cache_key)
+    if cached_policy is not None:
+        return cached_policy
+
     try:
         # 公開鍵を取得
         public_key = get_public_key(token)
@@ -78,35 +180,98 @@ def lambda_handler(event, context):
         return generate_deny("unauthorized", method_arn)
 
     role_data = fetch_role_data(role_id)
-    print(f"[Authorizer] Role data: {role_data}")
     if not role_data:
         return generate_deny(principal_id, method_arn)
 
     is_super_user = role_data.get("is_super_user") in [True, "true", "True", 1, "1"]
+    explicit_ops = ()
 
     if is_super_user:
-        print(f"[Authorizer] Super user: {principal_id}")
-        return generate_allow(
+        policy = generate_allow(
             principal_id,
             [get_method_arn_prefix(method_arn) + "/*/*"],
             context={
                 "username": username,
             },
         )
+    else:
+        allowed_ops = role_data.get("allowed_operations", [])
+        allowed_arns, denied_arns, explicit_ops = expand_allowed_operations(
+            role_id, _role_cache_state["version"], allowed_ops, method_arn
+        )
+        if matches_explicit_operations(explicit_ops, get_method_arn_prefix(method_arn), method_arn):
+            allowed_arns += (method_arn,)
+        if not allowed_arns:
+            return generate_deny(principal_id, method_arn)
 
-    allowed_ops = role_data.get("allowed_operations", [])
-    allowed_arns = expand_allowed_operations(allowed_ops, method_arn)
+        policy = generate_allow(
+            principal_id,
+            list(allowed_arns),
+            context={
+                "username": username,
+            },
+            denied_resources=list(denied_arns),
+        )
 
-    return generate_allow(
-        principal_id,
-        allowed_arns,
-        context={
-            "username": username,
-        },
-    )
+    # 個別に許可する操作があるロールのポリシーはリクエストのARNによって変わるため、キャッシュしない
+    # （同じ理由で、API Gateway のキャッシュも template.yaml の ReauthorizeEvery: 0 で無効にしている）
+    if claims.get("exp") and not explicit_ops:
+        expires_at = min(claims["exp"], time.time() + ROLE_CACHE_TTL_SECONDS)
+        put_cached_policy(cache_key, policy, expires_at, _role_cache_state["version"])
+    return policy
+
+
+def get_cached_policy(cache_key):
+    """
+    キャッシュ済みのポリシーを返す。
+    トークンの有効期限切れ、またはロールキャッシュのバージョンが変わった場合は破棄する。
+    ヒットしたかどうかは EMF のメトリクス PolicyCacheHit（1 / 0、平均がヒット率）として記録する。
+    """
+    entry = _policy_cache.get(cache_key)
+    if entry is not None:
+        policy, expires_at, role_version = entry
+        if time.time() < expires_at and role_version == _role_cache_state["version"]:
+            _policy_cache.move_to_end(cache_key)
+            _policy_cache_stats["hits"] += 1
+            add_metric("PolicyCacheHit", 1)
+            return policy
+        del _policy_cache[cache_key]
+
+    _policy_cache_stats["misses"] += 1
+    add_metric("PolicyCacheHit", 0)
+    return None
+
+
+def put_cached_policy(cache_key, policy, expires_at, role_version):
+    _policy_cache[cache_key] = (policy, expires_at, role_version)
+    _policy_cache.move_to_end(cache_key)
+    while len(_policy_cache) > POLICY_CACHE_MAX_ENTRIES:
+        _policy_cache.popitem(last=False)
 
 
 def fetch_role_data(role_id: str):
+    """
+    ロール情報をコンテナ内キャッシュから取得する。
+    キャッシュにない、または期限切れの場合のみDynamoDBから取得する。
+    """
+    now = time.monotonic()
+    sync_role_cache_version(now)
+
+    cached = _role_cache.get(role_id)
+    if cached is not None and now - cached[1] < ROLE_CACHE_TTL_SECONDS:
+        _role_cache.move_to_end(role_id)
+        return cached[0]
+
+    role_data = load_role_data(role_id)
+    if role_data:
+        _role_cache[role_id] = (role_data, now)
+        _role_cache.move_to_end(role_id)
+        while len(_role_cache) > ROLE_CACHE_MAX_ENTRIES:
+            _role_cache.popitem(last=False)
+    return role_data
+
+
+def load_role_data(role_id: str):
     try:
         resp = role_table.get_item(Key={"role_id": role_id})
         return resp.get("Item")
@@ -115,48 +280,237 @@ def fetch_role_data(role_id: str):
         return None
 
 
-def expand_allowed_operations(allowed_ops, method_arn):
+def sync_role_cache_version(now):
     """
+    ロールキャッシュのバージョンを一定間隔で確認する。
+    RoleAccessTableのストリームでバージョンが進んでいればキャッシュを破棄する。
+    """
+    if version_table is None:
+        return
+    checked_at = _role_cache_state["checked_at"]
+    if checked_at is not None and now - checked_at < ROLE_VERSION_CHECK_INTERVAL_SECONDS:
+        return
+    _role_cache_state["checked_at"] = now
+
+    try:
+        resp = version_table.get_item(Key={"cache_name": ROLE_CACHE_NAME})
+    except Exception as e:
+        print("DynamoDB error:", str(e))
+        return
+
+    version = int(resp.get("Item", {}).get("version", 0))
+    if version != _role_cache_state["version"]:
+        _role_cache.clear()
+        _role_cache_state["version"] = version
+
+
+def expand_allowed_operations(role_id, role_version, allowed_ops, method_arn):
+    """
+    ロールの allowed_operations を API/ステージ全体に対するリソースARNに変換する。
+    結果は (role_id, ロールキャッシュのバージョン, API/ステージのARN) ごとにメモ化する。
+
     例: methodArn: arn:aws:execute-api:region:account:api-id/stage/METHOD/resource
+
+    Returns:
+        tuple: (許可するARNのタプル, 拒否するARNのタプル, リクエストごとに許可する操作のタプル)
+    """
+    base_arn = get_method_arn_prefix(method_arn)  # arn:aws:execute-api:region:account:api-id/stage
+    key = (role_id, role_version, base_arn)
+    ops = tuple(allowed_ops)
+
+    entry = _compiled_policy_cache.get(key)
+    if entry is not None and entry[0] == ops:
+        _compiled_policy_cache.move_to_end(key)
+        return entry[1]
+
+    compiled = compile_allowed_operations(ops, base_arn)
+    _compiled_policy_cache[key] = (ops, compiled)
+    while len(_compiled_policy_cache) > COMPILED_POLICY_CACHE_MAX_ENTRIES:
+        _compiled_policy_cache.popitem(last=False)
+    return compiled
+
+
+def compile_allowed_operations(allowed_ops, base_arn):
+    """
+    "METHOD /path/{param}" 形式の操作一覧を、ワイルドカードを使った最小のARN集合に変換する。
+
+    パスパラメータ（とメソッドの "*"）は1セグメントにのみ一致するが、
+    IAMの "*" は "/" も含めて一致するため、より深いパスへの一致を拒否ARNで打ち消す。
+    "GET /users/{id}" と "GET /users/{id}/comments" のように、拒否ARNがほかの許可した操作にも一致する場合は、
+    拒否ARNでは打ち消せない（拒否が優先される）ため、その操作はワイルドカードで許可せず、
+    一致したリクエストのARNだけを個別に許可する（matches_explicit_operations）。
+
+    Returns:
+        tuple: (許可するARNのタプル, 拒否するARNのタプル, リクエストごとに許可する操作のタプル)
+    """
+    templates = {parse_operation(op) for op in allowed_ops}
+    templates = sorted(
+        t for t in templates
+        if not any(other != t and template_covers(other, t) for other in templates)
+    )
+
+    denied_by_template = {}
+    for template in templates:
+        denied_by_template[template] = []
+        for i, token in enumerate(template):
+            if token == SEGMENT_WILDCARD:
+                deeper = template[:i] + ("*/*",) + template[i + 1:]
+                denied_by_template[template].append(render_template(deeper))
+
+    explicit = tuple(
+        template for template in templates
+        if any(glob_overlaps_template(pattern, other)
+               for pattern in denied_by_template[template] for other in templates if other != template)
+    )
+
+    allowed = []
+    denied = []
+    for template in templates:
+        if template in explicit:
+            continue
+        allowed.append(f"{base_arn}/{render_template(template)}")
+        denied.extend(f"{base_arn}/{pattern}" for pattern in denied_by_template[template])
+
+    return tuple(dict.fromkeys(allowed)), tuple(dict.fromkeys(denied)), explicit
+
+
+def matches_explicit_operations(templates, base_arn, method_arn):
+    """
+    リクエストのARNが、個別に許可する操作（compile_allowed_operations の3番目の戻り値）のどれかに一致するか。
+    """
+    prefix = base_arn + "/"
+    if not templates or not method_arn.startswith(prefix):
+        return False
+    request = [(False, char) for char in method_arn[len(prefix):]]
+    return any(elements_overlap(request, template_elements(template)) for template in templates)
+
+
+def glob_overlaps_template(pattern, template):
+    """
+    IAMのワイルドカード（"*" は "/" も含む任意の文字列、"?" は任意の1文字）のパターンが、
+    操作 template が許可するリクエストのどれかに一致するか。
     """
-    parts = method_arn.split("/")
-    base_arn = "/".join(parts[:2])  # arn:aws:execute-api:region:account:api-id/stage
+    elements = [(True, ANY_CHAR) if c == "*" else (False, ANY_CHAR) if c == "?" else (False, c) for c in pattern]
+    return elements_overlap(elements, template_elements(template))
 
-    expanded = []
-    for op in allowed_ops:
-        method, path = op.split(" ", 1)
-        if not path.startswith("/"):
-            path = "/" + path
-        arn = f"{base_arn}/{method}{path}"
-        expanded.append(arn)
-    return expanded
+
+def template_elements(template):
+    """
+    操作のトークン列を (繰り返すか, 文字の種類) の列にする（パスパラメータは1文字以上の繰り返し）。
+    """
+    elements = []
+    for i, token in enumerate(template):
+        if i:
+            elements.append((False, "/"))
+        if token == SEGMENT_WILDCARD:
+            elements += [(False, SEGMENT_CHAR), (True, SEGMENT_CHAR)]
+        elif token == GREEDY_WILDCARD:
+            elements += [(False, ANY_CHAR), (True, ANY_CHAR)]
+        else:
+            elements += [(False, c) for c in token]
+    return elements
+
+
+def elements_overlap(a, b):
+    """
+    2つの (繰り返すか, 文字の種類) の列の両方に一致する文字列があるか（2つの列を同時にたどって調べる）。
+    """
+    seen = set()
+    pending = [(0, 0)]
+    while pending:
+        i, j = pending.pop()
+        if (i, j) in seen:
+            continue
+        seen.add((i, j))
+        if i == len(a) and j == len(b):
+            return True
+        # 繰り返しは0回でもよい
+        if i < len(a) and a[i][0]:
+            pending.append((i + 1, j))
+        if j < len(b) and b[j][0]:
+            pending.append((i, j + 1))
+        if i < len(a) and j < len(b) and chars_overlap(a[i][1], b[j][1]):
+            pending.append((i if a[i][0] else i + 1, j if b[j][0] else j + 1))
+    return False
+
+
+def chars_overlap(x, y):
+    if x == ANY_CHAR or y == ANY_CHAR:
+        return True
+    if x == SEGMENT_CHAR or y == SEGMENT_CHAR:
+        return "/" not in (x, y)
+    return x == y
+
+
+def parse_operation(op):
+    """
+    "GET /roles/{role_id}" を ("GET", "roles", SEGMENT_WILDCARD) のようなトークン列に変換する。
+    """
+    method, path = op.split(" ", 1)
+    method = method.strip().upper()
+    tokens = [SEGMENT_WILDCARD if method in ("*", "ANY") else method]
+    for segment in path.strip().strip("/").split("/"):
+        if segment.startswith("{") and segment.endswith("+}"):
+            tokens.append(GREEDY_WILDCARD)
+        elif segment.startswith("{") and segment.endswith("}"):
+            tokens.append(SEGMENT_WILDCARD)
+        else:
+            tokens.append(segment)
+    return tuple(tokens)
+
+
+def template_covers(a, b):
+    """
+    操作 a が許可するリクエストが、操作 b が許可するリクエストをすべて含むかどうか。
+    """
+    if a[-1] == GREEDY_WILDCARD:
+        return len(b) >= len(a) and all(token_covers(x, y) for x, y in zip(a[:-1], b))
+    return len(a) == len(b) and all(token_covers(x, y) for x, y in zip(a, b))
+
+
+def token_covers(x, y):
+    return x == y or (x == SEGMENT_WILDCARD and y not in (GREEDY_WILDCARD, ""))
+
+
+def render_template(template):
+    return "/".join("*" if token in (SEGMENT_WILDCARD, GREEDY_WILDCARD) else token for token in template)
 
 
 def get_method_arn_prefix(method_arn: str) -> str:
     return "/".join(method_arn.split("/")[:2])
 
 
-def generate_allow(principal_id, resources, context=None):
-    return generate_policy(principal_id, "Allow", resources, context)
+def generate_allow(principal_id, resources, context=None, denied_resources=None):
+    return generate_policy(principal_id, "Allow", resources, context, denied_resources)
 
 
 def generate_deny(principal_id, method_arn):
-    return generate_policy(principal_id, "Deny", [method_arn])
+    # API Gatewayの認可キャッシュが同じAPI/ステージの全リソースで使えるよう、ステージ全体を拒否する
+    return generate_policy(principal_id, "Deny", [get_method_arn_prefix(method_arn) + "/*/*"])
+
 
+def generate_policy(principal_id, effect, resources, context=None, denied_resources=None):
+    statements = [
+        {
+            "Action": "execute-api:Invoke",
+            "Effect": effect,
+            "Resource": resources,
+        }
+    ]
+    if denied_resources:
+        statements.append(
+            {
+                "Action": "execute-api:Invoke",
+                "Effect": "Deny",
+                "Resource": denied_resources,
+            }
+        )
 
-def generate_policy(principal_id, effect, resources, context=None):
-    print(f"[Authorizer] Generating {effect} for resources: {resources}")
     policy = {
         "principalId": principal_id,
         "policyDocument": {
             "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Action": "execute-api:Invoke",
-                    "Effect": effect,
-                    "Resource": resources,
-                }
-            ],
+            "Statement": statements,
         },
     }
 
@@ -4,25 +4,24 @@ import boto3
 from boto3.dynamodb.conditions import Key
 import uuid
 from datetime import datetime
+from response import build_headers, generate_response as encode_response
+from aws_clients import lazy_table
+from dynamodb_client import ClientTable
+from metrics import record_metrics
 
-dynamoDB = boto3.resource("dynamodb")
-table = dynamoDB.Table(name=os.getenv("TABLE_NAME"))
-allowed_origins = os.getenv("ALLOWED_ORIGINS", "*")
+# 書き込みはリソース、コメント一覧の読み取りは低レベルクライアントで行う
+table = lazy_table(os.getenv("TABLE_NAME"))
+query_table = ClientTable(os.getenv("TABLE_NAME"))
+
+response_headers = build_headers(allow_methods='GET,POST,OPTIONS', allow_headers='Content-Type,Authorization')
 
 def generate_response(status_code, body):
-    return {
-        "statusCode": status_code,
-        "body": json.dumps(body),
-        "headers": {
-            'Access-Control-Allow-Origin': allowed_origins,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
-        },
-    }
+    return encode_response(status_code, body, response_headers)
 
 def handle_exception(e):
     return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
 
+@record_metrics
 def lambda_handler(event, context):
     if "GET" == event["httpMethod"]:
         return get_comments(event)
@@ -40,7 +39,7 @@ def get_comments(event):
 
     pk = f"trouble#{trouble_id}"
     try:
-        response = table.query(
+        response = query_table.query(
             KeyConditionExpression=boto3.dynamodb.conditions.Key('PK').eq(pk)
         )
         items = response.get('Items', [])
@@ -3,10 +3,13 @@ import uuid
 import boto3
 import json
 from boto3.dynamodb.conditions import Key
+from aws_clients import lazy_table
+from metrics import record_metrics
+from response import generate_response
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["ROLE_TABLE_NAME"])
+table = lazy_table(os.environ["ROLE_TABLE_NAME"])
 
+@record_metrics
 def lambda_handler(event, context):
     try:
         # リクエストボディの取得とJSONパース
@@ -40,18 +43,9 @@ def lambda_handler(event, context):
         }
 
         # 成功レスポンスを返す
-        return {
-            "statusCode": 201,
-            "body": json.dumps(roles),
-            "headers": {
-                "Content-Type": "application/json"
-            }
-        }
+        return generate_response(201, roles)
 
     except Exception as e:
         # 作成に失敗した場合はエラーレスポンスを返す
         print("Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to create role"})
-        }
+        return generate_response(500, {"error": "Failed to create role"})
@@ -1,12 +1,14 @@
 import os
 import uuid
 import boto3
-import json
 from boto3.dynamodb.conditions import Key
+from dynamodb_client import ClientTable
+from metrics import record_metrics
+from response import generate_response
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["ROLE_TABLE_NAME"])
+table = ClientTable(os.environ["ROLE_TABLE_NAME"])
 
+@record_metrics
 def lambda_handler(event, context):
     try:
         # パスパラメータからTODO IDを取得
@@ -19,10 +21,7 @@ def lambda_handler(event, context):
         )
         # アイテムが存在しない場合は404エラーを返す
         if "Item" not in response or len(response["Item"]) == 0:
-            return {
-                "statusCode": 404,
-                "body": json.dumps({"error": "Role not found"})
-            }
+            return generate_response(404, {"error": "Role not found"})
         item = response.get("Item")
         result = {
             "role_id": item["role_id"],
@@ -30,16 +29,10 @@ def lambda_handler(event, context):
             "is_super_user": item.get("is_super_user", False),
             "allowed_operations": item.get("allowed_operations", []),
         }
-        return {
-            "statusCode": 200,
-            "headers": { "Content-Type": "application/json" },
-            "body": json.dumps(result),
-        }
+        # DynamoDB の数値（Decimal）も共通レイヤーで変換する
+        return generate_response(200, result)
 
     except Exception as e:
         # 作成に失敗した場合はエラーレスポンスを返す
         print("Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to get role"})
-        }
+        return generate_response(500, {"error": "Failed to get role"})
@@ -1,11 +1,13 @@
 import os
 import boto3
-import json
 from boto3.dynamodb.conditions import Key
+from dynamodb_client import ClientTable
+from metrics import record_metrics
+from response import generate_response
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["ROLE_TABLE_NAME"])
+table = ClientTable(os.environ["ROLE_TABLE_NAME"])
 
+@record_metrics
 def lambda_handler(event, context):
     try:
         # フルスキャン（ロール数が少なければ問題なし）
@@ -21,17 +23,8 @@ def lambda_handler(event, context):
                 "allowed_operations": item.get("allowed_operations", []),
             })
 
-        return {
-            "statusCode": 200,
-            "body": json.dumps(roles),
-            "headers": {
-                "Content-Type": "application/json"
-            }
-        }
+        return generate_response(200, roles)
 
     except Exception as e:
         print("Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to fetch roles"})
-        }
+        return generate_response(500, {"error": "Failed to fetch roles"})
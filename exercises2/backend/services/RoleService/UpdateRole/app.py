@@ -3,10 +3,17 @@ import uuid
 import boto3
 import json
 from boto3.dynamodb.conditions import Key
+from aws_clients import lazy_resource, lazy_table
+from metrics import record_metrics
+from response import generate_response
+from request_log import PrintLogger, log_requests
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["ROLE_TABLE_NAME"])
+dynamodb = lazy_resource("dynamodb")
+table = lazy_table(os.environ["ROLE_TABLE_NAME"])
+logger = PrintLogger("UpdateRole")
 
+@record_metrics
+@log_requests(logger)
 def lambda_handler(event, context):
     try:
         # パスパラメータからTODO IDを取得
@@ -15,9 +22,6 @@ def lambda_handler(event, context):
         # リクエストボディの取得とJSONパース
         body = json.loads(event.get('body', '{}'))
 
-        print("[UpdateRole] Event:", json.dumps(event))
-        print("[UpdateRole] Body:", json.dumps(body))
-
         # 更新するフィールドを抽出
         name = body.get("name")
         is_super_user = body.get("is_super_user")
@@ -60,30 +64,15 @@ def lambda_handler(event, context):
         except dynamodb.meta.client.exceptions.ConditionalCheckFailedException as e:
             print("Error:", str(e))
             # アイテムが見つからない場合
-            return {
-                "statusCode": 404,
-                "body": json.dumps({"error": "No such role"})
-            }
+            return generate_response(404, {"error": "No such role"})
         except Exception as e:
             print("Error:", str(e))
-            return {
-                "statusCode": 500,
-                "body": json.dumps({"error": "Failed to update role"})
-            }
+            return generate_response(500, {"error": "Failed to update role"})
 
         # 成功レスポンスを返す
-        return {
-            "statusCode": 200,
-            "body": json.dumps({"message": "Role updated successfully", "role_id": role_id}),
-            "headers": {
-                "Content-Type": "application/json"
-            }
-        }
+        return generate_response(200, {"message": "Role updated successfully", "role_id": role_id})
 
     except Exception as e:
         # 作成に失敗した場合はエラーレスポンスを返す
         print("Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Failed to create role"})
-        }
+        return generate_response(500, {"error": "Failed to create role"})
@@ -0,0 +1,42 @@
+import json
+import os
+from aws_clients import lazy_table
+
+version_table = lazy_table(os.environ['ROLE_VERSION_TABLE_NAME'])
+ROLE_CACHE_NAME = 'roles'
+
+def lambda_handler(event, context):
+
+    # RoleAccessTableのストリームを受け取り、更新・削除されたロールがあれば
+    # ロールキャッシュのバージョンを進める
+    # Authorizerはバージョンの変化を検知して、コンテナ内のキャッシュを破棄する
+    # 追加されたロールはまだキャッシュされていないため対象外とする
+    changed_role_ids = [
+        record['dynamodb']['Keys']['role_id']['S']
+        for record in event['Records']
+        if record['eventName'] in ('MODIFY', 'REMOVE')
+    ]
+
+    if len(changed_role_ids) == 0:
+        return {
+            "statusCode": 200,
+            "body": json.dumps({
+                "message": "No role changes",
+            }),
+        }
+
+    response = version_table.update_item(
+        Key={'cache_name': ROLE_CACHE_NAME},
+        UpdateExpression='ADD version :one',
+        ExpressionAttributeValues={':one': 1},
+        ReturnValues='UPDATED_NEW',
+    )
+    version = int(response['Attributes']['version'])
+    print(f"role cache version: {version}, changed roles: {changed_role_ids}")
+
+    return {
+        "statusCode": 200,
+        "body": json.dumps({
+            "version": version,
+        }),
+    }
@@ -2,24 +2,20 @@ import os
 import json
 import boto3
 from boto3.dynamodb.conditions import Key
-dynamoDB = boto3.resource("dynamodb")
-table = dynamoDB.Table(name=os.getenv("TABLE_NAME"))
-allowed_origins = os.getenv("ALLOWED_ORIGINS", "*")
+from response import build_headers, generate_response as encode_response
+from dynamodb_client import ClientTable
+from metrics import record_metrics
+table = ClientTable(os.getenv("TABLE_NAME"))
+
+response_headers = build_headers(allow_methods='GET,POST,OPTIONS', allow_headers='Content-Type,Authorization')
 
 def generate_response(status_code, body):
-    return {
-        "statusCode": status_code,
-        "body": json.dumps(body),
-        "headers": {
-            'Access-Control-Allow-Origin': allowed_origins,
-            'Access-Control-Allow-Headers': 'Content-Type,Authorization',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS',
-        },
-    }
+    return encode_response(status_code, body, response_headers)
 
 def handle_exception(e):
     return generate_response(500, {"message": "サーバー内部エラー", "error": str(e)})
 
+@record_metrics
 def lambda_handler(event, context):
     if "OPTIONS" == event["httpMethod"]:
         return generate_response(200, {"message": "CORS preflight response"})
@@ -2,12 +2,11 @@ from datetime import datetime, timedelta
 import json
 import os
 import time
-import boto3
+from aws_clients import lazy_client, lazy_table
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('TroubleTable')
+table = lazy_table('TroubleTable')
 LOG_GROUP_NAME = os.environ['LOG_GROUP_NAME']
-cloudwatchlogs = boto3.client('logs')
+cloudwatchlogs = lazy_client('logs')
 
 def lambda_handler(event, context):
 
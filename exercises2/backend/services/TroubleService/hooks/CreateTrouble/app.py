@@ -1,13 +1,15 @@
 import json
 import os
 import time
-import boto3
+from aws_clients import lazy_client, lazy_table
+from request_log import PrintLogger, log_requests
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('TroubleTable')
+table = lazy_table('TroubleTable')
 LOG_GROUP_NAME = os.environ['LOG_GROUP_NAME']
-cloudwatchlogs = boto3.client('logs')
+cloudwatchlogs = lazy_client('logs')
+logger = PrintLogger("CreateTrouble")
 
+@log_requests(logger)
 def lambda_handler(event, context):
 
     # ログストリームが存在しない場合は作成する
@@ -25,7 +27,6 @@ def lambda_handler(event, context):
     # DynamoDBStreamがInsertされたら、rowの内容を取得して、categoryが "緊急" であるかどうかを判定する
     # 緊急であれば CloudWatchLogsにログを出力する
     # 緊急でなければ何もしない
-    print(event)
     for record in event['Records']:
         if record['eventName'] == 'INSERT':
             row = record['dynamodb']['NewImage']
@@ -1,10 +1,13 @@
 import os
-import boto3
 import json
+from aws_clients import lazy_client
+from metrics import record_metrics
+from response import generate_response
 
-client = boto3.client("cognito-idp")
+client = lazy_client("cognito-idp")
 USER_POOL_ID = os.environ["COGNITO_USER_POOL_ID"]
 
+@record_metrics
 def lambda_handler(event, context):
     try:
         body = json.loads(event.get("body", "{}"))
@@ -15,15 +18,9 @@ def lambda_handler(event, context):
 
         # ユーザー名のバリデーション
         if not username or len(username) < 3 or len(username) > 32:
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "Invalid username"})
-            }
+            return generate_response(400, {"error": "Invalid username"})
         elif username == "me":
-            return {
-                "statusCode": 400,
-                "body": json.dumps({"error": "Username 'me' is reserved"})
-            }
+            return generate_response(400, {"error": "Username 'me' is reserved"})
 
         # ユーザー作成
         response = client.admin_create_user(
@@ -46,27 +43,15 @@ def lambda_handler(event, context):
             Permanent=True
         )
 
-        return {
-            "statusCode": 201,
-            "body": json.dumps({
-                "message": "User created",
-                "username": username
-            })
-        }
+        return generate_response(201, {
+            "message": "User created",
+            "username": username
+        })
 
     except client.exceptions.UsernameExistsException:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": "Username already exists"})
-        }
+        return generate_response(400, {"error": "Username already exists"})
     except KeyError as e:
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": f"Missing field: {str(e)}"})
-        }
+        return generate_response(400, {"error": f"Missing field: {str(e)}"})
     except Exception as e:
         print("[CreateUser] Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Internal server error"})
-        }
+        return generate_response(500, {"error": "Internal server error"})
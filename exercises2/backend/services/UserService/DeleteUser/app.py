@@ -1,39 +1,29 @@
 import os
-import boto3
-import json
+from aws_clients import lazy_client
+from metrics import record_metrics
+from response import generate_response
 
-client = boto3.client("cognito-idp")
+client = lazy_client("cognito-idp")
 USER_POOL_ID = os.environ["COGNITO_USER_POOL_ID"]
 
+@record_metrics
 def lambda_handler(event, context):
     path_params = event.get("pathParameters") or {}
     username = path_params.get("username")
 
     # 自己削除は不可
     if username == "me":
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": "Use /users/me or operation is not allowed"})
-        }
+        return generate_response(400, {"error": "Use /users/me or operation is not allowed"})
 
     try:
         client.admin_delete_user(
             UserPoolId=USER_POOL_ID,
             Username=username
         )
-        return {
-            "statusCode": 204,
-            "body": ""  # No content
-        }
+        return generate_response(204)  # No content
 
     except client.exceptions.UserNotFoundException:
-        return {
-            "statusCode": 404,
-            "body": json.dumps({"error": "User not found"})
-        }
+        return generate_response(404, {"error": "User not found"})
     except Exception as e:
         print("[DeleteUser] Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Internal server error"})
-        }
+        return generate_response(500, {"error": "Internal server error"})
@@ -1,10 +1,12 @@
 import os
-import boto3
-import json
+from aws_clients import lazy_client
+from metrics import record_metrics
+from response import generate_response
 
-client = boto3.client("cognito-idp")
+client = lazy_client("cognito-idp")
 USER_POOL_ID = os.environ["COGNITO_USER_POOL_ID"]
 
+@record_metrics
 def lambda_handler(event, context):
     print("[GetUser] Event:", event)
     print("[GetUser] Context:", context)
@@ -22,27 +24,17 @@ def lambda_handler(event, context):
 
         attributes = {attr["Name"]: attr["Value"] for attr in response.get("UserAttributes", [])}
 
-        return {
-            "statusCode": 200,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps({
-                "username": response["Username"],
-                "status": response.get("UserStatus"),
-                "enabled": response.get("Enabled"),
-                "email": attributes.get("email"),
-                "role": attributes.get("custom:role"),
-                "sub": attributes.get("sub")
-            })
-        }
+        return generate_response(200, {
+            "username": response["Username"],
+            "status": response.get("UserStatus"),
+            "enabled": response.get("Enabled"),
+            "email": attributes.get("email"),
+            "role": attributes.get("custom:role"),
+            "sub": attributes.get("sub")
+        })
 
     except client.exceptions.UserNotFoundException:
-        return {
-            "statusCode": 404,
-            "body": json.dumps({"error": "User not found"})
-        }
+        return generate_response(404, {"error": "User not found"})
     except Exception as e:
         print("[GetUser] Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "Internal server error"})
-        }
+        return generate_response(500, {"error": "Internal server error"})
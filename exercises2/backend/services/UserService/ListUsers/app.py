@@ -1,11 +1,13 @@
-import boto3
 import os
-import json
+from aws_clients import lazy_client
+from metrics import record_metrics
+from response import generate_response
 
-client = boto3.client("cognito-idp")
+client = lazy_client("cognito-idp")
 
 USER_POOL_ID = os.environ["COGNITO_USER_POOL_ID"]
 
+@record_metrics
 def lambda_handler(event, context):
     try:
         users = []
@@ -27,18 +29,11 @@ def lambda_handler(event, context):
             else:
                 break
 
-        return {
-            "statusCode": 200,
-            "headers": {"Content-Type": "application/json"},
-            "body": json.dumps([map_user(u) for u in users])
-        }
+        return generate_response(200, [map_user(u) for u in users])
 
     except Exception as e:
         print("[ListUsers] Error:", str(e))
-        return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "internal_server_error"})
-        }
+        return generate_response(500, {"error": "internal_server_error"})
 
 def map_user(user):
     attr = {a["Name"]: a["Value"] for a in user.get("Attributes", [])}
@@ -1,19 +1,19 @@
 import os
-import boto3
 import json
+from aws_clients import lazy_client
+from metrics import record_metrics
+from response import generate_response
 
-client = boto3.client("cognito-idp")
+client = lazy_client("cognito-idp")
 USER_POOL_ID = os.environ["COGNITO_USER_POOL_ID"]
 
+@record_metrics
 def lambda_handler(event, context):
     path_params = event.get("pathParameters") or {}
     username = path_params.get("username")
 
     if username == "me":
-        return {
-            "statusCode": 400,
-            "body": json.dumps({"error": "Use /users/me for self updates"})
-        }
+        return generate_response(400, {"error": "Use /users/me for self updates"})
 
     body = json.loads(event.get("body", "{}"))
     user_attributes = []
@@ -25,7 +25,7 @@ def lambda_handler(event, context):
         user_attributes.append({"Name": "custom:role", "Value": body["custom:role"]})
 
     if not user_attributes:
-        return {"statusCode": 400, "body": json.dumps({"error": "No attributes to update"})}
+        return generate_response(400, {"error": "No attributes to update"})
 
     try:
         client.admin_update_user_attributes(
@@ -33,9 +33,9 @@ def lambda_handler(event, context):
             Username=username,
             UserAttributes=user_attributes
         )
-        return {"statusCode": 200, "body": json.dumps({"message": "User updated"})}
+        return generate_response(200, {"message": "User updated"})
     except client.exceptions.UserNotFoundException:
-        return {"statusCode": 404, "body": json.dumps({"error": "User not found"})}
+        return generate_response(404, {"error": "User not found"})
     except Exception as e:
         print("[UpdateUser] Error:", str(e))
-        return {"statusCode": 500, "body": json.dumps({"error": "Internal server error"})}
+        return generate_response(500, {"error": "Internal server error"})
@@ -0,0 +1,491 @@
+import base64
+import os
+import re
+import sys
+
+import jwt
+import pytest
+import yaml
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+os.environ.setdefault("AWS_REGION", "ap-northeast-1")
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+os.environ.setdefault("ROLE_TABLE_NAME", "RoleAccessTable")
+os.environ.setdefault("COGNITO_USER_POOL_ID", "ap-northeast-1_test")
+os.environ.setdefault("COGNITO_CLIENT_ID", "test-client")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "layers", "CommonLayer"))
+
+import metrics  # noqa: E402
+from services.Authorizer import app  # noqa: E402
+
+
+def int_to_b64url(n):
+    return base64.urlsafe_b64encode(app.int_to_bytes(n)).rstrip(b"=").decode()
+
+
+def make_jwk(kid, private_key):
+    numbers = private_key.public_key().public_numbers()
+    return {"kid": kid, "kty": "RSA", "alg": "RS256", "e": int_to_b64url(numbers.e), "n": int_to_b64url(numbers.n)}
+
+
+@pytest.fixture(scope="module")
+def private_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture()
+def jwks(monkeypatch, private_key):
+    """get_public_keys をスタブ化し、呼び出し回数を記録する"""
+    state = {"keys": [make_jwk("kid-1", private_key)], "calls": 0}
+
+    def fake_get_public_keys():
+        state["calls"] += 1
+        return state["keys"]
+
+    monkeypatch.setattr(app, "get_public_keys", fake_get_public_keys)
+    monkeypatch.setattr(app, "_jwks_cache", {"keys": {}, "fetched_at": None, "last_refresh_attempt": None})
+    return state
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = {"value": 1000.0}
+    monkeypatch.setattr(app.time, "monotonic", lambda: now["value"])
+    return now
+
+
+def make_token(private_key, kid):
+    return jwt.encode({"sub": "user"}, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+def test_keys_are_fetched_once_and_reused(jwks, clock, private_key):
+    token = make_token(private_key, "kid-1")
+
+    first = app.get_public_key(token)
+    second = app.get_public_key(token)
+
+    assert first is second
+    assert jwks["calls"] == 1
+    assert jwt.decode(token, first, algorithms=["RS256"])["sub"] == "user"
+
+
+def test_keys_are_refreshed_after_ttl(jwks, clock, private_key):
+    token = make_token(private_key, "kid-1")
+    app.get_public_key(token)
+
+    clock["value"] += app.JWKS_CACHE_TTL_SECONDS
+    app.get_public_key(token)
+
+    assert jwks["calls"] == 2
+
+
+def test_unknown_kid_refresh_is_rate_limited(jwks, clock, private_key):
+    app.get_public_key(make_token(private_key, "kid-1"))
+
+    for _ in range(10):
+        with pytest.raises(jwt.InvalidTokenError):
+            app.get_public_key(make_token(private_key, "unknown"))
+
+    assert jwks["calls"] == 1
+
+
+def test_unknown_kid_triggers_refresh_for_rotated_key(jwks, clock, private_key):
+    app.get_public_key(make_token(private_key, "kid-1"))
+
+    jwks["keys"] = [make_jwk("kid-1", private_key), make_jwk("kid-2", private_key)]
+    clock["value"] += app.JWKS_MIN_REFRESH_INTERVAL_SECONDS
+
+    assert app.get_public_key(make_token(private_key, "kid-2")) is not None
+    assert jwks["calls"] == 2
+
+
+def test_stale_keys_are_kept_when_fetch_fails(jwks, clock, monkeypatch, private_key):
+    token = make_token(private_key, "kid-1")
+    cached = app.get_public_key(token)
+
+    def failing_get_public_keys():
+        raise RuntimeError("network error")
+
+    monkeypatch.setattr(app, "get_public_keys", failing_get_public_keys)
+    clock["value"] += app.JWKS_CACHE_TTL_SECONDS
+
+    assert app.get_public_key(token) is cached
+
+
+def test_failed_cold_start_fetch_is_retried_soon(jwks, clock, monkeypatch, private_key):
+    token = make_token(private_key, "kid-1")
+    get_public_keys = app.get_public_keys
+
+    def failing_get_public_keys():
+        jwks["calls"] += 1
+        raise RuntimeError("network error")
+
+    monkeypatch.setattr(app, "get_public_keys", failing_get_public_keys)
+    for _ in range(3):
+        with pytest.raises(jwt.InvalidTokenError):
+            app.get_public_key(token)
+    assert jwks["calls"] == 1
+
+    # キャッシュが空の間は、最短間隔（60秒）を待たずに再取得する
+    monkeypatch.setattr(app, "get_public_keys", get_public_keys)
+    clock["value"] += app.JWKS_EMPTY_CACHE_RETRY_SECONDS
+
+    assert app.get_public_key(token) is not None
+    assert jwks["calls"] == 2
+
+
+class FakeTable:
+    """get_item の呼び出し回数を記録するテーブルのスタブ"""
+
+    def __init__(self, items, key_name):
+        self.items = items
+        self.key_name = key_name
+        self.calls = 0
+
+    def get_item(self, Key):
+        self.calls += 1
+        item = self.items.get(Key[self.key_name])
+        return {"Item": item} if item is not None else {}
+
+
+@pytest.fixture()
+def role_tables(monkeypatch):
+    roles = FakeTable({"role-1": {"role_id": "role-1", "allowed_operations": ["GET /troubles"]}}, "role_id")
+    versions = FakeTable({"roles": {"cache_name": "roles", "version": 1}}, "cache_name")
+    monkeypatch.setattr(app, "role_table", roles)
+    monkeypatch.setattr(app, "version_table", versions)
+    monkeypatch.setattr(app, "_role_cache", app.OrderedDict())
+    monkeypatch.setattr(app, "_role_cache_state", {"version": None, "checked_at": None})
+    return roles, versions
+
+
+def test_role_data_is_cached(role_tables, clock):
+    roles, versions = role_tables
+
+    assert app.fetch_role_data("role-1")["role_id"] == "role-1"
+    assert app.fetch_role_data("role-1")["role_id"] == "role-1"
+
+    assert roles.calls == 1
+    assert versions.calls == 1
+
+
+def test_missing_role_is_not_cached(role_tables, clock):
+    roles, _ = role_tables
+
+    assert app.fetch_role_data("unknown") is None
+    assert app.fetch_role_data("unknown") is None
+
+    assert roles.calls == 2
+
+
+def test_role_cache_expires_after_ttl(role_tables, clock):
+    roles, _ = role_tables
+    app.fetch_role_data("role-1")
+
+    clock["value"] += app.ROLE_CACHE_TTL_SECONDS
+    app.fetch_role_data("role-1")
+
+    assert roles.calls == 2
+
+
+def test_role_cache_is_cleared_when_version_changes(role_tables, clock):
+    roles, versions = role_tables
+    app.fetch_role_data("role-1")
+
+    versions.items["roles"]["version"] = 2
+    app.fetch_role_data("role-1")
+    assert roles.calls == 1  # 確認間隔内はバージョンを見に行かない
+
+    clock["value"] += app.ROLE_VERSION_CHECK_INTERVAL_SECONDS
+    app.fetch_role_data("role-1")
+    assert roles.calls == 2
+    assert versions.calls == 2
+
+
+def test_role_cache_is_bounded(role_tables, clock, monkeypatch):
+    roles, _ = role_tables
+    monkeypatch.setattr(app, "ROLE_CACHE_MAX_ENTRIES", 2)
+    for role_id in ["a", "b", "c"]:
+        roles.items[role_id] = {"role_id": role_id}
+        app.fetch_role_data(role_id)
+
+    assert list(app._role_cache) == ["b", "c"]
+
+
+METHOD_ARN = "arn:aws:execute-api:ap-northeast-1:123456789012:api-id/prod/GET/troubles"
+
+
+@pytest.fixture()
+def policy_cache(monkeypatch):
+    monkeypatch.setattr(app, "_policy_cache", app.OrderedDict())
+    monkeypatch.setattr(app, "_policy_cache_stats", {"hits": 0, "misses": 0})
+    return app._policy_cache_stats
+
+
+def make_id_token(private_key, exp):
+    claims = {
+        "sub": "user-sub",
+        "username": "user01",
+        "custom:role": "role-1",
+        "aud": os.environ["COGNITO_CLIENT_ID"],
+        "iss": f"https://cognito-idp.{os.environ['AWS_REGION']}.amazonaws.com/{os.environ['COGNITO_USER_POOL_ID']}",
+        "exp": exp,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": "kid-1"})
+
+
+def invoke(token, method_arn=METHOD_ARN):
+    return app.lambda_handler({"authorizationToken": f"Bearer {token}", "methodArn": method_arn}, None)
+
+
+def test_policy_is_served_from_cache(jwks, clock, role_tables, policy_cache, private_key, monkeypatch):
+    token = make_id_token(private_key, int(app.time.time()) + 3600)
+    first = invoke(token)
+
+    monkeypatch.setattr(app, "get_public_key", lambda _: pytest.fail("token should not be verified again"))
+    second = invoke(token)
+
+    assert second is first
+    assert first["policyDocument"]["Statement"][0]["Effect"] == "Allow"
+    assert policy_cache == {"hits": 1, "misses": 1}
+
+
+def test_policy_cache_hits_are_recorded_as_metric(jwks, clock, role_tables, policy_cache, private_key, monkeypatch):
+    records = []
+    monkeypatch.setattr(metrics, "sink", records.append)
+    token = make_id_token(private_key, int(app.time.time()) + 3600)
+    invoke(token)
+    invoke(token)
+
+    assert [record["PolicyCacheHit"] for record in records] == [0, 1]
+    assert {"Name": "PolicyCacheHit", "Unit": "Count"} in records[0]["_aws"]["CloudWatchMetrics"][0]["Metrics"]
+
+
+def test_policy_cache_is_scoped_to_api_stage(jwks, clock, role_tables, policy_cache, private_key):
+    token = make_id_token(private_key, int(app.time.time()) + 3600)
+    invoke(token)
+    invoke(token, "arn:aws:execute-api:ap-northeast-1:123456789012:other-api/prod/GET/troubles")
+
+    assert policy_cache == {"hits": 0, "misses": 2}
+
+
+def test_policy_cache_expires_with_token(jwks, clock, role_tables, policy_cache, private_key, monkeypatch):
+    now = app.time.time()
+    token = make_id_token(private_key, int(now) + 60)
+    invoke(token)
+
+    monkeypatch.setattr(app.time, "time", lambda: now + 61)
+    invoke(token)
+
+    assert policy_cache == {"hits": 0, "misses": 2}
+
+
+def test_policy_cache_is_invalidated_by_role_version(jwks, clock, role_tables, policy_cache, private_key):
+    _, versions = role_tables
+    token = make_id_token(private_key, int(app.time.time()) + 3600)
+    invoke(token)
+
+    versions.items["roles"]["version"] = 2
+    clock["value"] += app.ROLE_VERSION_CHECK_INTERVAL_SECONDS
+    invoke(token)
+
+    assert policy_cache == {"hits": 0, "misses": 2}
+
+
+def test_nested_operations_allow_requested_resource(jwks, clock, role_tables, policy_cache, private_key, monkeypatch):
+    roles, _ = role_tables
+    roles.items["role-1"]["allowed_operations"] = ["GET /users/{username}", "GET /users/{username}/comments"]
+    monkeypatch.setattr(app, "_compiled_policy_cache", app.OrderedDict())
+    token = make_id_token(private_key, int(app.time.time()) + 3600)
+    method_arn = "arn:aws:execute-api:ap-northeast-1:123456789012:api-id/prod/GET/users/user01"
+
+    policy = invoke(token, method_arn)
+    invoke(token, method_arn)
+
+    allow, deny = policy["policyDocument"]["Statement"]
+    assert method_arn in allow["Resource"]
+    assert deny["Resource"] == ["arn:aws:execute-api:ap-northeast-1:123456789012:api-id/prod/GET/users/*/*/comments"]
+    # リクエストのARNを含むポリシーはキャッシュしない
+    assert policy_cache == {"hits": 0, "misses": 2}
+
+
+STAGE_ARN = "arn:aws:execute-api:ap-northeast-1:123456789012:api-id/prod"
+METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+# パスパラメータの下に別の操作がある構成も含めたルート一覧
+ROUTES = [
+    "/",
+    "/roles",
+    "/roles/{role_id}",
+    "/roles/{role_id}/members",
+    "/roles/{role_id}/members/{username}",
+    "/users",
+    "/users/{username}",
+    "/users/{username}/comments",
+    "/troubles",
+    "/comments",
+    "/files/{proxy+}",
+]
+ROLE_OPERATIONS = [
+    ["GET /roles"],
+    ["GET /roles/{role_id}"],
+    ["GET /roles/{role_id}", "GET /roles"],
+    ["GET /roles/{role_id}/members"],
+    ["* /troubles", "POST /troubles"],
+    ["ANY /users/{username}", "DELETE /users/{username}"],
+    ["GET /files/{proxy+}", "GET /files/{name}"],
+    ["GET /", "PUT /roles/{role_id}/members/{username}"],
+    ["GET /users/{username}", "GET /users/{username}/comments"],
+    ["GET /roles/{role_id}", "GET /roles/{role_id}/members/{username}", "GET /roles"],
+    ["ANY /users/{username}", "GET /users/{username}/comments"],
+]
+
+
+def glob_to_regex(pattern):
+    """IAMのワイルドカード（* は / も含めて任意の文字列に一致）を正規表現にする"""
+    return re.compile("".join(".*" if c == "*" else "." if c == "?" else re.escape(c) for c in pattern) + r"\Z")
+
+
+def operation_to_regex(op):
+    """ロールの操作定義どおりの意味（パスパラメータは1セグメント）で正規表現にする"""
+    method, path = op.split(" ", 1)
+    method = "[^/]+" if method in ("*", "ANY") else re.escape(method)
+    segments = []
+    for segment in path.strip("/").split("/"):
+        if segment.endswith("+}"):
+            segments.append(".+")
+        elif segment.startswith("{"):
+            segments.append("[^/]+")
+        else:
+            segments.append(re.escape(segment))
+    return re.compile(re.escape(STAGE_ARN) + "/" + method + "/" + "/".join(segments) + r"\Z")
+
+
+def policy_allows(compiled, arn):
+    """オーソライザーと同じく、個別に許可する操作に一致すればリクエストのARNを許可に加えて判定する"""
+    allowed, denied, explicit = compiled
+    if app.matches_explicit_operations(explicit, STAGE_ARN, arn):
+        allowed += (arn,)
+    return any(glob_to_regex(p).match(arn) for p in allowed) and not any(glob_to_regex(p).match(arn) for p in denied)
+
+
+def concrete_arns():
+    for route in ROUTES:
+        path = re.sub(r"\{proxy\+\}", "a/b/c", route)
+        path = re.sub(r"\{[^}]+\}", "abc", path)
+        for method in METHODS:
+            yield f"{STAGE_ARN}/{method}{path}"
+            yield f"arn:aws:execute-api:ap-northeast-1:123456789012:api-id/stg/{method}{path}"
+
+
+@pytest.mark.parametrize("operations", ROLE_OPERATIONS)
+def test_compiled_policy_never_widens_access(operations):
+    compiled = app.compile_allowed_operations(operations, STAGE_ARN)
+    expected = [operation_to_regex(op) for op in operations]
+
+    for arn in concrete_arns():
+        if policy_allows(compiled, arn):
+            assert any(r.match(arn) for r in expected), arn
+
+
+@pytest.mark.parametrize("operations", ROLE_OPERATIONS)
+def test_compiled_policy_keeps_access(operations):
+    compiled = app.compile_allowed_operations(operations, STAGE_ARN)
+    expected = [operation_to_regex(op) for op in operations]
+
+    for arn in concrete_arns():
+        if any(r.match(arn) for r in expected):
+            assert policy_allows(compiled, arn), arn
+
+
+def test_compiled_policy_is_minimal():
+    allowed, denied, explicit = app.compile_allowed_operations(
+        ["GET /users/{username}", "ANY /users/{username}", "DELETE /users/{username}", "GET /users"],
+        STAGE_ARN,
+    )
+
+    assert allowed == (f"{STAGE_ARN}/GET/users", f"{STAGE_ARN}/*/users/*")
+    assert denied == (f"{STAGE_ARN}/*/*/users/*", f"{STAGE_ARN}/*/users/*/*")
+    assert explicit == ()
+
+
+def test_nested_operation_is_not_shadowed_by_deny():
+    allowed, denied, explicit = app.compile_allowed_operations(
+        ["GET /users/{username}", "GET /users/{username}/comments"], STAGE_ARN
+    )
+
+    # GET /users/* の拒否（GET/users/*/*）は comments も拒否してしまうため、GET /users/{username} は個別に許可する
+    assert allowed == (f"{STAGE_ARN}/GET/users/*/comments",)
+    assert denied == (f"{STAGE_ARN}/GET/users/*/*/comments",)
+    assert explicit == (("GET", "users", app.SEGMENT_WILDCARD),)
+    assert policy_allows((allowed, denied, explicit), f"{STAGE_ARN}/GET/users/abc")
+    assert policy_allows((allowed, denied, explicit), f"{STAGE_ARN}/GET/users/abc/comments")
+    assert not policy_allows((allowed, denied, explicit), f"{STAGE_ARN}/GET/users/abc/files")
+
+
+def test_expand_allowed_operations_is_memoized(monkeypatch):
+    monkeypatch.setattr(app, "_compiled_policy_cache", app.OrderedDict())
+    calls = []
+    original = app.compile_allowed_operations
+
+    def counting(ops, base_arn):
+        calls.append(ops)
+        return original(ops, base_arn)
+
+    monkeypatch.setattr(app, "compile_allowed_operations", counting)
+
+    first = app.expand_allowed_operations("role-1", 1, ["GET /roles"], f"{STAGE_ARN}/GET/roles")
+    second = app.expand_allowed_operations("role-1", 1, ["GET /roles"], f"{STAGE_ARN}/POST/roles/abc")
+    app.expand_allowed_operations("role-1", 2, ["GET /roles"], f"{STAGE_ARN}/GET/roles")
+    app.expand_allowed_operations("role-1", 2, ["GET /users"], f"{STAGE_ARN}/GET/roles")
+
+    assert first is second
+    assert len(calls) == 3
+
+
+def test_deny_covers_whole_stage():
+    policy = app.generate_deny("unauthorized", f"{STAGE_ARN}/GET/roles")
+
+    assert policy["policyDocument"]["Statement"][0]["Resource"] == [f"{STAGE_ARN}/*/*"]
+
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "..", "template.yaml")
+
+
+def authorizer_ttls():
+    """template.yaml のオーソライザーごとの、API Gateway が結果をキャッシュする秒数（ReauthorizeEvery）"""
+    class Loader(yaml.SafeLoader):
+        pass
+
+    Loader.add_multi_constructor("!", lambda loader, suffix, node: None)
+    with open(TEMPLATE, encoding="utf-8") as f:
+        template = yaml.load(f, Loader)
+    for resource in template["Resources"].values():
+        authorizers = ((resource.get("Properties") or {}).get("Auth") or {}).get("Authorizers") or {}
+        for authorizer in authorizers.values():
+            yield (authorizer.get("Identity") or {}).get("ReauthorizeEvery", 300)
+
+
+def policy_document_allows(policy, arn):
+    statements = policy["policyDocument"]["Statement"]
+    matches = [s["Effect"] for s in statements if any(glob_to_regex(r).match(arn) for r in s["Resource"])]
+    return "Allow" in matches and "Deny" not in matches
+
+
+def test_policy_reused_by_api_gateway_allows_sibling_operations(jwks, clock, role_tables, policy_cache, private_key,
+                                                                monkeypatch):
+    roles, _ = role_tables
+    roles.items["role-1"]["allowed_operations"] = ["GET /users/{username}", "GET /users/{username}/comments"]
+    monkeypatch.setattr(app, "_compiled_policy_cache", app.OrderedDict())
+    token = make_id_token(private_key, int(app.time.time()) + 3600)
+    users_arn = f"{STAGE_ARN}/GET/users/user01"
+    comments_arn = f"{STAGE_ARN}/GET/users/user01/comments"
+    ttls = list(authorizer_ttls())
+    assert ttls
+
+    for first_arn, second_arn in ((users_arn, comments_arn), (comments_arn, users_arn)):
+        first = invoke(token, first_arn)
+        for ttl in ttls:
+            # API Gateway はキャッシュする間、同じトークンの別の操作にも最初のリクエストのポリシーを使う
+            policy = first if ttl else invoke(token, second_arn)
+            assert policy_document_allows(policy, second_arn), (ttl, second_arn)
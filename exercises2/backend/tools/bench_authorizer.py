@@ -0,0 +1,358 @@
+"""
+Authorizerのマイクロベンチマーク
+
+ローカルで生成したRSA鍵でRS256トークンを発行し、JWKSをプロセス内のHTTPスタブから配信します。
+RoleAccessTableはメモリ上のスタブに差し替え、以下の段階ごとに p50/p95/p99 とメモリ割り当てを計測します。
+
+- get_public_key / jwt.decode / fetch_role_data / expand_allowed_operations / generate_policy
+- lambda_handler 全体、およびコールドコンテナでのモジュールのインポート
+
+シナリオ:
+- cold: 毎回新しいPythonプロセスで、モジュールの読み込み（jwt, cryptography, boto3 なども含む）と最初の呼び出しを計る
+- warm-distinct: 同じコンテナで毎回異なるトークンを使う（JWKS・ロールはキャッシュ済み）
+- warm-repeat: 同じコンテナで同じトークンを繰り返し使う（ポリシーキャッシュが効く）
+
+使い方:
+    python tools/bench_authorizer.py --iterations 500 --cold-iterations 20
+    python tools/bench_authorizer.py --json result.json
+"""
+
+import argparse
+import base64
+import contextlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+
+# jwt・cryptography・http.server は関数の中で読み込む
+# （cold シナリオの子プロセスで、Authorizer より先に読み込まれて計測から外れないようにする）
+
+AUTHORIZER_PATH = os.path.join(os.path.dirname(__file__), "..", "services", "Authorizer", "app.py")
+LAYER_DIR = os.path.join(os.path.dirname(__file__), "..", "layers", "CommonLayer")
+
+# Authorizer が読み込む共通モジュール（aws_clients, dynamodb_client など）はレイヤーにある
+sys.path.insert(0, LAYER_DIR)
+
+REGION = "ap-northeast-1"
+USER_POOL_ID = f"{REGION}_bench"
+CLIENT_ID = "bench-client"
+KID = "bench-kid"
+ROLE_ID = "bench-role"
+STAGE_ARN = "arn:aws:execute-api:ap-northeast-1:123456789012:bench-api/prod"
+ALLOWED_OPERATIONS = [
+    "GET /troubles",
+    "POST /troubles",
+    "GET /roles",
+    "GET /roles/{role_id}",
+    "GET /users/{username}",
+    "GET /comments",
+    "POST /comments",
+]
+
+# 計測する段階（モジュール内の関数名）
+STAGES = [
+    "get_public_key",
+    "jwt.decode",
+    "fetch_role_data",
+    "expand_allowed_operations",
+    "generate_policy",
+]
+
+
+class FakeTable:
+    """get_item だけを持つDynamoDBテーブルのスタブ"""
+
+    def __init__(self, items, key_name):
+        self.items = items
+        self.key_name = key_name
+
+    def get_item(self, Key):
+        item = self.items.get(Key[self.key_name])
+        return {"Item": item} if item is not None else {}
+
+
+def int_to_b64url(n):
+    return base64.urlsafe_b64encode(n.to_bytes((n.bit_length() + 7) // 8, byteorder="big")).rstrip(b"=").decode()
+
+
+def start_jwks_stub(private_key):
+    """JWKSを返すHTTPサーバーを別スレッドで起動し、URLを返す"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    numbers = private_key.public_key().public_numbers()
+    body = json.dumps({
+        "keys": [{"kid": KID, "kty": "RSA", "alg": "RS256", "use": "sig",
+                  "e": int_to_b64url(numbers.e), "n": int_to_b64url(numbers.n)}],
+    }).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/{USER_POOL_ID}/.well-known/jwks.json"
+
+
+def mint_token(private_key):
+    import jwt
+
+    now = int(time.time())
+    claims = {
+        "sub": str(uuid.uuid4()),
+        "username": "bench-user",
+        "custom:role": ROLE_ID,
+        "aud": CLIENT_ID,
+        "iss": f"https://cognito-idp.{REGION}.amazonaws.com/{USER_POOL_ID}",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": KID})
+
+
+def make_event(token):
+    return {
+        "type": "TOKEN",
+        "authorizationToken": f"Bearer {token}",
+        "methodArn": f"{STAGE_ARN}/GET/troubles",
+    }
+
+
+def load_authorizer():
+    """Authorizerを新しいモジュールとして読み込み、テーブルをスタブに差し替える"""
+    spec = importlib.util.spec_from_file_location("bench_authorizer_app", AUTHORIZER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.role_table = FakeTable(
+        {ROLE_ID: {"role_id": ROLE_ID, "is_super_user": False, "allowed_operations": ALLOWED_OPERATIONS}},
+        "role_id",
+    )
+    module.version_table = FakeTable({"roles": {"cache_name": "roles", "version": 1}}, "cache_name")
+    return module
+
+
+class Recorder:
+    """段階ごとの所要時間とメモリ割り当てを記録する"""
+
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.samples = {}
+
+    def record(self, stage, elapsed, allocated):
+        entry = self.samples.setdefault(stage, {"seconds": [], "bytes": []})
+        entry["seconds"].append(elapsed)
+        if allocated is not None:
+            entry["bytes"].append(allocated)
+
+    def measure(self, stage, func, *args, **kwargs):
+        before = tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            allocated = tracemalloc.get_traced_memory()[1] - before if self.trace_memory else None
+            self.record(stage, elapsed, allocated)
+
+    def wrap(self, stage, func):
+        def wrapper(*args, **kwargs):
+            return self.measure(stage, func, *args, **kwargs)
+        return wrapper
+
+
+@contextlib.contextmanager
+def instrumented(module, recorder):
+    """段階ごとの関数を計測用ラッパーに差し替える"""
+    originals = []
+    for stage in STAGES:
+        owner, name = (module.jwt, "decode") if stage == "jwt.decode" else (module, stage)
+        original = getattr(owner, name)
+        originals.append((owner, name, original))
+        setattr(owner, name, recorder.wrap(stage, original))
+    try:
+        yield
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+
+def cold_child(token, trace_memory):
+    """
+    子プロセスの処理: Authorizerを読み込んで1回呼び出し、段階ごとの計測結果をJSONで標準出力に書く
+    """
+    recorder = Recorder(trace_memory)
+    if trace_memory:
+        tracemalloc.start()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        module = recorder.measure("import", load_authorizer)
+        with instrumented(module, recorder):
+            recorder.measure("lambda_handler", module.lambda_handler, make_event(token), None)
+    print(json.dumps(recorder.samples))
+
+
+def run_cold_child(token, trace_memory):
+    command = [sys.executable, os.path.abspath(__file__), "--cold-child", token]
+    if trace_memory:
+        command.append("--trace-memory")
+    result = subprocess.run(command, env=os.environ.copy(), capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"cold シナリオの子プロセスが失敗しました: {result.stderr.strip()}")
+    return json.loads(result.stdout)
+
+
+def run_cold(private_key, iterations, recorder):
+    """
+    毎回新しいプロセスで読み込みと最初の呼び出しを計る（同じプロセスで読み込み直すと、
+    jwt や boto3 などの依存パッケージが sys.modules に残ったままになり、コールドスタートにならない）
+    """
+    # 1回目は .pyc の作成が含まれるため捨てる
+    run_cold_child(mint_token(private_key), False)
+    for _ in range(iterations):
+        samples = run_cold_child(mint_token(private_key), recorder.trace_memory)
+        for stage, entry in samples.items():
+            for elapsed, allocated in zip(entry["seconds"], entry["bytes"] or [None] * len(entry["seconds"])):
+                recorder.record(stage, elapsed, allocated)
+
+
+def run_warm(private_key, iterations, recorder, repeat_token):
+    module = load_authorizer()
+    # ウォームアップ（JWKSとロールをキャッシュに載せる）
+    module.lambda_handler(make_event(mint_token(private_key)), None)
+
+    token = mint_token(private_key)
+    events = [make_event(token if repeat_token else mint_token(private_key)) for _ in range(iterations)]
+    with instrumented(module, recorder):
+        for event in events:
+            recorder.measure("lambda_handler", module.lambda_handler, event, None)
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(recorder):
+    summary = {}
+    for stage, entry in recorder.samples.items():
+        seconds = entry["seconds"]
+        summary[stage] = {
+            "count": len(seconds),
+            "p50_ms": percentile(seconds, 50) * 1000,
+            "p95_ms": percentile(seconds, 95) * 1000,
+            "p99_ms": percentile(seconds, 99) * 1000,
+        }
+    return summary
+
+
+def summarize_memory(recorder, summary):
+    for stage, entry in recorder.samples.items():
+        if entry["bytes"] and stage in summary:
+            summary[stage]["peak_alloc_kib_mean"] = sum(entry["bytes"]) / len(entry["bytes"]) / 1024
+
+
+def run_scenario(name, private_key, iterations, memory_iterations):
+    runners = {
+        "cold": lambda n, r: run_cold(private_key, n, r),
+        "warm-distinct": lambda n, r: run_warm(private_key, n, r, repeat_token=False),
+        "warm-repeat": lambda n, r: run_warm(private_key, n, r, repeat_token=True),
+    }
+    # 時間計測とメモリ計測は別々に行う（tracemalloc は処理時間に大きく影響するため）
+    timing = Recorder(trace_memory=False)
+    runners[name](iterations, timing)
+    summary = summarize(timing)
+
+    if memory_iterations:
+        memory = Recorder(trace_memory=True)
+        # cold シナリオでは子プロセスが tracemalloc を開始する
+        if name != "cold":
+            tracemalloc.start()
+        try:
+            runners[name](memory_iterations, memory)
+        finally:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+        summarize_memory(memory, summary)
+    return summary
+
+
+def print_table(results):
+    header = f"{'scenario':<14} {'stage':<26} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KiB':>9}"
+    print(header)
+    print("-" * len(header))
+    for scenario, summary in results.items():
+        for stage in ["import", "lambda_handler"] + STAGES:
+            if stage not in summary:
+                continue
+            row = summary[stage]
+            peak = row.get("peak_alloc_kib_mean")
+            peak_text = f"{peak:9.1f}" if peak is not None else f"{'-':>9}"
+            print(f"{scenario:<14} {stage:<26} {row['count']:>6} {row['p50_ms']:9.3f} "
+                  f"{row['p95_ms']:9.3f} {row['p99_ms']:9.3f} {peak_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authorizerのマイクロベンチマーク")
+    parser.add_argument("--iterations", type=int, default=300, help="ウォームシナリオの試行回数")
+    parser.add_argument("--cold-iterations", type=int, default=20, help="コールドシナリオの試行回数")
+    parser.add_argument("--memory-iterations", type=int, default=20, help="メモリ計測の試行回数（0で無効）")
+    parser.add_argument("--scenario", action="append", choices=["cold", "warm-distinct", "warm-repeat"],
+                        help="実行するシナリオ（複数指定可、省略時はすべて）")
+    parser.add_argument("--json", help="結果をJSONで書き出すファイルパス")
+    # cold シナリオの子プロセス用（内部で使う）
+    parser.add_argument("--cold-child", metavar="TOKEN", help=argparse.SUPPRESS)
+    parser.add_argument("--trace-memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_child:
+        cold_child(args.cold_child, args.trace_memory)
+        return
+
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    server, jwks_url = start_jwks_stub(private_key)
+
+    os.environ.setdefault("AWS_REGION", REGION)
+    os.environ.setdefault("AWS_DEFAULT_REGION", REGION)
+    os.environ["ROLE_TABLE_NAME"] = "RoleAccessTable"
+    os.environ["ROLE_VERSION_TABLE_NAME"] = "RoleCacheVersionTable"
+    os.environ["COGNITO_USER_POOL_ID"] = USER_POOL_ID
+    os.environ["COGNITO_CLIENT_ID"] = CLIENT_ID
+    os.environ["JWKS_URL"] = jwks_url
+
+    results = {}
+    try:
+        # Authorizerのログ出力は計測結果の表示を妨げるため捨てる
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for scenario in args.scenario or ["cold", "warm-distinct", "warm-repeat"]:
+                iterations = args.cold_iterations if scenario == "cold" else args.iterations
+                memory_iterations = min(args.memory_iterations, iterations)
+                results[scenario] = run_scenario(scenario, private_key, iterations, memory_iterations)
+    finally:
+        server.shutdown()
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"結果を {args.json} に書き出しました")
+
+
+if __name__ == "__main__":
+    main()
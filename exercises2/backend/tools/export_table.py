@@ -0,0 +1,76 @@
+"""
+Troubleテーブルを並列スキャンでNDJSONに書き出すツール
+
+layers/CommonLayer の parallel_scan を使い、複数セグメントを同時に読み取ります。
+アイテムは読み取った順に1行ずつ書き出すため、テーブルの大きさに関わらずメモリ使用量は一定です。
+TroubleTable はプロビジョンドキャパシティが小さいため、本番では --max-read-capacity で予算を指定してください。
+
+使い方:
+    python tools/export_table.py --segments 8 --output troubles.ndjson
+    python tools/export_table.py --endpoint-url http://localhost:4566 --max-read-capacity 100
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+
+import boto3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "layers", "CommonLayer"))
+
+from parallel_scan import ParallelScanner  # noqa: E402
+
+
+def json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Troubleテーブルを並列スキャンでNDJSONに書き出す")
+    parser.add_argument("--table", default=os.getenv("TABLE_NAME", "TroubleTable"), help="テーブル名")
+    parser.add_argument("--endpoint-url", default=os.getenv("ENDPOINT_URL"), help="DynamoDBのエンドポイント（LocalStackなど）")
+    parser.add_argument("--segments", type=int, default=4, help="セグメント数（並列度）")
+    parser.add_argument("--page-size", type=int, help="1回の scan で読み取る最大件数")
+    parser.add_argument("--max-read-capacity", type=float, help="読み込みキャパシティの予算（RCU/秒）")
+    parser.add_argument("--output", help="書き出し先のファイルパス（省略時は標準出力）")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb", endpoint_url=args.endpoint_url).Table(args.table)
+    scanner = ParallelScanner(
+        table.scan,
+        total_segments=args.segments,
+        page_size=args.page_size,
+        max_read_capacity=args.max_read_capacity,
+    )
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        for item in scanner.scan():
+            output.write(json.dumps(item, ensure_ascii=False, default=json_default))
+            output.write("\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    stats = scanner.stats
+    print(
+        f"{stats['items']} 件を {elapsed:.2f} 秒で書き出しました "
+        f"({stats['items'] / elapsed if elapsed else 0:.0f} 件/秒, "
+        f"消費RCU {stats['consumed_capacity']:.1f}, スロットリング {stats['throttles']} 回)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,69 @@
 import os
 import json
+import hashlib
+import pprint
 import click
+import fastjsonschema
 from pydantic import BaseModel
-from typing import List
 
 # モデルのインポート
 import models
 
+# 生成したファイルの先頭に書き込む、生成元のハッシュ
+HASH_PREFIX = "# source-hash: "
+HEADER = "# このファイルは generate-schema/main.py で生成されます。直接編集しないでください。\n"
+
+def source_hash(schema):
+    # JSON Schema と fastjsonschema のバージョンが同じなら、生成されるコードも同じになる
+    source = json.dumps(schema, sort_keys=True, ensure_ascii=False) + fastjsonschema.VERSION
+    return hashlib.sha256(source.encode()).hexdigest()
+
+def read_hash(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        for line in f:
+            if line.startswith(HASH_PREFIX):
+                return line[len(HASH_PREFIX):].strip()
+            if not line.startswith("#"):
+                break
+    return None
+
+def write_module(path, digest, body):
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        f.write(f"{HASH_PREFIX}{digest}\n")
+        f.write(body)
+
 @click.command()
-@click.argument('name')
-def generate_json_schema(name: str):
-    # モデルクラスの取得
-    model_class = getattr(models, name, None)
-    if not model_class or not issubclass(model_class, BaseModel):
-        raise ValueError(f"Model {name} not found or is not a valid Pydantic model")
-
-    # JSON Schemaの生成
-    schema = model_class.model_json_schema()
-
-    # JSON Schemaを指定されたディレクトリに保存
-    function_dir = os.path.join(os.path.dirname(__file__), '..', 'todo', name)
-    os.makedirs(function_dir, exist_ok=True)
-    schema_file_path = os.path.join(function_dir, 'schema.py')
-    with open(schema_file_path, 'w') as f:
-        f.write(f"schema = {json.dumps(schema, indent=2)}")
-
-    click.echo(f"JSON Schema for {name} has been written to {schema_file_path}")
+@click.argument('names', nargs=-1)
+@click.option('--force', is_flag=True, help='ハッシュが変わっていなくても再生成する')
+def generate_json_schema(names, force: bool):
+    # 名前の指定がなければすべてのモデルを対象にする
+    for name in names or models.__all__:
+        # モデルクラスの取得
+        model_class = getattr(models, name, None)
+        if not model_class or not issubclass(model_class, BaseModel):
+            raise ValueError(f"Model {name} not found or is not a valid Pydantic model")
+
+        # JSON Schemaの生成
+        schema = model_class.model_json_schema()
+        digest = source_hash(schema)
+
+        function_dir = os.path.join(os.path.dirname(__file__), '..', 'todo', name)
+        schema_file_path = os.path.join(function_dir, 'schema.py')
+        validator_file_path = os.path.join(function_dir, 'validator.py')
+        if not force and all(read_hash(path) == digest for path in (schema_file_path, validator_file_path)):
+            click.echo(f"{name} is up to date")
+            continue
+
+        # JSON Schema（参照用）と、コンパイル済みの検証関数を指定されたディレクトリに保存
+        # 実行時に fastjsonschema.compile を呼ばないため、読み込み時・リクエスト時のコンパイルが不要になる
+        os.makedirs(function_dir, exist_ok=True)
+        write_module(schema_file_path, digest, f"schema = {pprint.pformat(schema, sort_dicts=False)}\n")
+        write_module(validator_file_path, digest, fastjsonschema.compile_to_code(schema))
+
+        click.echo(f"JSON Schema and validator for {name} have been written to {function_dir}")
 
 if __name__ == '__main__':
     generate_json_schema()
@@ -3,9 +3,8 @@ import os
 import uuid
 import boto3
 from mypy_boto3_dynamodb import DynamoDBServiceResource
-from aws_lambda_powertools.utilities.validation import validate
-from aws_lambda_powertools.utilities.validation.exceptions import SchemaValidationError
-from schema import schema
+from fastjsonschema import JsonSchemaValueException
+from validator import validate
 from aws_lambda_powertools import Logger
 
 logger = Logger()
@@ -31,8 +30,8 @@ def lambda_handler(event, context):
     body = json.loads(event.get('body', '{}'))
     
     try:
-        validate(event=body, schema=schema)
-    except SchemaValidationError as e:
+        validate(body)
+    except JsonSchemaValueException as e:
         logger.error("Schema validation error: %s", e)
         return generate_response(400, {"message": "Invalid input", "error": str(e)})
     
@@ -1,13 +1,6 @@
-schema = {
-  "properties": {
-    "title": {
-      "title": "Title",
-      "type": "string"
-    }
-  },
-  "required": [
-    "title"
-  ],
-  "title": "CreateTodo",
-  "type": "object"
-}
\ No newline at end of file
+# このファイルは generate-schema/main.py で生成されます。直接編集しないでください。
+# source-hash: 8f24083a86b582a2c32dedebeafafd50ab8f13c179d9ad433e29688678812bc3
+schema = {'properties': {'title': {'title': 'Title', 'type': 'string'}},
+ 'required': ['title'],
+ 'title': 'CreateTodo',
+ 'type': 'object'}
@@ -0,0 +1,24 @@
+# このファイルは generate-schema/main.py で生成されます。直接編集しないでください。
+# source-hash: 8f24083a86b582a2c32dedebeafafd50ab8f13c179d9ad433e29688678812bc3
+VERSION = "2.22.2"
+from decimal import Decimal
+from fastjsonschema import JsonSchemaValueException, JsonSchemaValuesException
+
+
+NoneType = type(None)
+
+def validate(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'properties': {'title': {'title': 'Title', 'type': 'string'}}, 'required': ['title'], 'title': 'CreateTodo', 'type': 'object'}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data__missing_keys = set(['title']) - data.keys()
+        if data__missing_keys:
+            raise JsonSchemaValueException("" + (name_prefix or "data") + " must contain " + (str(sorted(data__missing_keys)) + " properties"), value=data, name="" + (name_prefix or "data") + "", definition={'properties': {'title': {'title': 'Title', 'type': 'string'}}, 'required': ['title'], 'title': 'CreateTodo', 'type': 'object'}, rule='required')
+        data_keys = set(data.keys())
+        if "title" in data_keys:
+            data_keys.remove("title")
+            data__title = data["title"]
+            if not isinstance(data__title, (str)):
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".title must be string", value=data__title, name="" + (name_prefix or "data") + ".title", definition={'title': 'Title', 'type': 'string'}, rule='type')
+    return data
\ No newline at end of file
@@ -2,16 +2,14 @@ import json
 import os
 import boto3
 from mypy_boto3_dynamodb import DynamoDBServiceResource
-from aws_lambda_powertools.utilities.validation import validate
-from schema import schema
+from validator import validate
 from aws_lambda_powertools import Logger
 
 logger = Logger()
 
 ENDPOINT_URL = os.getenv('ENDPOINT_URL') or None
 
-endpoint_url = os.getenv("ENDPOINT_URL")
-dynamoDB: DynamoDBServiceResource = boto3.resource("dynamodb", endpoint_url=endpoint_url)
+dynamoDB: DynamoDBServiceResource = boto3.resource("dynamodb", endpoint_url=ENDPOINT_URL)
 table = dynamoDB.Table(name=os.getenv("STATUS_TABLE"))
 
 def generate_response(status_code, body):
@@ -31,7 +29,7 @@ def lambda_handler(event, context):
     body = json.loads(event.get('body', '{}'))
 
     try:
-        validate(event=body, schema=schema)
+        validate(body)
     except ValueError as e:
         logger.error("Schema validation error: %s", e)
         return generate_response(400, {"message": "Invalid input", "errors": str(e)})
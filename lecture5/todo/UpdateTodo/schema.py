@@ -1,30 +1,10 @@
-schema = {
-  "properties": {
-    "title": {
-      "anyOf": [
-        {
-          "type": "string"
-        },
-        {
-          "type": "null"
-        }
-      ],
-      "default": null,
-      "title": "Title"
-    },
-    "checked": {
-      "anyOf": [
-        {
-          "type": "boolean"
-        },
-        {
-          "type": "null"
-        }
-      ],
-      "default": null,
-      "title": "Checked"
-    }
-  },
-  "title": "UpdateTodo",
-  "type": "object"
-}
+# このファイルは generate-schema/main.py で生成されます。直接編集しないでください。
+# source-hash: 2020e37c4cba910868eceb43d6301980d154ca355285f9a80317a8020570efb4
+schema = {'properties': {'title': {'anyOf': [{'type': 'string'}, {'type': 'null'}],
+                          'default': None,
+                          'title': 'Title'},
+                'checked': {'anyOf': [{'type': 'boolean'}, {'type': 'null'}],
+                            'default': None,
+                            'title': 'Checked'}},
+ 'title': 'UpdateTodo',
+ 'type': 'object'}
@@ -0,0 +1,54 @@
+# このファイルは generate-schema/main.py で生成されます。直接編集しないでください。
+# source-hash: 2020e37c4cba910868eceb43d6301980d154ca355285f9a80317a8020570efb4
+VERSION = "2.22.2"
+from decimal import Decimal
+from fastjsonschema import JsonSchemaValueException, JsonSchemaValuesException
+
+
+NoneType = type(None)
+
+def validate(data, custom_formats={}, name_prefix=None):
+    if not isinstance(data, (dict)):
+        raise JsonSchemaValueException("" + (name_prefix or "data") + " must be object", value=data, name="" + (name_prefix or "data") + "", definition={'properties': {'title': {'anyOf': [{'type': 'string'}, {'type': 'null'}], 'default': None, 'title': 'Title'}, 'checked': {'anyOf': [{'type': 'boolean'}, {'type': 'null'}], 'default': None, 'title': 'Checked'}}, 'title': 'UpdateTodo', 'type': 'object'}, rule='type')
+    data_is_dict = isinstance(data, dict)
+    if data_is_dict:
+        data_keys = set(data.keys())
+        if "title" in data_keys:
+            data_keys.remove("title")
+            data__title = data["title"]
+            data__title_any_of_count1 = 0
+            if not data__title_any_of_count1:
+                try:
+                    if not isinstance(data__title, (str)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".title must be string", value=data__title, name="" + (name_prefix or "data") + ".title", definition={'type': 'string'}, rule='type')
+                    data__title_any_of_count1 += 1
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+            if not data__title_any_of_count1:
+                try:
+                    if not isinstance(data__title, (NoneType)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".title must be null", value=data__title, name="" + (name_prefix or "data") + ".title", definition={'type': 'null'}, rule='type')
+                    data__title_any_of_count1 += 1
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+            if not data__title_any_of_count1:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".title cannot be validated by any definition", value=data__title, name="" + (name_prefix or "data") + ".title", definition={'anyOf': [{'type': 'string'}, {'type': 'null'}], 'default': None, 'title': 'Title'}, rule='anyOf')
+        else: data["title"] = None
+        if "checked" in data_keys:
+            data_keys.remove("checked")
+            data__checked = data["checked"]
+            data__checked_any_of_count2 = 0
+            if not data__checked_any_of_count2:
+                try:
+                    if not isinstance(data__checked, (bool)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".checked must be boolean", value=data__checked, name="" + (name_prefix or "data") + ".checked", definition={'type': 'boolean'}, rule='type')
+                    data__checked_any_of_count2 += 1
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+            if not data__checked_any_of_count2:
+                try:
+                    if not isinstance(data__checked, (NoneType)):
+                        raise JsonSchemaValueException("" + (name_prefix or "data") + ".checked must be null", value=data__checked, name="" + (name_prefix or "data") + ".checked", definition={'type': 'null'}, rule='type')
+                    data__checked_any_of_count2 += 1
+                except (JsonSchemaValueException, JsonSchemaValuesException): pass
+            if not data__checked_any_of_count2:
+                raise JsonSchemaValueException("" + (name_prefix or "data") + ".checked cannot be validated by any definition", value=data__checked, name="" + (name_prefix or "data") + ".checked", definition={'anyOf': [{'type': 'boolean'}, {'type': 'null'}], 'default': None, 'title': 'Checked'}, rule='anyOf')
+        else: data["checked"] = None
+    return data
\ No newline at end of file
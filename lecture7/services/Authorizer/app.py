@@ -1,17 +1,37 @@
 import os
-import json
+from collections import OrderedDict
 import jwt
 import boto3
 from jwt import InvalidTokenError
+import time
+from request_log import PrintLogger, log_requests
 
 dynamodb = boto3.resource("dynamodb")
 role_table = dynamodb.Table(os.environ["ROLE_TABLE_NAME"])
 cognito_user_pool_id = os.environ["COGNITO_USER_POOL_ID"]
 
+# ロールキャッシュの設定（コンテナ内で再利用する）
+ROLE_CACHE_NAME = "roles"
+ROLE_CACHE_TTL_SECONDS = int(os.getenv("ROLE_CACHE_TTL_SECONDS", "300"))
+ROLE_CACHE_MAX_ENTRIES = int(os.getenv("ROLE_CACHE_MAX_ENTRIES", "128"))
+ROLE_VERSION_CHECK_INTERVAL_SECONDS = int(os.getenv("ROLE_VERSION_CHECK_INTERVAL_SECONDS", "10"))
+ROLE_VERSION_TABLE_NAME = os.getenv("ROLE_VERSION_TABLE_NAME")
+version_table = dynamodb.Table(ROLE_VERSION_TABLE_NAME) if ROLE_VERSION_TABLE_NAME else None
 
-def lambda_handler(event, context):
-    print("[Authorizer] Event:", json.dumps(event))
+# role_id -> (ロール情報, 取得時刻)
+_role_cache = OrderedDict()
+_role_cache_state = {
+    "version": None,
+    "checked_at": None,
+}
+
+
+# イベント（トークンは伏せる）はサンプリングしたものだけを出力する
+logger = PrintLogger("Authorizer")
 
+
+@log_requests(logger)
+def lambda_handler(event, context):
     token = event.get("authorizationToken", "").replace("Bearer ", "").strip()
     method_arn = event["methodArn"]
 
@@ -25,14 +45,12 @@ def lambda_handler(event, context):
         return generate_deny("unauthorized", method_arn)
 
     role_data = fetch_role_data(role_id)
-    print(f"[Authorizer] Role data: {role_data}")
     if not role_data:
         return generate_deny(principal_id, method_arn)
 
     is_super_user = role_data.get("is_super_user") in [True, "true", "True", 1, "1"]
 
     if is_super_user:
-        print(f"[Authorizer] Super user: {principal_id}")
         return generate_allow(
             principal_id,
             [get_method_arn_prefix(method_arn) + "/*/*"],
@@ -54,6 +72,28 @@ def lambda_handler(event, context):
 
 
 def fetch_role_data(role_id: str):
+    """
+    ロール情報をコンテナ内キャッシュから取得する。
+    キャッシュにない、または期限切れの場合のみDynamoDBから取得する。
+    """
+    now = time.monotonic()
+    sync_role_cache_version(now)
+
+    cached = _role_cache.get(role_id)
+    if cached is not None and now - cached[1] < ROLE_CACHE_TTL_SECONDS:
+        _role_cache.move_to_end(role_id)
+        return cached[0]
+
+    role_data = load_role_data(role_id)
+    if role_data:
+        _role_cache[role_id] = (role_data, now)
+        _role_cache.move_to_end(role_id)
+        while len(_role_cache) > ROLE_CACHE_MAX_ENTRIES:
+            _role_cache.popitem(last=False)
+    return role_data
+
+
+def load_role_data(role_id: str):
     try:
         resp = role_table.get_item(Key={"role_id": role_id})
         return resp.get("Item")
@@ -62,6 +102,30 @@ def fetch_role_data(role_id: str):
         return None
 
 
+def sync_role_cache_version(now):
+    """
+    ロールキャッシュのバージョンを一定間隔で確認する。
+    RoleAccessTableのストリームでバージョンが進んでいればキャッシュを破棄する。
+    """
+    if version_table is None:
+        return
+    checked_at = _role_cache_state["checked_at"]
+    if checked_at is not None and now - checked_at < ROLE_VERSION_CHECK_INTERVAL_SECONDS:
+        return
+    _role_cache_state["checked_at"] = now
+
+    try:
+        resp = version_table.get_item(Key={"cache_name": ROLE_CACHE_NAME})
+    except Exception as e:
+        print("DynamoDB error:", str(e))
+        return
+
+    version = int(resp.get("Item", {}).get("version", 0))
+    if version != _role_cache_state["version"]:
+        _role_cache.clear()
+        _role_cache_state["version"] = version
+
+
 def expand_allowed_operations(allowed_ops, method_arn):
     """
     例: methodArn: arn:aws:execute-api:region:account:api-id/stage/METHOD/resource
@@ -92,7 +156,6 @@ def generate_deny(principal_id, method_arn):
 
 
 def generate_policy(principal_id, effect, resources, context=None):
-    print(f"[Authorizer] Generating {effect} for resources: {resources}")
     policy = {
         "principalId": principal_id,
         "policyDocument": {
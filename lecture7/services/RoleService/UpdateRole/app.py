@@ -3,10 +3,13 @@ import uuid
 import boto3
 import json
 from boto3.dynamodb.conditions import Key
+from request_log import PrintLogger, log_requests
 
 dynamodb = boto3.resource("dynamodb")
 table = dynamodb.Table(os.environ["ROLE_TABLE_NAME"])
+logger = PrintLogger("UpdateRole")
 
+@log_requests(logger)
 def lambda_handler(event, context):
     try:
         # パスパラメータからTODO IDを取得
@@ -15,9 +18,6 @@ def lambda_handler(event, context):
         # リクエストボディの取得とJSONパース
         body = json.loads(event.get('body', '{}'))
 
-        print("[UpdateRole] Event:", json.dumps(event))
-        print("[UpdateRole] Body:", json.dumps(body))
-
         # 更新するフィールドを抽出
         name = body.get("name")
         is_super_user = body.get("is_super_user")
@@ -1,5 +1,8 @@
-import boto3
 import json
+from aws_clients import lazy_client
+
+# 呼び出しごとに作らず、コンテナ内で再利用する
+client = lazy_client("stepfunctions")
 
 def lambda_handler(event, context):
     params = event.get("queryStringParameters") or {}
@@ -9,8 +12,6 @@ def lambda_handler(event, context):
     # パス情報を確実に取得（API Gateway v1/v2 互換）
     path = event.get("rawPath") or event.get("path") or ""
 
-    client = boto3.client("stepfunctions")
-
     if "approve" in path:
         client.send_task_success(
             taskToken=token,
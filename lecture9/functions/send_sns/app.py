@@ -1,12 +1,13 @@
 import os
-import boto3
 import urllib.parse
+from aws_clients import lazy_client
 
 approval_api_base = os.environ["APPROVAL_API_BASE_URL"]
 
+sns = lazy_client("sns")
+
 
 def lambda_handler(event, context):
-    sns = boto3.client("sns")
     token = urllib.parse.quote(event["token"])  # URL セーフ
     request_id = event.get("requestId", "unknown")
 
@@ -0,0 +1,645 @@
+"""
+SAMテンプレートのAPIをプロセス内で提供するローカルの API Gateway（スループットの計測用）
+
+`sam local start-api` は呼び出しごとにコンテナを起動するため、ローカルでのスループットやレイテンシが
+本番と大きく異なります。このツールは template.yaml の Api イベント（Path / Method / RestApiId）から
+ルートを作り、HTTPリクエストを API Gateway のプロキシ統合と同じ形式のイベントにしてハンドラーに渡します。
+
+- コンテナ: 関数ごとのワーカープロセスで、Lambdaと同じように1つずつリクエストを処理します。
+  空いているウォームなコンテナがあれば再利用し、なければ新しく起動します（コールドスタート）。
+  同時に処理するのは --workers（同時実行数）件までで、超えた分は空くまで待ちます。
+  コンテナの数が --max-containers に達したときは、最も長く使われていない空きのコンテナを止めて入れ替えます
+- 認可: ルートのオーソライザー（Auth.Authorizer / DefaultAuthorizer）がある場合、トークンがなければ401を返し、
+  requestContext.authorizer を Authorizer と同じ形（principalId と context の値）にします
+    - --auth static（既定）: トークンの JWT を署名を検証せずに読み、sub / username を使う
+    - --auth invoke: テンプレートのオーソライザーの関数を呼び出し、返されたポリシーを methodArn で評価する
+      （結果は ReauthorizeEvery 秒（既定300秒）キャッシュする）
+- CORS: Cors の設定があるAPIでは、OPTIONS のルートがないパスのプリフライトに応答します
+- タイムアウト: 関数の Timeout（最大29秒）を超えたコンテナは止め、504を返します
+
+--endpoint-url に memory:// を指定すると、このプロセスでフェイクのDynamoDB（fake_dynamodb）をHTTPで提供し、
+すべてのコンテナがそれを使います（コンテナの間でデータを共有する）。
+URLに template= がなければ、提供するテンプレートのテーブルを作ります（replay_events.py と同じ）。
+
+レスポンスには、計測用に X-Local-Function / X-Local-Cold-Start / X-Local-Init-Ms / X-Local-Duration-Ms を付けます。
+
+使い方:
+    python tools/local_api.py exercises1/backend/template.yaml --port 3000 --workers 8 \\
+        --endpoint-url memory://local
+    python tools/local_api.py exercises2/backend/template.yaml --api TroublesServiceApi --prewarm 1
+    python tools/local_api.py exercises1/backend/template.yaml --parameter-overrides ApiLayout=router
+
+    python tools/replay_events.py exercises1/backend/events/replay-todos.ndjson --target http://127.0.0.1:3000
+"""
+
+import argparse
+import base64
+import json
+import multiprocessing
+import os
+import re
+import signal
+import sys
+import threading
+import time
+import traceback
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sam_template import ACCOUNT_ID, REGION, LambdaContext, RouteTable, load_app, load_handler, with_template  # noqa: E402
+
+# memory:// のエンドポイントで使うフェイク（fake_dynamodb）のディレクトリ
+FAKE_DYNAMODB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "exercises1", "backend", "tools")
+
+# API Gateway の統合のタイムアウト（秒）
+INTEGRATION_TIMEOUT = 29
+
+# Lambdaの初期化（ハンドラーの読み込み）のタイムアウト（秒）
+INIT_TIMEOUT = 10
+
+# API Gateway がエラーのときに返すボディ
+MISSING_TOKEN = {"message": "Missing Authentication Token"}
+UNAUTHORIZED = {"message": "Unauthorized"}
+EXPLICIT_DENY = {"Message": "User is not authorized to access this resource with an explicit deny"}
+INTERNAL_ERROR = {"message": "Internal server error"}
+TIMED_OUT = {"message": "Endpoint request timed out"}
+
+
+class LocalHTTPServer(ThreadingHTTPServer):
+    """接続の待ち行列を大きくしたHTTPサーバー（負荷をかけたときに接続が拒否されないようにする）"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+
+# コンテナ（ワーカープロセス）
+def container_main(function, environment, quiet, connection):
+    """
+    コンテナのプロセス: ハンドラーを読み込み、受け取ったイベントを1件ずつ処理する
+
+    最初に ("ready", 初期化のミリ秒) か ("init_error", メッセージ) を送り、以降はイベントごとに
+    ("ok", レスポンス, 処理のミリ秒) か ("error", メッセージ, 処理のミリ秒) を返します。
+    """
+    # Ctrl+C はフロントエンドのプロセスが受け取り、コンテナを順に止める
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+    os.environ.update(environment)
+    os.environ.update(AWS_LAMBDA_FUNCTION_NAME=function["function_name"],
+                      AWS_LAMBDA_FUNCTION_MEMORY_SIZE=str(function["memory"]))
+    start = time.perf_counter()
+    try:
+        handler = load_handler(function, 0)
+    except Exception as e:
+        connection.send(("init_error", f"{type(e).__name__}: {e}"))
+        return
+    connection.send(("ready", (time.perf_counter() - start) * 1000))
+
+    while True:
+        event = connection.recv()
+        if event is None:
+            return
+        start = time.perf_counter()
+        try:
+            response = handler(event, LambdaContext(function))
+            result = ("ok", response)
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            result = ("error", f"{type(e).__name__}: {e}")
+        connection.send(result + ((time.perf_counter() - start) * 1000,))
+
+
+class InvocationError(Exception):
+    """関数の呼び出しに失敗した（初期化の失敗・例外・タイムアウト）"""
+
+    def __init__(self, message, timed_out=False):
+        super().__init__(message)
+        self.timed_out = timed_out
+
+
+class Container:
+    """1つの関数を処理するワーカープロセス"""
+
+    def __init__(self, context, function, environment, quiet):
+        self.function = function
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=container_main, args=(function, environment, quiet, child), daemon=True)
+        self.process.start()
+        self.init_ms = None
+        self.last_used = time.monotonic()
+
+    def _receive(self, timeout):
+        if not self.connection.poll(timeout):
+            raise InvocationError(f"{self.function['name']} が {timeout:g} 秒以内に応答しませんでした", timed_out=True)
+        try:
+            return self.connection.recv()
+        except EOFError:
+            raise InvocationError(f"{self.function['name']} のプロセスが終了しました")
+
+    def start(self):
+        """初期化（ハンドラーの読み込み）を待つ"""
+        if self.init_ms is None:
+            message = self._receive(INIT_TIMEOUT)
+            if message[0] != "ready":
+                raise InvocationError(f"{self.function['name']} の初期化に失敗しました: {message[1]}")
+            self.init_ms = message[1]
+
+    def invoke(self, event):
+        """
+        Returns:
+            tuple[dict, float]: ハンドラーのレスポンスと処理時間（ミリ秒）
+        """
+        self.start()
+        self.connection.send(event)
+        status, value, duration_ms = self._receive(min(self.function["timeout"], INTEGRATION_TIMEOUT))
+        if status != "ok":
+            raise InvocationError(value)
+        return value, duration_ms
+
+    def stop(self, wait=True):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        if wait:
+            self.join()
+
+    def join(self):
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class ContainerPool:
+    """
+    関数ごとのウォームなコンテナを管理するプール
+
+    Args:
+        size (int): 同時に処理する呼び出しの数の上限（同時実行数）
+        max_containers (int): コンテナ（プロセス）の数の上限（size 以上にする）
+        environment (dict): すべてのコンテナに設定する環境変数
+        quiet (bool): ハンドラーの標準出力を捨てる
+    """
+
+    def __init__(self, size, max_containers, environment, quiet):
+        self.size = size
+        self.max_containers = max(size, max_containers)
+        self.environment = environment
+        self.quiet = quiet
+        self.context = multiprocessing.get_context("spawn")
+        self.condition = threading.Condition()
+        self.idle = {}
+        self.count = 0
+        self.in_flight = 0
+        self.stats = {}
+
+    def _acquire(self, function):
+        evicted = None
+        with self.condition:
+            while self.in_flight >= self.size:
+                self.condition.wait()
+            self.in_flight += 1
+            idle = self.idle.get(function["name"])
+            if idle:
+                return idle.pop(), False
+            if self.count < self.max_containers:
+                self.count += 1
+            else:
+                # 処理中のコンテナは max_containers より少ないため、空きのコンテナが必ずある
+                candidates = [container for containers in self.idle.values() for container in containers]
+                evicted = min(candidates, key=lambda container: container.last_used)
+                self.idle[evicted.function["name"]].remove(evicted)
+        if evicted is not None:
+            evicted.stop()
+        return Container(self.context, function, self.environment, self.quiet), True
+
+    def _release(self, container, healthy):
+        with self.condition:
+            self.in_flight -= 1
+            if healthy:
+                container.last_used = time.monotonic()
+                self.idle.setdefault(container.function["name"], []).append(container)
+            else:
+                self.count -= 1
+            self.condition.notify_all()
+        if not healthy:
+            container.stop()
+
+    def invoke(self, function, event):
+        """
+        空いているコンテナで関数を呼び出す
+
+        Returns:
+            dict: レスポンス・処理時間・コールドスタートかどうか・初期化時間
+        """
+        container, cold = self._acquire(function)
+        healthy = False
+        try:
+            if cold:
+                container.start()
+            response, duration_ms = container.invoke(event)
+            healthy = True
+        except InvocationError as e:
+            # 例外はコンテナを使い続けられる（Lambdaと同じ）。タイムアウトと初期化の失敗は作り直す
+            healthy = not e.timed_out and container.init_ms is not None and container.process.is_alive()
+            raise
+        finally:
+            self._release(container, healthy)
+            with self.condition:
+                stats = self.stats.setdefault(function["name"], {"invocations": 0, "cold_starts": 0})
+                stats["invocations"] += 1
+                stats["cold_starts"] += int(cold)
+        return {"response": response, "duration_ms": duration_ms, "cold": cold, "init_ms": container.init_ms}
+
+    def prewarm(self, functions, per_function):
+        """関数ごとに per_function 個のコンテナを起動しておく（上限まで）"""
+        started = []
+        for function in functions:
+            for _ in range(per_function):
+                with self.condition:
+                    if self.count >= self.max_containers:
+                        break
+                    self.count += 1
+                started.append(Container(self.context, function, self.environment, self.quiet))
+        for container in started:
+            try:
+                container.start()
+                healthy = True
+            except InvocationError as e:
+                print(e, file=sys.stderr)
+                healthy = False
+            with self.condition:
+                self.in_flight += 1
+            self._release(container, healthy)
+
+    def close(self):
+        with self.condition:
+            containers = [container for containers in self.idle.values() for container in containers]
+            self.idle = {}
+        for container in containers:
+            container.stop(wait=False)
+        for container in containers:
+            container.join()
+
+
+# 認可
+def decode_claims(token):
+    """JWT のペイロードを署名を検証せずに読む（読めなければ空の辞書）"""
+    try:
+        payload = token.split(".")[1]
+        return json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except (IndexError, ValueError):
+        return {}
+
+
+def arn_matches(pattern, arn):
+    """IAMのリソースのワイルドカード（* は / を含む任意の文字列、? は1文字）で比較する"""
+    regex = "".join(".*" if char == "*" else "." if char == "?" else re.escape(char) for char in pattern)
+    return re.fullmatch(regex, arn) is not None
+
+
+def policy_allows(policy, method_arn):
+    """ポリシーが methodArn の呼び出しを許可するか（Deny が優先）"""
+    allowed = False
+    for statement in (policy.get("policyDocument") or {}).get("Statement") or []:
+        resources = statement.get("Resource") or []
+        if isinstance(resources, str):
+            resources = [resources]
+        if any(arn_matches(resource, method_arn) for resource in resources):
+            if statement.get("Effect") == "Deny":
+                return False
+            allowed = statement.get("Effect") == "Allow" or allowed
+    return allowed
+
+
+class Authorizer:
+    """
+    ルートのオーソライザーを処理する
+
+    Args:
+        pool (ContainerPool): オーソライザーの関数を呼び出すプール（invoke のとき）
+        functions (dict): 論理IDごとの関数
+        mode (str): static または invoke
+        principal_id (str | None): static のとき、トークンに sub がなければ使う principalId
+        context (dict): static のとき、requestContext.authorizer に加える値
+    """
+
+    def __init__(self, pool, functions, mode, principal_id, context):
+        self.pool = pool
+        self.functions = functions
+        self.mode = mode
+        self.principal_id = principal_id
+        self.context = context
+        self.cache = {}
+        self.lock = threading.Lock()
+
+    def authorize(self, authorizer, headers, method_arn):
+        """
+        Returns:
+            tuple[int, dict] | dict: エラーのステータスとボディ、または requestContext.authorizer の値
+        """
+        token = next((value for name, value in headers.items() if name.lower() == authorizer["header"].lower()), None)
+        if not token:
+            return 401, UNAUTHORIZED
+        if self.mode == "static":
+            claims = decode_claims(token.replace("Bearer ", "").strip())
+            principal_id = claims.get("sub") or self.principal_id or "local-user"
+            username = claims.get("username") or claims.get("cognito:username") or principal_id
+            return {"principalId": principal_id, "username": username, **self.context, "integrationLatency": 0}
+
+        key = (authorizer["name"], token)
+        now = time.monotonic()
+        with self.lock:
+            cached = self.cache.get(key)
+        start = time.perf_counter()
+        if cached is not None and cached[0] > now:
+            policy = cached[1]
+        else:
+            event = {"type": "TOKEN", "authorizationToken": token, "methodArn": method_arn}
+            try:
+                policy = self.pool.invoke(self.functions[authorizer["function"]], event)["response"]
+            except InvocationError as e:
+                # オーソライザーが "Unauthorized" を送出した場合は401、それ以外は500
+                return (401, UNAUTHORIZED) if "Unauthorized" in str(e) else (500, INTERNAL_ERROR)
+            if not isinstance(policy, dict) or "principalId" not in policy:
+                return 500, INTERNAL_ERROR
+            if authorizer["ttl"] > 0:
+                with self.lock:
+                    self.cache[key] = (now + authorizer["ttl"], policy)
+        if not policy_allows(policy, method_arn):
+            return 403, EXPLICIT_DENY
+        return {"principalId": policy["principalId"], **(policy.get("context") or {}),
+                "integrationLatency": int((time.perf_counter() - start) * 1000)}
+
+
+# DynamoDBのフェイク
+def serve_fake_dynamodb(url):
+    """
+    fake_dynamodb のデータベースをHTTPで提供し、エンドポイントのURLを返す
+
+    コンテナはそれぞれ別のプロセスのため、このプロセスでデータベースを持ち、HTTPで共有します。
+    """
+    sys.path.append(FAKE_DYNAMODB_DIR)
+    import fake_dynamodb
+    endpoint = fake_dynamodb.Endpoint.from_url(url)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            operation = (self.headers.get("X-Amz-Target") or "").split(".", 1)[-1]
+            status, response = endpoint.handle(operation, json.loads(body or b"{}"))
+            payload = json.dumps(response).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/x-amz-json-1.0")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("x-amzn-RequestId", uuid.uuid4().hex)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = LocalHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+# HTTPのフロントエンド
+def build_event(route, method, path, query, headers, body, path_parameters, authorizer, client_ip):
+    """API Gateway（REST API）のプロキシ統合のイベントを作る"""
+    api = route["api"]
+    request_id = str(uuid.uuid4())
+    now = time.time()
+    multi_headers = {}
+    for name, value in headers:
+        multi_headers.setdefault(name, []).append(value)
+    if body:
+        try:
+            body, is_base64 = body.decode("utf-8"), False
+        except UnicodeDecodeError:
+            body, is_base64 = base64.b64encode(body).decode(), True
+    else:
+        body, is_base64 = None, False
+    request_context = {
+        "resourceId": "local",
+        "resourcePath": route["path"],
+        "httpMethod": method,
+        "extendedRequestId": request_id,
+        "requestTime": time.strftime("%d/%b/%Y:%H:%M:%S +0000", time.gmtime(now)),
+        "path": f"/{api['stage']}{path}",
+        "accountId": ACCOUNT_ID,
+        "protocol": "HTTP/1.1",
+        "stage": api["stage"],
+        "domainName": multi_headers.get("Host", ["localhost"])[0],
+        "requestTimeEpoch": int(now * 1000),
+        "requestId": request_id,
+        "identity": {"sourceIp": client_ip, "userAgent": multi_headers.get("User-Agent", [None])[0]},
+        "apiId": api["name"],
+    }
+    if authorizer is not None:
+        request_context["authorizer"] = authorizer
+    return {
+        "resource": route["path"],
+        "path": path,
+        "httpMethod": method,
+        "headers": {name: values[-1] for name, values in multi_headers.items()},
+        "multiValueHeaders": multi_headers,
+        "queryStringParameters": {name: values[-1] for name, values in query.items()} or None,
+        "multiValueQueryStringParameters": query or None,
+        "pathParameters": path_parameters or None,
+        "stageVariables": None,
+        "requestContext": request_context,
+        "body": body,
+        "isBase64Encoded": is_base64,
+    }
+
+
+class LocalApi:
+    """ルートの選択・認可・イベントの作成・コンテナの呼び出しを行う"""
+
+    def __init__(self, routes, functions, pool, authorizer, log):
+        self.table = RouteTable(routes)
+        self.functions = functions
+        self.pool = pool
+        self.authorizer = authorizer
+        self.log = log
+
+    def handle(self, method, raw_path, headers, body, client_ip):
+        """
+        Returns:
+            tuple[int, list[tuple[str, str]], bytes]: ステータス・ヘッダー・ボディ
+        """
+        parts = urlsplit(raw_path)
+        path = unquote(parts.path) or "/"
+        query = parse_qs(parts.query, keep_blank_values=True)
+        matched = self.table.match({"httpMethod": method, "path": path})
+        if matched is None:
+            return self._preflight(method, path) or self._json(403, MISSING_TOKEN)
+        route, path_parameters = matched
+        api = route["api"]
+
+        authorizer = None
+        if route["authorizer"] is not None:
+            method_arn = f"arn:aws:execute-api:{REGION}:{ACCOUNT_ID}:{api['name']}/{api['stage']}/{method}{path}"
+            result = self.authorizer.authorize(route["authorizer"], dict(headers), method_arn)
+            if isinstance(result, tuple):
+                return self._json(*result)
+            authorizer = result
+
+        event = build_event(route, method, path, query, headers, body, path_parameters, authorizer, client_ip)
+        function = route["function"]
+        start = time.perf_counter()
+        try:
+            result = self.pool.invoke(function, event)
+        except InvocationError as e:
+            self.log(f"{method} {path} -> {function['name']}: {e}")
+            return self._json(504, TIMED_OUT) if e.timed_out else self._json(502, INTERNAL_ERROR)
+        status, response_headers, response_body = self._response(result["response"])
+        response_headers += [
+            ("X-Local-Function", function["name"]),
+            ("X-Local-Cold-Start", "true" if result["cold"] else "false"),
+            ("X-Local-Init-Ms", f"{result['init_ms']:.1f}"),
+            ("X-Local-Duration-Ms", f"{result['duration_ms']:.1f}"),
+        ]
+        cold = f" (コールドスタート, 初期化 {result['init_ms']:.0f}ms)" if result["cold"] else ""
+        self.log(f"{method} {path} -> {function['name']} {status} {(time.perf_counter() - start) * 1000:.1f}ms{cold}")
+        return status, response_headers, response_body
+
+    def _preflight(self, method, path):
+        """OPTIONS のルートがないパスに、APIの Cors の設定でプリフライトの応答を返す"""
+        if method != "OPTIONS":
+            return None
+        for route, pattern in self.table.patterns:
+            cors = route["api"]["cors"]
+            if cors and pattern.match(path):
+                headers = [("Access-Control-Allow-Origin", cors.get("AllowOrigin", "*")),
+                           ("Access-Control-Allow-Methods", cors["AllowMethods"])]
+                if "AllowHeaders" in cors:
+                    headers.append(("Access-Control-Allow-Headers", cors["AllowHeaders"]))
+                if "MaxAge" in cors:
+                    headers.append(("Access-Control-Max-Age", cors["MaxAge"]))
+                return 200, headers, b""
+        return None
+
+    @staticmethod
+    def _json(status, body):
+        return status, [("Content-Type", "application/json")], json.dumps(body).encode()
+
+    def _response(self, response):
+        """ハンドラーのレスポンスをHTTPのレスポンスにする（形式が不正なら502）"""
+        if not isinstance(response, dict) or not isinstance(response.get("statusCode"), int):
+            return self._json(502, INTERNAL_ERROR)
+        headers = [(name, str(value)) for name, value in (response.get("headers") or {}).items()]
+        for name, values in (response.get("multiValueHeaders") or {}).items():
+            headers.extend((name, str(value)) for value in values)
+        body = response.get("body") or ""
+        body = base64.b64decode(body) if response.get("isBase64Encoded") else str(body).encode()
+        return response["statusCode"], headers, body
+
+
+def make_handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            status, headers, payload = api.handle(self.command, self.path, list(self.headers.items()), body,
+                                                  self.client_address[0])
+            self.send_response(status)
+            for name, value in headers:
+                if name.lower() != "content-length":
+                    self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(payload)
+
+        do_GET = do_POST = do_PUT = do_DELETE = do_PATCH = do_OPTIONS = do_HEAD = _dispatch
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def parse_pairs(values):
+    pairs = {}
+    for value in values or []:
+        name, _, setting = value.partition("=")
+        pairs[name] = setting
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SAMテンプレートのAPIをローカルで提供する")
+    parser.add_argument("template", help="template.yaml")
+    parser.add_argument("--host", default="127.0.0.1", help="待ち受けるアドレス")
+    parser.add_argument("--port", type=int, default=3000, help="待ち受けるポート")
+    parser.add_argument("--workers", type=int, default=8, help="同時に処理する数の上限（同時実行数）")
+    parser.add_argument("--max-containers", type=int, help="コンテナ（プロセス）の数の上限（省略時は --workers の2倍）")
+    parser.add_argument("--prewarm", type=int, default=0, help="起動時に関数ごとに用意しておくコンテナの数")
+    parser.add_argument("--api", nargs="*", help="提供するAPIの論理ID（省略時はすべて）")
+    parser.add_argument("--parameter-overrides", nargs="*", help="テンプレートのパラメーター（名前=値）")
+    parser.add_argument("--endpoint-url", help="コンテナに設定する ENDPOINT_URL_DYNAMODB（memory:// など）")
+    parser.add_argument("--auth", choices=("static", "invoke"), default="static", help="オーソライザーの扱い")
+    parser.add_argument("--principal-id", help="--auth static でトークンに sub がないときの principalId")
+    parser.add_argument("--auth-context", nargs="*", help="--auth static で requestContext.authorizer に加える値（名前=値）")
+    parser.add_argument("--show-handler-output", action="store_true", help="ハンドラーのログを捨てずに表示する")
+    parser.add_argument("--quiet", action="store_true", help="リクエストごとのログを出力しない")
+    args = parser.parse_args()
+
+    app = load_app(args.template, parse_pairs(args.parameter_overrides))
+    routes = [route for route in app["routes"] if not args.api or route["api"]["name"] in args.api]
+    seen = {}
+    for route in list(routes):
+        key = (route["method"], route["path"])
+        if key in seen:
+            print(f"{route['method']} {route['path']} は {seen[key]} と重複するため {route['function']['name']} は使いません",
+                  file=sys.stderr)
+            routes.remove(route)
+        else:
+            seen[key] = route["function"]["name"]
+
+    environment = {"AWS_DEFAULT_REGION": REGION, "AWS_REGION": REGION}
+    if args.endpoint_url and args.endpoint_url.startswith("memory://"):
+        environment["ENDPOINT_URL_DYNAMODB"] = serve_fake_dynamodb(with_template(args.endpoint_url, args.template))
+        environment.update(AWS_ACCESS_KEY_ID=os.getenv("AWS_ACCESS_KEY_ID", "fake"),
+                           AWS_SECRET_ACCESS_KEY=os.getenv("AWS_SECRET_ACCESS_KEY", "fake"))
+    elif args.endpoint_url:
+        environment["ENDPOINT_URL_DYNAMODB"] = args.endpoint_url
+
+    pool = ContainerPool(args.workers, args.max_containers or args.workers * 2, environment,
+                         not args.show_handler_output)
+    authorizer = Authorizer(pool, app["functions"], args.auth, args.principal_id, parse_pairs(args.auth_context))
+    log = (lambda message: None) if args.quiet else (lambda message: print(message, file=sys.stderr, flush=True))
+    local_api = LocalApi(routes, app["functions"], pool, authorizer, log)
+
+    if args.prewarm:
+        functions = {route["function"]["name"]: route["function"] for route in routes}
+        pool.prewarm(functions.values(), args.prewarm)
+
+    server = LocalHTTPServer((args.host, args.port), make_handler(local_api))
+    for route in local_api.table.routes:
+        auth = f" [{route['authorizer']['name']}]" if route["authorizer"] else ""
+        print(f"{route['method']:<7} http://{args.host}:{args.port}{route['path']} -> "
+              f"{route['function']['name']} ({route['api']['name']}){auth}", file=sys.stderr)
+    print(f"同時実行数 {args.workers}、コンテナ {pool.max_containers} 個までで待ち受けています（Ctrl+C で終了）",
+          file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+        for name, stats in sorted(pool.stats.items()):
+            print(f"{name}: {stats['invocations']} 回（コールドスタート {stats['cold_starts']} 回）", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+すべてのLambda関数のコールドスタート時の初期化時間を計測するツール
+
+リポジトリ内の template.yaml から AWS::Serverless::Function を探し、関数ごとに新しいPythonプロセスで
+ハンドラーのモジュールを `python -X importtime` で読み込みます。
+初期化時間（モジュールの読み込みにかかった時間）と、時間のかかったパッケージの上位を表とJSONで出力します。
+
+- CodeUri / Handler / Runtime / Layers / Environment は Globals を含めてテンプレートから読み取ります
+- 同じテンプレートの AWS::Serverless::LayerVersion を !Ref している場合は、その ContentUri を sys.path に追加します
+- 読み込み時に環境変数を参照する関数があるため、テンプレートの環境変数を設定します（!Ref などはダミーの値）
+- 依存パッケージがインストールされていない関数はエラーとして表に残します
+
+予算（ミリ秒）を超えた関数がある場合は終了コード1で終了するため、CIでの確認にも使えます。
+関数ごとの予算は JSON（{"exercises1/backend:TodoListFunction": 800, ...}）で指定します。
+--write-budgets を指定すると、今回の計測値に余裕（--headroom）を加えた予算のJSONを書き出します。
+予算は計測する環境に依存するため、CIなど同じ環境で作ったものを使ってください。
+
+使い方:
+    python tools/profile_cold_start.py
+    python tools/profile_cold_start.py exercises1/backend/template.yaml --repeat 5 --json cold_start.json
+    python tools/profile_cold_start.py --write-budgets cold_start_budgets.json
+    python tools/profile_cold_start.py --budget-ms 1000 --budgets cold_start_budgets.json
+
+注意:
+    ローカルのPython・ディスクでの計測のため、Lambdaの実行環境での値とは異なります。
+    関数どうしの比較や、変更前後の比較に使ってください。
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+
+import yaml
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# テンプレートを探すときに除外するディレクトリ
+EXCLUDED_DIRS = ("node_modules", ".aws-sam", ".venv", "venv")
+
+# 計測用のコードが読み込む前に出力する区切り（これより前はインタプリタの起動時の読み込み）
+MARKER = "-- profile_cold_start --"
+
+# 新しいプロセスで実行する計測用のコード（ハンドラーのモジュールを読み込む時間を計る）
+IMPORT_SCRIPT = """
+import importlib, json, sys, time
+sys.stderr.write({marker!r} + "\\n")
+sys.stderr.flush()
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+getattr(module, sys.argv[2])
+print(json.dumps(time.perf_counter() - start))
+""".format(marker=MARKER)
+
+# -X importtime の出力（import time: self [us] | cumulative | imported package）
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+class CloudFormationLoader(yaml.SafeLoader):
+    """!Ref や !Sub などの短縮形の組み込み関数を {"Ref": ...} の形で読み込むローダー"""
+
+
+def construct_intrinsic(loader, tag_suffix, node):
+    if isinstance(node, yaml.ScalarNode):
+        value = loader.construct_scalar(node)
+    elif isinstance(node, yaml.SequenceNode):
+        value = loader.construct_sequence(node, deep=True)
+    else:
+        value = loader.construct_mapping(node, deep=True)
+    name = "Ref" if tag_suffix == "Ref" else f"Fn::{tag_suffix}"
+    return {name: value}
+
+
+CloudFormationLoader.add_multi_constructor("!", construct_intrinsic)
+
+
+def find_templates(paths):
+    """引数で指定されたテンプレート、またはリポジトリ内のすべての template.yaml を返す"""
+    if paths:
+        return [os.path.abspath(path) for path in paths]
+    templates = []
+    for path in glob.glob(os.path.join(ROOT_DIR, "**", "template.yaml"), recursive=True):
+        if not any(part in EXCLUDED_DIRS for part in path.split(os.sep)):
+            templates.append(path)
+    return sorted(templates)
+
+
+def discover_functions(template_path):
+    """
+    テンプレートからPythonのLambda関数を取り出す
+
+    Returns:
+        list[dict]: 関数ごとの名前・コードのディレクトリ・ハンドラー・レイヤーのディレクトリ・環境変数
+    """
+    with open(template_path, encoding="utf-8") as f:
+        template = yaml.load(f, Loader=CloudFormationLoader) or {}
+    base_dir = os.path.dirname(template_path)
+    project = os.path.relpath(base_dir, ROOT_DIR).replace(os.sep, "/")
+    globals_function = (template.get("Globals") or {}).get("Function") or {}
+    resources = template.get("Resources") or {}
+
+    functions = []
+    for logical_id, resource in resources.items():
+        if resource.get("Type") != "AWS::Serverless::Function":
+            continue
+        properties = {**globals_function, **(resource.get("Properties") or {})}
+        runtime = properties.get("Runtime") or ""
+        function = {"name": f"{project}:{logical_id}", "template": os.path.relpath(template_path, ROOT_DIR),
+                    "runtime": runtime}
+        if not runtime.startswith("python") or not isinstance(properties.get("CodeUri"), str) \
+                or not isinstance(properties.get("Handler"), str):
+            function["skipped"] = "Pythonの関数ではないか、CodeUri / Handler を読み取れません"
+            functions.append(function)
+            continue
+
+        layer_dirs = []
+        for layer in properties.get("Layers") or []:
+            layer_resource = resources.get(layer.get("Ref")) if isinstance(layer, dict) else None
+            content_uri = ((layer_resource or {}).get("Properties") or {}).get("ContentUri")
+            if isinstance(content_uri, str):
+                layer_dir = os.path.join(base_dir, content_uri)
+                # python/ の下に置く形式のレイヤーにも対応する
+                layer_dirs.extend(path for path in (os.path.join(layer_dir, "python"), layer_dir)
+                                  if os.path.isdir(path))
+
+        variables = ((properties.get("Environment") or {}).get("Variables") or {})
+        module_path, handler_name = properties["Handler"].rsplit(".", 1)
+        function.update({
+            "code_dir": os.path.join(base_dir, properties["CodeUri"]),
+            "module": module_path.replace("/", "."),
+            "handler": handler_name,
+            "layer_dirs": layer_dirs,
+            "environment": {name: value if isinstance(value, str) else "profile-cold-start"
+                            for name, value in variables.items()},
+        })
+        functions.append(function)
+    return functions
+
+
+def parse_importtime(stderr, top):
+    """
+    -X importtime の出力を、最上位のパッケージごとの時間（ミリ秒）に集計する
+
+    ハンドラーのモジュールから直接読み込まれたもの（インデントが1段のもの）の累積時間を、
+    パッケージの先頭の名前（boto3, aws_lambda_powertools など）ごとに合計します。
+    """
+    entries = []
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+    for line in lines:
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+    if not entries:
+        return []
+    # ハンドラーのモジュール自体が最後に出力される（最も浅いインデント）
+    root_indent = min(indent for _, indent, _ in entries)
+    packages = {}
+    for cumulative, indent, name in entries:
+        if indent == root_indent + 2:
+            package = name.split(".")[0]
+            packages[package] = packages.get(package, 0) + cumulative
+    ranked = sorted(packages.items(), key=lambda entry: entry[1], reverse=True)[:top]
+    return [{"package": package, "ms": round(us / 1000, 1)} for package, us in ranked]
+
+
+def profile_function(function, repeat, top):
+    """
+    新しいPythonプロセスでハンドラーを読み込み、初期化時間の中央値と上位のパッケージを返す
+    """
+    env = dict(os.environ, **function["environment"])
+    env.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+    env["PYTHONPATH"] = os.pathsep.join([function["code_dir"], *function["layer_dirs"]])
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT, function["module"], function["handler"]]
+
+    runs = []
+    # 1回目は .pyc の作成が含まれるため捨てる
+    for attempt in range(repeat + 1):
+        result = subprocess.run(command, cwd=function["code_dir"], env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            last_line = (result.stderr.strip().splitlines() or ["不明なエラー"])[-1]
+            return {"error": last_line}
+        if attempt:
+            runs.append((json.loads(result.stdout), result.stderr))
+    runs.sort(key=lambda run: run[0])
+    seconds, stderr = runs[len(runs) // 2]
+    return {"init_ms": round(seconds * 1000, 1), "top_imports": parse_importtime(stderr, top)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lambda関数のコールドスタート時の初期化時間を計測する")
+    parser.add_argument("templates", nargs="*", help="対象のテンプレート（省略時はリポジトリ内のすべて）")
+    parser.add_argument("--function", help="関数名（プロジェクト:論理ID）に含まれる文字列で絞り込む")
+    parser.add_argument("--repeat", type=int, default=3, help="関数ごとの計測回数（中央値を使う）")
+    parser.add_argument("--top", type=int, default=5, help="表示する上位のパッケージ数")
+    parser.add_argument("--budget-ms", type=float, help="すべての関数に共通の予算（ミリ秒）")
+    parser.add_argument("--budgets", help="関数ごとの予算（ミリ秒）を書いたJSONファイル")
+    parser.add_argument("--json", help="結果を書き出すJSONファイル")
+    parser.add_argument("--write-budgets", help="今回の計測値から関数ごとの予算を作って書き出すJSONファイル")
+    parser.add_argument("--headroom", type=float, default=0.2, help="--write-budgets で計測値に加える割合")
+    args = parser.parse_args()
+
+    budgets = {}
+    if args.budgets:
+        with open(args.budgets, encoding="utf-8") as f:
+            budgets = json.load(f)
+
+    results = []
+    for template_path in find_templates(args.templates):
+        for function in discover_functions(template_path):
+            if args.function and args.function not in function["name"]:
+                continue
+            result = {"name": function["name"], "template": function["template"], "runtime": function["runtime"]}
+            if "skipped" in function:
+                result["skipped"] = function["skipped"]
+            else:
+                result.update(profile_function(function, args.repeat, args.top))
+                budget = budgets.get(function["name"], args.budget_ms)
+                if budget is not None and "init_ms" in result:
+                    result["budget_ms"] = budget
+                    result["over_budget"] = result["init_ms"] > budget
+            results.append(result)
+
+    print(f"{'関数':<60}{'初期化 ms':>10}{'予算 ms':>9}  上位のパッケージ（ms）")
+    for result in sorted(results, key=lambda result: result.get("init_ms", -1), reverse=True):
+        if "init_ms" in result:
+            budget = f"{result['budget_ms']:g}" if "budget_ms" in result else "-"
+            mark = " !" if result.get("over_budget") else ""
+            top_imports = ", ".join(f"{entry['package']} {entry['ms']:g}" for entry in result["top_imports"])
+            print(f"{result['name']:<60}{result['init_ms']:>10.1f}{budget:>9}  {top_imports}{mark}")
+        else:
+            print(f"{result['name']:<60}{'-':>10}{'-':>9}  {result.get('error') or result.get('skipped')}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"functions": results}, f, ensure_ascii=False, indent=2)
+
+    if args.write_budgets:
+        # 10ミリ秒単位に切り上げる
+        new_budgets = {result["name"]: int(-(-result["init_ms"] * (1 + args.headroom) // 10) * 10)
+                       for result in results if "init_ms" in result}
+        with open(args.write_budgets, "w", encoding="utf-8") as f:
+            json.dump({**budgets, **new_budgets}, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    over_budget = [result["name"] for result in results if result.get("over_budget")]
+    if over_budget:
+        print(f"\n予算を超えた関数: {', '.join(over_budget)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
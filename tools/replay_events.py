@@ -0,0 +1,481 @@
+"""
+API Gateway のイベントを一定のレートで再生する負荷生成ツール
+
+記録した（またはテンプレートにした）API Gateway プロキシ統合のイベントを NDJSON（1行に1イベント）から読み込み、
+ハンドラーをプロセス内で呼び出すか、`sam local start-api` などのHTTPエンドポイントに送ります。
+ルートごとのレイテンシのヒストグラム（HDR形式）・エラー率・スループットを表示します。
+
+- オープンループ: 各イベントの送信予定時刻を --rate（と --arrival）から先に決め、応答を待たずに送ります。
+  レイテンシは送信予定時刻から応答までの時間で計るため、詰まって送信が遅れた時間も含まれます
+  （応答を待ってから次を送るクローズドループでは、遅い期間のリクエスト数が減って隠れてしまう）
+- プロセス内: --concurrency 個のワーカープロセスがそれぞれ1件ずつ処理します（Lambdaの同時実行数と同じ）。
+  ハンドラーは template.yaml の Api イベント（Path / Method）から探し、Globals を含む環境変数を設定して
+  最初に読み込みます（コールドスタートは計測に含めない）
+- HTTP: --target http://127.0.0.1:3000 のように指定すると、--concurrency 個のスレッドから送ります
+
+NDJSON の各行はイベント、または {"weight": 重み, "event": イベント} です。
+文字列の中の次のプレースホルダーは、送信ごとに置き換えます。
+
+    {{uuid}}  {{seq}}  {{randint:1:100}}  {{choice:low|medium|high}}  {{env:NAME}}
+
+使い方:
+    python tools/replay_events.py exercises1/backend/events/replay-todos.ndjson \\
+        --template exercises1/backend/template.yaml --endpoint-url memory://replay --rate 200 --duration 30
+    python tools/replay_events.py recorded.ndjson --target http://127.0.0.1:3000 --rate 50 --concurrency 10
+    python tools/replay_events.py recorded.ndjson --template exercises1/backend/template.yaml \\
+        --parameter-overrides ApiLayout=router --json replay.json
+
+注意:
+    --endpoint-url に memory:// を指定した場合、フェイクのデータベースはワーカープロセスごとに別になります。
+    URLに template= がなければ --template を追加し、各ワーカーでテンプレートのテーブルを作ります。
+    すべてのリクエストがエラーになった場合は、終了コード1で終了します（設定の誤りを見逃さないため）。
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import multiprocessing
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sam_template import LambdaContext, RouteTable, load_app, load_handler, with_template  # noqa: E402
+
+# memory:// のエンドポイントで使うフェイク（fake_dynamodb）のディレクトリ
+FAKE_DYNAMODB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "exercises1", "backend", "tools")
+
+# 表示するパーセンタイル
+PERCENTILES = (50, 90, 99, 99.9)
+
+# ヒストグラムの有効桁（2のべき乗ごとに 2**SUB_BUCKET_BITS 個に分ける。7ビットで誤差は1%未満）
+SUB_BUCKET_BITS = 7
+
+PLACEHOLDER = re.compile(r"\{\{(\w+)(?::([^}]*))?\}\}")
+
+
+class LatencyHistogram:
+    """
+    HdrHistogram と同じ考え方の対数・線形のヒストグラム（マイクロ秒）
+
+    値を2のべき乗の範囲ごとに一定数のバケットに分けるため、件数が増えてもメモリは増えず、
+    相対誤差が一定のままパーセンタイルを求められます。ワーカーごとのヒストグラムは merge で合算できます。
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value):
+        shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+        return (value >> shift) << shift
+
+    def record(self, microseconds):
+        value = max(0, int(microseconds))
+        key = self.bucket(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """パーセンタイルの値（マイクロ秒）"""
+        if not self.total:
+            return 0
+        threshold = self.total * percent / 100
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= threshold:
+                return min(key, self.max)
+        return self.max
+
+    def distribution(self, steps=(50, 75, 90, 95, 99, 99.9, 99.99, 100)):
+        """HdrHistogram の出力と同じ形式の（パーセンタイル, 値, 累積件数）の一覧"""
+        rows = []
+        for percent in steps:
+            value = self.percentile(percent)
+            rows.append((percent, value, sum(count for key, count in self.counts.items() if key <= value)))
+        return rows
+
+
+class RouteStats:
+    """ルートごとの件数・エラー・レイテンシ"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.count = 0
+        self.errors = 0
+        self.statuses = {}
+
+    def record(self, status, latency_us, service_us):
+        self.count += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not isinstance(status, int) or status >= 500:
+            self.errors += 1
+        self.histogram.record(latency_us)
+        self.service.record(service_us)
+
+
+# イベントの読み込みと置き換え
+def load_events(path):
+    """
+    NDJSON のイベントを読み込む
+
+    Returns:
+        list[tuple[float, dict]]: 重みとイベント
+    """
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            if "event" in entry and "httpMethod" not in entry:
+                events.append((float(entry.get("weight", 1)), entry["event"]))
+            else:
+                events.append((1.0, entry))
+    if not events:
+        raise ValueError(f"イベントがありません: {path}")
+    return events
+
+
+def render(value, rng, seq):
+    """イベントの文字列の中のプレースホルダーを置き換えたコピーを返す"""
+    if isinstance(value, dict):
+        return {key: render(item, rng, seq) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, rng, seq) for item in value]
+    if not isinstance(value, str) or "{{" not in value:
+        return value
+
+    def replace(match):
+        name, argument = match.group(1), match.group(2)
+        if name == "uuid":
+            return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        if name == "seq":
+            return str(seq)
+        if name == "randint":
+            low, high = argument.split(":")
+            return str(rng.randint(int(low), int(high)))
+        if name == "choice":
+            return rng.choice(argument.split("|"))
+        if name == "env":
+            return os.getenv(argument, "")
+        raise ValueError(f"不明なプレースホルダーです: {match.group(0)}")
+
+    return PLACEHOLDER.sub(replace, value)
+
+
+def route_of(event):
+    """集計に使う "GET /todos/{id}" の形のルート（resource がなければ path）"""
+    return f"{event.get('httpMethod', '-')} {event.get('resource') or event.get('path') or '-'}"
+
+
+def schedule(rate, duration, count, arrival, rng):
+    """
+    送信予定時刻（開始からの秒）を順に返す
+
+    Args:
+        arrival (str): constant（一定間隔）または poisson（指数分布の間隔）
+    """
+    offset = 0.0
+    sent = 0
+    while (count is None or sent < count) and (duration is None or offset < duration):
+        yield offset
+        sent += 1
+        offset += rng.expovariate(rate) if arrival == "poisson" else 1 / rate
+
+
+# プロセス内での呼び出し
+def install_fake_dynamodb(functions):
+    """
+    関数のレイヤーの aws_clients に、memory:// のエンドポイントのフェイク（fake_dynamodb）を登録する
+
+    ハンドラーを読み込む前に呼び出します（レイヤーに aws_clients がない関数は対象外）。
+    """
+    sys.path.append(FAKE_DYNAMODB_DIR)
+    import fake_dynamodb
+    for function in functions:
+        for layer_dir in function["layer_dirs"]:
+            if layer_dir not in sys.path:
+                sys.path.append(layer_dir)
+    try:
+        import aws_clients
+    except ImportError:
+        return
+    fake_dynamodb.install(aws_clients)
+
+
+def inprocess_worker(routes, environment, quiet, tasks, results):
+    """
+    ワーカープロセス: すべてのハンドラーを読み込んでから、イベントを1件ずつ処理する
+
+    結果は (ルート, ステータス, 送信予定時刻, 開始時刻, 終了時刻) を results に入れます。
+    """
+    if quiet:
+        # ハンドラーのログとEMFの出力を捨てる（ロガーは読み込み時の sys.stdout に書き込む）
+        sys.stdout = open(os.devnull, "w")
+    os.environ.update(environment)
+    if environment.get("ENDPOINT_URL_DYNAMODB", "").startswith("memory://"):
+        install_fake_dynamodb([route["function"] for route in routes])
+    table = RouteTable(routes)
+    handlers = {}
+    for index, route in enumerate(table.routes):
+        function = route["function"]
+        if function["name"] not in handlers:
+            handlers[function["name"]] = load_handler(function, index)
+    results.put("ready")
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            results.put(None)
+            return
+        intended, event, name = task
+        start = time.monotonic()
+        matched = table.match(event)
+        if matched is None:
+            results.put((name, "no-route", intended, start, time.monotonic()))
+            continue
+        route, path_parameters = matched
+        # パスだけのイベントは、一致したルートのパスで集計する
+        if not event.get("resource"):
+            name = f"{event.get('httpMethod')} {route['path']}"
+        if path_parameters is not None:
+            event = dict(event, resource=route["path"], pathParameters=path_parameters or None)
+        function = route["function"]
+        os.environ.update(function["environment"])
+        try:
+            response = handlers[function["name"]](event, LambdaContext(function))
+            status = response.get("statusCode") if isinstance(response, dict) else None
+        except Exception as e:
+            status = type(e).__name__
+        results.put((name, status, intended, start, time.monotonic()))
+
+
+# HTTPでの呼び出し
+def http_request(event):
+    """イベントからHTTPリクエストの (メソッド, パス, ヘッダー, ボディ) を作る"""
+    path = event.get("path") or event.get("resource") or "/"
+    for name, value in (event.get("pathParameters") or {}).items():
+        path = path.replace("{" + name + "+}", str(value)).replace("{" + name + "}", str(value))
+    query = event.get("multiValueQueryStringParameters") or event.get("queryStringParameters") or {}
+    if query:
+        path += "?" + urlencode(query, doseq=True)
+    body = event.get("body")
+    if body is not None:
+        body = base64.b64decode(body) if event.get("isBase64Encoded") else body.encode()
+    # 接続に関するヘッダーは http.client に任せる
+    headers = {name: value for name, value in (event.get("headers") or {}).items()
+               if name.lower() not in ("host", "content-length", "connection", "accept-encoding")}
+    return event.get("httpMethod", "GET"), path, headers, body
+
+
+def http_worker(target, timeout, tasks, results):
+    """スレッド: キープアライブの接続でイベントを送る"""
+    parts = urlsplit(target)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    base_path = parts.path.rstrip("/")
+    connection = None
+    while True:
+        task = tasks.get()
+        if task is None:
+            results.put(None)
+            return
+        intended, event, name = task
+        start = time.monotonic()
+        method, path, headers, body = http_request(event)
+        try:
+            if connection is None:
+                connection = connection_class(parts.netloc, timeout=timeout)
+            connection.request(method, base_path + path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException) as e:
+            status = type(e).__name__
+            connection = None
+        results.put((name, status, intended, start, time.monotonic()))
+
+
+def collect(results, workers, stats, warmup_until, lag):
+    """結果をルートごとの集計に加える（すべてのワーカーの終了を受け取るまで）"""
+    finished = 0
+    while finished < workers:
+        result = results.get()
+        if result is None:
+            finished += 1
+            continue
+        route, status, intended, start, end = result
+        lag.append(start - intended)
+        if intended < warmup_until:
+            continue
+        stats.setdefault(route, RouteStats()).record(status, (end - intended) * 1e6, (end - start) * 1e6)
+
+
+def format_ms(microseconds):
+    return f"{microseconds / 1000:.1f}"
+
+
+def print_report(stats, elapsed, lag, show_histogram):
+    """ルートごとの件数・エラー率・スループット・パーセンタイルを表示する"""
+    header = f"{'ルート':<36}{'件数':>8}{'エラー率':>9}{'件/秒':>9}" + "".join(f"{'p' + format(p, 'g'):>9}" for p in PERCENTILES)
+    print(header + f"{'最大':>9}  （ミリ秒、送信予定時刻から）")
+    total = RouteStats()
+    for route in sorted(stats):
+        entry = stats[route]
+        total.count += entry.count
+        total.errors += entry.errors
+        total.histogram.merge(entry.histogram)
+        total.service.merge(entry.service)
+        print(f"{route:<36}{entry.count:>8,}{entry.errors / entry.count:>9.1%}{entry.count / elapsed:>9.1f}"
+              + "".join(f"{format_ms(entry.histogram.percentile(p)):>9}" for p in PERCENTILES)
+              + f"{format_ms(entry.histogram.max):>9}  {dict(sorted(entry.statuses.items(), key=str))}")
+    if total.count:
+        print(f"{'合計':<36}{total.count:>8,}{total.errors / total.count:>9.1%}{total.count / elapsed:>9.1f}"
+              + "".join(f"{format_ms(total.histogram.percentile(p)):>9}" for p in PERCENTILES)
+              + f"{format_ms(total.histogram.max):>9}")
+        print(f"\n処理時間（送信の遅れを除く）の p99: {format_ms(total.service.percentile(99))} ミリ秒, "
+              f"送信の遅れの最大: {max(lag) * 1000:.1f} ミリ秒")
+    if show_histogram:
+        for route in sorted(stats):
+            print(f"\n{route}\n{'ミリ秒':>12}{'パーセンタイル':>16}{'累積件数':>10}")
+            for percent, value, cumulative in stats[route].histogram.distribution():
+                print(f"{format_ms(value):>12}{percent:>16g}{cumulative:>10,}")
+
+
+def report_json(stats, elapsed):
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "routes": {
+            route: {
+                "count": entry.count,
+                "errors": entry.errors,
+                "error_rate": round(entry.errors / entry.count, 4),
+                "throughput": round(entry.count / elapsed, 2),
+                "statuses": {str(status): count for status, count in entry.statuses.items()},
+                "latency_ms": {f"p{percent:g}": round(entry.histogram.percentile(percent) / 1000, 3)
+                               for percent in PERCENTILES} | {"max": round(entry.histogram.max / 1000, 3)},
+                "service_ms": {f"p{percent:g}": round(entry.service.percentile(percent) / 1000, 3)
+                               for percent in PERCENTILES},
+                "histogram_us": sorted(entry.histogram.counts.items()),
+            }
+            for route, entry in sorted(stats.items())
+        },
+    }
+
+
+def parse_overrides(values):
+    overrides = {}
+    for value in values or []:
+        name, _, setting = value.partition("=")
+        overrides[name] = setting
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API Gateway のイベントを一定のレートで再生する")
+    parser.add_argument("events", help="イベントの NDJSON ファイル")
+    parser.add_argument("--target", default="inprocess", help="inprocess または http(s)://ホスト:ポート")
+    parser.add_argument("--template", help="プロセス内で呼び出すときの template.yaml")
+    parser.add_argument("--parameter-overrides", nargs="*", help="テンプレートのパラメーター（名前=値）")
+    parser.add_argument("--endpoint-url", help="ワーカーに設定する ENDPOINT_URL_DYNAMODB（memory:// など）")
+    parser.add_argument("--rate", type=float, default=10.0, help="1秒あたりの送信件数")
+    parser.add_argument("--duration", type=float, help="送信する時間（秒）")
+    parser.add_argument("--count", type=int, help="送信する件数（--duration と --count のどちらもなければ10秒）")
+    parser.add_argument("--arrival", choices=("constant", "poisson"), default="poisson", help="送信間隔の分布")
+    parser.add_argument("--order", choices=("random", "sequential"), default="random",
+                        help="random: 重みに従って選ぶ / sequential: ファイルの順に繰り返す")
+    parser.add_argument("--concurrency", type=int, default=4, help="同時に処理する数（ワーカープロセス・スレッド）")
+    parser.add_argument("--warmup", type=float, default=0.0, help="集計に含めない最初の秒数")
+    parser.add_argument("--timeout", type=float, default=30.0, help="HTTPのタイムアウト（秒）")
+    parser.add_argument("--seed", type=int, help="乱数のシード")
+    parser.add_argument("--histogram", action="store_true", help="ルートごとのレイテンシの分布も表示する")
+    parser.add_argument("--show-handler-output", action="store_true", help="ハンドラーのログを捨てずに表示する")
+    parser.add_argument("--json", help="結果を書き出すJSONファイル")
+    args = parser.parse_args()
+
+    if args.duration is None and args.count is None:
+        args.duration = 10.0
+    rng = random.Random(args.seed)
+    events = load_events(args.events)
+    weights = [weight for weight, _ in events]
+
+    if args.target == "inprocess":
+        if not args.template:
+            parser.error("プロセス内で呼び出す場合は --template を指定してください")
+        routes = load_app(args.template, parse_overrides(args.parameter_overrides))["routes"]
+        environment = {"AWS_DEFAULT_REGION": os.getenv("AWS_DEFAULT_REGION", "ap-northeast-1")}
+        if args.endpoint_url:
+            environment["ENDPOINT_URL_DYNAMODB"] = with_template(args.endpoint_url, args.template)
+        tasks, results = multiprocessing.Queue(), multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=inprocess_worker, daemon=True,
+                                           args=(routes, environment, not args.show_handler_output, tasks, results))
+                   for _ in range(args.concurrency)]
+        for worker in workers:
+            worker.start()
+        # すべてのワーカーがハンドラーを読み込むまで待つ
+        for _ in workers:
+            if results.get() != "ready":
+                sys.exit("ワーカーの起動に失敗しました")
+    else:
+        tasks, results = queue.Queue(), queue.Queue()
+        workers = [threading.Thread(target=http_worker, args=(args.target, args.timeout, tasks, results), daemon=True)
+                   for _ in range(args.concurrency)]
+        for worker in workers:
+            worker.start()
+
+    stats, lag = {}, []
+    start = time.monotonic()
+    collector = threading.Thread(target=collect, args=(results, len(workers), stats, start + args.warmup, lag))
+    collector.start()
+
+    sent = 0
+    for offset in schedule(args.rate, args.duration, args.count, args.arrival, rng):
+        delay = start + offset - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        if args.order == "sequential":
+            event = events[sent % len(events)][1]
+        else:
+            event = rng.choices(events, weights=weights)[0][1]
+        # ルートの名前は置き換える前のイベントから作る（/todos/{{uuid}} がIDごとに分かれないように）
+        tasks.put((start + offset, render(event, rng, sent), route_of(event)))
+        sent += 1
+    for _ in workers:
+        tasks.put(None)
+    collector.join()
+    elapsed = time.monotonic() - start - args.warmup
+    for worker in workers:
+        worker.join()
+
+    print_report(stats, elapsed, lag, args.histogram)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report_json(stats, elapsed), f, ensure_ascii=False, indent=2)
+
+    count = sum(entry.count for entry in stats.values())
+    if count and sum(entry.errors for entry in stats.values()) == count:
+        sys.exit(f"すべてのリクエスト（{count:,}件）がエラーになりました。--show-handler-output でハンドラーのログを確認してください")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""
+SAMテンプレートから関数・API・ルートを読み取り、ハンドラーをプロセス内で読み込む共通モジュール
+
+replay_events.py（イベントの再生）と local_api.py（ローカルのAPI Gateway）で使います。
+
+- 関数: CodeUri / Handler / Layers / Environment / Timeout / MemorySize（Globals を含む）
+- API: AWS::Serverless::Api の StageName / Cors / Auth（Authorizers と DefaultAuthorizer）。
+  RestApiId のない Api イベントは暗黙のAPI（ServerlessRestApi）として扱う
+- ルート: Api イベントの Path / Method と、そのルートで使うオーソライザー
+- Conditions（Fn::Equals / Fn::Not / Fn::And / Fn::Or）を評価し、作られない関数は除く
+"""
+
+import importlib.util
+import os
+import re
+import sys
+import time
+import uuid
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import yaml
+
+from profile_cold_start import CloudFormationLoader
+
+# RestApiId のない Api イベントが使うAPIの論理ID（SAMが作るAPIと同じ名前）
+IMPLICIT_API = "ServerlessRestApi"
+
+# ローカルで使うリージョンとアカウントID（ARNの組み立て用）
+REGION = os.getenv("AWS_DEFAULT_REGION", "ap-northeast-1")
+ACCOUNT_ID = "123456789012"
+
+
+def evaluate_condition(value, parameters, conditions):
+    """Conditions の Fn::Equals / Fn::Not / Fn::And / Fn::Or / Condition を評価する"""
+    if isinstance(value, dict):
+        (name, argument), = value.items()
+        if name == "Ref":
+            return parameters.get(argument, argument)
+        if name in ("Condition", "Fn::Condition"):
+            return evaluate_condition(conditions[argument], parameters, conditions)
+        values = [evaluate_condition(item, parameters, conditions) for item in argument]
+        if name == "Fn::Equals":
+            return values[0] == values[1]
+        if name == "Fn::Not":
+            return not values[0]
+        if name == "Fn::And":
+            return all(values)
+        if name == "Fn::Or":
+            return any(values)
+        raise ValueError(f"評価できない条件です: {name}")
+    return value
+
+
+def resolve_value(value, parameters, resources):
+    """環境変数の値を文字列にする（!Ref はパラメーターの値かテーブル名、それ以外は論理IDなど）"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, bool)):
+        return str(value).lower() if isinstance(value, bool) else str(value)
+    if isinstance(value, dict) and "Ref" in value:
+        name = value["Ref"]
+        if name in parameters:
+            return str(parameters[name])
+        table_name = ((resources.get(name) or {}).get("Properties") or {}).get("TableName")
+        return table_name if isinstance(table_name, str) else name
+    return "local"
+
+
+def get_att_resource(value):
+    """!GetAtt X.Arn（または [X, Arn]）の X を返す"""
+    if isinstance(value, dict) and "Fn::GetAtt" in value:
+        target = value["Fn::GetAtt"]
+        return target[0] if isinstance(target, list) else target.split(".")[0]
+    return None
+
+
+def unquote(value):
+    """Cors の "'*'" のような値からシングルクォートを外す"""
+    return value[1:-1] if isinstance(value, str) and len(value) >= 2 and value[0] == value[-1] == "'" else value
+
+
+def read_api(logical_id, properties):
+    """AWS::Serverless::Api（または暗黙のAPI）のステージ・CORS・認可の設定"""
+    cors = properties.get("Cors")
+    if isinstance(cors, str):
+        cors = {"AllowOrigin": cors}
+    if isinstance(cors, dict):
+        cors = {name: unquote(value) for name, value in cors.items() if isinstance(value, str)}
+        cors.setdefault("AllowMethods", "*")
+    auth = properties.get("Auth") or {}
+    authorizers = {}
+    for name, spec in (auth.get("Authorizers") or {}).items():
+        identity = spec.get("Identity") or {}
+        authorizers[name] = {
+            "name": name,
+            "function": get_att_resource(spec.get("FunctionArn")),
+            "type": spec.get("FunctionPayloadType", "TOKEN"),
+            "header": identity.get("Header", "Authorization"),
+            "ttl": int(identity.get("ReauthorizeEvery", 300)),
+        }
+    return {
+        "name": logical_id,
+        "stage": properties.get("StageName") if isinstance(properties.get("StageName"), str) else "Prod",
+        "cors": cors or None,
+        "authorizers": authorizers,
+        "default_authorizer": auth.get("DefaultAuthorizer"),
+        "preflight_authorizer": auth.get("AddDefaultAuthorizerToCorsPreflight", True),
+    }
+
+
+def load_app(template_path, overrides=None):
+    """
+    テンプレートから関数・API・ルートを読み取る
+
+    Args:
+        template_path (str): template.yaml のパス
+        overrides (dict | None): パラメーターの値（--parameter-overrides）
+
+    Returns:
+        dict: functions（論理ID → 関数）, apis（論理ID → API）, routes（メソッド・パス・関数・API・オーソライザー）
+    """
+    with open(template_path, encoding="utf-8") as f:
+        template = yaml.load(f, Loader=CloudFormationLoader) or {}
+    base_dir = os.path.dirname(os.path.abspath(template_path))
+    parameters = {name: spec.get("Default") for name, spec in (template.get("Parameters") or {}).items()}
+    parameters.update(overrides or {})
+    conditions = template.get("Conditions") or {}
+    resources = template.get("Resources") or {}
+    globals_function = (template.get("Globals") or {}).get("Function") or {}
+    globals_api = (template.get("Globals") or {}).get("Api") or {}
+
+    def created(resource):
+        return "Condition" not in resource or evaluate_condition({"Condition": resource["Condition"]}, parameters,
+                                                                 conditions)
+
+    apis = {IMPLICIT_API: read_api(IMPLICIT_API, globals_api)}
+    for logical_id, resource in resources.items():
+        if resource.get("Type") == "AWS::Serverless::Api" and created(resource):
+            apis[logical_id] = read_api(logical_id, {**globals_api, **(resource.get("Properties") or {})})
+
+    functions = {}
+    routes = []
+    for logical_id, resource in resources.items():
+        if resource.get("Type") != "AWS::Serverless::Function" or not created(resource):
+            continue
+        properties = {**globals_function, **(resource.get("Properties") or {})}
+        if not str(properties.get("Runtime", "")).startswith("python"):
+            continue
+        variables = {**((globals_function.get("Environment") or {}).get("Variables") or {}),
+                     **(((resource.get("Properties") or {}).get("Environment") or {}).get("Variables") or {})}
+        layer_dirs = []
+        for layer in properties.get("Layers") or []:
+            content_uri = ((resources.get(layer.get("Ref")) or {}).get("Properties") or {}).get("ContentUri") \
+                if isinstance(layer, dict) else None
+            if isinstance(content_uri, str):
+                layer_dir = os.path.join(base_dir, content_uri)
+                layer_dirs.extend(path for path in (os.path.join(layer_dir, "python"), layer_dir)
+                                  if os.path.isdir(path))
+        module_path, handler_name = properties["Handler"].rsplit(".", 1)
+        code_dir = os.path.join(base_dir, properties["CodeUri"])
+        function_name = properties.get("FunctionName")
+        function = functions[logical_id] = {
+            "name": logical_id,
+            "function_name": function_name if isinstance(function_name, str) else logical_id,
+            "code_dir": code_dir,
+            "file": os.path.join(code_dir, module_path + ".py"),
+            "handler": handler_name,
+            "layer_dirs": layer_dirs,
+            "memory": properties.get("MemorySize", 128),
+            "timeout": properties.get("Timeout", 3),
+            "environment": {name: resolve_value(value, parameters, resources) for name, value in variables.items()},
+        }
+        for event in (properties.get("Events") or {}).values():
+            if event.get("Type") != "Api":
+                continue
+            event_properties = event.get("Properties") or {}
+            rest_api = event_properties.get("RestApiId")
+            api = apis.get(rest_api["Ref"] if isinstance(rest_api, dict) else IMPLICIT_API) or apis[IMPLICIT_API]
+            authorizer = (event_properties.get("Auth") or {}).get("Authorizer", api["default_authorizer"])
+            routes.append({
+                "method": event_properties["Method"].upper(),
+                "path": event_properties["Path"],
+                "function": function,
+                "api": api,
+                "authorizer": api["authorizers"].get(authorizer) if authorizer and authorizer != "NONE" else None,
+            })
+    return {"functions": functions, "apis": apis, "routes": routes}
+
+
+def path_pattern(path):
+    """/todos/{id} や /{proxy+} をパスに一致させる正規表現にする"""
+    pattern = re.sub(r"\\\{(\w+)\\\+\\\}", r"(?P<\1>.+)", re.escape(path))
+    return re.compile("^" + re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", pattern) + "$")
+
+
+class RouteTable:
+    """イベントのメソッドとリソース（なければパス）から関数を選ぶ"""
+
+    def __init__(self, routes):
+        # 固定のパスを優先する（パスパラメーターの少ない順）
+        self.routes = sorted(routes, key=lambda route: (route["path"].count("{"), "+}" in route["path"]))
+        self.patterns = [(route, path_pattern(route["path"])) for route in self.routes]
+
+    def match(self, event):
+        """
+        Returns:
+            tuple[dict, dict] | None: ルートと、パスから取り出したパスパラメーター
+        """
+        method = event.get("httpMethod", "").upper()
+        resource = event.get("resource")
+        for route in self.routes:
+            if route["path"] == resource and route["method"] in (method, "ANY"):
+                return route, None
+        path = event.get("path") or resource or ""
+        for route, pattern in self.patterns:
+            found = pattern.match(path)
+            if found and route["method"] in (method, "ANY"):
+                return route, found.groupdict()
+        return None
+
+
+class LambdaContext:
+    """ハンドラーに渡すコンテキスト（powertools の inject_lambda_context が使う属性を持つ）"""
+
+    def __init__(self, function, timeout=None):
+        self.function_name = function["function_name"]
+        self.memory_limit_in_mb = function["memory"]
+        self.invoked_function_arn = f"arn:aws:lambda:{REGION}:{ACCOUNT_ID}:function:{function['function_name']}"
+        self.aws_request_id = uuid.uuid4().hex
+        self.deadline = time.monotonic() + (timeout or function["timeout"])
+
+    def get_remaining_time_in_millis(self):
+        return int(max(0.0, self.deadline - time.monotonic()) * 1000)
+
+
+def load_handler(function, index):
+    """
+    関数の lambda_handler を読み込む
+
+    関数ごとに同じ名前のモジュール（app, schema など）があるため、ファイルから別の名前で読み込み、
+    読み込み中に追加された関数のディレクトリのモジュールは sys.modules から外します。
+    """
+    for layer_dir in function["layer_dirs"]:
+        if layer_dir not in sys.path:
+            sys.path.append(layer_dir)
+    os.environ.update(function["environment"])
+    before = set(sys.modules)
+    sys.path.insert(0, function["code_dir"])
+    try:
+        spec = importlib.util.spec_from_file_location(f"local_handler_{index}", function["file"])
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(function["code_dir"])
+        code_dir = os.path.abspath(function["code_dir"]) + os.sep
+        for name in set(sys.modules) - before:
+            if (getattr(sys.modules[name], "__file__", None) or "").startswith(code_dir):
+                del sys.modules[name]
+    return getattr(module, function["handler"])
+
+
+def with_template(endpoint_url, template):
+    """
+    memory:// のエンドポイントに template= がなければ追加する
+
+    フェイクのデータベースは空で始まるため、テンプレートがないとすべての呼び出しがテーブルなしのエラーになります。
+
+    Args:
+        endpoint_url (str): --endpoint-url の値
+        template (str): --template の値
+
+    Returns:
+        str: エンドポイントのURL
+    """
+    parts = urlsplit(endpoint_url)
+    if parts.scheme != "memory" or "template" in parse_qs(parts.query):
+        return endpoint_url
+    separator = "&" if parts.query else "?"
+    return f"{endpoint_url}{separator}{urlencode({'template': os.path.abspath(template)})}"
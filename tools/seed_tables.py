@@ -0,0 +1,479 @@
+"""
+負荷試験用の合成データをDynamoDBのテーブルに投入するツール
+
+SAMテンプレートからテーブル名とキースキーマを読み取り、本番に近い偏りを持つデータを生成して
+並列の BatchWriteItem で書き込みます。数百万件でもメモリに溜めずに、生成しながら書き込みます。
+
+データセット（テンプレートのテーブル）:
+- todos: exercises1 の TodoTable（StatusPriorityIndex / DueDateIndex の属性と、TodoTagTable のタグ行も書き込む）
+- troubles: exercises2 の TroubleTable（ユーザーごとの件数はZipf分布で偏らせる）
+- comments: exercises2 の CommentsTable（投稿先のトラブルはZipf分布で偏らせる）
+- roles: exercises2 の RoleAccessTable
+
+偏りの強さは --skew（Zipf分布の指数）で変えられます。IDは --seed と番号から決まるため、
+comments は troubles と同じIDのトラブルに投稿され、別々に実行しても対応が保たれます。
+
+1つのプロセスでは生成とリクエストの組み立てがGILで直列になるため、さらに速く投入したい場合は
+--shard 0/4 〜 3/4 のように番号を分けて複数のプロセス（マシン）で実行します。
+
+書き込みの進み具合（件数・スループット・消費WCU・再送）は --report-interval 秒ごとに標準エラーに出力し、
+最後にテーブルごとの集計を表示します（--json でJSONにも書き出せます）。
+
+使い方:
+    python tools/seed_tables.py --todos 1000000 --endpoint-url http://localhost:4566 --create-tables
+    python tools/seed_tables.py --users 20000 --troubles 500000 --comments 2000000 --roles 50 --workers 32
+    python tools/seed_tables.py --todos 100000 --endpoint-url memory://seed --create-tables
+    python tools/seed_tables.py --todos 10000000 --shard 2/8
+
+--endpoint-url に memory:// を指定すると、exercises1/backend/tools/fake_dynamodb.py のプロセス内のフェイクに
+書き込みます（生成と書き込みの処理自体の速さの確認用）。
+"""
+
+import argparse
+import bisect
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+
+import boto3
+import yaml
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(ROOT_DIR, "exercises1", "backend", "todo_service", "CommonLayer"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "exercises1", "backend", "tools"))
+
+from dynamodb_client import serialize_item  # noqa: E402
+from profile_cold_start import CloudFormationLoader  # noqa: E402
+from todo_index import PRIORITIES, index_attributes, tag_rows  # noqa: E402
+
+# BatchWriteItem の1回あたりの上限
+MAX_BATCH_WRITE = 25
+
+# 再送の待ち時間（秒）の初期値と上限
+BACKOFF_BASE = 0.05
+BACKOFF_MAX = 5.0
+
+# スロットリングとして再送するエラー
+THROTTLING_ERRORS = ("ProvisionedThroughputExceededException", "ThrottlingException", "RequestLimitExceeded")
+
+# SimpleTable の PrimaryKey の型と AttributeType の対応
+SIMPLE_TABLE_TYPES = {"String": "S", "Number": "N", "Binary": "B"}
+
+# データセットごとのテンプレートとテーブル（論理ID）
+DATASETS = {
+    "todos": {"template": "exercises1/backend/template.yaml", "table": "TodoTable", "derived": "TodoTagTable"},
+    "troubles": {"template": "exercises2/backend/template.yaml", "table": "TroubleTable"},
+    "comments": {"template": "exercises2/backend/template.yaml", "table": "CommentsTable"},
+    "roles": {"template": "exercises2/backend/template.yaml", "table": "RoleAccessTable"},
+}
+
+TITLE_VERBS = ("買う", "確認する", "連絡する", "まとめる", "予約する", "提出する", "片付ける", "修正する", "調べる", "準備する")
+TITLE_OBJECTS = ("牛乳", "請求書", "会議資料", "歯医者", "レポート", "部屋", "バグ", "旅行の計画", "見積もり", "引っ越し")
+DESCRIPTION_WORDS = ("今週中に", "忘れずに", "念のため", "担当者に", "できれば", "午前中に", "詳細は別途", "優先して",
+                     "メモを参照", "前回の続き")
+TROUBLE_CATEGORIES = ("仕事", "人間関係", "健康", "お金", "家族", "学校", "恋愛", "その他")
+TROUBLE_MESSAGES = ("うまくいかない", "どうすればよいか分からない", "相談したい", "眠れない", "困っている", "決められない")
+COMMENT_TEXTS = ("分かります", "私も同じでした", "少し休んでみては", "応援しています", "専門家に相談してみましょう",
+                 "大丈夫ですよ", "もう少し詳しく教えてください")
+# exercises2 の API のルート（ロールの allowed_operations に使う）
+OPERATIONS = ("GET /troubles", "POST /troubles", "GET /comments", "POST /comments", "GET /roles", "POST /roles",
+              "GET /roles/{role_id}", "PUT /roles/{role_id}", "DELETE /roles/{role_id}", "GET /users", "POST /users",
+              "GET /users/{user_id}", "PUT /users/{user_id}", "DELETE /users/{user_id}")
+
+
+def resolve(value, parameters):
+    """TableName などの値を文字列にする（!Ref のパラメーターは既定値を使う）"""
+    if isinstance(value, dict) and "Ref" in value:
+        return (parameters.get(value["Ref"]) or {}).get("Default")
+    return value if isinstance(value, str) else None
+
+
+def discover_tables(template_path):
+    """
+    テンプレートから AWS::DynamoDB::Table / AWS::Serverless::SimpleTable を取り出す
+
+    Returns:
+        dict: 論理IDごとのテーブル名と CreateTable の定義
+    """
+    with open(template_path, encoding="utf-8") as f:
+        template = yaml.load(f, Loader=CloudFormationLoader) or {}
+    parameters = template.get("Parameters") or {}
+    tables = {}
+    for logical_id, resource in (template.get("Resources") or {}).items():
+        properties = resource.get("Properties") or {}
+        if resource.get("Type") == "AWS::DynamoDB::Table":
+            definition = {name: properties[name] for name in ("KeySchema", "AttributeDefinitions",
+                                                               "GlobalSecondaryIndexes", "LocalSecondaryIndexes")
+                          if name in properties}
+        elif resource.get("Type") == "AWS::Serverless::SimpleTable":
+            primary_key = properties.get("PrimaryKey") or {"Name": "id", "Type": "String"}
+            definition = {
+                "KeySchema": [{"AttributeName": primary_key["Name"], "KeyType": "HASH"}],
+                "AttributeDefinitions": [{"AttributeName": primary_key["Name"],
+                                          "AttributeType": SIMPLE_TABLE_TYPES[primary_key["Type"]]}],
+            }
+        else:
+            continue
+        # 投入先ではオンデマンドで作る（プロビジョニングの設定は外す）
+        for index in definition.get("GlobalSecondaryIndexes", []):
+            index.pop("ProvisionedThroughput", None)
+        name = resolve(properties.get("TableName"), parameters) or logical_id
+        definition.update(TableName=name, BillingMode="PAY_PER_REQUEST")
+        tables[logical_id] = {"name": name, "definition": definition,
+                              "keys": [key["AttributeName"] for key in definition["KeySchema"]]}
+    return tables
+
+
+def stable_uuid(seed, kind, index):
+    """シードと種類と番号から決まるUUID（別々に実行しても同じIDになる）"""
+    digest = hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+class ZipfSampler:
+    """
+    0〜n-1 の番号をZipf分布で選ぶ（番号が小さいほど選ばれやすい）
+
+    Args:
+        n (int): 番号の数
+        skew (float): 指数（0で一様、大きいほど偏る）
+        rng (random.Random): 乱数
+    """
+
+    def __init__(self, n, skew, rng):
+        self.cumulative = list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(n)))
+        self.total = self.cumulative[-1]
+        self.rng = rng
+
+    def sample(self):
+        return bisect.bisect_left(self.cumulative, self.rng.random() * self.total)
+
+
+def generate_todos(indices, rng, seed, skew, start_date):
+    """
+    TODOを生成する（期限は今日の前後に集中させ、タグはZipf分布で偏らせる）
+
+    Yields:
+        tuple[str, dict]: 論理IDとアイテム（タグテーブルの行も含む）
+    """
+    tags = ZipfSampler(200, skew, rng)
+    tag_names = [f"tag{i:03d}" for i in range(200)]
+    for i in indices:
+        todo = {
+            "id": stable_uuid(seed, "todo", i),
+            "title": f"{rng.choice(TITLE_OBJECTS)}を{rng.choice(TITLE_VERBS)}",
+            "description": "、".join(rng.choices(DESCRIPTION_WORDS, k=int(rng.expovariate(1 / 6)))),
+            "is_completed": rng.random() < 0.3,
+            "priority": rng.choices(PRIORITIES, weights=(3, 5, 2))[0],
+            "tags": sorted({tag_names[tags.sample()] for _ in range(rng.choice((0, 1, 1, 2, 2, 3)))}),
+        }
+        # 期限のないTODOには due_date を書かない（DueDateIndex のキーに NULL は入れられない）
+        if rng.random() < 0.7:
+            days = int(rng.gauss(0, 30))
+            todo["due_date"] = (start_date + datetime.timedelta(days=days)).isoformat()
+        todo.update(index_attributes(todo))
+        yield "TodoTable", todo
+        for row in tag_rows(todo).values():
+            yield "TodoTagTable", row
+
+
+def generate_troubles(indices, rng, seed, skew, users):
+    """トラブルを生成する（投稿者はZipf分布で偏らせる）"""
+    authors = ZipfSampler(users, skew, rng)
+    for i in indices:
+        yield "TroubleTable", {
+            "user_id": stable_uuid(seed, "user", authors.sample()),
+            "item_id": f"trouble#{stable_uuid(seed, 'trouble', i)}",
+            "category": rng.choice(TROUBLE_CATEGORIES),
+            "message": rng.choice(TROUBLE_MESSAGES),
+        }
+
+
+def generate_comments(indices, rng, seed, skew, users, troubles, start_date):
+    """コメントを生成する（投稿先のトラブルと投稿者はZipf分布で偏らせる）"""
+    targets = ZipfSampler(troubles, skew, rng)
+    authors = ZipfSampler(users, skew, rng)
+    start = datetime.datetime.combine(start_date, datetime.time())
+    for i in indices:
+        timestamp = (start - datetime.timedelta(seconds=rng.randrange(90 * 86400))).isoformat()
+        yield "CommentsTable", {
+            "PK": f"trouble#{stable_uuid(seed, 'trouble', targets.sample())}",
+            "SK": f"createdAt#{timestamp}#{stable_uuid(seed, 'comment', i)}",
+            "user_id": f"user#{stable_uuid(seed, 'user', authors.sample())}",
+            "comment": rng.choice(COMMENT_TEXTS),
+        }
+
+
+def generate_roles(indices, rng, seed):
+    """ロールを生成する（一部はスーパーユーザー）"""
+    for i in indices:
+        yield "RoleAccessTable", {
+            "role_id": stable_uuid(seed, "role", i),
+            "name": f"role-{i}",
+            "is_super_user": rng.random() < 0.02,
+            "allowed_operations": sorted(rng.sample(OPERATIONS, rng.randint(1, len(OPERATIONS)))),
+        }
+
+
+class BatchWritePipeline:
+    """
+    BatchWriteItem を複数のスレッドで並列に実行するパイプライン
+
+    put で渡したアイテムをテーブルごとに25件ずつまとめ、上限のあるキューを通して書き込みスレッドに渡します。
+    書き込みが追いつかないときは put が待つため、生成の速さが書き込みの速さに合わせて抑えられます。
+    UnprocessedItems とスロットリングは指数バックオフ（ジッター付き）で再送します。
+
+    Args:
+        client: DynamoDBの低レベルクライアント
+        workers (int): 書き込みスレッドの数
+        report_interval (float): 進み具合を出力する間隔（秒、0で出力しない）
+    """
+
+    def __init__(self, client, workers, report_interval=5.0):
+        self.client = client
+        self.workers = workers
+        self.report_interval = report_interval
+        self.queue = queue.Queue(maxsize=workers * 4)
+        self.buffers = {}
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.error = None
+        self.stopped = threading.Event()
+        self.start = time.perf_counter()
+        self.threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        if report_interval > 0:
+            self.threads.append(threading.Thread(target=self._report, daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    def _table_stats(self, table_name):
+        stats = self.stats.get(table_name)
+        if stats is None:
+            stats = self.stats[table_name] = {"items": 0, "batches": 0, "capacity": 0.0, "unprocessed_retries": 0,
+                                              "throttled_retries": 0}
+        return stats
+
+    def put(self, table_name, key, item):
+        """
+        アイテムを書き込む（25件たまったら書き込みスレッドに渡す）
+
+        Args:
+            table_name (str): テーブル名
+            key (tuple): キーの値（同じリクエストに同じキーを入れないために使う）
+            item (dict): DynamoDBの形式のアイテム
+        """
+        if self.error is not None:
+            raise self.error
+        buffer = self.buffers.setdefault(table_name, {})
+        if key in buffer:
+            # 同じキーを1回の BatchWriteItem に入れるとエラーになるため、先に送る
+            self._flush(table_name)
+            buffer = self.buffers.setdefault(table_name, {})
+        buffer[key] = {"PutRequest": {"Item": item}}
+        if len(buffer) >= MAX_BATCH_WRITE:
+            self._flush(table_name)
+
+    def _flush(self, table_name):
+        buffer = self.buffers.pop(table_name, None)
+        if buffer:
+            self.queue.put((table_name, list(buffer.values())))
+
+    def _work(self):
+        rng = random.Random()
+        while True:
+            entry = self.queue.get()
+            if entry is None:
+                return
+            if self.error is None:
+                try:
+                    self._write(*entry, rng)
+                except Exception as e:
+                    self.error = e
+
+    def _write(self, table_name, requests, rng):
+        attempt = 0
+        items = len(requests)
+        while requests:
+            try:
+                response = self.client.batch_write_item(RequestItems={table_name: requests},
+                                                        ReturnConsumedCapacity="TOTAL")
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in THROTTLING_ERRORS:
+                    raise
+                with self.lock:
+                    self._table_stats(table_name)["throttled_retries"] += 1
+            else:
+                capacity = sum(entry.get("CapacityUnits") or 0 for entry in response.get("ConsumedCapacity") or [])
+                requests = (response.get("UnprocessedItems") or {}).get(table_name) or []
+                with self.lock:
+                    stats = self._table_stats(table_name)
+                    stats["batches"] += 1
+                    stats["capacity"] += capacity
+                    if requests:
+                        stats["unprocessed_retries"] += 1
+                    else:
+                        stats["items"] += items
+                if not requests:
+                    return
+            attempt += 1
+            time.sleep(rng.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+
+    def totals(self):
+        """すべてのテーブルの合計（件数・消費WCU・再送回数）"""
+        with self.lock:
+            stats = list(self.stats.values())
+        return {name: sum(entry[name] for entry in stats)
+                for name in ("items", "capacity", "unprocessed_retries", "throttled_retries")}
+
+    def _report(self):
+        previous, previous_time = 0, self.start
+        while not self.stopped.wait(self.report_interval):
+            totals = self.totals()
+            now = time.perf_counter()
+            recent = (totals["items"] - previous) / (now - previous_time)
+            average = totals["items"] / (now - self.start)
+            print(f"{totals['items']:,} 件 (直近 {recent:,.0f} 件/秒, 平均 {average:,.0f} 件/秒, "
+                  f"WCU {totals['capacity']:,.0f}, 再送 {totals['unprocessed_retries'] + totals['throttled_retries']:,})",
+                  file=sys.stderr)
+            previous, previous_time = totals["items"], now
+
+    def close(self):
+        """残りのアイテムを書き込み、スレッドの終了を待つ"""
+        for table_name in list(self.buffers):
+            self._flush(table_name)
+        for _ in range(self.workers):
+            self.queue.put(None)
+        for thread in self.threads[:self.workers]:
+            thread.join()
+        self.stopped.set()
+        if self.error is not None:
+            raise self.error
+        return time.perf_counter() - self.start
+
+
+def create_client(endpoint_url, workers):
+    """書き込みスレッドの数に合わせたコネクションプールのクライアントを作る"""
+    config = Config(max_pool_connections=max(10, workers), retries={"mode": "standard", "max_attempts": 3})
+    if endpoint_url and endpoint_url.startswith("memory://"):
+        import fake_dynamodb
+        client = boto3.client("dynamodb", region_name="ap-northeast-1", config=config, **fake_dynamodb.CLIENT_KWARGS)
+        fake_dynamodb.attach(client, endpoint_url)
+        return client
+    return boto3.client("dynamodb", endpoint_url=endpoint_url, config=config)
+
+
+def create_tables(client, tables):
+    """存在しないテーブルをテンプレートの定義（オンデマンド）で作る"""
+    for table in tables:
+        try:
+            client.describe_table(TableName=table["name"])
+            continue
+        except client.exceptions.ResourceNotFoundException:
+            pass
+        client.create_table(**table["definition"])
+        client.get_waiter("table_exists").wait(TableName=table["name"], WaiterConfig={"Delay": 1})
+        print(f"テーブル {table['name']} を作成しました", file=sys.stderr)
+
+
+def parse_shard(value):
+    """K/N の形式のシャードを (K, N) にする"""
+    shard, shards = (int(part) for part in value.split("/"))
+    if not 0 <= shard < shards:
+        raise argparse.ArgumentTypeError(f"0 <= K < N の K/N を指定してください: {value}")
+    return shard, shards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="負荷試験用の合成データをDynamoDBのテーブルに投入する")
+    parser.add_argument("--todos", type=int, default=0, help="TODOの件数")
+    parser.add_argument("--troubles", type=int, default=0, help="トラブルの件数")
+    parser.add_argument("--comments", type=int, default=0, help="コメントの件数")
+    parser.add_argument("--roles", type=int, default=0, help="ロールの件数")
+    parser.add_argument("--users", type=int, default=10000, help="トラブルとコメントの投稿者の人数")
+    parser.add_argument("--comment-troubles", type=int,
+                        help="コメントの投稿先にするトラブルの件数（省略時は --troubles、0なら10000）")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf分布の指数（0で一様）")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード（同じなら同じデータになる）")
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1),
+                        help="K/N: 番号を N 個に分けたうちの K 番目だけを書き込む（複数プロセスでの実行用）")
+    parser.add_argument("--start-date", type=datetime.date.fromisoformat, default=datetime.date.today(),
+                        help="期限や投稿日時の基準日（YYYY-MM-DD）")
+    parser.add_argument("--workers", type=int, default=16, help="書き込みスレッドの数")
+    parser.add_argument("--endpoint-url", default=os.getenv("ENDPOINT_URL"),
+                        help="DynamoDBのエンドポイント（LocalStack、memory:// など）")
+    parser.add_argument("--create-tables", action="store_true", help="存在しないテーブルをテンプレートから作る")
+    parser.add_argument("--report-interval", type=float, default=5.0, help="進み具合を出力する間隔（秒）")
+    parser.add_argument("--json", help="結果を書き出すJSONファイル")
+    args = parser.parse_args()
+
+    counts = {name: getattr(args, name) for name in DATASETS}
+    if not any(counts.values()):
+        parser.error("--todos / --troubles / --comments / --roles のいずれかに件数を指定してください")
+
+    templates = {}
+    targets = {}
+    for name, dataset in DATASETS.items():
+        if not counts[name]:
+            continue
+        template = dataset["template"]
+        if template not in templates:
+            templates[template] = discover_tables(os.path.join(ROOT_DIR, template))
+        for logical_id in (dataset["table"], dataset.get("derived")):
+            if logical_id:
+                targets[logical_id] = templates[template][logical_id]
+
+    client = create_client(args.endpoint_url, args.workers)
+    if args.create_tables:
+        create_tables(client, targets.values())
+
+    shard, shards = args.shard
+    rng = random.Random(f"{args.seed}:{shard}")
+    indices = {name: range(shard, count, shards) for name, count in counts.items()}
+    comment_troubles = args.comment_troubles or args.troubles or 10000
+    generators = [
+        generate_todos(indices["todos"], rng, args.seed, args.skew, args.start_date),
+        generate_troubles(indices["troubles"], rng, args.seed, args.skew, args.users),
+        generate_comments(indices["comments"], rng, args.seed, args.skew, args.users, comment_troubles,
+                          args.start_date),
+        generate_roles(indices["roles"], rng, args.seed),
+    ]
+
+    pipeline = BatchWritePipeline(client, args.workers, args.report_interval)
+    try:
+        for logical_id, item in itertools.chain.from_iterable(generators):
+            table = targets[logical_id]
+            pipeline.put(table["name"], tuple(item[key] for key in table["keys"]), serialize_item(item))
+    finally:
+        elapsed = pipeline.close()
+
+    results = []
+    print(f"{'テーブル':<30}{'件数':>12}{'件/秒':>10}{'WCU':>12}{'未処理の再送':>12}{'スロットリング':>14}")
+    for table in targets.values():
+        stats = pipeline.stats.get(table["name"])
+        if stats is None:
+            continue
+        results.append({"table": table["name"], **stats, "items_per_second": round(stats["items"] / elapsed, 1)})
+        print(f"{table['name']:<30}{stats['items']:>12,}{stats['items'] / elapsed:>10,.0f}{stats['capacity']:>12,.0f}"
+              f"{stats['unprocessed_retries']:>12,}{stats['throttled_retries']:>14,}")
+    totals = pipeline.totals()
+    print(f"\n{totals['items']:,} 件を {elapsed:.1f} 秒で書き込みました（{totals['items'] / elapsed:,.0f} 件/秒, "
+          f"書き込みスレッド {args.workers}）")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"elapsed_seconds": round(elapsed, 3), "workers": args.workers, "seed": args.seed,
+                       "shard": f"{shard}/{shards}", "tables": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()